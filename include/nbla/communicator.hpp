@@ -168,6 +168,22 @@ public:
   virtual void all_reduce(NdArrayPtr ndarray, bool division = false,
                           bool inplace = false, const string &group = "world");
 
+  /** all_reduce over gradients of variables including row-sparse gradients.
+
+  The row-sparse gradients (see SparseGrad) of the variables are gathered from
+  all workers by all_gather(), and each worker gets the sum of them as its
+  row-sparse gradient. The gradient of a variable whose dense grad is computed
+  on any worker is converted to dense and reduced by all_reduce(). The
+  communicator must have the float type config.
+
+  @param vars Variables whose gradients are reduced.
+  @param division Divide the reduced value.
+  @param group Name of a group.
+   */
+  virtual void all_reduce_sparse_grad(const vector<VariablePtr> &vars,
+                                      bool division = false,
+                                      const string &group = "world");
+
   /** all_reduce over parameters added.
 
   @param ndarray_list Vector of NdArrayPtr
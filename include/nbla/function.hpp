@@ -322,6 +322,15 @@ public:
    */
   virtual bool prohibit_zero_input_grad() const { return false; }
 
+  /** A flag for preventing that imperative execution reuses this function
+      set up for the same arguments and input shapes.
+
+      @note A subclass must override this if setup_impl() depends on the values
+     of inputs, e.g. the output shapes are computed from them, or if it keeps
+     references to the arrays of inputs or outputs.
+   */
+  virtual bool prohibit_setup_reuse() const { return false; }
+
   /** A flag for checking if setup_recompute() is needed.
 
       Checking if o-th output' data requires setup_recompute().
@@ -133,6 +133,13 @@ protected:
                                       const Variables &outputs,
                                       const vector<bool> &propagate_down,
                                       const vector<bool> &accum);
+  // Paths for channel_last=true, which work on the NHWC layout directly.
+  NBLA_API void forward_channel_last(const Variables &inputs,
+                                     const Variables &outputs);
+  NBLA_API void backward_channel_last(const Variables &inputs,
+                                      const Variables &outputs,
+                                      const vector<bool> &propagate_down,
+                                      const vector<bool> &accum);
   virtual bool grad_depends_input_data_impl(int i, int j) const {
     if (i == 0 && j == 1) {
       return true;
@@ -25,6 +25,20 @@ namespace nbla {
 
 NBLA_REGISTER_FUNCTION_HEADER(Einsum, const string &);
 
+/** Order of pairwise contractions of operands computed by Einsum.
+
+Each pair (i, j), i < j, contracts the i-th and the j-th operands into one by a
+BatchMatmul. The two operands are removed from the list of the operands and the
+result is appended to it. The order minimizing the estimated number of
+multiply-adds is searched exhaustively for up to 8 operands, and greedily
+otherwise. The result is cached for each pair of the equation and the shapes.
+
+@param equation A string that follows Einstein summation convention.
+@param shapes Shapes of the inputs.
+*/
+NBLA_API vector<pair<int, int>> einsum_path(const string &equation,
+                                            const vector<Shape_t> &shapes);
+
 /**
 Evaluates the Einstein summation convention on the inputs.
 
@@ -43,6 +57,7 @@ protected:
   const string equation_;
   vector<CgVariablePtr> input_cg_variables_;
   CgVariablePtr last_output_cg_variable_;
+  vector<pair<int, int>> contraction_path_;
 
 public:
   Einsum(const Context &ctx, const string &equation)
@@ -59,8 +74,12 @@ public:
     return SingletonManager::get<Cpu>()->array_classes();
   }
   virtual string name() { return "Einsum"; }
+  virtual bool prohibit_setup_reuse() const { return true; }
   virtual bool grad_depends_output_data(int i, int o) const { return false; }
 
+  /** Contraction order used by the last setup. See einsum_path(). */
+  vector<pair<int, int>> contraction_path() const { return contraction_path_; }
+
 protected:
   NBLA_API virtual void setup_impl(const Variables &inputs,
                                    const Variables &outputs);
@@ -35,6 +35,9 @@ Inputs:
 Outputs:
 - Output with shape @f$(I_0, ..., I_N, W_1, ..., W_M)@f$
 
+If the sparse gradient of the weights is enabled, the gradients are added to
+it only for the rows indexed, and the dense gradient is left zero.
+
 @tparam T Index type (integer)
 @tparam T1 Value type (usually float)
 @ingroup FunctionImplGrp
@@ -66,6 +69,8 @@ protected:
                                       const Variables &outputs,
                                       const vector<bool> &propagate_down,
                                       const vector<bool> &accum);
+  void backward_sparse(const Variables &inputs, const Variables &outputs,
+                       bool accum);
   virtual bool grad_depends_input_data_impl(int i, int j) const {
     if (i == 1 && j == 0) {
       return true;
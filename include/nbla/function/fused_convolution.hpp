@@ -99,6 +99,7 @@ public:
     return SingletonManager::get<Cpu>()->array_classes();
   }
   virtual string name() { return "FusedConvolution"; }
+  virtual bool prohibit_setup_reuse() const { return true; }
   virtual bool grad_depends_output_data(int i, int o) const {
     if (nonlinearity_ == "relu") {
       return true;
@@ -155,6 +156,13 @@ private:
   unordered_map<InName, CgVariablePtr> input_cg_variables_;
   CgVariablePtr last_output_cg_variable_;
   bool reset_cg_variables(const Variables &inputs, const Variables &outputs);
+
+  // Members only used in the fast path where convolution is followed by a
+  // single element-wise epilogue (folded BN, residual add and activation).
+  bool fast_path_ = false;
+  shared_ptr<Function> conv_;
+  Variables conv_inputs(const Variables &inputs);
+  void forward_epilogue(const Variables &inputs, const Variables &outputs);
 };
 } // namespace nbla
 #endif
@@ -0,0 +1,110 @@
+// Copyright 2023 Sony Group Corporation.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef NBLA_FUNCTION_FUSED_ELEMENTWISE_HPP
+#define NBLA_FUNCTION_FUSED_ELEMENTWISE_HPP
+
+#include <nbla/cpu.hpp>
+#include <nbla/function.hpp>
+#include <nbla/function_registry.hpp>
+
+namespace nbla {
+
+NBLA_REGISTER_FUNCTION_HEADER(FusedElementwise, const string &,
+                              const vector<float> &);
+
+/**
+A chain of element-wise operations fused into a single function.
+
+The chain is evaluated block by block so that intermediate values stay in a
+small buffer instead of being written to a full-sized array per operation.
+
+Inputs:
+- x: N-D array.
+- z: N-D array with the same shape as x. Required only when `add` is in `ops`.
+
+Outputs:
+- y: N-D array with the same shape as x.
+
+@param ops Comma separated names of element-wise operations applied in order.
+@param op_args Scalar arguments consumed in order by the operations which take
+one.
+
+\ingroup FunctionImplGrp
+ */
+template <typename T>
+class FusedElementwise : public BaseFunction<const string &,
+                                             const vector<float> &> {
+public:
+  enum class Op {
+    ADD,
+    ADD_SCALAR,
+    MUL_SCALAR,
+    POW_SCALAR,
+    RELU,
+    LEAKY_RELU,
+    RELU6,
+    SIGMOID,
+    TANH,
+    SWISH,
+    ELU,
+    EXP,
+    ABS
+  };
+
+protected:
+  const string ops_;
+  const vector<float> op_args_;
+
+  // Parsed representation of `ops_`. `params_[i]` is the scalar argument of
+  // `op_types_[i]` (0 if the operation takes none).
+  vector<Op> op_types_;
+  vector<float> params_;
+
+public:
+  FusedElementwise(const Context &ctx, const string &ops,
+                   const vector<float> &op_args)
+      : BaseFunction(ctx, ops, op_args), ops_(ops), op_args_(op_args) {}
+  virtual ~FusedElementwise() {}
+  virtual shared_ptr<Function> copy() const {
+    return create_FusedElementwise(ctx_, ops_, op_args_);
+  }
+  virtual int min_inputs() { return 1; }
+  virtual int min_outputs() { return 1; }
+  virtual vector<dtypes> in_types() {
+    return vector<dtypes>{get_dtype<T>(), get_dtype<T>()};
+  }
+  virtual vector<dtypes> out_types() { return vector<dtypes>{get_dtype<T>()}; }
+  virtual vector<string> allowed_array_classes() {
+    return SingletonManager::get<Cpu>()->array_classes();
+  }
+  virtual string name() { return "FusedElementwise"; }
+  virtual bool grad_depends_output_data(int i, int o) const { return false; }
+
+protected:
+  NBLA_API virtual void setup_impl(const Variables &inputs,
+                                   const Variables &outputs);
+  NBLA_API virtual void forward_impl(const Variables &inputs,
+                                     const Variables &outputs);
+  NBLA_API virtual void backward_impl(const Variables &inputs,
+                                      const Variables &outputs,
+                                      const vector<bool> &propagate_down,
+                                      const vector<bool> &accum);
+  virtual bool grad_depends_input_data_impl(int i, int j) const {
+    // Intermediate values are recomputed from all inputs in backward.
+    return true;
+  }
+};
+} // namespace nbla
+#endif
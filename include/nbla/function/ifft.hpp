@@ -68,6 +68,8 @@ protected:
   virtual bool grad_depends_input_data_impl(int i, int j) const {
     return false;
   }
+  // Product of the sizes of the signal axes.
+  double signal_size(const Shape_t &shape) const;
 };
 } // namespace nbla
 #endif
@@ -103,6 +103,13 @@ protected:
   NBLA_API virtual void calculate_window(Context &ctx, Variable *window) const;
   NBLA_API virtual void calculate_inv_window(Context &ctx,
                                              Variable *inv_window);
+  // Windowed IDFT and overlap-add of y_r and y_i into x by FFT, i.e. the
+  // deconvolution by the weights of calculate_conv_weight.
+  NBLA_API void idft_forward(Variable *y_r, Variable *y_i, Variable *x);
+  // Gradients of y_r and y_i for idft_forward.
+  NBLA_API void idft_backward(Variable *y_r, Variable *y_i, Variable *x,
+                              const vector<bool> &propagate_down,
+                              const vector<bool> &accum);
   NBLA_API virtual void apply_inv_window_forward(Variable *x, Variable *y);
   NBLA_API virtual void apply_inv_window_backward(Variable *x, Variable *y,
                                                   const bool accum);
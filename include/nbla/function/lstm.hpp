@@ -23,23 +23,7 @@
 #include <nbla/function_registry.hpp>
 #include <nbla/variable.hpp>
 
-#include <nbla/computation_graph/computation_graph.hpp>
-#include <nbla/computation_graph/function.hpp>
-#include <nbla/computation_graph/utils.hpp>
-#include <nbla/computation_graph/variable.hpp>
-
-#include <nbla/function/add2.hpp>
-#include <nbla/function/affine.hpp>
-#include <nbla/function/concatenate.hpp>
-#include <nbla/function/mul2.hpp>
-#include <nbla/function/reshape.hpp>
-#include <nbla/function/sigmoid.hpp>
-#include <nbla/function/sink.hpp>
-#include <nbla/function/slice.hpp>
-#include <nbla/function/split.hpp>
-#include <nbla/function/stack.hpp>
-#include <nbla/function/tanh.hpp>
-#include <nbla/function/transpose.hpp>
+#include <nbla/function/utils/fused_rnn.hpp>
 
 namespace nbla {
 
@@ -68,15 +52,15 @@ protected:
   int num_directions_;
   bool weight_exists_;
   bool bias_exists_;
-  vector<CgVariablePtr> ys_, hn_, cn_;
-  shared_ptr<CgVariable> x_, h_, c_, w0_, w_, b_;
+  FusedRNN fused_rnn_;
 
 public:
   LSTM(const Context &ctx, int num_layers, float dropout, bool bidirectional,
        bool training)
       : BaseFunction(ctx, num_layers, dropout, bidirectional, training),
         num_layers_(num_layers), dropout_(dropout),
-        bidirectional_(bidirectional), training_(training) {}
+        bidirectional_(bidirectional), training_(training),
+        fused_rnn_(FusedRNN::LSTM) {}
   virtual ~LSTM() {}
   virtual shared_ptr<Function> copy() const {
     return create_LSTM(ctx_, num_layers_, dropout_, bidirectional_, training_);
@@ -109,24 +93,14 @@ protected:
                                       const Variables &outputs,
                                       const vector<bool> &propagate_down,
                                       const vector<bool> &accum);
-  virtual bool grad_depends_input_data_impl(int i, int j) const {
-    return false;
-  }
+  virtual bool grad_depends_input_data_impl(int i, int j) const { return true; }
   virtual bool auto_grad_depends_input_data_impl(int i, int j) const {
     // lstm_backward requires the all inputs for recomputation.
     return true;
   }
 
 private:
-  vector<vector<CgVariablePtr>> create_fixed_length_lstm_graph(
-      shared_ptr<CgVariable> in_x, shared_ptr<CgVariable> in_h,
-      shared_ptr<CgVariable> in_c, shared_ptr<CgVariable> in_w0,
-      shared_ptr<CgVariable> in_w, shared_ptr<CgVariable> in_b);
-  vector<vector<CgVariablePtr>> lstm_cell(shared_ptr<CgVariable> x,
-                                          shared_ptr<CgVariable> h,
-                                          shared_ptr<CgVariable> c,
-                                          shared_ptr<CgVariable> w,
-                                          shared_ptr<CgVariable> b);
+  vector<Variable *> fused_inputs(const Variables &inputs);
 };
 } // namespace nbla
 #endif
@@ -55,6 +55,7 @@ public:
     return SingletonManager::get<Cpu>()->array_classes();
   }
   virtual string name() { return "NonZero"; }
+  virtual bool prohibit_setup_reuse() const { return true; }
   virtual bool grad_depends_output_data(int i, int o) const { return true; }
 
 protected:
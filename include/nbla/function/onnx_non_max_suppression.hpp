@@ -83,6 +83,7 @@ public:
     return SingletonManager::get<Cpu>()->array_classes();
   }
   virtual string name() { return "ONNXNonMaxSuppression"; }
+  virtual bool prohibit_setup_reuse() const { return true; }
   virtual bool grad_depends_output_data(int i, int o) const { return false; }
 
 protected:
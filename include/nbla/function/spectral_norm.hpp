@@ -86,6 +86,7 @@ public:
     return SingletonManager::get<Cpu>()->array_classes();
   }
   virtual string name() { return "SpectralNorm"; }
+  virtual bool prohibit_setup_reuse() const { return true; }
   virtual bool grad_depends_output_data(int i, int o) const { return i == 0; }
   virtual bool need_setup_recompute(int o) const { return true; }
 
@@ -102,6 +102,12 @@ protected:
                                       const Variables &outputs,
                                       const vector<bool> &propagate_down,
                                       const vector<bool> &accum);
+  // Windowed DFT of the frames of x by FFT, i.e. the convolution by the
+  // weights of calculate_conv_weight.
+  NBLA_API void dft_forward(Variable *x, Variable *y_r, Variable *y_i);
+  // Gradient of x for dft_forward.
+  NBLA_API void dft_backward(Variable *x, Variable *y_r, Variable *y_i,
+                             const bool accum);
 
   // Only for `as_istft_backward == true`.
   NBLA_API virtual void apply_inv_window_forward(Variable *x, Variable *y);
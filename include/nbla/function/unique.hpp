@@ -87,6 +87,7 @@ public:
     return SingletonManager::get<Cpu>()->array_classes();
   }
   virtual string name() { return "Unique"; }
+  virtual bool prohibit_setup_reuse() const { return true; }
 
 protected:
   NBLA_API virtual void setup_impl(const Variables &inputs,
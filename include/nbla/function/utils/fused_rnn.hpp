@@ -0,0 +1,218 @@
+// Copyright 2023 Sony Group Corporation.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef __NBLA_FUNCTION_UTILS_FUSED_RNN_HPP__
+#define __NBLA_FUNCTION_UTILS_FUSED_RNN_HPP__
+
+#include <nbla/half.hpp>
+#include <nbla/variable.hpp>
+
+namespace nbla {
+
+/** CPU kernels of multi-layer, optionally bidirectional RNN, LSTM and GRU.
+
+Input projections of the whole sequence are computed by one GEMM per layer
+and direction, and each step computes only the recurrent GEMM and the gate
+activations in place. Computation is in float; Half arrays are converted at
+the boundary.
+
+Layouts follow the RNN, LSTM and GRU functions: x (T, B, I), h and c (L, D,
+B, H), y (T, B, D * H), w0 (D, G, H, I + H), w (L - 1, D, G, H, D * H + H) and
+b (L, D, G, H) where G is 1, 4 and 3 for RNN, LSTM and GRU respectively except
+that GRU has 4 biases. For GRU, the last bias is added to the recurrent
+projection of the candidate gate.
+ */
+class NBLA_API FusedRNN {
+public:
+  enum Cell { RNN_TANH, RNN_RELU, LSTM, GRU };
+
+  /** Roles of the inputs. Variables absent in a function are nullptr. */
+  enum Input { X, H, C, W0, W, B, NUM_INPUTS };
+
+  FusedRNN(Cell cell) : cell_(cell) {}
+
+  void setup(int num_layers, int num_directions, int seq_len, int batch_size,
+             int input_size, int hidden_size, bool has_bias);
+
+  /** Compute y, hn and cn. Intermediate results are kept for backward if
+      training is true. */
+  void forward(const float *x, const float *h0, const float *c0,
+               const float *w0, const float *w, const float *b, float *y,
+               float *hn, float *cn, bool training);
+
+  /** Compute gradients. Each gradient is overwritten unless its pointer is
+      nullptr. */
+  void backward(const float *x, const float *h0, const float *c0,
+                const float *w0, const float *w, const float *b,
+                const float *dy, const float *dhn, const float *dcn, float *dx,
+                float *dh0, float *dc0, float *dw0, float *dw, float *db);
+
+  /** Forward with variables of the function. */
+  template <typename T>
+  void forward(const Context &ctx, const vector<Variable *> &inputs,
+               const vector<Variable *> &outputs, bool training);
+
+  /** Backward with variables of the function. */
+  template <typename T>
+  void backward(const Context &ctx, const vector<Variable *> &inputs,
+                const vector<Variable *> &outputs,
+                const vector<bool> &propagate_down, const vector<bool> &accum);
+
+private:
+  Cell cell_;
+  int num_layers_, num_directions_, seq_len_, batch_size_, input_size_,
+      hidden_size_;
+  bool has_bias_;
+  bool trained_ = false;
+
+  // Kept by forward for backward.
+  vector<float> layer_outputs_; // (L, T, B, D * H)
+  vector<float> gates_;         // (L, D, T, B, G * H)
+  vector<float> cells_;         // (L, D, T, B, H) for LSTM
+  vector<float> recurrent_n_;   // (L, D, T, B, H) for GRU
+
+  int num_gates() const;
+  int num_biases() const;
+  int layer_input_size(int l) const;
+  const float *weight(const float *w0, const float *w, int l, int d) const;
+  float *weight(float *w0, float *w, int l, int d) const;
+};
+
+namespace fused_rnn {
+/** Float view of an array, converted into buf unless T is float. */
+template <typename T>
+inline const float *as_float(const T *x, Size_t size, vector<float> &buf) {
+  buf.resize(size);
+  for (Size_t i = 0; i < size; ++i)
+    buf[i] = x[i];
+  return buf.data();
+}
+
+template <>
+inline const float *as_float<float>(const float *x, Size_t size,
+                                    vector<float> &buf) {
+  return x;
+}
+
+template <>
+inline const float *as_float<Half>(const Half *x, Size_t size,
+                                   vector<float> &buf) {
+  buf.resize(size);
+  halfbits2float_n(reinterpret_cast<const uint16_t *>(x), buf.data(), size);
+  return buf.data();
+}
+
+/** Float buffer to be stored into x by store(), or x itself if T is float
+    and the result is not accumulated. */
+template <typename T>
+inline float *float_buffer(T *x, Size_t size, bool accum, vector<float> &buf) {
+  buf.resize(size);
+  return buf.data();
+}
+
+template <>
+inline float *float_buffer<float>(float *x, Size_t size, bool accum,
+                                  vector<float> &buf) {
+  if (accum) {
+    buf.resize(size);
+    return buf.data();
+  }
+  return x;
+}
+
+template <typename T>
+inline void store(const float *src, T *dst, Size_t size, bool accum) {
+  if (static_cast<const void *>(src) == static_cast<const void *>(dst))
+    return;
+  for (Size_t i = 0; i < size; ++i)
+    dst[i] = accum ? T(float(dst[i]) + src[i]) : T(src[i]);
+}
+
+template <>
+inline void store<Half>(const float *src, Half *dst, Size_t size, bool accum) {
+  auto bits = reinterpret_cast<uint16_t *>(dst);
+  if (!accum) {
+    float2halfbits_n(src, bits, size);
+    return;
+  }
+  vector<float> tmp(size);
+  halfbits2float_n(bits, tmp.data(), size);
+  for (Size_t i = 0; i < size; ++i)
+    tmp[i] += src[i];
+  float2halfbits_n(tmp.data(), bits, size);
+}
+} // namespace fused_rnn
+
+template <typename T>
+void FusedRNN::forward(const Context &ctx, const vector<Variable *> &inputs,
+                       const vector<Variable *> &outputs, bool training) {
+  vector<vector<float>> bufs(NUM_INPUTS);
+  vector<const float *> in(NUM_INPUTS, nullptr);
+  for (int i = 0; i < NUM_INPUTS; ++i) {
+    if (inputs[i])
+      in[i] = fused_rnn::as_float<T>(inputs[i]->get_data_pointer<T>(ctx),
+                                     inputs[i]->size(), bufs[i]);
+  }
+  vector<vector<float>> out_bufs(outputs.size());
+  vector<T *> outs(3, nullptr);
+  vector<float *> fouts(3, nullptr);
+  for (size_t i = 0; i < outputs.size(); ++i) {
+    outs[i] = outputs[i]->cast_data_and_get_pointer<T>(ctx, true);
+    fouts[i] = fused_rnn::float_buffer<T>(outs[i], outputs[i]->size(), false,
+                                          out_bufs[i]);
+  }
+  forward(in[X], in[H], in[C], in[W0], in[W], in[B], fouts[0], fouts[1],
+          fouts[2], training);
+  for (size_t i = 0; i < outputs.size(); ++i)
+    fused_rnn::store<T>(fouts[i], outs[i], outputs[i]->size(), false);
+}
+
+template <typename T>
+void FusedRNN::backward(const Context &ctx, const vector<Variable *> &inputs,
+                        const vector<Variable *> &outputs,
+                        const vector<bool> &propagate_down,
+                        const vector<bool> &accum) {
+  vector<vector<float>> bufs(NUM_INPUTS);
+  vector<const float *> in(NUM_INPUTS, nullptr);
+  for (int i = 0; i < NUM_INPUTS; ++i) {
+    if (inputs[i])
+      in[i] = fused_rnn::as_float<T>(inputs[i]->get_data_pointer<T>(ctx),
+                                     inputs[i]->size(), bufs[i]);
+  }
+  vector<vector<float>> dout_bufs(outputs.size());
+  vector<const float *> douts(3, nullptr);
+  for (size_t i = 0; i < outputs.size(); ++i) {
+    douts[i] = fused_rnn::as_float<T>(outputs[i]->get_grad_pointer<T>(ctx),
+                                      outputs[i]->size(), dout_bufs[i]);
+  }
+  vector<vector<float>> din_bufs(NUM_INPUTS);
+  vector<T *> dins(NUM_INPUTS, nullptr);
+  vector<float *> fdins(NUM_INPUTS, nullptr);
+  for (int i = 0; i < NUM_INPUTS; ++i) {
+    if (inputs[i] && propagate_down[i]) {
+      dins[i] = inputs[i]->cast_grad_and_get_pointer<T>(ctx, !accum[i]);
+      fdins[i] = fused_rnn::float_buffer<T>(dins[i], inputs[i]->size(),
+                                            accum[i], din_bufs[i]);
+    }
+  }
+  backward(in[X], in[H], in[C], in[W0], in[W], in[B], douts[0], douts[1],
+           douts[2], fdins[X], fdins[H], fdins[C], fdins[W0], fdins[W],
+           fdins[B]);
+  for (int i = 0; i < NUM_INPUTS; ++i) {
+    if (fdins[i])
+      fused_rnn::store<T>(fdins[i], dins[i], inputs[i]->size(), accum[i]);
+  }
+}
+} // namespace nbla
+#endif
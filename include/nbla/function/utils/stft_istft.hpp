@@ -45,6 +45,39 @@ void create_window(Variable *window, const string &window_type,
     }
   }
 }
+
+/** Windowed DFT of the frames of signals, computed by FFT.
+
+  y_r[b, f, t] + j y_i[b, f, t] =
+    alpha_f sum_n x[b, t * stride + n] window[n] exp(-2 pi j f n / fft_size)
+
+for f = 0, ..., fft_size / 2. alpha_f is 1, or the coefficient of the inverse
+DFT of one-sided spectrum (1 / fft_size for f = 0, fft_size / 2 and
+2 / fft_size otherwise) if idft_coef is true. It is the same as the
+convolution of x by the DFT coefficients multiplied by the window.
+
+@param x Signals of (batch_size, x_size).
+@param y_r Real part of (batch_size, fft_size / 2 + 1, num_frames). Skipped if
+nullptr.
+@param y_i Imaginary part. Skipped if nullptr.
+ */
+template <typename T>
+void stft_by_fft(const T *x, T *y_r, T *y_i, const T *window, int batch_size,
+                 int x_size, int fft_size, int stride, int num_frames,
+                 bool idft_coef, bool accum_r, bool accum_i);
+
+/** Adjoint of stft_by_fft, i.e. windowed inverse DFT and overlap-add.
+
+  x[b, t * stride + n] = sum_t window[n] Re(
+    sum_f alpha_f (y_r[b, f, t] + j y_i[b, f, t]) exp(2 pi j f n / fft_size))
+
+It is the same as the deconvolution of y_r and y_i by the coefficients
+multiplied by the window. y_r or y_i can be nullptr for zeros.
+ */
+template <typename T>
+void istft_by_fft(const T *y_r, const T *y_i, T *x, const T *window,
+                  int batch_size, int x_size, int fft_size, int stride,
+                  int num_frames, bool idft_coef, bool accum);
 } // namespace nbla
 
 #endif
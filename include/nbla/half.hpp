@@ -44,6 +44,43 @@ inline float halfbits2float(uint16_t hbits) {
   return fvalue;
 }
 
+/** Convert a float into bfloat16 bits, the upper 16 bits of float, rounding
+    to nearest even. NaN is kept NaN.
+ */
+inline uint16_t float2bfloat16bits(float fvalue) {
+  union {
+    uint32_t bits;
+    float value_;
+  };
+  value_ = fvalue;
+  if ((bits & 0x7fffffffu) > 0x7f800000u) {
+    return (uint16_t)((bits >> 16) | 0x40u);
+  }
+  return (uint16_t)((bits + 0x7fffu + ((bits >> 16) & 1u)) >> 16);
+}
+
+inline float bfloat16bits2float(uint16_t bbits) {
+  union {
+    uint32_t fbits;
+    float fvalue;
+  };
+  fbits = (uint32_t)bbits << 16;
+  return fvalue;
+}
+
+/** Bulk conversions between float and half or bfloat16 bits.
+
+These give the same results as the scalar conversions above except that
+float values in (2^-25, 2^-24) are rounded to the smallest subnormal half as
+IEEE 754 specifies, and that the hardware conversion (F16C) may quiet
+signaling NaNs. They are vectorized, and are parallelized over threads for
+large arrays.
+ */
+NBLA_API void float2halfbits_n(const float *src, uint16_t *dst, size_t n);
+NBLA_API void halfbits2float_n(const uint16_t *src, float *dst, size_t n);
+NBLA_API void float2bfloat16bits_n(const float *src, uint16_t *dst, size_t n);
+NBLA_API void bfloat16bits2float_n(const uint16_t *src, float *dst, size_t n);
+
 /** \addtogroup NNablaCoreGrp */
 /*@{*/
 
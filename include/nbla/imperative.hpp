@@ -17,6 +17,11 @@
 
 #include <nbla/function.hpp>
 #include <nbla/nd_array.hpp>
+#include <nbla/singleton_manager.hpp>
+
+#include <list>
+#include <mutex>
+#include <unordered_map>
 
 namespace nbla {
 
@@ -34,6 +39,24 @@ NBLA_API vector<NdArrayPtr> execute(FunctionPtr func,
                                     int n_outputs,
                                     vector<NdArrayPtr> outputs = {});
 
+/** Execute a function given NdArray instances as inputs reusing a function
+    previously set up.
+
+    A function set up for the same key, the same context and the same input
+    shapes and dtypes is taken from ImperativeCache, and is executed without
+    setup. Otherwise func is set up and executed, and is stored in the cache
+    afterwards.
+
+    @param[in] key A string identifying the type and the arguments of func.
+   The cache is not used if it is empty.
+
+    @sa execute
+*/
+NBLA_API vector<NdArrayPtr> execute(const string &key, FunctionPtr func,
+                                    const vector<NdArrayPtr> &inputs,
+                                    int n_outputs,
+                                    vector<NdArrayPtr> outputs = {});
+
 NBLA_API void execute(FunctionPtr f, const Variables &inputs,
                       const Variables &outputs);
 
@@ -41,6 +64,59 @@ NBLA_API void backward(FunctionPtr f, const Variables &inputs,
                        const Variables &outputs,
                        const vector<bool> &propagate_down,
                        const vector<bool> &accum, bool with_setup = false);
+
+/**
+Singleton class storing functions set up by imperative execution.
+
+The least recently used functions are removed when the number of functions
+exceeds the capacity. A function is taken out of the cache while it is
+executed, so that it is never executed by two threads at once.
+*/
+class NBLA_API ImperativeCache {
+public:
+  /** Function set up and its output shapes. */
+  struct Entry {
+    FunctionPtr func;
+    vector<Shape_t> out_shapes;
+  };
+
+  ~ImperativeCache();
+
+  /** Take out a function stored with the key.
+
+      @retval Entry with nullptr func if no function is stored.
+   */
+  Entry pop(const string &key);
+
+  /** Store a function with the key. */
+  void push(const string &key, const Entry &entry);
+
+  /** Get the maximum number of stored functions. */
+  size_t capacity() const;
+
+  /** Set the maximum number of stored functions. 0 disables the cache. */
+  void set_capacity(size_t capacity);
+
+  /** Get the number of stored functions. */
+  size_t size() const;
+
+  /** Remove all stored functions. */
+  void clear();
+
+private:
+  typedef std::list<pair<string, Entry>> Entries;
+  Entries entries_; ///< Most recently used first.
+  std::unordered_multimap<string, Entries::iterator> index_;
+  size_t capacity_;
+  mutable std::mutex mutex_;
+
+  void evict();
+
+  friend SingletonManager;
+  // Never called by users.
+  ImperativeCache();
+  DISABLE_COPY_AND_ASSIGN(ImperativeCache);
+};
 } // namespace nbla
 
 #endif
@@ -221,7 +221,9 @@ public:
   /** Update all params using stored grads in #params_ by backpropagation.
 
   This internally calls update_impl() which must be implemented in a derived
-  class.
+  class. A parameter having only a row-sparse gradient (see SparseGrad) is
+  updated by update_sparse_impl() if the solver runs on CPU and no weight decay
+  is fused in the update.
   */
   void update(update_hook_type pre_callback = nullptr,
               update_hook_type post_callback = nullptr);
@@ -305,6 +307,22 @@ protected:
   */
   virtual void update_impl(const string &key, VariablePtr param) = 0;
 
+  /** Lazy update implementation for a row-sparse gradient.
+
+  Only the rows in the sparse gradient of the parameter and their states are
+  updated, while the dense grad is zero. Solvers whose states decay at every
+  update (e.g. Momentum and Adam) keep the states of the other rows as they
+  are.
+
+  @param key Key of parameter.
+  @param param Parameter variable.
+  @return false if not supported. The sparse gradient is then added to the
+  dense grad, and update_impl() is called.
+  */
+  virtual bool update_sparse_impl(const string &key, VariablePtr param) {
+    return false;
+  }
+
   /** Weight decay implementation.
 
   @param key Key of parameter.
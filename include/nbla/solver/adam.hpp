@@ -61,6 +61,7 @@ protected:
   virtual void set_state_impl(const string &key, VariablePtr param);
   virtual void remove_state_impl(const string &key);
   virtual void update_impl(const string &key, VariablePtr param);
+  virtual bool update_sparse_impl(const string &key, VariablePtr param);
   NBLA_DECL_WEIGHT_DECAY();
   NBLA_DECL_CLIP_GRAD_BY_NORM();
   NBLA_DECL_CHECK_INF_GRAD();
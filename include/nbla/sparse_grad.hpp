@@ -0,0 +1,69 @@
+// Copyright 2023 Sony Group Corporation.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef __NBLA_SPARSE_GRAD_HPP__
+#define __NBLA_SPARSE_GRAD_HPP__
+
+#include <nbla/common.hpp>
+
+namespace nbla {
+
+class Variable;
+
+/** Row-sparse part of the gradient of a Variable.
+
+If enabled, a Function propagating to a few rows of a large parameter (e.g.
+Embed) adds the gradients of the rows here instead of the dense grad of the
+Variable, and Solver updates only the rows. The gradient of the Variable is
+the sum of the dense grad and the rows held here.
+
+rows are sorted and unique indices of the first axis, and values holds the
+gradients of the rows in float, row_size elements for each row.
+
+\ingroup NNablaCoreGrp
+*/
+struct NBLA_API SparseGrad {
+  bool enabled = false; ///< Whether Functions may store gradients here.
+  vector<int64_t> rows; ///< Sorted and unique row indices.
+  vector<float> values; ///< Gradients of rows.
+  Size_t row_size = 0;  ///< Number of elements in a row.
+
+  bool empty() const { return rows.empty(); }
+
+  /** Discard all rows. */
+  void clear();
+
+  /** Add gradients of rows.
+
+  @param new_rows Row indices, which may be unsorted and duplicated.
+  @param new_values Gradients of the rows, row_size elements for each row.
+  @param n Number of rows.
+  @param row_size Number of elements in a row.
+  */
+  void add(const int64_t *new_rows, const float *new_values, Size_t n,
+           Size_t row_size);
+
+  /** Multiply the gradients of all rows by scale. */
+  void scale(float scale);
+
+  /** Whether any gradient is inf (if inf is true) or nan (if nan is true).
+   */
+  bool has_inf_or_nan(bool inf, bool nan) const;
+};
+
+/** Add the row-sparse gradient of a Variable to its dense grad, and clear it.
+ */
+NBLA_API void sparse_grad_to_dense(Variable *var);
+} // namespace nbla
+#endif
@@ -28,6 +28,19 @@ namespace nbla {
 
 using std::pair;
 
+/** Counts of array synchronizations performed by SyncedArray.
+
+    An array is synchronized when it is requested in a dtype or an array class
+    different from the head. The counts are accumulated over all SyncedArray
+    instances until they are reset.
+ */
+struct SyncStatistics {
+  size_t copies;      ///< Number of synchronizations.
+  size_t conversions; ///< Synchronizations with dtype conversion.
+  size_t transfers;   ///< Synchronizations across array classes.
+  size_t bytes;       ///< Bytes written to the synchronized arrays.
+};
+
 /** Synchronized array interface that implicitly transfers and cast arrays
 over devices and data types.
 \ingroup NNablaCoreGrp
@@ -115,6 +128,37 @@ public:
   shared_ptr<const Array> get_sp(dtypes dtype, const Context &ctx,
                                  const int async_flags = AsyncFlag::NONE);
 
+  /** Cast and get many arrays with the same dtype and context at once.
+
+  This is equivalent to calling cast_sp() for each array, except that the
+  copies between host arrays are performed together, parallelized over
+  threads, after the heads of all arrays are moved. If an exception is
+  thrown, the copies for the arrays already cast are done before it
+  propagates.
+
+  @sa cast_sp
+   */
+  static vector<shared_ptr<Array>>
+  cast_sp_batch(const vector<shared_ptr<SyncedArray>> &arrays, dtypes dtype,
+                const Context &ctx, bool write_only = false,
+                const int async_flags = AsyncFlag::NONE);
+
+  /** Get many arrays with the same dtype and context at once.
+
+  @sa cast_sp_batch, get_sp
+   */
+  static vector<shared_ptr<const Array>>
+  get_sp_batch(const vector<shared_ptr<SyncedArray>> &arrays, dtypes dtype,
+               const Context &ctx, const int async_flags = AsyncFlag::NONE);
+
+  /** Get the counts of synchronizations since the last reset.
+   */
+  static SyncStatistics sync_statistics();
+
+  /** Reset the counts of synchronizations.
+   */
+  static void reset_sync_statistics();
+
   /** Get the head array.
    */
   Array *head_array();
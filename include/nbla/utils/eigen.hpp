@@ -18,6 +18,8 @@
 #define EIGEN_NO_DEBUG
 #define EIGEN_MPL2_ONLY
 
+#include <nbla/half.hpp>
+
 #include <Eigen/Dense>
 
 namespace nbla {
@@ -75,6 +77,44 @@ template <typename T> using ConstColVectorMap = Eigen::Map<const ColVector<T>>;
       }                                                                        \
     }                                                                          \
   }
+
+/** C = A * B, or C += A * B if accum, where each matrix is transposed if the
+    corresponding flag is true.
+
+    Half matrices are converted to float in bulk, multiplied and accumulated
+    in float, and rounded to half once when stored.
+ */
+template <typename T>
+void matmul(MatrixMap<T> c, bool tc, ConstMatrixMap<T> a, bool ta,
+            ConstMatrixMap<T> b, bool tb, bool accum) {
+  if (accum) {
+    NBLA_EIGEN_MATMUL_T(c, tc, a, ta, b, tb, +=);
+  } else {
+    NBLA_EIGEN_MATMUL_T(c, tc, a, ta, b, tb, =);
+  }
+}
+
+template <>
+inline void matmul<Half>(MatrixMap<Half> c, bool tc, ConstMatrixMap<Half> a,
+                         bool ta, ConstMatrixMap<Half> b, bool tb, bool accum) {
+  auto to_float = [](const Half *x, Matrix<float> &fx) {
+    halfbits2float_n(reinterpret_cast<const uint16_t *>(x), fx.data(),
+                     fx.size());
+  };
+  Matrix<float> fa(a.rows(), a.cols());
+  Matrix<float> fb(b.rows(), b.cols());
+  Matrix<float> fc(c.rows(), c.cols());
+  to_float(a.data(), fa);
+  to_float(b.data(), fb);
+  if (accum) {
+    to_float(c.data(), fc);
+    NBLA_EIGEN_MATMUL_T(fc, tc, fa, ta, fb, tb, +=);
+  } else {
+    NBLA_EIGEN_MATMUL_T(fc, tc, fa, ta, fb, tb, =);
+  }
+  float2halfbits_n(fc.data(), reinterpret_cast<uint16_t *>(c.data()),
+                   fc.size());
+}
 } // namespace eigen
 } // namespace nbla
 #endif
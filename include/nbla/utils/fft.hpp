@@ -0,0 +1,85 @@
+// Copyright 2023 Sony Group Corporation.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef __NBLA_UTILS_FFT_HPP__
+#define __NBLA_UTILS_FFT_HPP__
+
+#include <nbla/common.hpp>
+
+#include <complex>
+
+namespace nbla {
+
+/** Plan of 1-D complex DFT of any length on CPU.
+
+The length is factored into radices 4, 2, 3, 5, ... and transformed by the
+Stockham algorithm. A length having a large prime factor is transformed by
+Bluestein's algorithm with a power-of-two FFT, so that every length costs
+O(n log n).
+
+The transform is not normalized in both directions.
+ */
+class NBLA_API FFTPlan {
+public:
+  typedef std::complex<double> Complex;
+
+  explicit FFTPlan(Size_t n);
+  ~FFTPlan();
+
+  /** Length of the transform. */
+  Size_t size() const { return n_; }
+
+  /** Number of elements of the work buffer required by execute(). */
+  Size_t work_size() const;
+
+  /** Transform `data` of size() elements in place.
+
+      @param data Sequence to transform.
+      @param inverse Compute exp(+2 pi j k n / N) instead of exp(-2 pi j k n /
+      N).
+      @param work Buffer of work_size() elements.
+   */
+  void execute(Complex *data, bool inverse, Complex *work) const;
+
+private:
+  Size_t n_;
+  vector<Size_t> radices_;
+  vector<Complex> twiddle_; // exp(-2 pi j k / n)
+  // For Bluestein's algorithm
+  shared_ptr<FFTPlan> sub_;
+  vector<Complex> chirp_;
+  vector<Complex> chirp_fft_;
+
+  void stockham(Complex *data, Complex *work) const;
+  void bluestein(Complex *data, Complex *work) const;
+};
+
+/** N-d complex DFT of a batch of signals.
+
+The input and output are (batch..., N_1, ..., N_d, 2) where the last axis holds
+the real and imaginary parts.
+
+@param x Input.
+@param y Output. It can be the same as x.
+@param shape Shape of x and y.
+@param signal_ndim Number of axes transformed, d.
+@param inverse Inverse transform without normalization if true.
+@param scale Multiplied to the result.
+@param accum Accumulate the result to y.
+ */
+template <typename T>
+void fft_nd(const T *x, T *y, const Shape_t &shape, int signal_ndim,
+            bool inverse, double scale, bool accum);
+} // namespace nbla
+#endif
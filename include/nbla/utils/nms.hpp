@@ -0,0 +1,215 @@
+// Copyright 2023 Sony Group Corporation.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef __NBLA_UTILS_NMS_HPP__
+#define __NBLA_UTILS_NMS_HPP__
+
+#include <nbla/common.hpp>
+
+#include <algorithm>
+#include <cmath>
+#include <limits>
+
+namespace nbla {
+
+/** Order of candidate boxes by descending score.
+
+Ties are broken by the smaller box index so that the result does not depend on
+the sort implementation. The boxes are popped one by one from a heap, so that
+a caller terminating early (e.g. by the maximum number of output boxes) pays
+only O(n + k log n) instead of a full sort.
+ */
+template <typename T> class NmsScoreQueue {
+  const T *scores_;
+  int stride_;
+  vector<int> heap_;
+  vector<int>::iterator end_;
+
+  struct Less {
+    const T *scores;
+    int stride;
+    bool operator()(int i, int j) const {
+      const T si = scores[i * stride];
+      const T sj = scores[j * stride];
+      return si < sj || (si == sj && i > j);
+    }
+  };
+
+public:
+  /** Reset with the candidates.
+
+      @param scores Score of the box i is scores[i * stride].
+      @param stride Stride of scores.
+      @param candidates Indices of the candidate boxes.
+   */
+  void reset(const T *scores, int stride, const vector<int> &candidates) {
+    scores_ = scores;
+    stride_ = stride;
+    heap_.assign(candidates.begin(), candidates.end());
+    std::make_heap(heap_.begin(), heap_.end(), Less{scores_, stride_});
+    end_ = heap_.end();
+  }
+
+  bool empty() const { return end_ == heap_.begin(); }
+
+  /** Pop the index of the box with the highest score. */
+  int pop() {
+    std::pop_heap(heap_.begin(), end_, Less{scores_, stride_});
+    --end_;
+    return *end_;
+  }
+};
+
+/** Uniform grid over the extents of boxes used to skip the pairs of boxes
+which never overlap during non-maximum suppression.
+
+The extent of the box i is given as extents[4 * i + (0, 1, 2, 3)] =
+(x_begin, y_begin, x_end, y_end). Inserted boxes are registered to every cell
+covered by the extent, and a query visits only the boxes registered to the
+cells covered by the queried box. The grid is disabled and every inserted box
+is visited when the boxes are too few or the extents are not finite, or when
+non-overlapping boxes can be suppressed (negative IoU threshold).
+ */
+template <typename T> class NmsSpatialGrid {
+  const T *extents_;
+  bool enabled_;
+  int cells_x_, cells_y_;
+  T origin_x_, origin_y_, scale_x_, scale_y_;
+  vector<vector<int>> cells_;
+  vector<int> inserted_;
+  vector<int> visited_;
+  int stamp_;
+
+  static int cell_index(T v, T origin, T scale, int cells) {
+    const T c = (v - origin) * scale;
+    if (!(c > 0))
+      return 0;
+    if (c >= cells)
+      return cells - 1;
+    return static_cast<int>(c);
+  }
+
+  void cell_range(int i, int &x0, int &y0, int &x1, int &y1) const {
+    const T *e = extents_ + 4 * i;
+    x0 = cell_index(e[0], origin_x_, scale_x_, cells_x_);
+    y0 = cell_index(e[1], origin_y_, scale_y_, cells_y_);
+    x1 = cell_index(e[2], origin_x_, scale_x_, cells_x_);
+    y1 = cell_index(e[3], origin_y_, scale_y_, cells_y_);
+  }
+
+public:
+  NmsSpatialGrid() : stamp_(0) {}
+
+  /** Reset the grid for the candidate boxes.
+
+      @param extents Extents of all boxes.
+      @param num_boxes Number of all boxes.
+      @param candidates Indices of the boxes which are inserted or queried.
+      @param iou_threshold IoU threshold of the suppression.
+   */
+  void reset(const T *extents, int num_boxes, const vector<int> &candidates,
+             float iou_threshold) {
+    extents_ = extents;
+    inserted_.clear();
+    const int n = static_cast<int>(candidates.size());
+    enabled_ = iou_threshold >= 0 && n > 32;
+    T x_min = 0, y_min = 0, x_max = 0, y_max = 0;
+    if (enabled_) {
+      x_min = y_min = std::numeric_limits<T>::max();
+      x_max = y_max = std::numeric_limits<T>::lowest();
+      for (int i : candidates) {
+        const T *e = extents_ + 4 * i;
+        if (!(std::isfinite(e[0]) && std::isfinite(e[1]) &&
+              std::isfinite(e[2]) && std::isfinite(e[3]))) {
+          enabled_ = false;
+          break;
+        }
+        x_min = std::min(x_min, e[0]);
+        y_min = std::min(y_min, e[1]);
+        x_max = std::max(x_max, e[2]);
+        y_max = std::max(y_max, e[3]);
+      }
+    }
+    if (!enabled_) {
+      return;
+    }
+    // About two candidates per cell on average, at most 64 x 64 cells.
+    const int cells =
+        std::max(1, std::min(64, static_cast<int>(std::sqrt(n / 2.0))));
+    cells_x_ = x_max > x_min ? cells : 1;
+    cells_y_ = y_max > y_min ? cells : 1;
+    origin_x_ = x_min;
+    origin_y_ = y_min;
+    scale_x_ = x_max > x_min ? cells_x_ / (x_max - x_min) : 0;
+    scale_y_ = y_max > y_min ? cells_y_ / (y_max - y_min) : 0;
+    if (!(std::isfinite(scale_x_) && std::isfinite(scale_y_))) {
+      enabled_ = false;
+      return;
+    }
+    cells_.resize(cells_x_ * cells_y_);
+    for (auto &cell : cells_) {
+      cell.clear();
+    }
+    if (static_cast<int>(visited_.size()) < num_boxes) {
+      visited_.assign(num_boxes, 0);
+      stamp_ = 0;
+    }
+  }
+
+  /** Register the box i. */
+  void insert(int i) {
+    if (!enabled_) {
+      inserted_.push_back(i);
+      return;
+    }
+    int x0, y0, x1, y1;
+    cell_range(i, x0, y0, x1, y1);
+    for (int cy = y0; cy <= y1; ++cy) {
+      for (int cx = x0; cx <= x1; ++cx) {
+        cells_[cy * cells_x_ + cx].push_back(i);
+      }
+    }
+  }
+
+  /** Whether pred(j) is true for any inserted box j possibly overlapping the
+      box i.
+   */
+  template <typename Pred> bool any_of_neighbors(int i, Pred pred) {
+    if (!enabled_) {
+      return std::any_of(inserted_.begin(), inserted_.end(), pred);
+    }
+    if (++stamp_ == 0) {
+      std::fill(visited_.begin(), visited_.end(), 0);
+      stamp_ = 1;
+    }
+    int x0, y0, x1, y1;
+    cell_range(i, x0, y0, x1, y1);
+    for (int cy = y0; cy <= y1; ++cy) {
+      for (int cx = x0; cx <= x1; ++cx) {
+        for (int j : cells_[cy * cells_x_ + cx]) {
+          if (visited_[j] == stamp_) {
+            continue;
+          }
+          visited_[j] = stamp_;
+          if (pred(j)) {
+            return true;
+          }
+        }
+      }
+    }
+    return false;
+  }
+};
+} // namespace nbla
+#endif
@@ -22,45 +22,84 @@
 
 namespace nbla {
 
-/* top_k(x, n, k, out) writes the indices of the k largest elements
- * from x[0 ... n-1] into out[0 ... k-1]. The element out[0] is the
- * index of the largest element in x. The elements out[1 ... k-1]
- * are the indices of subsequently smaller or equal elements in x.
+namespace top_k_detail {
+
+/* Selection by a heap of k elements is O(n log k) but rejects most elements
+ * by a single comparison, and is used when k is small relative to n.
+ * Otherwise nth_element partially selects the k elements in O(n) and only
+ * they are sorted.
  */
+constexpr size_t heap_max_ratio = 8;
 
-template <typename T, bool largest>
-inline void top_k(const T *x, const size_t n, const size_t k, size_t *out) {
+template <typename T, bool largest, typename V>
+inline void select(const T *x, const size_t n, const size_t k, size_t *out,
+                   V value) {
   using greater =
       typename std::conditional<largest, std::greater<T>, std::less<T>>::type;
 
+  // Ties are ordered by the index, so that both paths select the same
+  // elements in the same order.
   struct cmp {
     bool operator()(const std::pair<T, size_t> &a,
                     const std::pair<T, size_t> &b) {
-      return greater()(a.first, b.first);
+      return greater()(a.first, b.first) ||
+             (!greater()(b.first, a.first) && a.second < b.second);
     }
   };
 
-  vector<std::pair<T, size_t>> heap(k);
-  for (size_t i = 0; i < k; ++i) {
-    heap[i] = std::make_pair(x[i], i);
-  }
+  if (k * heap_max_ratio < n) {
+    vector<std::pair<T, size_t>> heap(k);
+    for (size_t i = 0; i < k; ++i) {
+      heap[i] = std::make_pair(value(x[i]), i);
+    }
 
-  std::make_heap(heap.begin(), heap.end(), cmp());
+    std::make_heap(heap.begin(), heap.end(), cmp());
+
+    // An element equal to the top of the heap is rejected since its index
+    // is larger than the indices in the heap.
+    for (size_t i = k; i < n; ++i) {
+      const auto x_at_i = value(x[i]);
+      if (greater()(x_at_i, heap[0].first)) {
+        std::pop_heap(heap.begin(), heap.end(), cmp());
+        heap[heap.size() - 1] = std::make_pair(x_at_i, i);
+        std::push_heap(heap.begin(), heap.end(), cmp());
+      }
+    }
+    std::sort_heap(heap.begin(), heap.end(), cmp());
 
-  for (size_t i = k; i < n; ++i) {
-    const auto x_at_i = x[i];
-    if (greater()(x_at_i, heap[0].first)) {
-      std::pop_heap(heap.begin(), heap.end(), cmp());
-      heap[heap.size() - 1] = std::make_pair(x_at_i, i);
-      std::push_heap(heap.begin(), heap.end(), cmp());
+    for (size_t i = 0; i < k; ++i) {
+      out[i] = heap[i].second;
     }
+    return;
   }
-  std::sort_heap(heap.begin(), heap.end(), cmp());
+
+  vector<std::pair<T, size_t>> items(n);
+  for (size_t i = 0; i < n; ++i) {
+    items[i] = std::make_pair(value(x[i]), i);
+  }
+  if (k < n) {
+    std::nth_element(items.begin(), items.begin() + (k - 1), items.end(),
+                     cmp());
+  }
+  std::sort(items.begin(), items.begin() + k, cmp());
 
   for (size_t i = 0; i < k; ++i) {
-    out[i] = heap[i].second;
+    out[i] = items[i].second;
   }
 }
+} // namespace top_k_detail
+
+/* top_k(x, n, k, out) writes the indices of the k largest elements
+ * from x[0 ... n-1] into out[0 ... k-1]. The element out[0] is the
+ * index of the largest element in x. The elements out[1 ... k-1]
+ * are the indices of subsequently smaller or equal elements in x.
+ * Equal elements are taken in the order of their indices.
+ */
+
+template <typename T, bool largest>
+inline void top_k(const T *x, const size_t n, const size_t k, size_t *out) {
+  top_k_detail::select<T, largest>(x, n, k, out, [](const T &v) { return v; });
+}
 
 /* top_k_abs(x, n, k, out) behaves identical to top_k() except that
  * it considers the absolute values of elements in x.
@@ -68,36 +107,8 @@ inline void top_k(const T *x, const size_t n, const size_t k, size_t *out) {
 
 template <typename T, bool largest>
 inline void top_k_abs(const T *x, const size_t n, const size_t k, size_t *out) {
-  using greater =
-      typename std::conditional<largest, std::greater<T>, std::less<T>>::type;
-
-  struct cmp {
-    bool operator()(const std::pair<T, size_t> &a,
-                    const std::pair<T, size_t> &b) {
-      return greater()(a.first, b.first);
-    }
-  };
-
-  vector<std::pair<T, size_t>> heap(k);
-  for (size_t i = 0; i < k; ++i) {
-    heap[i] = std::make_pair(x[i] < 0 ? -x[i] : x[i], i);
-  }
-
-  std::make_heap(heap.begin(), heap.end(), cmp());
-
-  for (size_t i = k; i < n; ++i) {
-    const auto x_at_i = x[i] < 0 ? -x[i] : x[i];
-    if (greater()(x_at_i, heap[0].first)) {
-      std::pop_heap(heap.begin(), heap.end(), cmp());
-      heap[heap.size() - 1] = std::make_pair(x_at_i, i);
-      std::push_heap(heap.begin(), heap.end(), cmp());
-    }
-  }
-  std::sort_heap(heap.begin(), heap.end(), cmp());
-
-  for (size_t i = 0; i < k; ++i) {
-    out[i] = heap[i].second;
-  }
+  top_k_detail::select<T, largest>(
+      x, n, k, out, [](const T &v) { return v < 0 ? T(-v) : v; });
 }
 } // namespace nbla
 #endif
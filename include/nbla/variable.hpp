@@ -18,6 +18,7 @@
 
 #include <nbla/common.hpp>
 #include <nbla/nd_array.hpp>
+#include <nbla/sparse_grad.hpp>
 
 #include <memory>
 
@@ -74,6 +75,8 @@ class Variable : public BaseVariable {
   Size_t size_;     ///< Size.
   Size_t ndim_;     ///< Number of dimensions.
 
+  shared_ptr<SparseGrad> sparse_grad_; ///< Shared with views.
+
   /** Update shape info by shape.
    */
   void update_shape_info();
@@ -179,6 +182,22 @@ public:
     return arr->const_pointer<T>();
   }
 
+  /** Whether Function%s may store the gradient as a row-sparse gradient.
+
+  @sa SparseGrad
+   */
+  inline bool sparse_grad_enabled() const { return sparse_grad_->enabled; }
+
+  /** Enable or disable the row-sparse gradient.
+   */
+  inline void set_sparse_grad_enabled(bool enabled) {
+    sparse_grad_->enabled = enabled;
+  }
+
+  /** Row-sparse part of the gradient, which is added to grad().
+   */
+  inline shared_ptr<SparseGrad> sparse_grad() { return sparse_grad_; }
+
   DISABLE_COPY_AND_ASSIGN(Variable);
 
 private:
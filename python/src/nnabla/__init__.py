@@ -30,7 +30,12 @@ from ._version import (
     __build_number__
 )
 from .variable import Variable, Context
-from ._nd_array import NdArray
+from ._nd_array import (
+    NdArray,
+    cast_arrays,
+    sync_statistics,
+    reset_sync_statistics
+)
 from .parameter import (
     get_current_parameter_scope,
     parameter_scope, get_parameters, clear_parameters,
@@ -42,6 +47,7 @@ from .auto_forward import auto_forward, set_auto_forward, get_auto_forward
 from .recompute import recompute, recompute_fn, set_global_recompute
 from ._computation_graph import forward_all
 from .grad import grad
+from .jit import jit
 from .callback import (
     set_function_pre_hook,
     set_function_post_hook,
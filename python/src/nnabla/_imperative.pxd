@@ -15,6 +15,7 @@
 from libcpp cimport bool as cpp_bool
 from libcpp.vector cimport vector
 from libcpp.memory cimport shared_ptr
+from libcpp.string cimport string
 from _nd_array cimport *
 from function cimport *
 
@@ -24,3 +25,13 @@ cdef extern from "nbla/imperative.hpp" namespace "nbla":
         const vector[NdArrayPtr] & ,
         int n_outputs,
         vector[NdArrayPtr] outputs) except+
+    vector[NdArrayPtr] imperative_execute_cached "nbla::execute" (
+        const string & key,
+        FunctionPtr,
+        const vector[NdArrayPtr] & ,
+        int n_outputs,
+        vector[NdArrayPtr] outputs) except+
+    size_t imperative_cache_capacity "nbla::SingletonManager::get<nbla::ImperativeCache>()->capacity" () except+
+    void imperative_cache_set_capacity "nbla::SingletonManager::get<nbla::ImperativeCache>()->set_capacity" (size_t capacity) except+
+    size_t imperative_cache_size "nbla::SingletonManager::get<nbla::ImperativeCache>()->size" () except+
+    void imperative_cache_clear "nbla::SingletonManager::get<nbla::ImperativeCache>()->clear" () except+
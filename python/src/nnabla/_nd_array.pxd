@@ -23,6 +23,12 @@ from _context cimport *
 
 cdef extern from "nbla/synced_array.hpp" namespace "nbla":
 
+    cdef cppclass CSyncStatistics "nbla::SyncStatistics":
+        size_t copies
+        size_t conversions
+        size_t transfers
+        size_t bytes
+
     cdef cppclass CSyncedArray "nbla::SyncedArray":
         CSyncedArray(Size_t size) except +
         CArray * cast(dtypes dtype, const CContext & ctx) nogil except+
@@ -38,6 +44,12 @@ cdef extern from "nbla/synced_array.hpp" namespace "nbla":
         cpp_bool zeroing() const
         void clear() except+
         int get_python_user_reference_counts() const
+        @staticmethod
+        vector[ArrayPtr] cast_sp_batch(const vector[shared_ptr[CSyncedArray]] & arrays, dtypes dtype, const CContext & ctx, cpp_bool write_only) nogil except+
+        @staticmethod
+        CSyncStatistics sync_statistics() except+
+        @staticmethod
+        void reset_sync_statistics() except+
 
     ctypedef shared_ptr[CSyncedArray] SyncedArrayPtr
 
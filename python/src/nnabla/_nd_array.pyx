@@ -611,3 +611,71 @@ cdef class NdArray:
         """
         arr = self.arrp.narrow(dim, start, length)
         return NdArray.create(arr)
+
+
+def cast_arrays(arrays, dtype, ctx=None):
+    """
+    In-place cast of data type of many arrays at once.
+
+    This is equivalent to calling :func:`~nnabla.NdArray.cast` of each
+    array, but the data type conversions and copies between host arrays are
+    performed together and parallelized over threads.
+
+    Args:
+        arrays (list of :obj:`~nnabla.NdArray` or :obj:`~nnabla.Variable`):
+            Arrays to be cast. The data of a :obj:`~nnabla.Variable` is cast.
+        dtype (:obj:`numpy.dtype`):  Numpy Data type.
+        ctx (:obj:`nnabla.Context`, optional): Context descriptor.
+
+    Returns:
+        list of :obj:`numpy.array` if ``ctx`` is None, otherwise nothing.
+    """
+    from nnabla_ext.cpu import context
+    ctx_ = context()
+    if ctx is not None:
+        ctx_ = ctx
+    cdef int type_num = np.dtype(dtype).num
+    cdef CContext cctx = <CContext ?> ctx_
+    cdef vector[SyncedArrayPtr] sarrays
+    cdef NdArray a
+    nd_arrays = [x.data if isinstance(x, Variable) else x for x in arrays]
+    for x in nd_arrays:
+        a = <NdArray ?> x
+        sarrays.push_back(a.arrp.array())
+    with nogil:
+        CSyncedArray.cast_sp_batch(sarrays, < dtypes > type_num, cctx, False)
+    if ctx is None:
+        return [x.data for x in nd_arrays]
+
+
+def sync_statistics():
+    """
+    Get the counts of array synchronizations.
+
+    An array is synchronized when it is requested in a data type or a device
+    different from the ones it is lastly modified with. The counts are
+    accumulated over all arrays until :func:`reset_sync_statistics` is
+    called, so they can be measured for each iteration of training.
+
+    Returns:
+        dict: The counts with the following keys.
+
+        * ``copies``: Number of synchronizations.
+        * ``conversions``: Number of synchronizations with data type conversion.
+        * ``transfers``: Number of synchronizations across devices or array classes.
+        * ``bytes``: Bytes written by the synchronizations.
+    """
+    cdef CSyncStatistics stats = CSyncedArray.sync_statistics()
+    return {'copies': stats.copies,
+            'conversions': stats.conversions,
+            'transfers': stats.transfers,
+            'bytes': stats.bytes}
+
+
+def reset_sync_statistics():
+    """
+    Reset the counts of array synchronizations.
+
+    See :func:`sync_statistics`.
+    """
+    CSyncedArray.reset_sync_statistics()
@@ -40,6 +40,8 @@ cdef extern from "nbla/variable.hpp" namespace "nbla":
         NdArrayPtr grad() except +
         void set_data(NdArrayPtr) except +
         void set_grad(NdArrayPtr) except +
+        cpp_bool sparse_grad_enabled()
+        void set_sparse_grad_enabled(cpp_bool)
     ctypedef shared_ptr[CVariable] VariablePtr
 
 cdef extern from "nbla/computation_graph/variable.hpp" namespace "nbla":
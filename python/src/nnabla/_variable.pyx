@@ -432,6 +432,34 @@ cdef class Variable:
     def recompute(self, b):
         self.get_varp().set_recompute(b)
 
+    @property
+    def sparse_grad(self):
+        """
+        Gets or sets a boolean indicating whether functions may store the gradient of this variable as a row-sparse gradient.
+
+        If true, :func:`~nnabla.functions.embed` propagates the gradient only
+        to the rows indexed, which is kept apart from :attr:`grad`. The solver
+        updates only the rows, and
+        :meth:`~nnabla.communicators.Communicator.all_reduce_sparse_grad`
+        reduces them over workers. The row-sparse gradient is added to
+        :attr:`grad` when a solver applies an operation to the whole gradient,
+        such as :meth:`~nnabla.solver.Solver.weight_decay` and
+        :meth:`~nnabla.solver.Solver.clip_grad_by_norm`. Like :attr:`grad`
+        of parameters, it is accumulated over functions and backward calls
+        until :meth:`~nnabla.solver.Solver.zero_grad` clears it.
+
+        Args:
+            b (bool): Whether the row-sparse gradient is enabled.
+
+        Returns:
+           bool: Whether the row-sparse gradient is enabled.
+        """
+        return self.get_varp().variable().get().sparse_grad_enabled()
+
+    @sparse_grad.setter
+    def sparse_grad(self, b):
+        self.get_varp().variable().get().set_sparse_grad_enabled(b)
+
     def rewire_on(self, var):
         '''Rewire a successor graph of this variable on top of ``var``.
 
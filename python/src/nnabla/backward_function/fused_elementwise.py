@@ -0,0 +1,117 @@
+# Copyright 2023 Sony Group Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import nnabla.functions as F
+
+from .utils import no_grad
+
+
+_OPS_WITH_ARG = ('add_scalar', 'mul_scalar', 'pow_scalar', 'leaky_relu', 'elu')
+
+
+def _unfused_ops(ops, op_args):
+    args = iter(op_args)
+    for op in ops.split(','):
+        op = op.strip()
+        yield op, next(args) if op in _OPS_WITH_ARG else None
+
+
+def _forward(op, h, z, a):
+    if op == 'add':
+        return h + z
+    if op == 'add_scalar':
+        return F.add_scalar(h, a)
+    if op == 'mul_scalar':
+        return F.mul_scalar(h, a)
+    if op == 'pow_scalar':
+        return F.pow_scalar(h, a)
+    if op == 'leaky_relu':
+        return F.leaky_relu(h, a)
+    if op == 'elu':
+        return F.elu(h, a)
+    return getattr(F, op)(h)
+
+
+def _grad(op, g, h, y, a):
+    # Gradient wrt the input h of the operation whose output is y.
+    if op in ('add', 'add_scalar'):
+        return g
+    if op == 'mul_scalar':
+        return g * a
+    if op == 'pow_scalar':
+        return g * a * F.pow_scalar(h, a - 1)
+    if op == 'relu':
+        return g * no_grad(F.greater_scalar(h, 0))
+    if op == 'leaky_relu':
+        m = no_grad(F.greater_scalar(h, 0))
+        return g * (m + (1 - m) * a)
+    if op == 'relu6':
+        m = no_grad(F.greater_scalar(h, 0) * F.less_scalar(h, 6))
+        return g * m
+    if op == 'sigmoid':
+        return g * y * (1 - y)
+    if op == 'tanh':
+        return g * (1 - y ** 2)
+    if op == 'swish':
+        s = F.sigmoid(h)
+        return g * s * (1 + h * (1 - s))
+    if op == 'elu':
+        m = no_grad(F.greater_equal_scalar(h, 0))
+        return g * (m + (1 - m) * (y + a))
+    if op == 'exp':
+        return g * y
+    if op == 'abs':
+        return g * no_grad(F.sign(h, 0))
+    raise ValueError("Unsupported operation '{}'.".format(op))
+
+
+def fused_elementwise_backward(grad_inputs, inputs, input_shapes, outputs, output_shapes, ops='relu', op_args=list()):
+    """
+    Args:
+      grad_inputs (list of :obj:`nnabla.Variable`): Propagated grads to this backward function.
+      inputs (list of :obj:`nnabla.Variable` and None): Input Variables of the forward function
+          if this backward function depends on it. Otherwise, None is set instead.
+      input_shapes (list of tuple of :obj:`int`): Input shapes of the forward function.
+          The shapes of the inputs in which None is set can be passed.
+      outputs (list of :obj:`nnabla.Variable` and None): Output Variables of the forward function
+          if this backward function depends on it. Otherwise, None is set instead.
+      output_shapes (list of tuple of :obj:`int`): Output shapes of the forward function.
+          The shapes of the outputs in which None is set can be passed.
+      kwargs (dict of arguments): Dictionary of the corresponding function arguments.
+
+    Return:
+      list of Variable: Return the gradients wrt inputs of the corresponding function.
+    """
+    dy = grad_inputs[0]
+    x0 = inputs[0]
+    z0 = inputs[1] if len(inputs) > 1 else None
+
+    # Recompute the intermediate values of the chain
+    chain = list(_unfused_ops(ops, op_args))
+    hs = [x0]
+    for op, a in chain:
+        hs.append(_forward(op, hs[-1], z0, a))
+
+    g = dy
+    dz0 = None
+    for i in reversed(range(len(chain))):
+        op, a = chain[i]
+        if op == 'add':
+            dz0 = g
+        g = _grad(op, g, hs[i], hs[i + 1], a)
+    dx0 = g
+    if z0 is None:
+        return dx0
+    return dx0, dz0
@@ -56,6 +56,7 @@ cdef extern from "nbla/communicator.hpp" namespace "nbla":
         void bcast(const vector[shared_ptr[CNdArray]] & ndarray_list, int src, cpp_bool inplace, const string & group) nogil except +
         void bcast(shared_ptr[CNdArray] ndarray, int src, cpp_bool inplace, const string & group) nogil except +
         void all_gather(shared_ptr[CNdArray] ndarray, const vector[shared_ptr[CNdArray]] & ndarray_list, const string & group) nogil except +
+        void all_reduce_sparse_grad(const vector[shared_ptr[CVariable]] & vars, cpp_bool division, const string & group) nogil except +
 
         void reduce_async(cpp_bool division) nogil except +
         void allreduce_async(cpp_bool division, cpp_bool inplace) nogil except +
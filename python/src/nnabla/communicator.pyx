@@ -418,6 +418,42 @@ cdef class Communicator:
         with nogil:
             self.communicatorp.all_gather(cndarray, cndarray_list, group)
 
+    def all_reduce_sparse_grad(self, params, cpp_bool division=False, string group="world"):
+        """All reduce over gradients of parameters including row-sparse gradients.
+
+        The row-sparse gradients of the parameters (see
+        :attr:`nnabla.Variable.sparse_grad`) are gathered from all devices,
+        and each device gets the sum of them. Only the rows indexed on any
+        device are exchanged. The gradient of a parameter whose dense
+        gradient is computed on any device is reduced as a whole. The
+        communicator must be created with the ``float`` type config.
+
+        Args:
+            params (list of :obj:`Variable`): Parameters whose gradients are reduced.
+            division (bool): Flag to divide the reduce data by the
+                number of `contexts` added, or the number of devices.
+            group (string): Name of a group. This groups is used when the collective is called.
+
+        Example:
+
+        .. code-block:: python
+
+            # Run like `mpirun -n 2 python <code_snippet.py>`
+            h = PF.embed(x, n_items, 64, sparse_grad=True)
+            ...
+            solver.zero_grad()
+            loss.backward()
+            comm.all_reduce_sparse_grad(list(nn.get_parameters().values()),
+                                        division=True)
+            solver.update()
+
+        """
+        cdef vector[shared_ptr[CVariable]] cparams
+        for x in params:
+            cparams.push_back(( < _Variable > x).get_varp().variable())
+        with nogil:
+            self.communicatorp.all_reduce_sparse_grad(cparams, division, group)
+
     def reduce_scatter(self, ndarray_list, ndarray, cpp_bool division=False, string group="world"):
         """Reduce scatter over data in different device.
 
@@ -16,6 +16,10 @@
 """
 This module implements a series of optimizer based on proto_graph object.
 """
+from collections import OrderedDict
+from itertools import chain
+
+import nnabla as nn
 from nnabla.logger import logger
 
 
@@ -111,3 +115,306 @@ class IdentityRemover:
                 if not self.is_required(pf):
                     return
             remove_function(pf, self.renamed)
+
+
+# Functions which must not be evaluated at conversion time nor merged, since
+# they are random, stateful or used as graph control.
+_NOT_FOLDABLE_FUNCTIONS = {
+    'Dropout', 'ImageAugmentation', 'VATNoise', 'Sink', 'Unlink',
+    'BatchNormalization', 'SyncBatchNormalization', 'FusedBatchNormalization',
+    'MinMaxQuantize', 'Prune', 'WeightNormalization', 'SpectralNorm',
+    'RepeatStart', 'RepeatEnd', 'RecurrentInput', 'RecurrentOutput', 'Delay',
+}
+
+
+def _is_foldable(pf):
+    return pf.type not in _NOT_FOLDABLE_FUNCTIONS \
+        and not pf.type.startswith('Rand')
+
+
+def _get_proto_variable(proto_network, name):
+    if name in proto_network.variables:
+        return proto_network.variables[name]
+    return proto_network.parameters[name]
+
+
+def _protected_variables(proto_network):
+    """
+    Variables which are referred from outside of the network, i.e. network
+    ports and the data/output variables of executors.
+    """
+    protected = set(proto_network.inputs) | set(proto_network.outputs)
+    for e in proto_network.owner().executors.values():
+        if e.proto is None or e.proto.network_name != proto_network.name:
+            continue
+        protected |= {v.variable_name for v in e.proto.data_variable}
+        protected |= {v.variable_name for v in e.proto.output_variable}
+    return protected
+
+
+def _rebuild_links(proto_network):
+    """
+    Rebuild ``parent`` and ``required`` of all proto variables and the network
+    ports from the function list.
+    """
+    for pv in chain(proto_network.variables.values(), proto_network.parameters.values()):
+        pv.parent = None
+        pv.required = []
+    for pf in proto_network.functions.values():
+        for name in pf.inputs:
+            _get_proto_variable(proto_network, name).required.append(pf.name)
+        for name in pf.outputs:
+            _get_proto_variable(proto_network, name).parent = pf.name
+    proto_network.inputs = [k for k, v in proto_network.variables.items()
+                            if not v.parent and v.required]
+    proto_network.outputs = [k for k, v in proto_network.variables.items()
+                             if not v.required and v.parent]
+
+
+def _replace_input(proto_network, old_name, new_name):
+    """
+    Let all functions referring ``old_name`` refer ``new_name`` instead.
+    """
+    old_pv = _get_proto_variable(proto_network, old_name)
+    new_pv = _get_proto_variable(proto_network, new_name)
+    for f_name in old_pv.required:
+        pf = proto_network.functions[f_name]
+        pf.inputs = [new_name if n == old_name else n for n in pf.inputs]
+        pf._proto = None
+        if f_name not in new_pv.required:
+            new_pv.required.append(f_name)
+    old_pv.required = []
+
+
+def _delete_function(proto_network, pf):
+    for name in pf.inputs:
+        pv = _get_proto_variable(proto_network, name)
+        pv.required = [r for r in pv.required if r != pf.name]
+    for name in pf.outputs:
+        _get_proto_variable(proto_network, name).parent = None
+    del proto_network.functions[pf.name]
+    logger.info(f"proto_function:{pf.name} is deleted.")
+
+
+def fold_constants(proto_network):
+    """
+    Evaluate the functions whose inputs are all parameters (or outputs of
+    other folded functions), and replace their outputs with new parameters.
+
+    Args:
+        proto_network (:obj:`nnabla.graph_def.ProtoNetwork`): Target network, modified in place.
+
+    Returns:
+        int: The number of folded functions.
+    """
+    from nnabla.core.graph_def import ProtoVariable
+    from nnabla.parameter import get_parameter_or_create
+    from nnabla.utils.load_function import _create_function_instance
+
+    graph = proto_network.owner()
+    protected = _protected_variables(proto_network)
+    folded = 0
+    with nn.parameter_scope('', graph.parameter_scope):
+        for pf in list(proto_network.forward_sequence()):
+            if not _is_foldable(pf):
+                continue
+            if any(n not in proto_network.parameters for n in pf.inputs):
+                continue
+            if any(n in protected or n in proto_network.parameters for n in pf.outputs):
+                continue
+            inputs = []
+            for n in pf.inputs:
+                pv = proto_network.parameters[n]
+                inputs.append(get_parameter_or_create(
+                    pv.name, pv.shape, pv.initializer, pv.need_grad, as_need_grad=False))
+            function_instance = _create_function_instance(
+                graph.current_context, pf.proto)
+            outputs = function_instance(*inputs, n_outputs=len(pf.outputs),
+                                        auto_forward=True)
+            if not isinstance(outputs, tuple):
+                outputs = (outputs,)
+            _delete_function(proto_network, pf)
+            for name, o in zip(pf.outputs, outputs):
+                old_pv = proto_network.variables.pop(name)
+                pv = proto_network.parameters[name] = ProtoVariable(
+                    o.shape, name, False, 'Parameter')
+                pv.required = old_pv.required
+                param = nn.Variable.from_numpy_array(o.d.copy())
+                param.need_grad = False
+                nn.parameter.set_parameter(name, param)
+                pv.variable_instance = param
+            folded += 1
+            logger.info(f"proto_function:{pf.name} is folded to constant.")
+    return folded
+
+
+def _function_key(pf):
+    args = sorted((k, repr(v)) for k, v in (pf.args or {}).items())
+    return (pf.type, tuple(args), tuple(pf.inputs), len(pf.outputs))
+
+
+def eliminate_common_subexpressions(proto_network):
+    """
+    Merge the functions of the same type and arguments applied to the same
+    inputs into the first one of them.
+
+    Args:
+        proto_network (:obj:`nnabla.graph_def.ProtoNetwork`): Target network, modified in place.
+
+    Returns:
+        int: The number of removed functions.
+    """
+    protected = _protected_variables(proto_network)
+    seen = {}
+    removed = 0
+    for pf in list(proto_network.forward_sequence()):
+        if not _is_foldable(pf):
+            continue
+        key = _function_key(pf)
+        if key not in seen:
+            seen[key] = pf
+            continue
+        if any(n in protected for n in pf.outputs):
+            continue
+        origin = seen[key]
+        for old_name, new_name in zip(pf.outputs, origin.outputs):
+            _replace_input(proto_network, old_name, new_name)
+        _delete_function(proto_network, pf)
+        removed += 1
+    return removed
+
+
+def remove_redundant_reshapes(proto_network):
+    """
+    Remove Identity functions and no-op Reshape functions, and collapse
+    chains of Reshape into a single Reshape.
+
+    Args:
+        proto_network (:obj:`nnabla.graph_def.ProtoNetwork`): Target network, modified in place.
+
+    Returns:
+        int: The number of removed functions.
+    """
+    protected = _protected_variables(proto_network)
+    removed = 0
+    for pf in list(proto_network.forward_sequence()):
+        if pf.type not in ('Identity', 'Reshape') or pf.name not in proto_network.functions:
+            continue
+        x_name, y_name = pf.inputs[0], pf.outputs[0]
+        x = _get_proto_variable(proto_network, x_name)
+        y = _get_proto_variable(proto_network, y_name)
+        if pf.type == 'Identity' or tuple(x.shape) == tuple(y.shape):
+            if y_name in protected:
+                continue
+            _replace_input(proto_network, y_name, x_name)
+            _delete_function(proto_network, pf)
+            removed += 1
+            continue
+        # Reshape(Reshape(x)) -> Reshape(x)
+        parent = proto_network.functions.get(x.parent) if x.parent else None
+        if parent is None or parent.type != 'Reshape' or x_name in protected \
+                or len(x.required) != 1:
+            continue
+        pf.inputs = [parent.inputs[0]]
+        pf._proto = None
+        x.required = []
+        src = _get_proto_variable(proto_network, parent.inputs[0])
+        src.required.append(pf.name)
+        _delete_function(proto_network, parent)
+        removed += 1
+    return removed
+
+
+def eliminate_dead_code(proto_network):
+    """
+    Remove the functions whose outputs are never used, and the variables and
+    parameters which are not referred by any function anymore.
+    Parameters which are not used by any network of the graph are removed from
+    the parameter scope as well.
+
+    Args:
+        proto_network (:obj:`nnabla.graph_def.ProtoNetwork`): Target network, modified in place.
+
+    Returns:
+        int: The number of removed functions.
+    """
+    protected = _protected_variables(proto_network)
+    removed = 0
+    changed = True
+    while changed:
+        changed = False
+        for pf in list(proto_network.functions.values()):
+            if not pf.outputs:
+                continue
+            if any(_get_proto_variable(proto_network, n).required or n in protected
+                   for n in pf.outputs):
+                continue
+            _delete_function(proto_network, pf)
+            removed += 1
+            changed = True
+
+    proto_network.variables = OrderedDict(
+        [(k, v) for k, v in proto_network.variables.items()
+         if v.required or v.parent or k in protected])
+    unused = [k for k, v in proto_network.parameters.items() if not v.required]
+    proto_network.parameters = OrderedDict(
+        [(k, v) for k, v in proto_network.parameters.items() if v.required])
+
+    graph = proto_network.owner()
+    used = set(chain.from_iterable(n.parameters.keys()
+                                   for n in graph.networks.values()))
+    with nn.parameter_scope('', graph.parameter_scope):
+        for k in unused:
+            if k not in used:
+                nn.parameter.pop_parameter(k)
+    return removed
+
+
+def _update_executor_parameters(proto_network):
+    for e in proto_network.owner().executors.values():
+        if e.proto is None or e.proto.network_name != proto_network.name:
+            continue
+        del e.proto.parameter_variable[:]
+        for param in proto_network.parameters.keys():
+            d = e.proto.parameter_variable.add()
+            d.variable_name = param
+
+
+def optimize_inference(proto_network, fold=True, cse=True, reshape=True, dce=True):
+    """
+    Optimize a proto network for inference. The following passes are applied
+    until the network does not change anymore.
+
+    * constant folding of the subgraphs whose inputs are all parameters
+    * common subexpression elimination
+    * removal of Identity and Reshape chains
+    * dead code elimination
+
+    Args:
+        proto_network (:obj:`nnabla.graph_def.ProtoNetwork`): Target network, modified in place.
+        fold (bool): Enable constant folding.
+        cse (bool): Enable common subexpression elimination.
+        reshape (bool): Enable removal of Identity and Reshape chains.
+        dce (bool): Enable dead code elimination.
+
+    Returns:
+        dict: The number of functions removed by each pass.
+    """
+    _rebuild_links(proto_network)
+    stats = {'fold': 0, 'cse': 0, 'reshape': 0, 'dce': 0}
+    passes = [('fold', fold, fold_constants),
+              ('cse', cse, eliminate_common_subexpressions),
+              ('reshape', reshape, remove_redundant_reshapes),
+              ('dce', dce, eliminate_dead_code)]
+    changed = True
+    while changed:
+        changed = False
+        for name, enabled, opt_pass in passes:
+            if not enabled:
+                continue
+            n = opt_pass(proto_network)
+            stats[name] += n
+            changed |= n > 0
+    _update_executor_parameters(proto_network)
+    logger.info(f"Optimized {proto_network.name}: {stats}")
+    return stats
@@ -20,6 +20,8 @@ from .batch_normalization_folding import (BatchNormalizationFoldingModifier,
                                           BatchNormalizationFoldingOppositeModifierInner)
 from .batch_normalization_self_folding import BatchNormalizationSelfFoldingModifier
 from .fused_batch_normalization import FusedBatchNormalizationModifier
+from .fused_convolution import FusedConvolutionModifier
+from .fused_elementwise import FusedElementwiseModifier
 from .unfused_batch_normalization import UnfusedBatchNormalizationModifier
 from .channel_last import ChannelLastModifier
 from .channel_first import ChannelFirstModifier
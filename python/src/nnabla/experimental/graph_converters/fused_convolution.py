@@ -0,0 +1,146 @@
+# Copyright 2023 Sony Group Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import nnabla.functions as F
+
+from .graph_converter import FunctionModifier
+
+
+class FusedConvolutionModifier(FunctionModifier):
+    """
+    Block `Convolution -> BatchNormalization -> Add2 -> Non-Linear` pass is fused into one `FusedConvolution`.
+
+    BatchNormalization, Add2 and Non-Linear are optional,
+    but at least one of them must follow Convolution.
+    A function is taken into the block only when it is the only consumer
+    of the output of the previous function, and Add2 is taken only when
+    the block is its first input.
+    BatchNormalization is not fused when Convolution has a bias.
+
+    On CPU, when BatchNormalization uses running statistics (`batch_stat=False`),
+    everything after Convolution is computed in a single pass over the convolution output.
+
+    Examples:
+
+    .. code-block:: python
+
+       pred = Model(..., test=True)
+
+       import nnabla.experimental.graph_converters as GC
+
+       modifiers = [GC.FusedConvolutionModifier()]
+       gc = GC.GraphConverter(modifiers)
+       pred = gc.convert(pred)
+    """
+
+    BN, ADD2, ACT = 1, 2, 3
+
+    def __init__(self):
+        super(FusedConvolutionModifier, self).__init__()
+        self._blocks = {}  # Output variable of the original graph: block
+        self._fct_set = {
+            'ReLU': 'relu',
+            'Sigmoid': 'sigmoid',
+            'Tanh': 'tanh',
+            'LeakyReLU': 'leaky_relu',
+            'ELU': 'elu',
+            'ReLU6': 'relu6',
+        }
+
+    def modify(self, f, inputs):
+        fname = f.info.type_name
+
+        if fname == 'Convolution':
+            block = dict(x=inputs[0], weight=inputs[1],
+                         bias=inputs[2] if len(inputs) == 3 else None,
+                         bn=None, z=None, nonlinearity='identity',
+                         nonlinearity_args=[], args=f.info.args, stage=0)
+        else:
+            block = self._blocks.pop(f.inputs[0], None)
+            if block is None:
+                return
+            if fname == 'BatchNormalization':
+                block['bn'] = (inputs[1:5], f.info.args)
+                block['stage'] = self.BN
+            elif fname == 'Add2':
+                block['z'] = inputs[1]
+                block['stage'] = self.ADD2
+            else:
+                block['nonlinearity'] = self._fct_set[fname]
+                if fname in ('LeakyReLU', 'ELU'):
+                    block['nonlinearity_args'] = [f.info.args['alpha']]
+                block['stage'] = self.ACT
+
+        # Defer until the last function of the block
+        if self._next_extends(f, block):
+            self._blocks[f.outputs[0]] = block
+            return inputs[0]
+
+        # Convolution alone
+        if block['stage'] == 0:
+            return
+
+        return self._fused_convolution(block)
+
+    def _next_extends(self, f, block):
+        refs = f.outputs[0].function_references
+        if len(refs) != 1:
+            return False
+        g = refs[0]
+        gname = g.info.type_name
+        stage = block['stage']
+
+        if gname == 'BatchNormalization':
+            args = block['args']
+            ndim = len(f.outputs[0].shape)
+            axis = ndim - 1 if args['channel_last'] else args['base_axis']
+            bn_args = g.info.args
+            return stage < self.BN and block['bias'] is None \
+                and len(g.inputs) == 5 and len(g.outputs) == 1 \
+                and g.inputs[0] == f.outputs[0] \
+                and list(bn_args['axes']) == [axis] \
+                and not bn_args.get('no_scale', False) \
+                and not bn_args.get('no_bias', False)
+
+        if gname == 'Add2':
+            # Only through the first input so that a block on the other
+            # input (e.g., projection shortcut) is fused on its own.
+            return stage < self.ADD2 \
+                and g.inputs[0] == f.outputs[0] \
+                and g.inputs[1] != f.outputs[0] \
+                and g.inputs[0].shape == g.inputs[1].shape
+
+        return stage < self.ACT and gname in self._fct_set
+
+    def _fused_convolution(self, block):
+        args = block['args']
+        beta = gamma = mean = variance = None
+        bn_args = dict(decay_rate=0.9, eps=1e-05, batch_stat=True)
+        if block['bn'] is not None:
+            (beta, gamma, mean, variance), bn = block['bn']
+            bn_args = dict(decay_rate=bn['decay_rate'], eps=bn['eps'],
+                           batch_stat=bn['batch_stat'])
+        return F.fused_convolution(block['x'], block['weight'], block['bias'],
+                                   beta, gamma, mean, variance, block['z'],
+                                   base_axis=args['base_axis'],
+                                   pad=args['pad'], stride=args['stride'],
+                                   dilation=args['dilation'],
+                                   group=args['group'],
+                                   channel_last=args['channel_last'],
+                                   nonlinearity=block['nonlinearity'],
+                                   nonlinearity_args=block['nonlinearity_args'],
+                                   **bn_args)
+
+    def __finish__(self):
+        self._blocks = {}
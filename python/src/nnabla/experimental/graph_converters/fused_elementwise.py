@@ -0,0 +1,113 @@
+# Copyright 2023 Sony Group Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import nnabla.functions as F
+
+from .graph_converter import FunctionModifier
+
+
+class FusedElementwiseModifier(FunctionModifier):
+    """
+    Chain of element-wise functions is fused into one `FusedElementwise`.
+
+    Consecutive element-wise functions (e.g., `MulScalar -> Add2 -> ReLU`)
+    where each output is consumed only by the next function are replaced by
+    a single `FusedElementwise`. At most one `Add2` without broadcast is
+    included in a chain, taking the chain as its first input.
+    A chain of a single function is left as it is.
+
+    Examples:
+
+    .. code-block:: python
+
+       pred = Model(...)
+
+       import nnabla.experimental.graph_converters as GC
+
+       modifiers = [GC.FusedElementwiseModifier()]
+       gc = GC.GraphConverter(modifiers)
+       pred = gc.convert(pred)
+    """
+
+    def __init__(self):
+        super(FusedElementwiseModifier, self).__init__()
+        self._chains = {}  # Output variable of the original graph: chain
+        # Function type: (operation, name of the scalar argument)
+        self._fct_set = {
+            'Add2': ('add', None),
+            'AddScalar': ('add_scalar', 'val'),
+            'MulScalar': ('mul_scalar', 'val'),
+            'PowScalar': ('pow_scalar', 'val'),
+            'ReLU': ('relu', None),
+            'LeakyReLU': ('leaky_relu', 'alpha'),
+            'ReLU6': ('relu6', None),
+            'Sigmoid': ('sigmoid', None),
+            'Tanh': ('tanh', None),
+            'Swish': ('swish', None),
+            'ELU': ('elu', 'alpha'),
+            'Exp': ('exp', None),
+            'Abs': ('abs', None),
+        }
+
+    def modify(self, f, inputs):
+        fname = f.info.type_name
+        if not self._is_fusable(f):
+            return
+
+        chain = self._chains.pop(f.inputs[0], None)
+        if chain is None:
+            chain = dict(x=inputs[0], z=None, ops=[], op_args=[])
+        if fname == 'Add2':
+            chain['z'] = inputs[1]
+
+        op, arg = self._fct_set[fname]
+        chain['ops'].append(op)
+        if arg is not None:
+            chain['op_args'].append(float(f.info.args[arg]))
+
+        # Defer until the last function of the chain
+        if self._next_extends(f, chain):
+            self._chains[f.outputs[0]] = chain
+            return inputs[0]
+
+        if len(chain['ops']) < 2:
+            return
+
+        return F.fused_elementwise(chain['x'], chain['z'],
+                                   ops=','.join(chain['ops']),
+                                   op_args=chain['op_args'])
+
+    def _is_fusable(self, f):
+        if f.info.type_name not in self._fct_set:
+            return False
+        if f.info.type_name == 'Add2':
+            return f.inputs[0] != f.inputs[1] \
+                and f.inputs[0].shape == f.inputs[1].shape
+        return True
+
+    def _next_extends(self, f, chain):
+        refs = f.outputs[0].function_references
+        if len(refs) != 1:
+            return False
+        g = refs[0]
+        if not self._is_fusable(g):
+            return False
+        if g.info.type_name == 'Add2':
+            # Only through the first input so that a chain on the other
+            # input is fused on its own.
+            return chain['z'] is None and g.inputs[0] == f.outputs[0]
+        return True
+
+    def __finish__(self):
+        self._chains = {}
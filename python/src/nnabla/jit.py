@@ -0,0 +1,271 @@
+# Copyright 2023 Sony Group Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''
+Trace-and-replay execution of imperative functions.
+'''
+
+import functools
+from collections import OrderedDict
+
+import numpy as np
+
+import nnabla as nn
+
+
+class _Trace(object):
+    def __init__(self, inputs, outputs, structure, single):
+        self.inputs = inputs
+        self.outputs = outputs
+        self.structure = structure
+        self.single = single
+        self.validated = 0
+
+
+def _is_array(x):
+    return isinstance(x, (nn.NdArray, nn.Variable, np.ndarray))
+
+
+def _signature(args, kwargs):
+    keys = []
+    for x in list(args) + [kwargs[k] for k in sorted(kwargs)]:
+        if isinstance(x, (nn.NdArray, nn.Variable)):
+            keys.append((type(x), tuple(x.shape), x.data.dtype
+                         if isinstance(x, nn.Variable) else x.dtype))
+        elif isinstance(x, np.ndarray):
+            keys.append((np.ndarray, x.shape, x.dtype))
+        else:
+            keys.append(x)
+    sig = (tuple(keys), tuple(sorted(kwargs)))
+    try:
+        hash(sig)
+    except TypeError:
+        return None
+    return sig
+
+
+def _flat_arrays(args, kwargs):
+    return [x for x in list(args) + [kwargs[k] for k in sorted(kwargs)]
+            if _is_array(x)]
+
+
+def _as_ndarray(x):
+    if isinstance(x, nn.Variable):
+        return x.data
+    if isinstance(x, np.ndarray):
+        return nn.NdArray.from_numpy_array(x)
+    return x
+
+
+def _placeholder(x):
+    arr = _as_ndarray(x)
+    v = nn.Variable(arr.shape, need_grad=False)
+    v.data.cast(arr.dtype)
+    v.data.copy_from(arr, use_current_context=False)
+    return v
+
+
+def _detach(arr):
+    out = nn.NdArray(arr.shape)
+    out.cast(arr.dtype)
+    return out.copy_from(arr, use_current_context=False)
+
+
+def _graph_structure(inputs, outputs):
+    # Keys of variables are stable over traces of the same code: placeholders
+    # by their position, outputs of functions by their position in the
+    # topological order, and the other leaves such as parameters by identity.
+    keys = {v: ('input', i) for i, v in enumerate(inputs)}
+    visited = set()
+    structure = []
+
+    def key(v):
+        if v not in keys:
+            keys[v] = ('leaf', hash(v), tuple(v.shape))
+        return keys[v]
+
+    def visit(func):
+        if hash(func) in visited:
+            return
+        visited.add(hash(func))
+        for i in func.inputs:
+            if i.parent is not None and i not in keys:
+                visit(i.parent)
+        ins = tuple(key(i) for i in func.inputs)
+        for j, o in enumerate(func.outputs):
+            keys[o] = ('output', len(structure), j, tuple(o.shape))
+        structure.append((func.info.type_name,
+                          repr(sorted(func.info.args.items())), ins))
+
+    for o in outputs:
+        if o.parent is not None and o not in keys:
+            visit(o.parent)
+    return (tuple(structure), tuple(key(o) for o in outputs))
+
+
+def _execute(func, args, kwargs):
+    # Executes func with placeholders of the array arguments.
+    placeholders = {}
+    targs = []
+    for i, x in enumerate(args):
+        if _is_array(x):
+            placeholders[('arg', i)] = x = _placeholder(x)
+        targs.append(x)
+    tkwargs = {}
+    for k in sorted(kwargs):
+        x = kwargs[k]
+        if _is_array(x):
+            placeholders[('kwarg', k)] = x = _placeholder(x)
+        tkwargs[k] = x
+    # In the same order as _flat_arrays.
+    inputs = [placeholders[('arg', i)] for i, x in enumerate(args)
+              if _is_array(x)] + \
+        [placeholders[('kwarg', k)] for k in sorted(kwargs)
+         if _is_array(kwargs[k])]
+
+    with nn.auto_forward(True):
+        ret = func(*targs, **tkwargs)
+    outputs = [ret] if isinstance(ret, nn.Variable) else ret
+    if not isinstance(outputs, (tuple, list)) or \
+            not all(isinstance(o, nn.Variable) for o in outputs):
+        return ret, None
+    return ret, _Trace(inputs, list(outputs), None,
+                       isinstance(ret, nn.Variable))
+
+
+def _trace(func, args, kwargs):
+    _, trace = _execute(func, args, kwargs)
+    if trace is not None:
+        trace.structure = _graph_structure(trace.inputs, trace.outputs)
+    return trace
+
+
+def _results(trace, return_variables):
+    outs = []
+    for o in trace.outputs:
+        arr = _detach(o.data)
+        if return_variables:
+            v = nn.Variable(arr.shape, need_grad=False)
+            v.data = arr
+            outs.append(v)
+        else:
+            outs.append(arr)
+    return outs[0] if trace.single else type(trace.outputs)(outs)
+
+
+def _replay(trace, arrays):
+    for v, x in zip(trace.inputs, arrays):
+        v.data.copy_from(_as_ndarray(x), use_current_context=False)
+    nn.forward_all([o for o in trace.outputs if o.parent is not None],
+                   clear_buffer=True)
+
+
+def jit(func=None, max_signatures=16, validate=1):
+    '''Decorator compiling an imperative function by tracing and replaying.
+
+    On the first call with a signature of inputs, the decorated function is
+    executed with the auto-forward mode, and the computation graph it built
+    is kept. Later calls with the same signature copy the inputs into the
+    graph and execute it by :func:`~nnabla.forward_all`, skipping the Python
+    code and the setup of the functions.
+
+    The signature is the shapes and dtypes of the array arguments
+    (:obj:`~nnabla.NdArray`, :obj:`~nnabla.Variable` and
+    :obj:`numpy.ndarray`) together with the values of the other arguments,
+    which must be hashable. The decorated function must return a
+    :obj:`~nnabla.Variable` or a tuple or list of them.
+
+    The first ``validate`` calls after a trace execute the function again and
+    compare the graph with the traced one. If the graph differs, e.g. by a
+    branch depending on input values, the signature falls back to the
+    auto-forward execution on every call. A function whose control flow
+    depends on values of inputs only rarely should not be decorated, since
+    the divergence is detected only during the validation.
+
+    The results are new arrays of :obj:`~nnabla.NdArray`, or
+    :obj:`~nnabla.Variable` without parents if any of the array arguments is
+    a :obj:`~nnabla.Variable`. Gradients are not propagated through them.
+
+    Args:
+        func (callable): Function to compile.
+        max_signatures (int): Maximum number of traces kept. The least
+            recently used trace is discarded first.
+        validate (int): Number of calls re-executing the function to check
+            that the graph does not change after each trace.
+
+    Example:
+
+    .. code-block:: python
+
+        import nnabla as nn
+        import nnabla.functions as F
+        import nnabla.parametric_functions as PF
+
+        @nn.jit
+        def predict(x):
+            h = F.relu(PF.affine(x, 64, name='fc1'))
+            return PF.affine(h, 10, name='fc2')
+
+        y = predict(nn.NdArray.from_numpy_array(x_data))  # traced
+        y = predict(nn.NdArray.from_numpy_array(x_data))  # validated
+        y = predict(nn.NdArray.from_numpy_array(x_data))  # replayed
+    '''
+    if func is None:
+        return functools.partial(jit, max_signatures=max_signatures,
+                                 validate=validate)
+
+    # Signature to _Trace, or to None for the fallback.
+    traces = OrderedDict()
+
+    def eager(args, kwargs, return_variables):
+        # Inputs and results are converted as in the traced execution.
+        ret, trace = _execute(func, args, kwargs)
+        if trace is None:
+            return ret
+        return _results(trace, return_variables)
+
+    @functools.wraps(func)
+    def wrapped(*args, **kwargs):
+        arrays = _flat_arrays(args, kwargs)
+        return_variables = any(isinstance(x, nn.Variable) for x in arrays)
+        sig = _signature(args, kwargs)
+        if sig is None:
+            return eager(args, kwargs, return_variables)
+        if sig in traces:
+            traces.move_to_end(sig)
+            trace = traces[sig]
+            if trace is None:
+                return eager(args, kwargs, return_variables)
+            if trace.validated < validate:
+                retrace = _trace(func, args, kwargs)
+                if retrace is None or retrace.structure != trace.structure:
+                    traces[sig] = None
+                    if retrace is None:
+                        return eager(args, kwargs, return_variables)
+                else:
+                    trace.validated += 1
+                return _results(retrace, return_variables)
+            _replay(trace, arrays)
+            return _results(trace, return_variables)
+
+        trace = _trace(func, args, kwargs)
+        traces[sig] = trace
+        while len(traces) > max_signatures:
+            traces.popitem(last=False)
+        if trace is None:
+            return eager(args, kwargs, return_variables)
+        return _results(trace, return_variables)
+
+    wrapped.clear_cache = traces.clear
+    return wrapped
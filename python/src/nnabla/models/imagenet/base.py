@@ -20,7 +20,7 @@ from nnabla.utils.nnp_graph import NnpLoader
 from ..utils import *
 
 
-class ImageNetBase(object):
+class ImageNetBase(CachedNetworkMixin):
 
     """
     Most of ImageNet pretrained models are inherited from this class
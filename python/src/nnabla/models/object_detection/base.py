@@ -18,7 +18,7 @@ from nnabla.utils.nnp_graph import NnpLoader
 from ..utils import *
 
 
-class ObjectDetection(object):
+class ObjectDetection(CachedNetworkMixin):
 
     @property
     def input_shape(self):
@@ -101,7 +101,7 @@ def letterbox(img_orig, h, w):
         new_w = int((im_w * h) / im_h)
 
     patch = imresize(img_orig, (new_w, new_h))
-    img = np.ones((h, w, 3), np.uint8) * 127
+    img = np.full((h, w, 3), 127, np.uint8)
     # resize
     x0 = int((w - new_w) / 2)
     y0 = int((h - new_h) / 2)
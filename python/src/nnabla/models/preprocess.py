@@ -0,0 +1,153 @@
+# Copyright 2023 Sony Group Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from nnabla.utils.image_utils import imresize
+
+
+def fit_size(im_h, im_w, height, width, mode):
+    '''
+    Returns the size ``(new_h, new_w)`` of an image resized to fit inside
+    ``(height, width)`` and its offset ``(y0, x0)`` in the frame.
+
+    Args:
+        im_h (int): Height of the image.
+        im_w (int): Width of the image.
+        height (int): Height of the frame.
+        width (int): Width of the frame.
+        mode (str):
+            ``'resize'`` stretches the image to the frame.
+            ``'letterbox'`` keeps the aspect ratio and centers the image as
+            :func:`~nnabla.models.object_detection.utils.letterbox`.
+            ``'pad'`` keeps the aspect ratio and places the image at the
+            top-left corner as the preprocessing of the semantic segmentation
+            models.
+    '''
+    if mode == 'resize':
+        return (height, width), (0, 0)
+    if mode == 'letterbox':
+        if (width * 1.0 / im_w) < (height * 1. / im_h):
+            new_w = width
+            new_h = int((im_h * width) / im_w)
+        else:
+            new_h = height
+            new_w = int((im_w * height) / im_h)
+        return (new_h, new_w), (int((height - new_h) / 2), int((width - new_w) / 2))
+    if mode == 'pad':
+        ratio = min(height * 1.0 / im_h, width * 1.0 / im_w)
+        return (int(im_h * ratio), int(im_w * ratio)), (0, 0)
+    raise ValueError('Unknown mode: {}'.format(mode))
+
+
+def _preprocess_image(image, dst, mode, scale, bias, pad_value, channel_last,
+                      interpolate):
+    im_h, im_w, channels = image.shape
+    height, width = dst.shape[:2] if channel_last else dst.shape[1:]
+    (new_h, new_w), (y0, x0) = fit_size(im_h, im_w, height, width, mode)
+    if (new_h, new_w) != (im_h, im_w):
+        if mode == 'pad':
+            # Resized in float as the preprocessing of the models.
+            image = image.astype(np.float32)
+        image = imresize(image, (new_w, new_h), interpolate=interpolate)
+        image = image.reshape(new_h, new_w, channels)
+    if (new_h, new_w) != (height, width):
+        dst[...] = pad_value * scale + bias
+    if channel_last:
+        region = dst[y0:y0 + new_h, x0:x0 + new_w]
+    else:
+        region = dst[:, y0:y0 + new_h, x0:x0 + new_w]
+        image = image.transpose(2, 0, 1)
+    # Scale directly into the batch without a temporary array.
+    np.multiply(image, scale, out=region, casting='unsafe')
+    if bias != 0:
+        region += bias
+    return new_h, new_w
+
+
+def preprocess_images(images, height, width, mode='resize', scale=1.0, bias=0.0,
+                      pad_value=127, out=None, channel_last=False, num_threads=None,
+                      interpolate='bilinear'):
+    '''
+    Preprocess images into a batch.
+
+    Each image is resized to fit inside ``(height, width)`` according to
+    ``mode``, and written as ``image * scale + bias`` into a single batch
+    array. The pixels not covered by the image become
+    ``pad_value * scale + bias``. Images are processed in parallel threads.
+
+    The preprocessing of the pretrained models is given as follows.
+
+    .. code-block:: python
+
+        # ImageNet models
+        x.d = preprocess_images(images, 224, 224)[0]
+        # YoloV2
+        x.d, sizes = preprocess_images(images, 608, 608, mode='letterbox')
+        # DeepLabV3plus
+        x.d = preprocess_images(images, 513, 513, mode='pad',
+                                scale=2 / 255., bias=-1., pad_value=127.5)[0]
+
+    Args:
+        images (list of numpy.ndarray): Images of (height, width, channel) shape.
+            The images must have the same number of channels.
+        height (int): Height of the batch.
+        width (int): Width of the batch.
+        mode (str): ``'resize'``, ``'letterbox'`` or ``'pad'``. See :func:`fit_size`.
+        scale (float): Scale multiplied to pixel values.
+        bias (float): Bias added to the scaled pixel values.
+        pad_value (float): Pixel value of the padding.
+        out (numpy.ndarray):
+            Batch array to write into. A new float32 array is allocated if not given.
+            Reusing it avoids allocation for each batch.
+        channel_last (bool): The batch is of (N, H, W, C) shape if True, otherwise (N, C, H, W).
+        num_threads (int): Number of threads. The default is the number of CPUs.
+        interpolate (str): Interpolation of resizing, one of ``'nearest'``,
+            ``'bilinear'``, ``'bicubic'`` and ``'lanczos'``. Use ``'nearest'``
+            for label maps.
+
+    Returns:
+        tuple of numpy.ndarray: The batch and the size ``(new_h, new_w)`` of each resized image.
+    '''
+    if len(images) == 0:
+        raise ValueError('No image is given.')
+    channels = images[0].shape[2] if images[0].ndim == 3 else 1
+    shape = (len(images), height, width, channels) if channel_last \
+        else (len(images), channels, height, width)
+    if out is None:
+        out = np.empty(shape, dtype=np.float32)
+    elif out.shape != shape:
+        raise ValueError('out must be of {} shape. Given {}.'.format(
+            shape, out.shape))
+
+    def process(i):
+        image = images[i]
+        if image.ndim == 2:
+            image = image[..., None]
+        return _preprocess_image(image, out[i], mode, scale, bias, pad_value,
+                                 channel_last, interpolate)
+
+    if num_threads is None:
+        num_threads = os.cpu_count() or 1
+    num_threads = min(num_threads, len(images))
+    if num_threads <= 1:
+        sizes = [process(i) for i in range(len(images))]
+    else:
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            sizes = list(executor.map(process, range(len(images))))
+    return out, np.array(sizes, dtype=np.int64).reshape(len(images), 2)
@@ -19,7 +19,7 @@ from nnabla.utils.nnp_graph import NnpLoader
 from ..utils import *
 
 
-class SemanticSegmentation(object):
+class SemanticSegmentation(CachedNetworkMixin):
 
     '''
     Semantic Segmentation pretrained models are inherited from this class
@@ -32,7 +32,9 @@ def resize(image, desired_size):
 
 
 def zero_mean_unit_range(image):
-    return ((2.0 / 255.0) * image - 1.0)
+    image = (2.0 / 255.0) * image
+    image -= 1.0
+    return image
 
 
 def cast(image):
@@ -51,8 +53,8 @@ def pad(image, desired_size=(513, 513), value=None):
                       for x, ds in zip(old_size, desired_size)])
 
     # Pad image with mean pixel value
-    new_im = np.pad(image, ((0, (new_size[0]-old_size[0])), (0, new_size[1] -
-                                                             old_size[1]), (0, 0)), mode='constant', constant_values=value)
+    new_im = np.full(new_size + image.shape[2:], value, dtype=image.dtype)
+    new_im[:old_size[0], :old_size[1]] = image
     return new_im
 
 
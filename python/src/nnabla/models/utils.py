@@ -15,7 +15,9 @@
 from __future__ import absolute_import
 
 import os
+from collections import OrderedDict
 
+import nnabla as nn
 from nnabla import logger
 from nnabla.utils.download import get_data_home
 
@@ -48,3 +50,55 @@ def get_model_url_base():
     else:
         url_base = 'https://nnabla.org/pretrained-models/nnp_models/'
     return url_base
+
+
+class CachedNetworkMixin(object):
+    '''
+    Provides :meth:`cached_network` to model classes creating a network by
+    ``__call__``.
+    '''
+
+    # Maximum number of networks kept by cached_network.
+    _max_cached_networks = 8
+
+    def cached_network(self, input_shape=None, **kwargs):
+        '''
+        Returns an input variable and a network created from a loaded model,
+        reusing the ones created by a previous call with the same arguments.
+
+        Creating a network from a model builds the graph every time, which
+        costs much for repeated inference. The networks are cached for each
+        input shape and the other arguments, and the least recently used one
+        is discarded if more than 8 networks are cached.
+
+        Args:
+            input_shape (tuple of int):
+                Shape of the input variable including the batch size. The
+                default is a batch size of 1 and ``self.input_shape``.
+            kwargs: Arguments of ``__call__`` other than ``input_var``.
+
+        Returns:
+            tuple: The input :obj:`~nnabla.Variable` and the output of ``__call__``.
+
+        Example:
+
+        .. code-block:: python
+
+            for images in batches:
+                x, y = model.cached_network((len(images),) + model.input_shape)
+                x.d = preprocess_images(images, *model.input_shape[1:])[0]
+                y.forward(clear_buffer=True)
+        '''
+        if input_shape is None:
+            input_shape = (1,) + tuple(self.input_shape)
+        input_shape = tuple(int(s) for s in input_shape)
+        key = (input_shape, tuple(sorted(kwargs.items())))
+        cache = self.__dict__.setdefault('_cached_networks', OrderedDict())
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        x = nn.Variable(input_shape)
+        cache[key] = x, self(x, **kwargs)
+        while len(cache) > self._max_cached_networks:
+            cache.popitem(last=False)
+        return cache[key]
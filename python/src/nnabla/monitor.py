@@ -14,12 +14,163 @@
 
 from __future__ import print_function
 
+import atexit
 import numpy as np
 import os
+import queue
+import threading
 import time
+from collections import OrderedDict
 
 from nnabla.logger import logger
 
+_LOG_FILENAME = 'monitor.log'
+_LOG_RECORD = np.dtype([('name', '<i4'), ('index', '<i8'), ('value', '<f8')])
+
+# Maximum number of queued operations processed before flushing the files.
+_MAX_BATCH = 1024
+
+
+class _MonitorWriter(object):
+
+    """Writes the outputs of monitors sharing a :class:`Monitor`.
+
+    File handles are kept open. If ``async_write`` is ``True``, the writes are
+    queued and processed in batches by a background thread, otherwise they
+    are processed and flushed immediately.
+    """
+
+    def __init__(self, save_path, async_write=False, binary_log=False):
+        self.binary_log = binary_log
+        self._files = {}
+        self._names = {}
+        self._records = []
+        self._error = None
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        if binary_log:
+            path = os.path.join(save_path, _LOG_FILENAME)
+            self._log_path = path
+            self._names_path = path + '.names'
+            self._truncate(path, 'wb')
+            self._truncate(self._names_path)
+        if async_write:
+            self._queue = queue.Queue()
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+        atexit.register(self.close)
+
+    def _file(self, path, mode='a'):
+        f = self._files.get(path)
+        if f is None:
+            f = open(path, mode)
+            self._files[path] = f
+        return f
+
+    def _truncate(self, path, mode='w'):
+        f = self._files.pop(path, None)
+        if f is not None:
+            f.close()
+        self._file(path, mode)
+
+    def _write_line(self, path, line):
+        print(line, file=self._file(path))
+
+    def _write_record(self, name, index, value):
+        code = self._names.get(name)
+        if code is None:
+            code = len(self._names)
+            self._names[name] = code
+            self._write_line(self._names_path, name)
+        self._records.append((code, index, value))
+
+    def _save_image(self, path, img):
+        from nnabla.utils.image_utils import imsave
+        imsave(path, img)
+
+    def _flush(self):
+        if self._records:
+            records = np.array(self._records, dtype=_LOG_RECORD)
+            self._records = []
+            self._file(self._log_path, 'ab').write(records.tobytes())
+        for f in self._files.values():
+            f.flush()
+
+    def _process(self, ops):
+        for op in ops:
+            op[0](*op[1:])
+        self._flush()
+
+    def _run(self):
+        while True:
+            ops = [self._queue.get()]
+            while ops[-1] is not None and len(ops) < _MAX_BATCH:
+                try:
+                    ops.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = ops[-1] is None
+            if stop:
+                ops.pop()
+            try:
+                self._process(ops)
+            except Exception as e:
+                logger.error('Monitor failed to write: {}'.format(e))
+                if self._error is None:
+                    self._error = e
+            for _ in range(len(ops) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _submit(self, *op):
+        with self._lock:
+            if self._thread is not None:
+                self._queue.put(op)
+                return
+            self._process([op])
+
+    def truncate(self, path):
+        self._submit(self._truncate, path)
+
+    def write_line(self, path, line):
+        self._submit(self._write_line, path, line)
+
+    def write_record(self, name, index, value):
+        self._submit(self._write_record, name, index, value)
+
+    def save_image(self, path, img):
+        self._submit(self._save_image, path, img)
+
+    def flush(self):
+        if self._thread is not None:
+            self._queue.join()
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(None)
+        if thread is not None:
+            thread.join()
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+        atexit.unregister(self.close)
+
+
+def _get_writer(monitor):
+    writer = getattr(monitor, '_writer', None)
+    if writer is None:
+        writer = _MonitorWriter(monitor.save_path)
+        monitor._writer = writer
+    return writer
+
 
 class Monitor(object):
 
@@ -27,16 +178,43 @@ class Monitor(object):
     This class is created to setup the output directory of the monitoring logs.
     The created :class:`nnabla.monitor.Monitor` instance is passed to classes
     in the following :ref:`monitors`.
+
+    The outputs of the monitors are written through the file handles kept
+    open by this instance.
+
+    Args:
+        save_path (str): Output directory.
+        async_write (bool): If ``True``, the outputs are queued and written
+            by a background thread so that ``.add()`` of the monitors never
+            waits for file I/O. Call :meth:`flush` to wait for the writes.
+        binary_log (bool): If ``True``, the values of
+            :class:`MonitorSeries` and :class:`MonitorTimeElapsed` are
+            appended to a single binary file ``monitor.log`` instead of a
+            text file for each monitor. See :func:`read_monitor_log`.
     """
 
-    def __init__(self, save_path):
+    def __init__(self, save_path, async_write=False, binary_log=False):
         self._save_path = save_path
         os.makedirs(save_path, exist_ok=True)
+        self._writer = _MonitorWriter(save_path, async_write=async_write,
+                                      binary_log=binary_log)
 
     @property
     def save_path(self):
         return self._save_path
 
+    def flush(self):
+        """Wait until all the queued outputs are written.
+
+        An error raised while writing the outputs in the background is
+        re-raised here.
+        """
+        self._writer.flush()
+
+    def close(self):
+        """Write the queued outputs and close the files."""
+        self._writer.close()
+
 
 class MonitorSeries(object):
     """Logs a series of values.
@@ -66,12 +244,14 @@ class MonitorSeries(object):
         self.interval = interval
         self.verbose = verbose
         self.sp = None
+        self._writer = None
         if monitor is not None:
-            self.sp = os.path.join(
-                monitor.save_path, name.replace(" ", "-")) + ".series.txt"
-            # refresh output file
-            with open(self.sp, "w") as f:
-                pass
+            self._writer = _get_writer(monitor)
+            if not self._writer.binary_log:
+                self.sp = os.path.join(
+                    monitor.save_path, name.replace(" ", "-")) + ".series.txt"
+                # refresh output file
+                self._writer.truncate(self.sp)
         self.flush_at = -1
         self.buf = []
 
@@ -90,8 +270,9 @@ class MonitorSeries(object):
         if self.verbose:
             logger.info("iter={} {{{}}}={}".format(index, self.name, value))
         if self.sp is not None:
-            with open(self.sp, 'a') as fd:
-                print("{} {:g}".format(index, value), file=fd)
+            self._writer.write_line(self.sp, "{} {:g}".format(index, value))
+        elif self._writer is not None:
+            self._writer.write_record(self.name, index, value)
         self.flush_at = index
         self.buf = []
 
@@ -127,12 +308,14 @@ class MonitorTimeElapsed(object):
         self.interval = interval
         self.verbose = verbose
         self.sp = None
+        self._writer = None
         if monitor is not None:
-            self.sp = os.path.join(
-                monitor.save_path, name.replace(" ", "-")) + ".timer.txt"
-            # refresh output file
-            with open(self.sp, "w") as f:
-                pass
+            self._writer = _get_writer(monitor)
+            if not self._writer.binary_log:
+                self.sp = os.path.join(
+                    monitor.save_path, name.replace(" ", "-")) + ".timer.txt"
+                # refresh output file
+                self._writer.truncate(self.sp)
         self.flush_at = -1
         self.start = time.time()
         self.lap = self.start
@@ -156,9 +339,12 @@ class MonitorTimeElapsed(object):
             logger.info("iter={} {{{}}}={}[sec/{}iter] {}[sec]".format(
                 index, self.name, elapsed, it, elapsed_total))
         if self.sp is not None:
-            with open(self.sp, 'a') as fd:
-                print("{} {} {} {}".format(index, elapsed,
-                                           it, elapsed_total), file=fd)
+            self._writer.write_line(self.sp, "{} {} {} {}".format(
+                index, elapsed, it, elapsed_total))
+        elif self._writer is not None:
+            self._writer.write_record(self.name, index, elapsed)
+            self._writer.write_record(
+                self.name + '/total', index, elapsed_total)
         self.flush_at = index
 
 
@@ -204,6 +390,7 @@ class MonitorImage(object):
         if normalize_method is None:
             self.normalize_method = self.default_normalize_method
         self.num_images = num_images
+        self._writer = _get_writer(monitor)
         self.save_dir = os.path.join(monitor.save_path, name.replace(' ', '-'))
         try:
             os.makedirs(self.save_dir)
@@ -227,7 +414,6 @@ class MonitorImage(object):
 
         """
         import nnabla as nn
-        from nnabla.utils.image_utils import imsave
         if index != 0 and (index + 1) % self.interval != 0:
             return
         if isinstance(var, nn.Variable):
@@ -253,7 +439,7 @@ class MonitorImage(object):
             if img.shape[-1] == 1:
                 img = img[..., 0]
             path = path_tmpl.format('{:03d}.png'.format(j))
-            imsave(path, img)
+            self._writer.save_image(path, img)
         if self.verbose:
             logger.info("iter={} {{{}}} are written to {}.".format(
                 index, self.name, path_tmpl.format('*.png')))
@@ -306,7 +492,6 @@ class MonitorImageTile(MonitorImage):
 
         """
         import nnabla as nn
-        from nnabla.utils.image_utils import imsave
         if index and (index + 1) % self.interval:
             return
         if isinstance(var, nn.Variable):
@@ -328,7 +513,7 @@ class MonitorImageTile(MonitorImage):
                 [data, np.ones((data.shape[0], 1) + data.shape[-2:])], axis=1)
         tile = tile_images(data)
         path = os.path.join(self.save_dir, '{:06d}.png'.format(index))
-        imsave(path, tile)
+        self._writer.save_image(path, tile)
         if self.verbose:
             logger.info("iter={} {{{}}} is written to {}.".format(
                 index, self.name, path))
@@ -430,3 +615,29 @@ def plot_time_elapsed(filename, elapsed=False, unit='s', plot_kwargs=None):
     else:
         raise ValueError('The argument `unit` must be chosen from {s|m|h|d}.')
     plt.plot(index, values, **plot_kwargs)
+
+
+def read_monitor_log(save_path):
+    """Read the values written by monitors of a :class:`Monitor` with
+    ``binary_log=True``.
+
+    The elapsed time of :class:`MonitorTimeElapsed` named ``name`` is given as
+    ``name`` and the total elapsed time as ``name + '/total'``.
+
+    Args:
+        save_path (str): Output directory of the :class:`Monitor`.
+
+    Returns:
+        ~collections.OrderedDict: Map from the name of a monitor to a tuple
+        of the indices and the values as :obj:`numpy.ndarray`.
+
+    """
+    path = os.path.join(save_path, _LOG_FILENAME)
+    with open(path + '.names') as f:
+        names = f.read().splitlines()
+    records = np.fromfile(path, dtype=_LOG_RECORD)
+    series = OrderedDict()
+    for code, name in enumerate(names):
+        selected = records[records['name'] == code]
+        series[name] = (selected['index'], selected['value'])
+    return series
@@ -2228,7 +2228,7 @@ def group_normalization(inp, num_groups, channel_axis=1, batch_axis=0, eps=1e-05
     ('W', 'Embedding matrix', '(n_inputs, n_features)', True),
 ])
 def embed(inp, n_inputs, n_features, initializer=None,
-          fix_parameters=False, apply_w=None):
+          fix_parameters=False, apply_w=None, sparse_grad=False):
     """ Embed.
 
     Embed slices a matrix/tensor with indexing array/tensor. Weights are initialized with :obj:`nnabla.initializer.UniformInitializer` within the range of :math:`-\\sqrt{3}` and :math:`\\sqrt{3}`.
@@ -2240,6 +2240,9 @@ def embed(inp, n_inputs, n_features, initializer=None,
         fix_parameters (bool): When set to `True`, the embedding weight matrix
             will not be updated.
         apply_w (function): Lambda, function, or callable object applied to the weights.
+        sparse_grad (bool): When set to `True`, the gradient of the embedding
+            weight matrix is kept only for the rows indexed, and solvers
+            update only the rows. See :attr:`nnabla.Variable.sparse_grad`.
 
     Returns:
         ~nnabla.Variable: Output with shape :math:`(I_0, ..., I_N, W_1, ..., W_M)`
@@ -2248,6 +2251,8 @@ def embed(inp, n_inputs, n_features, initializer=None,
         initializer = UniformInitializer((-np.sqrt(3.), np.sqrt(3)))
     w = get_parameter_or_create("W", [n_inputs, n_features],
                                 initializer, True, not fix_parameters)
+    if sparse_grad:
+        w.sparse_grad = True
     if apply_w is not None:
         w = apply_w(w)
     return F.embed(inp, w)
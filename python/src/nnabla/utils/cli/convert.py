@@ -214,6 +214,14 @@ def add_convert_command(subparsers):
                            help='[export][TFLite] export to INT8 quantized tflite model.')
     subparser.add_argument('--dataset', type=str, default=None,
                            help='[export][TFLite] Specify the path of represent dataset which will be passed to INT8 quantized tflite converter.')
+    subparser.add_argument('--calibration-batch-size', type=int, default=32,
+                           help='[export][TFLite] Number of represent samples fed to the interpreter at once in calibration.')
+    subparser.add_argument('--calibration-threads', type=int, default=1,
+                           help='[export][TFLite] Number of interpreters run in parallel in calibration.')
+    subparser.add_argument('--calibration-method', type=str, default='minmax', choices=['minmax', 'percentile'],
+                           help='[export][TFLite] Calibration method, moving average of min/max values or percentile of histogram.')
+    subparser.add_argument('--calibration-percentile', type=float, default=99.99,
+                           help='[export][TFLite] Percentile used by "percentile" calibration method.')
     subparser.add_argument('--ir_version', type=int, default=-1,
                            help='[export] Set ONNX IR version to convert to, \
                            default is the latest supported IR version corresponding to the current ONNX version.')
@@ -21,6 +21,7 @@ import nnabla.utils.load as load
 import numpy as np
 from nnabla.logger import logger
 from nnabla.utils.cli.utility import let_data_to_variable, is_float, compute_full_path
+from nnabla.utils.csv_index import open_csv_index
 from nnabla.utils.data_iterator import data_iterator_cache
 from nnabla.utils.data_iterator import data_iterator_csv_dataset
 from nnabla.utils.data_source_loader import FileReader
@@ -52,6 +53,20 @@ def _set_initial_values(result, type_and_name, d):
     return result
 
 
+class _CsvRows(object):
+    '''Rows of a dataset CSV converted on demand from its index.'''
+
+    def __init__(self, csv_index, convert):
+        self._csv_index = csv_index
+        self._convert = convert
+
+    def __len__(self):
+        return len(self._csv_index)
+
+    def __getitem__(self, i):
+        return self._convert(self._csv_index.row(i))
+
+
 def _update_result(args, index, result, values, output_index, type_end_names, output_image):
     outputs = []
     for o, type_and_name in zip(values, type_end_names):
@@ -225,21 +240,17 @@ def forward_command(args):
             with_memory_cache=False,
             with_file_cache=False))
 
-        # load dataset as csv
-        filereader = FileReader(args.dataset)
-        with filereader.open(textmode=True, encoding='utf-8-sig') as f:
-            rows = [row for row in csv.reader(f)]
-        row0 = rows.pop(0)
+        # load dataset as csv, reading rows on demand
+        csv_index = open_csv_index(args.dataset)
+        row0 = list(csv_index.header)
         if args.replace_path:
             root_path = os.path.dirname(args.dataset)
             root_path = os.path.abspath(root_path.replace('/|\\', os.path.sep))
         else:
             root_path = '.'
-        rows = [row for row in rows if len(row)]
-        rows = list(map(lambda row: list(map(lambda i, x: x if row0[i][0] == '#' or is_float(
-            x) else compute_full_path(root_path, x), range(len(row)), row)), rows))
-        for i in range(len(rows)):
-            orders[i] = i
+        rows = _CsvRows(csv_index, lambda row: list(map(lambda i, x: x if row0[i][0] == '#' or is_float(
+            x) else compute_full_path(root_path, x), range(len(row)), row)))
+        orders = range(len(rows))
     # With Cache
     elif os.path.splitext(args.dataset)[1] == '.cache':
         data_iterator = (lambda: data_iterator_cache(
@@ -17,11 +17,15 @@ import json
 import os
 
 
-def optimize_nnp_model_command(input_file, output_file):
+def optimize_nnp_model_command(input_file, output_file, inference=True):
+    from nnabla.core.graph_optimizer import optimize_inference
     from nnabla.utils.converter.nnabla.optimizer import optimize_nnp
     import nnabla as nn
 
     g = nn.graph_def.load(input_file)
+    if inference:
+        for network in g.networks.values():
+            optimize_inference(network)
     network = optimize_nnp(g)
     g.networks[network.name] = network
     g.save(output_file)
@@ -57,7 +61,8 @@ def optimization_command(args):
     elif ext == '.nnp':
         if os.path.splitext(output_file)[1] != '.nnp':
             raise ValueError("Input or output file format error.")
-        optimize_nnp_model_command(input_file, output_file)
+        optimize_nnp_model_command(
+            input_file, output_file, not args.no_inference_optimization)
     else:
         raise ValueError(f"{ext} is unsupported file format.")
 
@@ -66,9 +71,11 @@ def add_optimize_command(subparsers):
     ################################################################################
     # Optimize pb model
     subparser = subparsers.add_parser(
-        'optimize', help='Optimize pb model.')
+        'optimize', help='Optimize pb or nnp model.')
     subparser.add_argument('input_file', nargs=1,
-                           help='Input pre-optimized pb model.')
+                           help='Input pre-optimized pb or nnp model.')
     subparser.add_argument('output_file', nargs=1,
-                           help='Output optimized pb model.')
+                           help='Output optimized pb or nnp model.')
+    subparser.add_argument('--no-inference-optimization', action='store_true',
+                           help='[nnp] Disable constant folding, common subexpression elimination and dead code elimination.')
     subparser.set_defaults(func=optimization_command)
@@ -27,6 +27,7 @@ from contextlib2 import ExitStack  # Backport from python3
 from nnabla.ext_utils import import_extension_module
 from nnabla.logger import logger
 from nnabla.utils.cli.utility import let_data_to_variable
+from nnabla.utils.profiler import FunctionCost, function_cost, roofline_stat
 from nnabla.utils.progress import configure_progress, progress
 
 
@@ -71,7 +72,16 @@ def add_result(title, result_dict, result_array):
     return result_array
 
 
-def profile_optimizer(config, result_array, synchronize):
+def add_roofline_result(title, roofline_rows, roofline_array):
+    for stat in roofline_rows:
+        roofline_array.append([title, stat.function_name, stat.inputs_shape,
+                               stat.flops, stat.bytes, stat.mean_time * 1000,
+                               stat.gflops_per_sec, stat.arithmetic_intensity,
+                               stat.bound])
+    return roofline_array
+
+
+def profile_optimizer(config, result_array, synchronize, roofline_array=None):
     # Profile Training
     for opt in config.optimizers.values():
         o = opt.optimizer
@@ -138,13 +148,32 @@ def profile_optimizer(config, result_array, synchronize):
             clear_buffer=True, function_pre_hook=lambda f: o.backward_sequence.append(f))
 
         # Forward (detail)
+        roofline_rows = []
+        total_cost = [0, 0, 0]
+        total_time = 0.
         for func in o.forward_sequence:
             if func.name == 'Sink':
                 continue
-            profile(config, 'forward_function (%s : %s)' % (func.name, func.name),
+            name = 'forward_function (%s : %s)' % (func.name, func.name)
+            profile(config, name,
                     partial(func.forward, inputs=func.inputs,
                             outputs=func.outputs),
                     result_dict, synchronize)
+            cost = function_cost(func)
+            t = result_dict[name] / 1000
+            roofline_rows.append(roofline_stat(func.name, cost, t,
+                                               inputs_shape=[
+                                                   x.shape for x in func.inputs],
+                                               peak_gflops=config.peak_gflops,
+                                               peak_bandwidth=config.peak_bandwidth))
+            total_cost = [a + b for a, b in zip(total_cost, cost)]
+            total_time += t
+        roofline_rows.append(roofline_stat('total', FunctionCost(*total_cost), total_time,
+                                           peak_gflops=config.peak_gflops,
+                                           peak_bandwidth=config.peak_bandwidth))
+        if roofline_array is not None:
+            roofline_array = add_roofline_result(
+                result_name, roofline_rows, roofline_array)
 
         # Backward (detail)
         def empty_func():
@@ -201,7 +230,7 @@ def profile_optimizer(config, result_array, synchronize):
 
         result_array = add_result(result_name, result_dict, result_array)
 
-    return result_array
+    return result_array, roofline_array
 
 
 def profile_command(args):
@@ -216,6 +245,8 @@ def profile_command(args):
 
     config.global_config = info.global_config
     config.training_config = info.training_config
+    config.peak_gflops = args.peak_gflops
+    config.peak_bandwidth = args.peak_bandwidth
 
     class OptConfig:
         pass
@@ -246,6 +277,8 @@ def profile_command(args):
         def synchronize(): return None
 
     result_array = [['time in ms']]
+    roofline_array = [['optimizer', 'function', 'inputs_shape', 'flops', 'bytes', 'time in ms',
+                       'GFLOP/s', 'arithmetic intensity (FLOP/byte)', 'bound']]
 
     callback.update_status('processing', True)
 
@@ -261,13 +294,17 @@ def profile_command(args):
                 else:
                     di_instance = optimizer_data_iterators[di]
                 o.data_iterators.append(di_instance)
-        result_array = profile_optimizer(config, result_array, synchronize)
+        result_array, roofline_array = profile_optimizer(
+            config, result_array, synchronize, roofline_array)
 
     # Write profiling result
     import csv
     with open(args.outdir + os.sep + 'profile.csv', 'w') as f:
         writer = csv.writer(f, lineterminator='\n')
         writer.writerows(result_array)
+    with open(args.outdir + os.sep + 'roofline.csv', 'w') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerows(roofline_array)
 
     logger.log(99, 'Profile Completed.')
     progress(None)
@@ -283,4 +320,10 @@ def add_profile_command(subparsers):
         '-c', '--config', help='path to nntxt', required=True)
     subparser.add_argument(
         '-o', '--outdir', help='output directory', required=True)
+    subparser.add_argument(
+        '--peak-gflops', help='peak compute performance of the device in GFLOP/s, used for roofline classification',
+        type=float, default=None)
+    subparser.add_argument(
+        '--peak-bandwidth', help='peak memory bandwidth of the device in GB/s, used for roofline classification',
+        type=float, default=None)
     subparser.set_defaults(func=profile_command)
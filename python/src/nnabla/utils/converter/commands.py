@@ -16,6 +16,7 @@
 import collections
 import os
 import sys
+import time
 
 from .nnabla import NnpImporter, NnpExporter
 from .nnablart import NnbExporter, CsrcExporter
@@ -197,9 +198,14 @@ def _export_from_nnp(args, nnp, output):
                 'TFLITE: If you want to use with other size use `-b` option and provide a positive value.')
             args.batch_size = nnp.protobuf.network[0].batch_size
         from .tflite import TFLiteExporter
+        calibration_options = {
+            'batch_size': getattr(args, 'calibration_batch_size', 32),
+            'num_threads': getattr(args, 'calibration_threads', 1),
+            'method': getattr(args, 'calibration_method', 'minmax'),
+            'percentile': getattr(args, 'calibration_percentile', 99.99)}
         TFLiteExporter(nnp, args.batch_size,
                        channel_last=args.channel_last, quantization=args.quantization,
-                       dataset=args.dataset).execute(output)
+                       dataset=args.dataset, calibration_options=calibration_options).execute(output)
     else:
         print('Output file ({})'.format(args.export_format) +
               ' is not supported or output directory does not exist.')
@@ -272,7 +278,9 @@ def _get_split_ranges(nnp, args, supported_set):
 
 
 def convert_files(args, ifiles, output):
+    start = time.perf_counter()
     nnp = _import_file(args, ifiles)
+    logger.info("Import: {:.3f} sec".format(time.perf_counter() - start))
     if nnp is not None:
         network_name = nnp.protobuf.executor[0].network_name
         if args.export_format == 'ONNX':
@@ -333,7 +341,11 @@ def convert_files(args, ifiles, output):
             import yaml
             print(yaml.dump(nnb_info, default_flow_style=False))
         else:
-            return _export_from_nnp(args, nnp, output)
+            start = time.perf_counter()
+            result = _export_from_nnp(args, nnp, output)
+            logger.info("Export: {:.3f} sec".format(
+                time.perf_counter() - start))
+            return result
     else:
         print('Import from {} failed.'.format(ifiles))
         return False
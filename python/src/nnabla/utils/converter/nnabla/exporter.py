@@ -78,6 +78,38 @@ def rename_square_bracket(nnp):
             e.variable_name = get_renamed(e.variable_name)
 
 
+def _varint(value):
+    buf = bytearray()
+    while value > 0x7f:
+        buf.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buf.append(value)
+    return bytes(buf)
+
+
+def _is_repeated(desc):
+    # FieldDescriptor.label is removed in recent protobuf.
+    if hasattr(desc, 'is_repeated'):
+        return desc.is_repeated
+    return desc.label == desc.LABEL_REPEATED
+
+
+def _copy_without_parameter(nnp):
+    # Copy each field except parameter instead of copying all and clearing
+    # parameter, which briefly holds another copy of all parameters.
+    dst = nnabla_pb2.NNablaProtoBuf()
+    for desc, value in nnp.ListFields():
+        if desc.name == 'parameter':
+            continue
+        if _is_repeated(desc):
+            getattr(dst, desc.name).extend(value)
+        elif desc.type == desc.TYPE_MESSAGE:
+            getattr(dst, desc.name).CopyFrom(value)
+        else:
+            setattr(dst, desc.name, value)
+    return dst
+
+
 class NnpExporter:
     def __init__(self, nnp, batch_size, parameter_type='protobuf', force=False):
         self._parameter_type = parameter_type
@@ -97,12 +129,24 @@ class NnpExporter:
         with open(filename, 'wb') as f:
             f.write(nnp.SerializeToString())
 
+    def _write_parameter_protobuf(self, filename, nnp):
+        # Same bytes as an NNablaProtoBuf holding only the parameters, written
+        # one parameter at a time.
+        field = nnabla_pb2.NNablaProtoBuf.DESCRIPTOR.fields_by_name['parameter']
+        tag = _varint((field.number << 3) | 2)  # length-delimited
+        with open(filename, 'wb') as f:
+            for param in nnp.parameter:
+                data = param.SerializeToString()
+                f.write(tag)
+                f.write(_varint(len(data)))
+                f.write(data)
+
     def _write_h5(self, filename, nnp):
         import h5py
         with h5py.File(filename, 'w') as hd:
             for i, param in enumerate(nnp.parameter):
-                data = np.reshape(list(param.data),
-                                  tuple(list(param.shape.dim)))
+                data = np.array(param.data, dtype=np.float32).reshape(
+                    tuple(param.shape.dim))
                 dset = hd.create_dataset(
                     param.variable_name, dtype='f4', data=data)
                 dset.attrs['need_grad'] = param.need_grad
@@ -114,19 +158,13 @@ class NnpExporter:
         if self._parameter_type == 'included':
             self._write_nntxt('{}/network.nntxt'.format(outdir), self._nnp)
         else:
-            nnp_wo_parameter = nnabla_pb2.NNablaProtoBuf()
-            nnp_wo_parameter.CopyFrom(self._nnp)
-            nnp_wo_parameter.ClearField('parameter')
+            nnp_wo_parameter = _copy_without_parameter(self._nnp)
             self._write_nntxt(
                 '{}/network.nntxt'.format(outdir), nnp_wo_parameter)
 
             if self._parameter_type == 'protobuf':
-                nnp_parameter_only = nnabla_pb2.NNablaProtoBuf()
-                for param in self._nnp.parameter:
-                    parameter = nnp_parameter_only.parameter.add()
-                    parameter.CopyFrom(param)
-                self._write_protobuf(
-                    '{}/parameter.protobuf'.format(outdir), nnp_parameter_only)
+                self._write_parameter_protobuf(
+                    '{}/parameter.protobuf'.format(outdir), self._nnp)
             elif self._parameter_type == 'h5':
                 self._write_h5('{}/parameter.h5'.format(outdir), self._nnp)
             elif self._parameter_type == 'none':
@@ -119,8 +119,10 @@ class CsrcExporter:
             f.write(header)
 
     def _export_csrc_implements(self, dirname, name, prefix):
-        from .save_variable_buffer import save_variable_buffer
-        actual_buf_sizes, vidx_to_abidx = save_variable_buffer(self._info)
+        from .save_variable_buffer import plan_variable_offsets
+        # All Buffer Variables are placed in a single arena by offsets.
+        arena_size, vidx_to_offset = plan_variable_offsets(self._info)
+        actual_buf_sizes = [arena_size]
 
         batch_size = self._info._batch_size
 
@@ -251,12 +253,8 @@ class CsrcExporter:
                     '    (c->v{}).data = c->param_pool[{}];'.format(n, param_id_start))
                 param_id_start += 1
             else:
-                if n in vidx_to_abidx:
-                    initialize_context.append(
-                        '    (c->v{}).data = c->buffer_pool[{}];'.format(n, vidx_to_abidx[n]))
-                else:
-                    initialize_context.append(
-                        '    (c->v{}).data = c->buffer_pool[{}];'.format(n, 0))
+                initialize_context.append(
+                    '    (c->v{}).data = (float *)c->buffer_pool[0] + {};'.format(n, vidx_to_offset.get(n, 0)))
             variable_buffers[v.name] = '(c->v{}).data'.format(n)
             variables[v.name] = '(c->v{})'.format(n)
 
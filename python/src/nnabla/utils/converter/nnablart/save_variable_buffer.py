@@ -14,6 +14,8 @@
 
 import numpy as np
 
+from nnabla.logger import logger
+
 
 class _LifeSpan:
     def __init__(self):
@@ -184,6 +186,86 @@ def __assign_actual_buf_to_variable(info, actual_buf_sizes, buf_var_refs):
     return vidx_to_abidx
 
 
+def __make_buf_var_records(info, buf_var_lives):
+    # records of (size, begin_func_idx, end_func_idx, vidx) of Buffer
+    # Variables referred by any Function, largest first
+    records = []
+    for buf_idx, buf_var_life in enumerate(buf_var_lives):
+        if buf_var_life.begin_func_idx < 0:
+            continue  # not referred
+        records.append((info._variable_buffer_size[buf_idx],
+                        buf_var_life.begin_func_idx,
+                        buf_var_life.end_func_idx,
+                        info._variable_buffer_index[buf_idx][0]))
+    records.sort(key=lambda r: (-r[0], r[1], r[3]))
+    return records
+
+
+def __plan_shared_buffers(records):
+    # greedy by size: each Variable is assigned to the smallest actual buffer
+    # vacant during its life, or to a new one
+    actual_buf_sizes = []
+    actual_buf_lives = []
+    vidx_to_abidx = {}
+    for size, begin, end, vidx in records:
+        best = -1
+        for abidx, lives in enumerate(actual_buf_lives):
+            if actual_buf_sizes[abidx] < size:
+                continue
+            if any(b <= end and begin <= e for b, e in lives):
+                continue
+            if best < 0 or actual_buf_sizes[abidx] < actual_buf_sizes[best]:
+                best = abidx
+        if best < 0:
+            best = len(actual_buf_sizes)
+            actual_buf_sizes.append(size)
+            actual_buf_lives.append([])
+        actual_buf_lives[best].append((begin, end))
+        vidx_to_abidx[vidx] = best
+    return actual_buf_sizes, vidx_to_abidx
+
+
+def plan_variable_arena(info, alignment=1):
+    '''Plan offsets of Buffer Variables in a single arena.
+
+    Variables are placed from the largest one, each at the offset of the
+    smallest gap that fits among the Variables alive at the same time, or
+    above them all (greedy by size with best fit).
+
+    Args:
+        info: Information created by ``create_nnabart_info``.
+        alignment (int): Alignment of offsets in the unit of sizes.
+
+    Returns:
+        tuple of arena size and dict of Variable index to offset.
+    '''
+    def align(x):
+        return (x + alignment - 1) // alignment * alignment
+
+    records = __make_buf_var_records(info, __make_buf_var_lives(info))
+    placed = []
+    vidx_to_offset = {}
+    arena_size = 0
+    for size, begin, end, vidx in records:
+        alive = sorted((o, s) for o, s, b, e in placed
+                       if b <= end and begin <= e)
+        offset = -1
+        best_gap = 0
+        prev_end = 0
+        for o, s in alive:
+            gap = o - prev_end
+            if gap >= size and (offset < 0 or gap < best_gap):
+                offset = prev_end
+                best_gap = gap
+            prev_end = max(prev_end, align(o + s))
+        if offset < 0:
+            offset = prev_end
+        placed.append((offset, size, begin, end))
+        vidx_to_offset[vidx] = offset
+        arena_size = max(arena_size, offset + size)
+    return arena_size, vidx_to_offset
+
+
 def save_variable_buffer(info):
     # make the followings to save memory usage for Variable Buffer:
     #  - actual_buf_sizes(list): sizes of actual buffers, which lie under Variable Buffer.
@@ -195,5 +277,45 @@ def save_variable_buffer(info):
     buf_var_refs = __make_buf_var_refs(info, buf_var_lives)
     vidx_to_abidx = __assign_actual_buf_to_variable(
         info, actual_buf_sizes, buf_var_refs)
-
-    return list(actual_buf_sizes), vidx_to_abidx
+    actual_buf_sizes = list(actual_buf_sizes)
+
+    # take the assignment by greedy by size if it is smaller
+    shared_buf_sizes, shared_vidx_to_abidx = __plan_shared_buffers(
+        __make_buf_var_records(info, buf_var_lives))
+    first_fit_size = sum(actual_buf_sizes)
+    if sum(shared_buf_sizes) < first_fit_size:
+        actual_buf_sizes = shared_buf_sizes
+        vidx_to_abidx = shared_vidx_to_abidx
+
+    arena_size, _ = plan_variable_arena(info)
+    logger.info('Variable buffers: {} in {} buffers (first fit: {}), '
+                '{} in an arena.'.format(sum(actual_buf_sizes),
+                                         len(actual_buf_sizes),
+                                         first_fit_size, arena_size))
+
+    return actual_buf_sizes, vidx_to_abidx
+
+
+def plan_variable_offsets(info):
+    '''Plan offsets of Buffer Variables in a single region.
+
+    The smaller of the arena by :func:`plan_variable_arena` and the buffers
+    by :func:`save_variable_buffer` laid out one after another is taken,
+    since neither is always smaller than the other.
+
+    Args:
+        info: Information created by ``create_nnabart_info``.
+
+    Returns:
+        tuple of region size and dict of Variable index to offset.
+    '''
+    arena_size, vidx_to_offset = plan_variable_arena(info)
+    actual_buf_sizes, vidx_to_abidx = save_variable_buffer(info)
+    buf_offsets = np.cumsum([0] + [int(s) for s in actual_buf_sizes])
+    buffers_size = int(buf_offsets[-1])
+    logger.info('Variable offsets: {} in an arena, {} in buffers.'.format(
+        arena_size, buffers_size))
+    if buffers_size < arena_size:
+        return buffers_size, {vidx: int(buf_offsets[abidx])
+                              for vidx, abidx in vidx_to_abidx.items()}
+    return arena_size, vidx_to_offset
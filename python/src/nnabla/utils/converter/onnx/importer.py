@@ -16,9 +16,12 @@
 from collections import OrderedDict
 from functools import partial
 from struct import pack, unpack
+import mmap
+import os
 import re
+import time
 
-import nnabla.logger as logger
+from nnabla.logger import logger
 import numpy as np
 from nnabla.utils import nnabla_pb2
 
@@ -456,65 +459,84 @@ def rearrange_pads(pads):
     return [j for i in zip(starts, ends) for j in i]
 
 
-def tensor_to_sequence(tensor):
-    """Convert given TensorProto to a Python sequence"""
-    if tensor.data_type == TensorProto.FLOAT:
-        # convert raw bytestream to floating points
-        if tensor.raw_data:
-            return np.fromstring(tensor.raw_data, dtype=np.float32)
-        elif len(tensor.float_data) > 0:
-            return tensor.float_data
-        else:
-            return np.array([], dtype=np.int32)
-    elif tensor.data_type == TensorProto.INT32:
-        # convert raw bytestream to integer
-        if tensor.raw_data:
-            return np.fromstring(tensor.raw_data, dtype=np.int32)
-        elif len(tensor.int32_data) > 0:
-            return tensor.int32_data
-        else:
-            return np.array([], dtype=np.int32)
-    elif tensor.data_type == TensorProto.INT64:
-        # convert raw bytestream to integer
-        if tensor.raw_data:
-            return np.fromstring(tensor.raw_data, dtype=np.int64)
-        elif len(tensor.int64_data) > 0:
-            return tensor.int64_data
-        else:
-            return np.array([], dtype=np.int64)
-    elif tensor.data_type == TensorProto.BOOL:
-        if tensor.raw_data:
-            return np.fromstring(tensor.raw_data, dtype=bool)
-        elif tensor.int32_data:
-            return tensor.int32_data
-        else:
-            return np.array([], dtype=bool)
-    elif tensor.data_type == TensorProto.INT8:
-        if tensor.raw_data:
-            return np.fromstring(tensor.raw_data, dtype=np.int8)
-        elif len(tensor.int32_data) > 0:
-            return tensor.int32_data
-        else:
-            return np.array([], dtype=np.int8)
-    elif tensor.data_type == TensorProto.UINT8:
-        if tensor.raw_data:
-            return np.fromstring(tensor.raw_data, dtype=np.uint8)
-        elif len(tensor.int32_data) > 0:
-            return tensor.int32_data
-        else:
-            return np.array([], dtype=np.uint8)
-    else:
+class ExternalData:
+    """Resolve external data of tensors by memory-mapping the files.
+
+    Locations are relative to ``base_dir``, the directory of the model.
+    Each file is mapped once and tensors are viewed from the mapping without
+    copy.
+    """
+
+    def __init__(self, base_dir):
+        self._base_dir = os.path.abspath(base_dir)
+        self._files = {}
+
+    def read(self, tensor, dtype):
+        info = {e.key: e.value for e in tensor.external_data}
+        if 'location' not in info:
+            raise ValueError(
+                "location of external data is not given for {}".format(tensor.name))
+        path = os.path.normpath(os.path.join(self._base_dir, info['location']))
+        if os.path.commonpath([self._base_dir, path]) != self._base_dir:
+            raise ValueError("External data of {} is outside of {}: {}".format(
+                tensor.name, self._base_dir, info['location']))
+        if path not in self._files:
+            if os.path.getsize(path) == 0:
+                self._files[path] = np.array([], dtype=np.uint8)
+            else:
+                self._files[path] = np.memmap(path, dtype=np.uint8, mode='r')
+        buf = self._files[path]
+        offset = int(info.get('offset', 0))
+        length = int(info['length']) if 'length' in info else len(buf) - offset
+        itemsize = np.dtype(dtype).itemsize
+        if offset < 0 or length < 0 or offset + length > len(buf) \
+                or length % itemsize != 0:
+            raise ValueError("Invalid external data for {}: offset {}, length {} in {}"
+                             .format(tensor.name, offset, length, path))
+        return np.frombuffer(buf, dtype=dtype, count=length // itemsize,
+                             offset=offset)
+
+
+def tensor_to_sequence(tensor, external_data=None):
+    """Convert given TensorProto to a Python sequence
+
+    raw_data and external data are viewed without copy. External data is
+    read by ``external_data``, an :obj:`ExternalData` of the model.
+    """
+    # numpy dtype of raw_data and the typed field of each data type
+    fields = {
+        TensorProto.FLOAT: (np.float32, 'float_data'),
+        TensorProto.INT32: (np.int32, 'int32_data'),
+        TensorProto.INT64: (np.int64, 'int64_data'),
+        TensorProto.BOOL: (bool, 'int32_data'),
+        TensorProto.INT8: (np.int8, 'int32_data'),
+        TensorProto.UINT8: (np.uint8, 'int32_data'),
+    }
+    if tensor.data_type not in fields:
         raise ValueError("Unsupported tensor data type for {}: {}"
                          .format(tensor.name, tensor.data_type))
+    dtype, field = fields[tensor.data_type]
+    if tensor.data_location == TensorProto.EXTERNAL:
+        if external_data is None:
+            raise ValueError("External data of {} cannot be resolved without the model file"
+                             .format(tensor.name))
+        return external_data.read(tensor, dtype)
+    if tensor.raw_data:
+        # convert raw bytestream without copy
+        return np.frombuffer(tensor.raw_data, dtype=dtype)
+    data = getattr(tensor, field)
+    if len(data) > 0:
+        return data
+    return np.array([], dtype=dtype)
 
 
-def add_tensor_as_parameter(pb, tensor):
+def add_tensor_as_parameter(pb, tensor, external_data=None):
     """Add given tensor as a parameter"""
     p = pb.parameter.add()
     p.variable_name = tensor.name
     shape = normalize_shape(tensor.dims)
     p.shape.dim.extend(shape)
-    p.data.extend(tensor_to_sequence(tensor))
+    p.data.extend(tensor_to_sequence(tensor, external_data))
     tensor_size = np.prod(tensor.dims)
     if tensor_size != 0 and len(p.data) == 0:
         data_type = TensorProto.DataType.keys()[tensor.data_type]
@@ -550,6 +572,11 @@ def create_parameter_variable(pb, name, shape, val):
 class OnnxImporter:
     def __init__(self, file_path=''):
         self._file_path = file_path
+        self._external_data = None  # ExternalData of the model file
+        # Whether the model was loaded from file_path and its tensors may be
+        # released once converted.
+        self._owns_model = False
+        self._stage_times = OrderedDict()  # Elapsed seconds of each stage
 
         # We use an OrderedDict and not a set
         # to preserve order
@@ -783,8 +810,15 @@ class OnnxImporter:
 
     def get_onnx_graph_info(self):
         model_proto = ModelProto()
-        with open(self._file_path, "rb") as f:
-            model_proto.ParseFromString(f.read())
+        # Parse from a mapping of the file instead of reading it into a copy.
+        # Tensors in external data files are mapped when converted.
+        with open(self._file_path, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            with memoryview(m) as buf:
+                model_proto.ParseFromString(buf)
+        self._external_data = ExternalData(
+            os.path.dirname(os.path.abspath(self._file_path)))
+        self._owns_model = True
         self._ir_version = model_proto.ir_version
         self._graph = model_proto.graph
         self._opset_import = model_proto.opset_import
@@ -850,7 +884,7 @@ class OnnxImporter:
                 continue
             attr = find_with_name(op.attribute, "value")
             assert attr is not None
-            data = tensor_to_sequence(attr.t)
+            data = tensor_to_sequence(attr.t, self._external_data)
             data_type = attr.t.data_type
             shape = attr.t.dims
 
@@ -858,7 +892,7 @@ class OnnxImporter:
         if data is None:
             init = find_with_name(self._graph.initializer, input_name)
             if init is not None:
-                data = tensor_to_sequence(init)
+                data = tensor_to_sequence(init, self._external_data)
                 data_type = init.data_type
                 shape = init.dims
 
@@ -2071,7 +2105,7 @@ class OnnxImporter:
                         "value attribute must be set for {}".format(n.op_type))
                 t.name = name
                 # add tensor as parameter
-                add_tensor_as_parameter(self._pb, t)
+                add_tensor_as_parameter(self._pb, t, self._external_data)
                 self._param_vars[t.name] = None
                 self._shape_output[name] = normalize_shape(t.dims)
             else:
@@ -2844,11 +2878,7 @@ class OnnxImporter:
                 if init.data_type != TensorProto.FLOAT:
                     raise ValueError(
                         "Only FLOAT is supported for {} in {} op_type".format(n.input[1], n.op_type))
-                if init.raw_data:
-                    scales.extend(np.fromstring(
-                        init.raw_data, dtype=np.float32))
-                elif init.float_data:
-                    scales.extend(init.float_data)
+                scales.extend(tensor_to_sequence(init, self._external_data))
         self._merged_inputs.append(n.input[1])
         del func.input[1]
         scales = [int(np.floor(i)) for i in scales]
@@ -3072,7 +3102,7 @@ class OnnxImporter:
     def ConstantOfShape(self, func_list, n):
         def get_value(tensor, typed_data):
             if tensor.raw_data:
-                return np.fromstring(tensor.raw_data, dtype=np.float32)[0]
+                return np.frombuffer(tensor.raw_data, dtype=np.float32)[0]
             else:
                 return typed_data[0]
 
@@ -4939,11 +4969,13 @@ class OnnxImporter:
         network.name = self._graph.name
 
         # convert nodes
+        start = time.perf_counter()
         for n in self._graph.node:
             self.check_domain(n.domain)
             fl = self.convert_to_functions(n)
 
             network.function.extend(fl)
+        self._stage_times['functions'] = time.perf_counter() - start
 
         # Gather all unique names for input and output
         for f in network.function:
@@ -4956,14 +4988,20 @@ class OnnxImporter:
                 self._all_vars[o] = None
 
         # convert parameters
+        start = time.perf_counter()
         for init in self._graph.initializer:
             if init.name in self._merged_inputs:
                 # Ignore any initializer that is already merged
                 # to a function node
                 continue
-            add_tensor_as_parameter(pb, init)
+            add_tensor_as_parameter(pb, init, self._external_data)
             # Keep the list of all initializer names
             self._param_vars[init.name] = None
+            if self._owns_model:
+                # The data is in the parameter now. Release it so that the
+                # model and the NNP do not hold two copies of all parameters.
+                init.ClearField('raw_data')
+        self._stage_times['parameters'] = time.perf_counter() - start
         # We need to distinguish constant parameters (which become 'Parameter' in NNabla)
         # from input/output variables (which become 'Buffer' in NNabla).
         # Constant parameters appear in the initializer list so we keep
@@ -5080,12 +5118,22 @@ class OnnxImporter:
         nnp.other_files = []
         return nnp
 
-    def import_from_onnx_model(self, onnx_model):
+    def import_from_onnx_model(self, onnx_model, base_dir=None):
+        # base_dir is the directory of external data files, if the model was
+        # loaded without them.
+        if base_dir is not None:
+            self._external_data = ExternalData(base_dir)
         self._ir_version = onnx_model.ir_version
         self._graph = onnx_model.graph
         self._opset_import = onnx_model.opset_import
 
     def execute(self):
+        self._stage_times = OrderedDict()
         if self._file_path != '':
+            start = time.perf_counter()
             self.get_onnx_graph_info()
-        return self.onnx_model_to_nnp_protobuf()
+            self._stage_times['load'] = time.perf_counter() - start
+        nnp = self.onnx_model_to_nnp_protobuf()
+        for stage, elapsed in self._stage_times.items():
+            logger.info("ONNX import {}: {:.3f} sec".format(stage, elapsed))
+        return nnp
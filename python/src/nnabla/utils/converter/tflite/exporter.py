@@ -96,7 +96,8 @@ class DataFormat(Enum):
 
 
 class TFLiteExporter:
-    def __init__(self, nnp, batch_size, channel_last=False, data_type="float32", quantization=None, dataset=None):
+    def __init__(self, nnp, batch_size, channel_last=False, data_type="float32", quantization=None, dataset=None,
+                 calibration_options=None):
         # check flatc installation
         try:
             subprocess.check_output([flatc_path, '--version'])
@@ -117,6 +118,7 @@ class TFLiteExporter:
         self.data_type = data_type
         self.quantization = quantization
         self.dataset = dataset
+        self.calibration_options = calibration_options or {}
         self.models = None
         self.operator_codes_list = []
         self.operators_list = []
@@ -2414,7 +2416,7 @@ class TFLiteExporter:
             from .quantized_converter import QuantizationConverter
             dataset = np.load(self.dataset)
             quantization_converter = QuantizationConverter(
-                self.models, output, dataset)
+                self.models, output, dataset, **self.calibration_options)
             quantized_model = quantization_converter.convert()
             quantized_model['subgraphs'][0]['outputs'] = self.backup_output
             self.export_to_tflite(quantized_model, output)
@@ -233,58 +233,66 @@ def check_opset(models):
 
 
 class QuantizationConverter(object):
-    def __init__(self, models, tflite, dataset):
+    def __init__(self, models, tflite, dataset, batch_size=32, num_threads=1,
+                 method='minmax', percentile=99.99):
         self.models = models
-        self.calibrator = Calibrator(tflite, dataset)
+        self.calibrator = Calibrator(tflite, dataset, batch_size=batch_size,
+                                     num_threads=num_threads, method=method,
+                                     percentile=percentile)
+        # Tensors are only appended during conversion, so index lookups go
+        # through the list directly, and the name map is built once.
+        self.tensors = self.models['subgraphs'][0]['tensors']
+        self.tensor_name_to_index = {tensor['name']: i
+                                     for i, tensor in enumerate(self.tensors)}
 
     def get_tensor_data_by_index(self, tensor_idx):
-        for i, tensor in enumerate(self.models['subgraphs'][0]['tensors']):
-            if i == tensor_idx:
-                if not tensor.get('type'):
-                    tensor['type'] = 'FLOAT32'
-                dtype = DTYPES.get(tensor['type'], np.float32)
-                buffer_idx = tensor['buffer']
-                data = self.models['buffers'][buffer_idx]['data']
-                data = bytearray(data)  # list to bytearray
-                data = np.frombuffer(data, dtype=dtype)  # bytearray to ndarray
-                data = np.reshape(data, tensor['shape'])
-                return data
+        tensor = self.tensors[tensor_idx]
+        if not tensor.get('type'):
+            tensor['type'] = 'FLOAT32'
+        dtype = DTYPES.get(tensor['type'], np.float32)
+        buffer_idx = tensor['buffer']
+        data = self.models['buffers'][buffer_idx]['data']
+        data = bytearray(data)  # list to bytearray
+        data = np.frombuffer(data, dtype=dtype)  # bytearray to ndarray
+        data = np.reshape(data, tensor['shape'])
+        return data
 
     def get_tensor_type_by_index(self, tensor_idx):
-        for i, tensor in enumerate(self.models['subgraphs'][0]['tensors']):
-            if i == tensor_idx:
-                buffer_idx = tensor['buffer']
-                data = self.models['buffers'][buffer_idx]
-                if bool(data):
-                    return 'Parameter'
-                else:
-                    return 'Buffer'
+        buffer_idx = self.tensors[tensor_idx]['buffer']
+        data = self.models['buffers'][buffer_idx]
+        if bool(data):
+            return 'Parameter'
+        else:
+            return 'Buffer'
 
     def get_tensor_by_index(self, tensor_idx):
-        for i, tensor in enumerate(self.models['subgraphs'][0]['tensors']):
-            if i == tensor_idx:
-                return tensor
+        return self.tensors[tensor_idx]
 
     def get_tensor_and_data_by_index(self, tensor_idx):
         return self.get_tensor_data_by_index(tensor_idx), self.get_tensor_by_index(tensor_idx)
 
     def set_tensor_data_by_index(self, tensor_idx, data):
-        for i, tensor in enumerate(self.models['subgraphs'][0]['tensors']):
-            if i == tensor_idx:
-                buffer_idx = tensor['buffer']
-                self.models['buffers'][buffer_idx]['data'] = data
+        buffer_idx = self.tensors[tensor_idx]['buffer']
+        self.models['buffers'][buffer_idx]['data'] = data
+
+    def append_tensor(self, tensor_info):
+        self.tensors.append(tensor_info)
+        self.tensor_name_to_index[tensor_info['name']] = len(self.tensors) - 1
+        return len(self.tensors) - 1
 
     def quantize_buffer(self):
         # Quantize buffer by calibrator
         quantization_param = self.calibrator.run()
         for buffer_name in quantization_param:
-            for tensor in self.models['subgraphs'][0]['tensors']:
-                if tensor['name'] == buffer_name:
-                    tensor['quantization'] = {'min': [quantization_param[buffer_name]['min']],
-                                              'max': [quantization_param[buffer_name]['max']],
-                                              'scale': [quantization_param[buffer_name]['scale']],
-                                              'zero_point': [int(quantization_param[buffer_name]['zero_point'])]}
-                    tensor['type'] = 'INT8'
+            tensor_idx = self.tensor_name_to_index.get(buffer_name)
+            if tensor_idx is None:
+                continue
+            tensor = self.tensors[tensor_idx]
+            tensor['quantization'] = {'min': [quantization_param[buffer_name]['min']],
+                                      'max': [quantization_param[buffer_name]['max']],
+                                      'scale': [quantization_param[buffer_name]['scale']],
+                                      'zero_point': [int(quantization_param[buffer_name]['zero_point'])]}
+            tensor['type'] = 'INT8'
         for op in self.models['subgraphs'][0]['operators']:
             opcode_index = op.get('opcode_index', 0)
             op_name = self.models['operator_codes'][opcode_index]['builtin_code']
@@ -350,12 +358,10 @@ class QuantizationConverter(object):
                                 'zero_point': [int(zero_point.tolist())]
                             }
                         }
-                        self.models['subgraphs'][0]['tensors'].append(
-                            tensor_info)
                         quantize_op = {
                             'opcode_index': len(self.models['operator_codes']) - 1,
                             'inputs': [input_idx],
-                            'outputs': [len(self.models['subgraphs'][0]['tensors']) - 1]
+                            'outputs': [self.append_tensor(tensor_info)]
                         }
                         for operator in self.models['subgraphs'][0]['operators']:
                             inps = operator['inputs']
@@ -477,57 +483,221 @@ class QuantizationConverter(object):
         return self.models
 
 
+class Histogram(object):
+    """
+    Histogram of values over the symmetric range [-limit, limit].
+    The range is doubled by merging neighbouring bins whenever a value out of
+    the range is added, so that it can be accumulated incrementally and merged
+    between calibration workers without keeping the collected values.
+    The limit is always a power of 2 so that any two histograms can be merged.
+    """
+
+    def __init__(self, num_bins=2048):
+        if num_bins % 4:
+            raise ValueError("num_bins must be a multiple of 4.")
+        self.num_bins = num_bins
+        self.limit = 0.0
+        self.counts = np.zeros(num_bins, dtype=np.int64)
+
+    def _expand(self, limit):
+        if self.limit == 0.0:
+            self.limit = 2.0 ** np.ceil(np.log2(limit))
+            return
+        n = self.num_bins
+        while self.limit < limit:
+            merged = self.counts.reshape(n // 2, 2).sum(axis=1)
+            self.counts = np.zeros(n, dtype=np.int64)
+            self.counts[n // 4: n // 4 + n // 2] = merged
+            self.limit *= 2
+
+    def add(self, data):
+        if data.size == 0:
+            return
+        abs_max = float(np.max(np.abs(data)))
+        if abs_max > self.limit:
+            self._expand(abs_max)
+        if self.limit == 0.0:
+            self.counts[self.num_bins // 2] += data.size
+            return
+        counts, _ = np.histogram(data, bins=self.num_bins,
+                                 range=(-self.limit, self.limit))
+        self.counts += counts
+
+    def merge(self, other):
+        if other.limit == 0.0:
+            self.counts[self.num_bins // 2] += other.counts.sum()
+            return
+        if other.limit > self.limit:
+            self._expand(other.limit)
+        counts = other.counts
+        limit = other.limit
+        n = self.num_bins
+        while limit < self.limit:
+            merged = counts.reshape(n // 2, 2).sum(axis=1)
+            counts = np.zeros(n, dtype=np.int64)
+            counts[n // 4: n // 4 + n // 2] = merged
+            limit *= 2
+        self.counts += counts
+
+    def percentile_range(self, percentile):
+        cdf = np.cumsum(self.counts)
+        total = cdf[-1]
+        edges = np.linspace(-self.limit, self.limit, self.num_bins + 1)
+        tail = total * (100.0 - percentile) / 200.0
+        lower = int(np.searchsorted(cdf, tail, side='right'))
+        upper = int(np.searchsorted(cdf, total - tail, side='left'))
+        return edges[min(lower, self.num_bins)], edges[min(upper + 1, self.num_bins)]
+
+
 class Calibrator(object):
-    def __init__(self, tflite, dataset):
+    def __init__(self, tflite, dataset, batch_size=32, num_threads=1, method='minmax', percentile=99.99):
         """
         :param tflite (str): tflite model file
         :param dataset (numpy.ndarray): represent dataset
+        :param batch_size (int): number of samples fed to the interpreter at once.
+            Falls back to 1 if the model can't be resized to this batch size.
+            Values are still reduced per sample, so it does not change the result.
+        :param num_threads (int): number of interpreter instances run in parallel
+        :param method (str): 'minmax' for moving average of min and max values,
+            'percentile' for clipping the range at the given percentile of the histogram
+        :param percentile (float): percentile used by 'percentile' method
         """
+        if method not in ('minmax', 'percentile'):
+            raise ValueError(
+                "Unsupported calibration method {}.".format(method))
+        self.tflite = tflite
         self.dataset = dataset
-        self.interpreter = tf.lite.Interpreter(tflite)
-        self.input_details = self.interpreter.get_input_details()
+        self.num_threads = max(1, num_threads)
+        self.method = method
+        self.percentile = percentile
+        interpreter = tf.lite.Interpreter(tflite)
+        self.input_details = interpreter.get_input_details()
         if len(self.input_details) > 1:
             raise ValueError(
                 "Currently, model more than 1 input is unsupported.")
-        self.output_details = self.interpreter.get_output_details()
-        self.interpreter.resize_tensor_input(
-            self.input_details[0]['index'], self.input_details[0]['shape'])
-        self.interpreter.allocate_tensors()
+        self.output_details = interpreter.get_output_details()
+        self.output_names = [d['name'] for d in self.output_details]
+        self.batch_size = self._check_batch_size(interpreter, batch_size)
         self.quantization_param = {}
+        for name in self.output_names:
+            self.quantization_param[name] = {}
+
+    def _resize(self, interpreter, batch_size):
+        input_shape = list(self.input_details[0]['shape'])
+        input_shape[0] = batch_size
+        interpreter.resize_tensor_input(
+            self.input_details[0]['index'], input_shape)
+        interpreter.allocate_tensors()
+
+    def _check_batch_size(self, interpreter, batch_size):
+        batch_size = max(1, min(batch_size, len(self.dataset)))
+        if batch_size == 1:
+            return 1
+        try:
+            self._resize(interpreter, batch_size)
+            interpreter.set_tensor(self.input_details[0]['index'],
+                                   self._prepare_batch(0, batch_size))
+            interpreter.invoke()
+        except (RuntimeError, ValueError):
+            # Models having batch size in constant tensors (e.g. RESHAPE)
+            # can't be resized.
+            return 1
+        # Values are reduced per sample, so every output must keep the batch
+        # as its first axis.
         for output_detail in self.output_details:
-            self.quantization_param[output_detail['name']] = {}
+            shape = interpreter.get_tensor(output_detail['index']).shape
+            if len(shape) == 0 or shape[0] != batch_size:
+                return 1
+        return batch_size
+
+    def _create_interpreter(self):
+        interpreter = tf.lite.Interpreter(self.tflite)
+        self._resize(interpreter, self.batch_size)
+        return interpreter
+
+    def _prepare_batch(self, start, stop):
+        input_data = np.asarray(self.dataset[start:stop], dtype=np.float32)
+        input_shape = self.input_details[0]['shape']
+        if tuple(input_shape[1:]) != input_data.shape[1:]:
+            input_data = np.transpose(input_data, (0, 2, 3, 1))
+        return input_data
+
+    def _calibrate_batches(self, starts, pbar):
+        # Returns per-sample (min, max) arrays of each output and batch for
+        # 'minmax' method, or histograms of each output for 'percentile'
+        # method.
+        interpreter = self._create_interpreter()
+        batch_size = self.batch_size
+        min_max = {}
+        histograms = {name: Histogram() for name in self.output_names}
+        for start in starts:
+            input_data = self._prepare_batch(start, start + batch_size)
+            if input_data.shape[0] != batch_size:
+                # The last batch
+                self._resize(interpreter, input_data.shape[0])
+                batch_size = input_data.shape[0]
+            interpreter.set_tensor(self.input_details[0]['index'], input_data)
+            interpreter.invoke()
+            for output_detail in self.output_details:
+                output_tensor = interpreter.get_tensor(output_detail['index'])
+                if self.method == 'minmax':
+                    samples = output_tensor.reshape(input_data.shape[0], -1)
+                    min_max[(start, output_detail['name'])] = (
+                        samples.min(axis=1), samples.max(axis=1))
+                else:
+                    histograms[output_detail['name']].add(output_tensor)
+            pbar.update(input_data.shape[0])
+        return min_max, histograms
+
+    def _moving_average_min_max(self, min_max, starts):
+        # Using exponential moving averages to smooth max value and min value
+        # Reference: https://arxiv.org/pdf/1712.05877.pdf
+        # The averages are taken over samples in dataset order regardless of
+        # the batch size and the number of threads, so that the result is
+        # the same as feeding samples one by one.
+        alpha = 0.1
+        for start in starts:
+            for name in self.output_names:
+                param = self.quantization_param[name]
+                for min_v, max_v in zip(*min_max[(start, name)]):
+                    if not param.get('max'):
+                        param['max'] = max_v
+                    if max_v > param['max']:
+                        param['max'] = alpha * max_v + \
+                            (1 - alpha) * param['max']
+                    if not param.get('min'):
+                        param['min'] = min_v
+                    if min_v < param['min']:
+                        param['min'] = alpha * min_v + \
+                            (1 - alpha) * param['min']
 
     def run(self):
         # Forward on represent dataset to collect max and min value of each buffer
-        alpha = 0.1
-        for input_data in tqdm.tqdm(self.dataset, desc="Calibrating..."):
-            input_data = np.array(input_data).astype(np.float32)
-            input_data = np.expand_dims(input_data, 0)
-            input_shape = self.input_details[0]['shape']
-            if not (input_shape == input_data.shape).all():
-                input_data = np.transpose(input_data, (0, 2, 3, 1))
-            self.interpreter.set_tensor(
-                self.input_details[0]['index'], input_data)
-            self.interpreter.invoke()
-
-            for output_detail in self.output_details:
-                output_tensor = self.interpreter.get_tensor(
-                    output_detail['index'])
-                if not self.quantization_param[output_detail['name']].get('max'):
-                    self.quantization_param[output_detail['name']
-                                            ]['max'] = output_tensor.max()
-                # Using exponential moving averages to smooth max value and min value
-                # Reference: https://arxiv.org/pdf/1712.05877.pdf
-                if output_tensor.max() > self.quantization_param[output_detail['name']]['max']:
-                    self.quantization_param[output_detail['name']]['max'] = alpha * output_tensor.max(
-                    ) + (1 - alpha) * self.quantization_param[output_detail['name']]['max']
-
-                if not self.quantization_param[output_detail['name']].get('min'):
-                    self.quantization_param[output_detail['name']
-                                            ]['min'] = output_tensor.min()
-                if output_tensor.min() < self.quantization_param[output_detail['name']]['min']:
-                    self.quantization_param[output_detail['name']]['min'] = alpha * output_tensor.min(
-                    ) + (1 - alpha) * self.quantization_param[output_detail['name']]['min']
+        starts = list(range(0, len(self.dataset), self.batch_size))
+        num_threads = min(self.num_threads, len(starts))
+        shards = [starts[i::num_threads] for i in range(num_threads)]
+        with tqdm.tqdm(total=len(self.dataset), desc="Calibrating...") as pbar:
+            if num_threads == 1:
+                results = [self._calibrate_batches(shards[0], pbar)]
+            else:
+                from concurrent.futures import ThreadPoolExecutor
+                with ThreadPoolExecutor(max_workers=num_threads) as executor:
+                    results = list(executor.map(
+                        lambda shard: self._calibrate_batches(shard, pbar), shards))
+
+        if self.method == 'minmax':
+            min_max = {}
+            for r, _ in results:
+                min_max.update(r)
+            self._moving_average_min_max(min_max, starts)
+        else:
+            for name in self.output_names:
+                histogram = results[0][1][name]
+                for _, h in results[1:]:
+                    histogram.merge(h[name])
+                min_v, max_v = histogram.percentile_range(self.percentile)
+                self.quantization_param[name]['min'] = np.float32(min_v)
+                self.quantization_param[name]['max'] = np.float32(max_v)
 
         for name in self.quantization_param:
             max_v = self.quantization_param[name]['max']
@@ -0,0 +1,274 @@
+# Copyright 2023 Sony Group Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''
+Compact index of rows of a dataset CSV file.
+'''
+
+import csv
+import os
+import threading
+from array import array
+from collections import deque
+
+import numpy
+from six import BytesIO
+
+from nnabla.logger import logger
+
+_INDEX_VERSION = 1
+
+# String columns having more unique values than this are not interned but
+# read from the file on demand.
+_MAX_INTERNED_VALUES = 1 << 16
+
+
+class _ColumnBuilder(object):
+    def __init__(self):
+        self.floats = array('d')
+        self.codes = array('i')
+        self.values = {}
+
+    def append(self, value):
+        if self.floats is not None:
+            try:
+                self.floats.append(float(value))
+            except ValueError:
+                self.floats = None
+        if self.codes is not None:
+            code = self.values.setdefault(value, len(self.values))
+            if len(self.values) > _MAX_INTERNED_VALUES:
+                self.codes = None
+                self.values = None
+            else:
+                self.codes.append(code)
+
+
+class CsvIndex(object):
+    '''CsvIndex
+
+    Index of the rows of a CSV file built in one streaming pass, which
+    serves each row without keeping all the rows in memory.
+
+    It stores the byte offset of each row in a NumPy array. A column whose
+    values are all numbers is stored as a float64 array, and a string
+    column having a small number of unique values is stored as interned
+    codes. The other columns are read by seeking to the row in the file.
+    Empty rows are skipped.
+
+    If ``index_filename`` is given, the index is saved to the file and
+    loaded from it later as long as the CSV file is not modified.
+
+    Args:
+        file (file object): Seekable binary file of the CSV. It is closed
+            by :meth:`close`.
+        index_filename (str): File name to save and load the index.
+        csv_filename (str): File name of the CSV used to check if the
+            saved index is up to date.
+        encoding (str): Encoding of the CSV.
+    '''
+
+    def __init__(self, file, index_filename=None, csv_filename=None,
+                 encoding='utf-8-sig'):
+        self._file = file
+        self._encoding = encoding
+        # BOM is only at the head of the file.
+        self._row_encoding = 'utf-8' if encoding == 'utf-8-sig' else encoding
+        self._lock = threading.Lock()
+
+        stamp = None
+        if index_filename is not None and csv_filename is not None:
+            st = os.stat(csv_filename)
+            stamp = numpy.array([_INDEX_VERSION, st.st_size, st.st_mtime_ns],
+                                dtype=numpy.int64)
+            if self._load(index_filename, stamp):
+                return
+        self._build()
+        if stamp is not None:
+            self._save(index_filename, stamp)
+
+    def _build(self):
+        self._file.seek(0)
+        header_line = self._file.readline()
+        self.header = next(csv.reader([header_line.decode(self._encoding)]))
+
+        offsets = array('q')
+        columns = [_ColumnBuilder() for _ in self.header]
+        line_offsets = deque()
+        state = {'pos': len(header_line)}
+
+        def lines():
+            for line in self._file:
+                line_offsets.append(state['pos'])
+                state['pos'] += len(line)
+                yield line.decode(self._row_encoding)
+
+        reader = csv.reader(lines())
+        consumed = 0
+        for row in reader:
+            # Offset of the first line of this row.
+            row_offset = line_offsets[0]
+            while consumed < reader.line_num:
+                line_offsets.popleft()
+                consumed += 1
+            if not row:
+                continue
+            offsets.append(row_offset)
+            for column, value in zip(columns, row):
+                column.append(value)
+            for column in columns[len(row):]:
+                column.append('')
+        offsets.append(state['pos'])
+
+        self._offsets = numpy.frombuffer(offsets, dtype=numpy.int64).copy()
+        self._floats = []
+        self._codes = []
+        self._values = []
+        for column in columns:
+            floats = codes = values = None
+            if column.floats is not None:
+                floats = numpy.frombuffer(
+                    column.floats, dtype=numpy.float64).copy()
+            elif column.codes is not None:
+                codes = numpy.frombuffer(
+                    column.codes, dtype=numpy.int32).copy()
+                values = [None] * len(column.values)
+                for value, code in column.values.items():
+                    values[code] = value
+            self._floats.append(floats)
+            self._codes.append(codes)
+            self._values.append(values)
+
+    def _save(self, index_filename, stamp):
+        arrays = {'stamp': stamp,
+                  'header': numpy.array(self.header, dtype=str),
+                  'offsets': self._offsets}
+        for i in range(len(self.header)):
+            if self._floats[i] is not None:
+                arrays['floats_{}'.format(i)] = self._floats[i]
+            elif self._codes[i] is not None:
+                arrays['codes_{}'.format(i)] = self._codes[i]
+                arrays['values_{}'.format(i)] = numpy.array(
+                    self._values[i], dtype=str)
+        # Written to a temporary file and renamed, so that an interrupted
+        # save does not leave a truncated index.
+        tmp_filename = '{}.{}.{}.tmp'.format(
+            index_filename, os.getpid(), threading.get_ident())
+        try:
+            with open(tmp_filename, 'wb') as f:
+                numpy.savez(f, **arrays)
+            os.replace(tmp_filename, index_filename)
+        except OSError as e:
+            logger.info('Could not save CSV index {} ({}).'.format(
+                index_filename, e))
+            if os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
+
+    def _load(self, index_filename, stamp):
+        if not os.path.exists(index_filename):
+            return False
+        try:
+            with numpy.load(index_filename, allow_pickle=False) as f:
+                if not numpy.array_equal(f['stamp'], stamp):
+                    return False
+                self.header = [str(h) for h in f['header']]
+                self._offsets = f['offsets']
+                self._floats = []
+                self._codes = []
+                self._values = []
+                for i in range(len(self.header)):
+                    floats = codes = values = None
+                    if 'floats_{}'.format(i) in f:
+                        floats = f['floats_{}'.format(i)]
+                    elif 'codes_{}'.format(i) in f:
+                        codes = f['codes_{}'.format(i)]
+                        values = [str(v) for v in f['values_{}'.format(i)]]
+                    self._floats.append(floats)
+                    self._codes.append(codes)
+                    self._values.append(values)
+        except Exception as e:
+            logger.info('Could not load CSV index {} ({}).'.format(
+                index_filename, e))
+            return False
+        logger.info('CSV index loaded from {}.'.format(index_filename))
+        return True
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def row(self, position):
+        '''Strings of the row at position as they are in the file.'''
+        begin = int(self._offsets[position])
+        end = int(self._offsets[position + 1])
+        with self._lock:
+            self._file.seek(begin)
+            data = self._file.read(end - begin)
+        row = next(csv.reader([data.decode(self._row_encoding)]))
+        return row + [''] * (len(self.header) - len(row))
+
+    def values(self, position, columns=None):
+        '''Values of the row at position.
+
+        Numeric columns are given as float, and the other columns as str.
+
+        Args:
+            position (int): Row index.
+            columns (list of int): Column indices. All columns if None.
+        '''
+        if columns is None:
+            columns = range(len(self.header))
+        row = None
+        result = []
+        for i in columns:
+            if self._floats[i] is not None:
+                result.append(float(self._floats[i][position]))
+            elif self._codes[i] is not None:
+                result.append(self._values[i][self._codes[i][position]])
+            else:
+                if row is None:
+                    row = self.row(position)
+                result.append(row[i])
+        return result
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def open_csv_index(filename):
+    '''Open :class:`CsvIndex` of a local or remote CSV file.
+
+    The index of a local CSV file is saved as ``<filename>.index.npz``.
+    A remote CSV file is read through the local disk cache of
+    :class:`~nnabla.utils.data_source_loader.FileReader`, or kept in
+    memory if the disk cache is disabled.
+
+    Args:
+        filename (str): File name or URI of the CSV.
+
+    Returns:
+        :class:`CsvIndex`
+    '''
+    from nnabla.utils.data_source_loader import FileReader
+    filereader = FileReader(filename)
+    path = filereader.local_path()
+    if path is not None:
+        return CsvIndex(open(path, 'rb'), index_filename=path + '.index.npz',
+                        csv_filename=path)
+    f = filereader.open_cached()
+    if f is None:
+        with filereader.open() as f:
+            return CsvIndex(BytesIO(f.read()))
+    return CsvIndex(f)
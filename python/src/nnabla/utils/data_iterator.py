@@ -34,6 +34,7 @@ from .data_source import SlicedDataSource
 from .data_source_implements import CacheDataSource
 from .data_source_implements import ConcatDataSource
 from .data_source_implements import CsvDataSource
+from .data_source_implements import MixtureDataSource
 from .data_source_implements import SimpleDataSource
 
 
@@ -744,7 +745,11 @@ def data_iterator_concat_datasets(data_source_list,
                                   cache_dir=None,
                                   epoch_begin_callbacks=[],
                                   epoch_end_callbacks=[],
-                                  stop_exhausted=False):
+                                  stop_exhausted=False,
+                                  weights=None,
+                                  epoch_size=None,
+                                  source_shuffle=None,
+                                  state=None):
     '''data_iterator_concat_datasets
     Get data from multiple datasets.
 
@@ -754,6 +759,16 @@ def data_iterator_concat_datasets(data_source_list,
 
         batch = data_iterator_concat_datasets([DataSource0, DataSource1, ...], batch_size)
 
+    If any of ``weights``, ``epoch_size`` and ``state`` is given, samples are
+    drawn by :py:class:`.data_source_implements.MixtureDataSource` instead of
+    concatenating the datasets. ``with_memory_cache`` is ignored in this case
+    since the samples differ from epoch to epoch.
+
+    .. code-block:: python
+
+        batch = data_iterator_concat_datasets([DataSource0, DataSource1], batch_size,
+                                              weights=[0.8, 0.2], epoch_size='max')
+
     Args:
         data_source_list (list of DataSource): list of datasets.
         batch_size (int): Size of data unit.
@@ -792,15 +807,35 @@ def data_iterator_concat_datasets(data_source_list,
         stop_exhausted (bool): If ``stop_exhausted`` is set to False, iterator will be reset
             so that iteration can be continued. If ``stop_exhausted`` is set to True, iterator
             will raise StopIteration to stop the loop.
+        weights (list of float): Sampling weight of each dataset.
+            If None, weights are proportional to the size of the datasets.
+        epoch_size (int or str): Number of samples in an epoch, or one of
+            ``'sum'``, ``'max'`` and ``'min'``.
+            See :py:class:`.data_source_implements.MixtureDataSource`.
+            Default is ``'sum'``.
+        source_shuffle (bool or list of bool): Whether the samples of each
+            dataset are shuffled. If None, ``shuffle`` of each dataset is used.
+        state (dict): State to resume from, given by
+            :py:meth:`.data_source_implements.MixtureDataSource.get_state`.
 
 
     Returns:
         :py:class:`DataIterator <nnabla.utils.data_iterator.DataIterator>`:
             Instance of DataIterator
     '''
-    ds = ConcatDataSource(data_source_list,
-                          shuffle=shuffle,
-                          rng=rng)
+    if weights is None and epoch_size is None and state is None:
+        ds = ConcatDataSource(data_source_list,
+                              shuffle=shuffle,
+                              rng=rng)
+    else:
+        ds = MixtureDataSource(data_source_list,
+                               weights=weights,
+                               epoch_size='sum' if epoch_size is None else epoch_size,
+                               shuffle=shuffle,
+                               rng=rng,
+                               source_shuffle=source_shuffle,
+                               state=state)
+        with_memory_cache = False
     return data_iterator(ds,
                          use_thread=use_thread,
                          batch_size=batch_size,
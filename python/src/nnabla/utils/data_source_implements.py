@@ -18,6 +18,7 @@
 
 
 import atexit
+import bisect
 import csv
 import os
 import threading
@@ -30,6 +31,7 @@ from nnabla.logger import logger
 from nnabla.utils.communicator_util import current_communicator
 from six.moves import queue
 
+from .csv_index import open_csv_index
 from .data_source import DataSource
 from .data_source_loader import FileReader, load
 
@@ -260,6 +262,12 @@ class CacheDataSource(DataSource):
             if self._cache_type == ".npy" and self._num_of_threads > 0:
                 file_names_to_prefetch = [o[0] for o in self._order[position + self._max_length:position + self._max_length *
                                                                     self._num_of_threads:self._max_length]]
+            elif self._num_of_threads > 0:
+                # Remote h5 files are downloaded into local disk cache
+                # in background.
+                self._filereader.prefetch_cache(
+                    [o[0] for o in self._order[position + self._max_length:position + self._max_length *
+                                               self._num_of_threads:self._max_length]])
 
             self._current_data = self._get_next_data(
                 filename, file_names_to_prefetch)
@@ -280,7 +288,7 @@ class CacheDataSource(DataSource):
 
     def initialize_cache_files(self, filename):
         length = -1
-        with self._filereader.open_cache(filename) as cache:
+        with self._filereader.open_cache(filename, partial=True) as cache:
 
             # Check variables.
             if self._variables is None:
@@ -316,7 +324,7 @@ class CacheDataSource(DataSource):
                     if length > self._max_length:
                         self._max_length = length
                     if self._variables is None:
-                        with self._filereader.open_cache(file_name) as cache:
+                        with self._filereader.open_cache(file_name, partial=True) as cache:
                             # Check variables.
                             self._variables = list(cache.keys())
         except:
@@ -404,6 +412,12 @@ class CacheDataSource(DataSource):
 
 class CsvDataSource(DataSource):
     '''
+    Get data from a dataset CSV file.
+
+    Rows are served from a :class:`~nnabla.utils.csv_index.CsvIndex`
+    instead of being kept in memory. The index of a local CSV file is saved
+    as ``<CSV file name>.index.npz`` next to it, so that it is built only
+    once.
     '''
 
     def _remove_comment_cols(self, header, rows):
@@ -470,35 +484,38 @@ class CsvDataSource(DataSource):
         return value
 
     def _get_data(self, position):
-        return tuple(self._process_row(self._rows[self._order[position]]))
+        return tuple(self._process_row(self._index.values(
+            self._order[position], self._columns_to_use)))
 
     def __init__(self, filename, shuffle=False, rng=None, normalize=False):
         super(CsvDataSource, self).__init__(shuffle=shuffle, rng=rng)
         self._filename = filename
         self._normalize = normalize
 
-        # Store contents of CSV file into the self._rows list.
         self._generation = -1
-        self._rows = []
         self._filereader = FileReader(self._filename)
-        with self._filereader.open(textmode=True, encoding='utf-8-sig') as f:
-            csvreader = csv.reader(f)
-            header = next(csvreader)
-            self._rows = list(csvreader)
-            self._size = len(self._rows)
-            self._remove_comment_cols(header, self._rows)
-            self._process_header(header)
+        self._index = open_csv_index(self._filename)
+        header = self._index.header
+        self._columns_to_use = [i for i, h in enumerate(header)
+                                if not h.startswith('#')]
+        self._size = len(self._index)
+        self._process_header([header[i] for i in self._columns_to_use])
         self._original_source_uri = self._filename
-        self._original_order = list(range(self._size))
-        self._order = list(range(self._size))
+        self._original_order = numpy.arange(self._size)
+        self._order = numpy.arange(self._size)
         self._variables = tuple(self._variables_dict.keys())
         self.reset()
 
+    def close(self):
+        if getattr(self, '_index', None) is not None:
+            self._index.close()
+            self._index = None
+        super(CsvDataSource, self).close()
+
     def reset(self):
         if self._shuffle:
             logger.debug('Shuffle start.')
-            self._order = list(
-                self._rng.permutation(list(range(self._size))))
+            self._order = self._rng.permutation(self._size)
             logger.debug('Shuffle end.')
         self._generation += 1
         super(CsvDataSource, self).reset()
@@ -515,22 +532,20 @@ class ConcatDataSource(DataSource):
         super(ConcatDataSource, self).__init__(shuffle=shuffle, rng=rng)
         self._data_sources = data_source_list
 
-        self._sw_points = list(map(
-            lambda s: sum(
-                [x.size for x in data_source_list[:data_source_list.index(s) + 1]]),
-            data_source_list))  # Switching DataSource index
+        # Switching DataSource index
+        self._sw_points = numpy.cumsum([x.size for x in data_source_list])
 
-        self._size = self._sw_points[-1]
+        self._size = int(self._sw_points[-1])
         self._variables = data_source_list[0].variables
         self.reset()
 
     def _get_data(self, position):
         idx = self._indexes[position]
-        for i, data_bound in enumerate(self._sw_points):
-            if idx < data_bound:
-                _idx = idx - self._sw_points[i - 1] if i > 0 else idx
-                return self._data_sources[i]._get_data(_idx)
-        return None
+        i = bisect.bisect_right(self._sw_points, idx)
+        if i >= len(self._data_sources):
+            return None
+        _idx = idx - self._sw_points[i - 1] if i > 0 else idx
+        return self._data_sources[i]._get_data(_idx)
 
     def reset(self):
         # reset method initialize self._indexes
@@ -539,3 +554,179 @@ class ConcatDataSource(DataSource):
         else:
             self._indexes = numpy.arange(self._size)
         super(ConcatDataSource, self).reset()
+
+
+class MixtureDataSource(DataSource):
+    '''MixtureDataSource
+
+    Wrapper DataSource which samples from multiple DataSources with
+    per-source weights.
+
+    Each epoch contains ``epoch_size`` samples, and the number of samples
+    taken from each source in an epoch is proportional to its weight. The
+    samples of a source are taken in its own order, which continues across
+    epochs of the mixture and is shuffled every time the source is
+    exhausted if the source is shuffled. Each order is derived from a seed
+    drawn from ``rng``, the epoch index and the position only, so that the
+    iteration can be resumed from a state given by :meth:`get_state`.
+
+    Args:
+        data_source_list (list of DataSource): Sources of the samples.
+        weights (list of float): Sampling weight of each source. If None,
+            weights are proportional to the size of the sources.
+        epoch_size (int or str): Number of samples in an epoch.
+            ``'sum'`` is the sum of the sizes of the sources, ``'max'`` is
+            the number needed to take every sample of every source, and
+            ``'min'`` is the number needed to take every sample of any
+            source. Default is ``'sum'``.
+        shuffle (bool): Whether the sources are interleaved at random.
+            Otherwise the sources are interleaved evenly.
+        rng (None or :obj:`numpy.random.RandomState`): Numpy random number
+            generator.
+        source_shuffle (bool or list of bool): Whether the samples of each
+            source are shuffled. If None, ``shuffle`` of each source is used.
+        state (dict): State to resume from, given by :meth:`get_state`.
+    '''
+
+    def __init__(self, data_source_list, weights=None, epoch_size='sum',
+                 shuffle=True, rng=None, source_shuffle=None, state=None):
+        super(MixtureDataSource, self).__init__(shuffle=shuffle, rng=rng)
+        self._data_sources = data_source_list
+        self._source_sizes = numpy.array([x.size for x in data_source_list],
+                                         dtype=numpy.int64)
+        if weights is None:
+            weights = self._source_sizes
+        weights = numpy.array(weights, dtype=numpy.float64)
+        if len(weights) != len(data_source_list):
+            raise ValueError('Number of weights ({}) must be the same as '
+                             'number of data sources ({}).'.format(
+                                 len(weights), len(data_source_list)))
+        if (weights < 0).any() or not weights.sum() > 0:
+            raise ValueError('Weights must be non-negative and have '
+                             'a positive sum.')
+        if ((weights > 0) & (self._source_sizes == 0)).any():
+            raise ValueError('Empty data source must have zero weight.')
+        self._weights = weights / weights.sum()
+
+        if source_shuffle is None:
+            source_shuffle = [x.shuffle for x in data_source_list]
+        elif isinstance(source_shuffle, bool):
+            source_shuffle = [source_shuffle] * len(data_source_list)
+        self._source_shuffle = list(source_shuffle)
+
+        self._size = self._epoch_size(epoch_size)
+        self._counts = self._source_counts()
+        self._variables = data_source_list[0].variables
+        self._seed = int(self._rng.randint(numpy.iinfo(numpy.int32).max))
+        self._epoch = 0
+        self._source_orders = [(None, None)] * len(data_source_list)
+        self._resume_position = None
+        self._generate_epoch_order()
+        if state is not None:
+            self.set_state(state)
+
+    def _epoch_size(self, epoch_size):
+        if epoch_size == 'sum':
+            return int(self._source_sizes.sum())
+        used = self._weights > 0
+        epochs = self._source_sizes[used] / self._weights[used]
+        if epoch_size == 'max':
+            return int(numpy.ceil(epochs.max()))
+        if epoch_size == 'min':
+            return int(numpy.ceil(epochs.min()))
+        epoch_size = int(epoch_size)
+        if epoch_size <= 0:
+            raise ValueError('epoch_size must be positive.')
+        return epoch_size
+
+    def _source_counts(self):
+        # Largest remainder allocation, so that the counts sum up to the
+        # epoch size.
+        raw = self._weights * self._size
+        counts = numpy.floor(raw).astype(numpy.int64)
+        rest = self._size - int(counts.sum())
+        if rest > 0:
+            counts[numpy.argsort(counts - raw, kind='stable')[:rest]] += 1
+        return counts
+
+    def _generate_epoch_order(self):
+        sources = numpy.repeat(numpy.arange(len(self._counts)), self._counts)
+        if self._shuffle:
+            rng = numpy.random.RandomState([self._seed, 0, self._epoch])
+            order = rng.permutation(self._size)
+        else:
+            # Spread the samples of each source evenly over the epoch.
+            times = numpy.concatenate([(numpy.arange(c) + 0.5) / c
+                                       for c in self._counts if c > 0])
+            order = numpy.argsort(times, kind='stable')
+        self._sources = sources[order]
+        # Rank of each sample among the samples of the same source.
+        self._ranks = numpy.empty(self._size, dtype=numpy.int64)
+        self._ranks[numpy.argsort(self._sources, kind='stable')] = \
+            numpy.concatenate([numpy.arange(c) for c in self._counts])
+
+    def _source_order(self, source, source_epoch):
+        epoch, order = self._source_orders[source]
+        if epoch != source_epoch:
+            size = int(self._source_sizes[source])
+            if self._source_shuffle[source]:
+                rng = numpy.random.RandomState(
+                    [self._seed, source + 1, source_epoch])
+                order = rng.permutation(size)
+            else:
+                order = numpy.arange(size)
+            self._source_orders[source] = (source_epoch, order)
+        return order
+
+    def _get_data(self, position):
+        self._resume_position = None
+        source = int(self._sources[position])
+        # Number of samples taken from the source before this one.
+        taken = self._epoch * int(self._counts[source]) + \
+            int(self._ranks[position])
+        source_epoch, index = divmod(taken,
+                                     int(self._source_sizes[source]))
+        order = self._source_order(source, source_epoch)
+        return self._data_sources[source]._get_data(int(order[index]))
+
+    @property
+    def epoch(self):
+        '''Index of the current epoch.'''
+        return self._epoch
+
+    def get_state(self):
+        '''State of the iteration.
+
+        Returns:
+            dict: ``epoch`` and ``position`` of the next sample, and ``seed``
+            of the orders.
+        '''
+        return {'epoch': self._epoch, 'position': self._position,
+                'seed': self._seed}
+
+    def set_state(self, state):
+        '''Resume the iteration from the state given by :meth:`get_state`.
+
+        The position is kept by the next :meth:`reset` so that the state
+        can be set before the source is passed to an iterator.
+
+        Args:
+            state (dict): ``epoch`` and ``position`` of the next sample, and
+                ``seed`` of the orders.
+        '''
+        if 'seed' in state:
+            self._seed = int(state['seed'])
+            self._source_orders = [(None, None)] * len(self._data_sources)
+        epoch, position = divmod(int(state['position']), self._size)
+        self._epoch = int(state['epoch']) + epoch
+        self._position = position
+        self._resume_position = position
+        self._generate_epoch_order()
+
+    def reset(self):
+        if self._position >= self._size:
+            self._epoch += 1
+            self._generate_epoch_order()
+        super(MixtureDataSource, self).reset()
+        if self._resume_position is not None:
+            self._position = self._resume_position
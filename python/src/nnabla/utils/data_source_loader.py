@@ -22,6 +22,12 @@ from __future__ import absolute_import
 
 import contextlib
 import csv
+import hashlib
+import io
+import socket
+import sys
+import threading
+import time
 # TODO temporary work around to suppress FutureWarning message.
 import warnings
 
@@ -36,14 +42,14 @@ import h5py
 import numpy
 import scipy.io.wavfile
 import os
-import urllib.request as request
 import six
-import tempfile
 import binascii
-from shutil import rmtree
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from nnabla.utils.image_utils import imresize, imread
 from nnabla.utils.audio_utils import auresize, auread
+from nnabla.config import nnabla_config
 from nnabla.logger import logger
 
 
@@ -64,6 +70,358 @@ with warnings.catch_warnings():
     warnings.simplefilter('default', RuntimeWarning)
 
 
+class _HTTPError(IOError):
+    def __init__(self, method, uri, status):
+        super(_HTTPError, self).__init__(
+            'HTTP {} {}: {}'.format(method, uri, status))
+        self.status = status
+
+
+def _is_transient_error(e):
+    '''Whether the error may be resolved by retrying, i.e. a connection
+    error, a timeout, a server error or too many requests.'''
+    status = getattr(e, 'status', None)
+    response = getattr(e, 'response', None)
+    if status is None and isinstance(response, dict):
+        # botocore.exceptions.ClientError
+        status = response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+    if status is not None:
+        return status >= 500 or status == 429
+    if isinstance(e, (ConnectionError, TimeoutError, socket.timeout)):
+        return True
+    # The modules are loaded if they can raise the errors.
+    urllib3 = sys.modules.get('urllib3')
+    if urllib3 is not None and isinstance(e, urllib3.exceptions.HTTPError):
+        return True
+    botocore = sys.modules.get('botocore.exceptions')
+    if botocore is not None and isinstance(
+            e, (botocore.ConnectionError, botocore.HTTPClientError)):
+        return True
+    return False
+
+
+def _retry(func, name, max_retry=10):
+    '''Call func() retrying transient errors with exponential backoff.'''
+    wait = 0.1
+    for retry in range(1, max_retry + 1):
+        try:
+            return func()
+        except Exception as e:
+            if not _is_transient_error(e):
+                raise
+            if retry == max_retry:
+                logger.log(99, '{}() retry count over give up.'.format(name))
+                raise
+            logger.log(
+                99, '{}() fails retrying count {}/{}.'.format(name, retry, max_retry))
+            time.sleep(wait)
+            wait = min(wait * 2, 5.0)
+
+
+def _split_s3_uri(uri):
+    uri_header, uri_body = uri.split('://', 1)
+    us = uri_body.split('/')
+    bucketname = us.pop(0)
+    return bucketname, '/'.join(us)
+
+
+class _RemoteFileCache(object):
+    '''Size bounded local disk cache of remote files.
+
+    A file is cached for a version of the remote object, e.g. its size, ETag
+    and modification time, so that a changed object is downloaded again.
+    Files are evicted in least recently used order when the total size
+    exceeds ``max_size`` bytes. Files left by a previous process in the
+    same directory are reused.
+    '''
+
+    def __init__(self, directory, max_size):
+        self._directory = directory
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._downloading = {}
+        self._entries = OrderedDict()
+        self._total_size = 0
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        names = [n for n in os.listdir(directory) if not n.endswith('.tmp')]
+        paths = [os.path.join(directory, n) for n in names]
+        for n, p in sorted(zip(names, paths), key=lambda x: os.path.getmtime(x[1])):
+            size = os.path.getsize(p)
+            self._entries[n] = size
+            self._total_size += size
+        self._evict()
+
+    def _name(self, uri, version):
+        ext = os.path.splitext(uri)[1].lower()
+        key = '{}\n{}'.format(uri, version)
+        return hashlib.sha1(key.encode('utf-8')).hexdigest() + ext
+
+    def _evict(self):
+        while self._total_size > self._max_size and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self._total_size -= size
+            try:
+                os.remove(os.path.join(self._directory, name))
+            except OSError:
+                pass
+
+    def _open_entry(self, name):
+        # Called with the lock held. The file is opened before the lock is
+        # released, so that eviction by another thread does not remove it
+        # under the caller. A file removed by another process sharing the
+        # directory is downloaded again.
+        try:
+            f = open(os.path.join(self._directory, name), 'rb')
+        except (IOError, OSError):
+            self._total_size -= self._entries.pop(name)
+            return None
+        self._entries.move_to_end(name)
+        return f
+
+    def open(self, uri, version, fetch):
+        '''Open the local copy of the version of uri in binary mode, calling
+        fetch() to get the contents if it is not cached yet.'''
+        name = self._name(uri, version)
+        path = os.path.join(self._directory, name)
+        while True:
+            with self._lock:
+                if name in self._entries:
+                    f = self._open_entry(name)
+                    if f is not None:
+                        return f
+                event = self._downloading.get(name)
+                if event is None:
+                    event = self._downloading[name] = threading.Event()
+                    break
+            # Another thread is downloading the same file.
+            event.wait()
+        try:
+            data = fetch()
+            tmp_path = '{}.{}.{}.tmp'.format(
+                path, os.getpid(), threading.get_ident())
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            with self._lock:
+                f = open(path, 'rb')
+                self._entries[name] = len(data)
+                self._total_size += len(data)
+                self._evict()
+        finally:
+            with self._lock:
+                del self._downloading[name]
+            event.set()
+        return f
+
+    def contains(self, uri, version):
+        with self._lock:
+            return self._name(uri, version) in self._entries
+
+
+class _RangedFile(io.RawIOBase):
+    '''Read only file like object fetching blocks of a remote file on
+    demand by ranged reads. Recently read blocks are kept in memory.'''
+
+    def __init__(self, size, read_range, block_size=1 << 20, num_blocks=16):
+        self._size = size
+        self._read_range = read_range
+        self._block_size = block_size
+        self._num_blocks = num_blocks
+        self._blocks = OrderedDict()
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = self._size + offset
+        else:
+            raise ValueError('Invalid whence ({})'.format(whence))
+        return self._pos
+
+    def _block(self, index):
+        block = self._blocks.get(index)
+        if block is None:
+            begin = index * self._block_size
+            end = min(begin + self._block_size, self._size)
+            block = self._read_range(begin, end)
+            self._blocks[index] = block
+            if len(self._blocks) > self._num_blocks:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(index)
+        return block
+
+    def readinto(self, b):
+        view = memoryview(b).cast('B')
+        length = min(len(view), max(self._size - self._pos, 0))
+        done = 0
+        while done < length:
+            index, offset = divmod(self._pos, self._block_size)
+            block = self._block(index)
+            n = min(length - done, len(block) - offset)
+            view[done:done + n] = block[offset:offset + n]
+            done += n
+            self._pos += n
+        return done
+
+
+class _RemoteStore(object):
+    '''Process wide access to S3 and HTTP/HTTPS objects shared by all
+    FileReader instances.
+
+    It keeps a connection pool for each protocol, a thread pool to prefetch
+    objects concurrently, and a local disk cache which keeps downloaded
+    objects across epochs. The pool size and the disk cache are configured
+    by ``remote_num_of_connections``, ``remote_cache_location`` and
+    ``remote_cache_max_size`` in ``[DATA_ITERATOR]`` of nnabla config.
+    '''
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get(cls):
+        with cls._instance_lock:
+            # Clients and threads are not inherited by forked processes.
+            if cls._instance is None or cls._instance._pid != os.getpid():
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._num_connections = int(nnabla_config.get(
+            'DATA_ITERATOR', 'remote_num_of_connections'))
+        self._s3_client = None
+        self._http_pool = None
+        self._executor = None
+        cache_size = int(nnabla_config.get(
+            'DATA_ITERATOR', 'remote_cache_max_size'))
+        self._cache = None
+        if cache_size > 0:
+            cache_dir = nnabla_config.get(
+                'DATA_ITERATOR', 'remote_cache_location')
+            if not cache_dir:
+                cache_dir = os.path.join(get_data_home(), 'remote_cache')
+            self._cache = _RemoteFileCache(cache_dir, cache_size)
+
+    def s3_client(self):
+        with self._lock:
+            if self._s3_client is None:
+                import boto3
+                from botocore.config import Config
+                logger.info('Creating session for S3')
+                self._s3_client = boto3.session.Session().client(
+                    's3', config=Config(max_pool_connections=self._num_connections))
+            return self._s3_client
+
+    def http_pool(self):
+        with self._lock:
+            if self._http_pool is None:
+                import certifi
+                import urllib3
+                self._http_pool = urllib3.PoolManager(
+                    maxsize=self._num_connections, block=True,
+                    cert_reqs='CERT_REQUIRED', ca_certs=certifi.where())
+            return self._http_pool
+
+    def _http_request(self, method, uri, headers=None):
+        r = self.http_pool().request(method, uri, headers=headers)
+        if r.status >= 400:
+            raise _HTTPError(method, uri, r.status)
+        return r
+
+    def read(self, uri, begin=None, end=None):
+        '''Contents of uri, or its byte range [begin, end) if given.'''
+        if begin is not None and begin >= end:
+            return b''
+        if uri[0:5].lower() == 's3://':
+            bucketname, key = _split_s3_uri(uri)
+
+            def read():
+                kwargs = {}
+                if begin is not None:
+                    kwargs['Range'] = 'bytes={}-{}'.format(begin, end - 1)
+                return self.s3_client().get_object(
+                    Bucket=bucketname, Key=key, **kwargs)['Body'].read()
+            return _retry(read, 'read_s3_object')
+
+        def read():
+            headers = None
+            if begin is not None:
+                headers = {'Range': 'bytes={}-{}'.format(begin, end - 1)}
+            data = self._http_request('GET', uri, headers).data
+            if begin is not None and len(data) > end - begin:
+                # The server ignored the range.
+                data = data[begin:end]
+            return data
+        return _retry(read, 'read_http_object')
+
+    def stat(self, uri):
+        '''Size of uri and its version identifying the contents.'''
+        if uri[0:5].lower() == 's3://':
+            bucketname, key = _split_s3_uri(uri)
+            r = _retry(lambda: self.s3_client().head_object(
+                Bucket=bucketname, Key=key), 'head_s3_object')
+            size = int(r['ContentLength'])
+            version = (size, r.get('ETag'), str(r.get('LastModified')))
+        else:
+            headers = _retry(lambda: self._http_request(
+                'HEAD', uri).headers, 'head_http_object')
+            size = int(headers['Content-Length'])
+            version = (size, headers.get('ETag'), headers.get('Last-Modified'))
+        return size, '{}:{}:{}'.format(*version)
+
+    def open_cached(self, uri, stat=None):
+        '''Open the local cached copy of uri in binary mode, or return None
+        if the disk cache is disabled. The copy is validated by ``stat``, or
+        by :meth:`stat` if not given.'''
+        if self._cache is None:
+            return None
+        version = (stat or self.stat(uri))[1]
+        return self._cache.open(uri, version, lambda: self.read(uri))
+
+    def is_cached(self, uri, stat):
+        return self._cache is not None and self._cache.contains(uri, stat[1])
+
+    def open_ranged(self, uri, stat):
+        return io.BufferedReader(_RangedFile(
+            stat[0], lambda begin, end: self.read(uri, begin, end)))
+
+    def _prefetch(self, uri):
+        try:
+            stat = self.stat(uri)
+            if not self._cache.contains(uri, stat[1]):
+                self.open_cached(uri, stat).close()
+        except Exception as e:
+            # The file is downloaded again when it is opened.
+            logger.warning('Failed to prefetch {}: {}'.format(uri, e))
+
+    def prefetch(self, uris):
+        '''Download uris into the disk cache in background.'''
+        if self._cache is None:
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._num_connections)
+        for uri in uris:
+            self._executor.submit(self._prefetch, uri)
+
+
 class FileReader:
     '''FileReader
 
@@ -74,10 +432,15 @@ class FileReader:
     * HTTP/HTTPS (URI)
     * S3         (URI with s3:// prefix)
 
-    Currently HTTP/HTTPS source does not support CACHE input because
+    Currently HTTP/HTTPS source does not support listdir() because
     there is no standard way to get directory entry with
     HTTP/HTTPS/protocol.
 
+    Remote files are read through connections pooled by all FileReader
+    instances. If ``remote_cache_max_size`` is set, they are also kept in a
+    size bounded local disk cache so that unchanged files are downloaded only
+    once across epochs. See ``remote_*`` entries of ``[DATA_ITERATOR]`` in
+    nnabla config.
 
     To access S3 data, you must specify credentials with environment
     variable.
@@ -101,63 +464,51 @@ class FileReader:
         self.base_ext = os.path.splitext(self._base_uri)[1].lower()
         if base_uri[0:5].lower() == 's3://':
             self._file_type = 's3'
-            uri_header, uri_body = self._base_uri.split('://', 1)
-            us = uri_body.split('/')
-            bucketname = us.pop(0)
-            self._s3_base_key = '/'.join(us)
-            logger.info('Creating session for S3 bucket {}'.format(bucketname))
-
-            import boto3
-            self._s3_bucket = boto3.session.Session().resource('s3').Bucket(bucketname)
-
+            self._s3_bucketname, self._s3_base_key = _split_s3_uri(
+                self._base_uri)
         elif base_uri[0:7].lower() == 'http://' or base_uri[0:8].lower() == 'https://':
             self._file_type = 'http'
         else:
             self._file_type = 'file'
 
     def read_s3_object(self, key):
-        retry = 1
-        result = ''
-        while True:
-            if retry > 10:
-                logger.log(99, 'read_s3_object() retry count over give up.')
-                raise
-            try:
-                result = self._s3_bucket.Object(key).get()['Body'].read()
-                break
-            except:
-                logger.log(
-                    99, 'read_s3_object() fails retrying count {}/10.'.format(retry))
-                retry += 1
+        return _RemoteStore.get().read('s3://{}/{}'.format(self._s3_bucketname, key))
+
+    def _resolve(self, filename):
+        if filename is None:
+            return self._base_uri
+        if self._file_type == 's3':
+            return urljoin(self._base_uri.replace(
+                's3://', 'http://'), filename.replace('\\', '/')).replace('http://', 's3://')
+        elif self._file_type == 'http':
+            return urljoin(self._base_uri, filename.replace('\\', '/'))
+        return os.path.abspath(os.path.join(os.path.dirname(
+            self._base_uri.replace('\\', '/')), filename.replace('\\', '/')))
 
-        return result
+    def _resolve_cache(self, cache_name):
+        if self._file_type == 's3':
+            return urljoin((self._base_uri + '/').replace('s3://', 'http://'),
+                           cache_name.replace('\\', '/')).replace('http://', 's3://')
+        elif self._file_type == 'http':
+            return urljoin(self._base_uri + '/', cache_name.replace('\\', '/'))
+        return os.path.abspath(os.path.join(os.path.dirname(
+            (self._base_uri + '/').replace('\\', '/')), cache_name.replace('\\', '/')))
 
     @contextlib.contextmanager
     def open(self, filename=None, textmode=False, encoding='utf-8-sig'):
-        if filename is None:
-            filename = self._base_uri
-        else:
-            if self._file_type == 's3':
-                filename = urljoin(self._base_uri.replace(
-                    's3://', 'http://'), filename.replace('\\', '/')).replace('http://', 's3://')
-            elif self._file_type == 'http':
-                filename = urljoin(self._base_uri, filename.replace('\\', '/'))
-            else:
-                filename = os.path.abspath(os.path.join(os.path.dirname(
-                    self._base_uri.replace('\\', '/')), filename.replace('\\', '/')))
+        filename = self._resolve(filename)
         f = None
-        if self._file_type == 's3':
-            uri_header, uri_body = filename.split('://', 1)
-            us = uri_body.split('/')
-            bucketname = us.pop(0)
-            key = '/'.join(us)
-            logger.info('Opening {}'.format(key))
-            if textmode:
-                f = StringIO(self.read_s3_object(key).decode(encoding))
+        if self._file_type != 'file':
+            logger.info('Opening {}'.format(filename))
+            store = _RemoteStore.get()
+            f = store.open_cached(filename)
+            if f is not None:
+                if textmode:
+                    f = io.TextIOWrapper(f, encoding=encoding)
+            elif textmode:
+                f = StringIO(store.read(filename).decode(encoding))
             else:
-                f = BytesIO(self.read_s3_object(key))
-        elif self._file_type == 'http':
-            f = request.urlopen(filename)
+                f = BytesIO(store.read(filename))
         else:
             if textmode:
                 f = open(filename, 'rt', encoding=encoding)
@@ -167,32 +518,70 @@ class FileReader:
         yield f
         f.close()
 
+    def local_path(self, filename=None):
+        '''Path of the local file, or None if the file is remote.'''
+        if self._file_type != 'file':
+            return None
+        return self._resolve(filename)
+
+    def open_cached(self, filename=None):
+        '''Open the local disk cache of the remote file in binary mode. None
+        if the file is local or the disk cache is disabled. The caller closes
+        the returned file.'''
+        if self._file_type == 'file':
+            return None
+        return _RemoteStore.get().open_cached(self._resolve(filename))
+
     @contextlib.contextmanager
-    def open_cache(self, cache_name):
-        if self._file_type == 's3':
-            tmpdir = tempfile.mkdtemp()
-            filename = urljoin((self._base_uri + '/').replace('s3://', 'http://'),
-                               cache_name.replace('\\', '/')).replace('http://', 's3://')
-            key = '/'.join(filename.split('/')[3:])
-            fn = '{}/{}'.format(tmpdir, os.path.basename(filename))
-            with open(fn, 'wb') as f:
-                f.write(self.read_s3_object(key))
-            with h5py.File(fn, 'r') as h5:
-                yield h5
-            rmtree(tmpdir, ignore_errors=True)
-        elif self._file_type == 'http':
-            pass
-        else:
-            filename = os.path.abspath(os.path.join(os.path.dirname(
-                (self._base_uri + '/').replace('\\', '/')), cache_name.replace('\\', '/')))
-            with h5py.File(filename, 'r') as h5:
+    def open_cache(self, cache_name, partial=False):
+        '''Open h5 cache file.
+
+        Args:
+            cache_name (str): Name of the cache file.
+            partial (bool): If True, a remote cache file which is not in the
+                local disk cache is accessed by ranged reads instead of
+                downloading whole of it. Use it to read a small part of the
+                file such as its keys and lengths.
+        '''
+        filename = self._resolve_cache(cache_name)
+        if self._file_type != 'file':
+            store = _RemoteStore.get()
+            stat = store.stat(filename)
+            if partial and not store.is_cached(filename, stat):
+                with store.open_ranged(filename, stat) as f:
+                    with h5py.File(f, 'r') as h5:
+                        yield h5
+                return
+            f = store.open_cached(filename, stat)
+            if f is None:
+                f = BytesIO(store.read(filename))
+            with f, h5py.File(f, 'r') as h5:
                 yield h5
+            return
+        with h5py.File(filename, 'r') as h5:
+            yield h5
+
+    def prefetch(self, filenames):
+        '''Start downloading remote files into the local disk cache.'''
+        if self._file_type == 'file':
+            return
+        _RemoteStore.get().prefetch([self._resolve(fn) for fn in filenames])
+
+    def prefetch_cache(self, cache_names):
+        '''Start downloading remote cache files into the local disk cache.'''
+        if self._file_type == 'file':
+            return
+        _RemoteStore.get().prefetch([self._resolve_cache(fn)
+                                     for fn in cache_names])
 
     def listdir(self):
         if self._file_type == 's3':
             list = []
-            for fn in self._s3_bucket.objects.filter(Prefix=self._s3_base_key + '/', Delimiter='/'):
-                list.append(os.path.basename(fn.key))
+            paginator = _RemoteStore.get().s3_client().get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=self._s3_bucketname,
+                                           Prefix=self._s3_base_key + '/', Delimiter='/'):
+                for obj in page.get('Contents', []):
+                    list.append(os.path.basename(obj['Key']))
             return sorted(list)
         elif self._file_type == 'http':
             return None
@@ -281,59 +670,86 @@ class ResourceFileReader:
             self.handler.seek(0)
 
 
-def load_image_imread(file, shape=None, max_range=1.0):
+def load_image_chw(file, shape=None, out=None, reduce_on_decode=False):
     '''
-    Load image from file like object.
+    Load image from file like object without normalization.
 
     :param file: Image contents
     :type file: file like object.
     :param shape: shape of output array
         e.g. (3, 128, 192) : n_color, height, width.
     :type shape: tuple of int
+    :param out: If given, the image is written into this array (e.g. a
+        slice of a uint8 batch buffer) and it is returned.
+    :type out: numpy.ndarray
+    :param bool reduce_on_decode: If True and shape is given, the image is
+        decoded at the lowest resolution not smaller than it when the image
+        format allows (e.g. JPEG DCT scaling), and then resized to it. It is
+        faster, but pixel values slightly differ from the full decoding.
+
+    :return: numpy array of (n_color, height, width). Its dtype is uint8,
+        or uint16 for some 16-bit images.
+
+    '''
+    size = None if shape is None else (shape[2], shape[1])
+    img = imread(file, size=size, channel_first=True,
+                 reduce_on_decode=reduce_on_decode)
+    if len(img.shape) == 2:  # gray image
+        img = img[numpy.newaxis]
+    if shape is not None:
+        assert (img.shape[0] == shape[0])
+    if out is None:
+        return img
+    numpy.copyto(out, img)
+    return out
+
+
+def normalize_image(img, max_range=1.0, out=None):
+    '''
+    Scale pixel values of an image or a batch of images loaded by
+    :func:`load_image_chw` from [0, 255] ([0, 65535] for uint16) to
+    [0, max_range].
+
+    Normalizing a whole batch at once is faster than normalizing each
+    image on loading.
+
+    :param img: Image or images.
+    :type img: numpy.ndarray
     :param float max_range: the value of return array ranges from 0 to `max_range`.
+        If negative, img is returned as is.
+    :param out: If given, the result is written into this array.
+    :type out: numpy.ndarray
 
     :return: numpy array
 
     '''
-    orig_img = imread(
-        file)  # return value is from zero to 255 (even if the image has 16-bitdepth.)
+    if max_range < 0:
+        return img
+    # 16bit depth, or 8bit depth (default)
+    full_range = 65535.0 if img.dtype == numpy.uint16 else 255.0
+    if max_range == full_range:
+        if out is None:
+            return img
+        numpy.copyto(out, img)
+        return out
+    return numpy.multiply(img, max_range / full_range, out=out)
 
-    if len(orig_img.shape) == 2:  # gray image
-        height, width = orig_img.shape
-        if shape is None:
-            out_height, out_width, out_n_color = height, width, 1
-        else:
-            out_n_color, out_height, out_width = shape
-        assert (out_n_color == 1)
-        if out_height != height or out_width != width:
-            # imresize returns 0 to 255 image.
-            orig_img = imresize(orig_img, (out_height, out_width))
-        orig_img = orig_img.reshape((out_n_color, out_height, out_width))
-    elif len(orig_img.shape) == 3:  # RGB image
-        height, width, n_color = orig_img.shape
-        if shape is None:
-            out_height, out_width, out_n_color = height, width, n_color
-        else:
-            out_n_color, out_height, out_width = shape
-        assert (out_n_color == n_color)
-        if out_height != height or out_width != width or out_n_color != n_color:
-            # imresize returns 0 to 255 image.
-            orig_img = imresize(orig_img, (out_height, out_width, out_n_color))
-        orig_img = orig_img.transpose(2, 0, 1)
 
-    if max_range < 0:
-        return orig_img
-    else:
-        # 16bit depth
-        if orig_img.dtype == 'uint16':
-            if max_range == 65535.0:
-                return orig_img
-            return orig_img * (max_range / 65535.0)
-        # 8bit depth (default)
-        else:
-            if max_range == 255.0:
-                return orig_img
-            return orig_img * (max_range / 255.0)
+def load_image_imread(file, shape=None, max_range=1.0):
+    '''
+    Load image from file like object.
+
+    :param file: Image contents
+    :type file: file like object.
+    :param shape: shape of output array
+        e.g. (3, 128, 192) : n_color, height, width.
+    :type shape: tuple of int
+    :param float max_range: the value of return array ranges from 0 to `max_range`.
+
+    :return: numpy array
+
+    '''
+    return normalize_image(load_image_chw(file, shape), max_range)
 
 
 def load_image(file, shape=None, normalize=False):
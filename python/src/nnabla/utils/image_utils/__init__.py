@@ -78,7 +78,7 @@ def minmax_auto_scale(img, as_uint16):
 
 
 def imread(path, grayscale=False, size=None, interpolate="bilinear",
-           channel_first=False, as_uint16=False, num_channels=-1, **kwargs):
+           channel_first=False, as_uint16=False, num_channels=-1, reduce_on_decode=False, **kwargs):
     """
     Read image from ``path``.
     If you specify the ``size``, the output array is resized.
@@ -99,6 +99,12 @@ def imread(path, grayscale=False, size=None, interpolate="bilinear",
         as_uint16 (bool): If True, this function tries to read img as np.uint16. Default is False.
         num_channels (int): channel size of output array.
             Default is -1 which preserves raw image shape.
+        reduce_on_decode (bool):
+            If True and ``size`` is given, JPEG image is decoded at the lowest resolution of 1/2, 1/4 or 1/8
+            which is not smaller than ``size`` (by draft mode of pil backend or IMREAD_REDUCED_* of cv2 backend),
+            and then resized to ``size``. It is much faster and uses less memory for large images,
+            but the result slightly differs from resizing a fully decoded image.
+            Default is False.
         return_palette_indices (bool):
             This argument can be used only by pil backend.
             On pil backend, if this flag is True and PIL.Image has the mode "P",
@@ -114,7 +120,7 @@ def imread(path, grayscale=False, size=None, interpolate="bilinear",
     best_backend = backend_manager.get_best_backend(path, "load")
     return best_backend.imread(path, grayscale=grayscale, size=size, interpolate=interpolate,
                                channel_first=channel_first, as_uint16=as_uint16, num_channels=num_channels,
-                               **kwargs)
+                               reduce_on_decode=reduce_on_decode, **kwargs)
 
 
 def imsave(path, img, channel_first=False, as_uint16=False, auto_scale=True, **kwargs):
@@ -91,6 +91,41 @@ def check_type_and_cast_if_necessary(img, as_uint16):
     return img
 
 
+def _jpeg_info(data):
+    # Get (width, height, number of components) from the SOF marker of JPEG
+    # data, or None if data is not a JPEG image.
+    if data[:2] != b'\xff\xd8':
+        return None
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:  # fill byte
+            pos += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:  # no payload
+            pos += 2
+            continue
+        if 0xC0 <= marker <= 0xCF and marker not in [0xC4, 0xC8, 0xCC]:
+            if pos + 10 > len(data):
+                return None
+            height = (data[pos + 5] << 8) | data[pos + 6]
+            width = (data[pos + 7] << 8) | data[pos + 8]
+            return width, height, data[pos + 9]
+        pos += 2 + ((data[pos + 2] << 8) | data[pos + 3])
+    return None
+
+
+def _reduction_factor(width, height, size):
+    # The largest JPEG DCT scaling factor keeping the image not smaller
+    # than size (width, height).
+    for factor in [8, 4, 2]:
+        if -(-width // factor) >= size[0] and -(-height // factor) >= size[1]:
+            return factor
+    return 1
+
+
 def _imread_before(grayscale, num_channels):
     # pre-process for imread. check arguments.
     if num_channels not in [-1, 0, 1, 3, 4]:
@@ -20,7 +20,8 @@ import numpy as np
 from nnabla.logger import logger
 
 from .common import upscale_pixel_intensity, check_type_and_cast_if_necessary, \
-    _imread_before, _imread_after, _imsave_before, _imresize_before, _imresize_after
+    _imread_before, _imread_after, _imsave_before, _imresize_before, _imresize_after, \
+    _jpeg_info, _reduction_factor
 from .image_utils_backend import ImageUtilsBackend
 
 
@@ -32,6 +33,15 @@ class Cv2Backend(ImageUtilsBackend):
         "lanczos": cv2.INTER_LANCZOS4,
     }
 
+    _reduced_modes = {
+        (1, 2): cv2.IMREAD_REDUCED_GRAYSCALE_2,
+        (1, 4): cv2.IMREAD_REDUCED_GRAYSCALE_4,
+        (1, 8): cv2.IMREAD_REDUCED_GRAYSCALE_8,
+        (3, 2): cv2.IMREAD_REDUCED_COLOR_2,
+        (3, 4): cv2.IMREAD_REDUCED_COLOR_4,
+        (3, 8): cv2.IMREAD_REDUCED_COLOR_8,
+    }
+
     def __init__(self):
         ImageUtilsBackend.__init__(self)
 
@@ -44,6 +54,31 @@ class Cv2Backend(ImageUtilsBackend):
 
         return img
 
+    @staticmethod
+    def _imread_reduced_helper(path, grayscale, size):
+        # Decode JPEG at the lowest resolution not smaller than size by DCT
+        # scaling. It returns None if the image can not be decoded so.
+        if hasattr(path, "read"):
+            data = path.read()
+        else:
+            with open(path, "rb") as f:
+                data = f.read()
+        info = _jpeg_info(data)
+        if info is not None:
+            width, height, components = info
+            factor = _reduction_factor(width, height, size)
+            if grayscale and components == 3:
+                components = 1
+            r_mode = Cv2Backend._reduced_modes.get((components, factor))
+            if r_mode is not None:
+                if not grayscale:
+                    # IMREAD_REDUCED_* modes apply the EXIF orientation, but
+                    # IMREAD_UNCHANGED used without reduction does not.
+                    r_mode |= cv2.IMREAD_IGNORE_ORIENTATION
+                return cv2.imdecode(np.frombuffer(data, np.uint8), r_mode)
+        r_mode = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_UNCHANGED
+        return cv2.imdecode(np.frombuffer(data, np.uint8), r_mode)
+
     @staticmethod
     def convert_channel_from_gray(img, num_channels):
         if num_channels in [-1, 0]:
@@ -120,7 +155,7 @@ class Cv2Backend(ImageUtilsBackend):
                 return "NG"
 
     def imread(self, path, grayscale=False, size=None, interpolate="bilinear",
-               channel_first=False, as_uint16=False, num_channels=-1):
+               channel_first=False, as_uint16=False, num_channels=-1, reduce_on_decode=False):
         """
         Read image by cv2 module.
 
@@ -140,6 +175,9 @@ class Cv2Backend(ImageUtilsBackend):
             num_channels (int):
                 channel size of output array.
                 Default is -1 which preserves raw image shape.
+            reduce_on_decode (bool):
+                If True and ``size`` is given, JPEG image is decoded at the lowest resolution of 1/2, 1/4 or 1/8
+                which is not smaller than ``size`` by IMREAD_REDUCED_* modes, and then resized to ``size``.
 
         Returns:
             numpy.ndarray
@@ -147,8 +185,11 @@ class Cv2Backend(ImageUtilsBackend):
 
         _imread_before(grayscale, num_channels)
 
-        r_mode = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_UNCHANGED
-        img = self._imread_helper(path, r_mode)
+        if reduce_on_decode and size is not None and not as_uint16:
+            img = self._imread_reduced_helper(path, grayscale, size)
+        else:
+            r_mode = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_UNCHANGED
+            img = self._imread_helper(path, r_mode)
 
         if as_uint16 and img.dtype != np.uint16:
             if img.dtype == np.uint8:
@@ -88,7 +88,8 @@ class DicomBackend(ImageUtilsBackend):
                 return "NG"
 
     def imread(self, path, grayscale=False, size=None, interpolate="bilinear",
-               channel_first=False, as_uint16=False, num_channels=-1, return_palette_indices=False):
+               channel_first=False, as_uint16=False, num_channels=-1, return_palette_indices=False,
+               reduce_on_decode=False):
         """
         Read image by DICOM module.
         Notice that PIL only supports uint8 for RGB (not uint16).
@@ -116,6 +117,8 @@ class DicomBackend(ImageUtilsBackend):
                 If this flag is True and read Image has the mode "P",
                 then this function returns 2-D array containing the indices into palette.
                 We recommend that this flag should be False unless you intend to use the raw palette indices.
+            reduce_on_decode (bool):
+                This argument is ignored in DICOM backend.
 
         Returns:
             numpy.ndarray
@@ -33,12 +33,12 @@ class ImageUtilsBackend(object):
         return "NG"
 
     def imread(self, path, grayscale=False, size=None, interpolate="bilinear",
-               channel_first=False, as_uint16=False, num_channels=-1):
+               channel_first=False, as_uint16=False, num_channels=-1, reduce_on_decode=False):
         backend = self.get_best_backend(path, 'load')
         if backend is None:
             raise ValueError("No available backend to load image.")
         return backend.imread(path, grayscale, size, interpolate, channel_first,
-                              as_uint16, num_channels)
+                              as_uint16, num_channels, reduce_on_decode=reduce_on_decode)
 
     def imsave(self, path, img, channel_first=False, as_uint16=False, auto_scale=True):
         backend = self.get_best_backend(path, 'save')
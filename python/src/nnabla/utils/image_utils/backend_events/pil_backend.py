@@ -101,7 +101,8 @@ class PilBackend(ImageUtilsBackend):
                 return "NG"
 
     def imread(self, path, grayscale=False, size=None, interpolate="bilinear",
-               channel_first=False, as_uint16=False, num_channels=-1, return_palette_indices=False):
+               channel_first=False, as_uint16=False, num_channels=-1, return_palette_indices=False,
+               reduce_on_decode=False):
         """
         Read image by PIL module.
         Notice that PIL only supports uint8 for RGB (not uint16).
@@ -129,6 +130,9 @@ class PilBackend(ImageUtilsBackend):
                 If this flag is True and read Image has the mode "P",
                 then this function returns 2-D array containing the indices into palette.
                 We recommend that this flag should be False unless you intend to use the raw palette indices.
+            reduce_on_decode (bool):
+                If True and ``size`` is given, JPEG image is decoded at the lowest resolution of 1/2, 1/4 or 1/8
+                which is not smaller than ``size`` by draft mode of pillow, and then resized to ``size``.
 
         Returns:
             numpy.ndarray
@@ -146,6 +150,10 @@ class PilBackend(ImageUtilsBackend):
 
         pil_img = Image.open(path, mode="r")
 
+        if reduce_on_decode and size is not None and pil_img.format == "JPEG":
+            # DCT scaling, decoding only the required resolution.
+            pil_img.draft("L" if grayscale else None, tuple(size))
+
         try:
             img = self.pil_image_to_ndarray(
                 pil_img, grayscale, num_channels, return_palette_indices)
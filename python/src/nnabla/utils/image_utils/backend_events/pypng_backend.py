@@ -101,7 +101,7 @@ class PngBackend(ImageUtilsBackend):
                 return "NG"
 
     def imread(self, path, grayscale=False, size=None, interpolate="bilinear",
-               channel_first=False, as_uint16=False, num_channels=-1):
+               channel_first=False, as_uint16=False, num_channels=-1, reduce_on_decode=False):
         """
         Read image by pypng module.
 
@@ -121,6 +121,8 @@ class PngBackend(ImageUtilsBackend):
             num_channels (int):
                 channel size of output array.
                 Default is -1 which preserves raw image shape.
+            reduce_on_decode (bool):
+                This argument is ignored because PNG can not be decoded at a reduced resolution.
 
         Returns:
             numpy.ndarray
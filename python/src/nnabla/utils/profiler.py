@@ -38,6 +38,228 @@ def convert_time_scale(sec, format="m"):
     return sec * converter[format]
 
 
+FunctionCost = namedtuple("FunctionCost", ["flops", "bytes_read", "bytes_written"])
+
+RooflineStat = namedtuple("RooflineStat", ["parameter_scope", "function_name", "inputs_shape",
+                                           "flops", "bytes", "mean_time", "gflops_per_sec",
+                                           "arithmetic_intensity", "bound"])
+
+
+def _prod(shape):
+    n = 1
+    for s in shape:
+        n *= s
+    return n
+
+
+# Analytical FLOPs per output element of elementwise/activation functions.
+# Functions which do not appear here and have no dedicated cost function are
+# counted as 1 FLOP per output element if they are listed in
+# ``_ELEMENTWISE_FUNCTIONS``, and as 0 FLOP (data movement only) otherwise.
+_ELEMENTWISE_FLOPS = {
+    "Sigmoid": 4, "Tanh": 5, "Swish": 5, "GELU": 8, "Mish": 8, "ELU": 3,
+    "SELU": 4, "CELU": 4, "SoftPlus": 3, "SoftSign": 2, "LogSigmoid": 4,
+    "TanhShrink": 6, "HardSigmoid": 3, "HardTanh": 2, "ReLU6": 2,
+    "LeakyReLU": 2, "PReLU": 2, "Exp": 1, "Log": 1, "Pow2": 1,
+    "PowScalar": 1, "RPowScalar": 1, "Sinc": 3, "Erf": 1,
+}
+
+_ELEMENTWISE_FUNCTIONS = set(_ELEMENTWISE_FLOPS.keys()) | {
+    "ReLU", "Abs", "Sign", "Add2", "BcAdd2", "Sub2", "Mul2", "Div2",
+    "Minimum2", "Maximum2", "AddScalar", "MulScalar", "RSubScalar",
+    "RDivScalar", "MinimumScalar", "MaximumScalar", "Round", "Ceil", "Floor",
+    "Sin", "Cos", "Tan", "Sinh", "Cosh", "ASin", "ACos", "ATan", "ATan2",
+    "ASinh", "ACosh", "ATanh", "Mod2", "Where",
+}
+
+# FLOPs per element of normalization functions (mean, variance, normalize,
+# scale and shift).
+_NORMALIZATION_FLOPS = {
+    "BatchNormalization": 8, "FusedBatchNormalization": 9,
+    "SyncBatchNormalization": 8, "LayerNormalization": 8,
+    "InstanceNormalization": 8, "GroupNormalization": 8,
+    "TensorNormalization": 8, "NormNormalization": 4,
+    "WeightStandardization": 8, "MeanSubtraction": 2,
+}
+
+
+def _convolution_flops(inputs_shape, outputs_shape, args):
+    # Each output element is a dot product over (C / group) * prod(kernel),
+    # which is exactly prod(W.shape[1:]) for any channel_last setting.
+    y = _prod(outputs_shape[0])
+    flops = 2 * y * _prod(inputs_shape[1][1:])
+    if len(inputs_shape) > 2:
+        flops += y
+    return flops
+
+
+def _deconvolution_flops(inputs_shape, outputs_shape, args):
+    # Every input element is scattered to (OC / group) * prod(kernel) outputs.
+    flops = 2 * _prod(inputs_shape[0]) * _prod(inputs_shape[1][1:])
+    if len(inputs_shape) > 2:
+        flops += _prod(outputs_shape[0])
+    return flops
+
+
+def _affine_flops(inputs_shape, outputs_shape, args):
+    y = _prod(outputs_shape[0])
+    w = inputs_shape[1]
+    base_axis = args.get("base_axis", 1)
+    n_outmaps = _prod(outputs_shape[0][base_axis:])
+    flops = 2 * y * (_prod(w) // max(n_outmaps, 1))
+    if len(inputs_shape) > 2:
+        flops += y
+    return flops
+
+
+def _batch_matmul_flops(inputs_shape, outputs_shape, args):
+    a = inputs_shape[0]
+    k = a[-2] if args.get("transpose_a", False) else a[-1]
+    return 2 * _prod(outputs_shape[0]) * k
+
+
+def _pooling_flops(inputs_shape, outputs_shape, args):
+    return _prod(outputs_shape[0]) * _prod(args.get("kernel", (1,)))
+
+
+def _global_pooling_flops(inputs_shape, outputs_shape, args):
+    return _prod(inputs_shape[0])
+
+
+def _normalization_flops(name):
+    def cost(inputs_shape, outputs_shape, args):
+        return _NORMALIZATION_FLOPS[name] * _prod(inputs_shape[0])
+    return cost
+
+
+def _elementwise_flops(name):
+    def cost(inputs_shape, outputs_shape, args):
+        return _ELEMENTWISE_FLOPS.get(name, 1) * _prod(outputs_shape[0])
+    return cost
+
+
+def _reduction_flops(inputs_shape, outputs_shape, args):
+    return _prod(inputs_shape[0])
+
+
+def _softmax_flops(inputs_shape, outputs_shape, args):
+    # max, subtract, exp, sum and divide.
+    return 5 * _prod(inputs_shape[0])
+
+
+_FLOPS_FUNCTIONS = {
+    "Convolution": _convolution_flops,
+    "FusedConvolution": _convolution_flops,
+    "DepthwiseConvolution": _convolution_flops,
+    "BinaryConnectConvolution": _convolution_flops,
+    "BinaryWeightConvolution": _convolution_flops,
+    "INQConvolution": _convolution_flops,
+    "Deconvolution": _deconvolution_flops,
+    "DepthwiseDeconvolution": _deconvolution_flops,
+    "Affine": _affine_flops,
+    "BinaryConnectAffine": _affine_flops,
+    "BinaryWeightAffine": _affine_flops,
+    "INQAffine": _affine_flops,
+    "BatchMatmul": _batch_matmul_flops,
+    "MaxPooling": _pooling_flops,
+    "AveragePooling": _pooling_flops,
+    "SumPooling": _pooling_flops,
+    "GlobalAveragePooling": _global_pooling_flops,
+    "Softmax": _softmax_flops,
+    "LogSoftmax": _softmax_flops,
+    "Sum": _reduction_flops,
+    "Mean": _reduction_flops,
+    "Max": _reduction_flops,
+    "Min": _reduction_flops,
+    "Prod": _reduction_flops,
+    "AddN": _reduction_flops,
+    "MulN": _reduction_flops,
+}
+_FLOPS_FUNCTIONS.update({k: _normalization_flops(k)
+                         for k in _NORMALIZATION_FLOPS})
+_FLOPS_FUNCTIONS.update({k: _elementwise_flops(k)
+                         for k in _ELEMENTWISE_FUNCTIONS})
+
+
+def estimate_function_cost(function_name, inputs_shape, outputs_shape, args=None, itemsize=4):
+    """Estimate analytical FLOPs and memory traffic of a function.
+
+    The memory traffic is the minimal one, i.e. every input is read once and
+    every output is written once.
+
+    Args:
+        function_name (str): Function type name such as ``"Convolution"``.
+        inputs_shape (list of tuple): Shapes of the function inputs.
+        outputs_shape (list of tuple): Shapes of the function outputs.
+        args (dict): Function arguments. Default is None.
+        itemsize (int): Bytes per element. Default is 4 (float32).
+
+    Returns:
+        :obj:`FunctionCost`: ``(flops, bytes_read, bytes_written)``.
+        ``flops`` is 0 for data movement functions or functions whose cost
+        model is not known.
+    """
+    args = dict(args) if args is not None else {}
+    cost = _FLOPS_FUNCTIONS.get(function_name)
+    flops = cost(inputs_shape, outputs_shape, args) if cost else 0
+    bytes_read = itemsize * sum(_prod(s) for s in inputs_shape)
+    bytes_written = itemsize * sum(_prod(s) for s in outputs_shape)
+    return FunctionCost(flops=flops, bytes_read=bytes_read, bytes_written=bytes_written)
+
+
+def function_cost(f, itemsize=4):
+    """Estimate analytical FLOPs and memory traffic of a function in a graph.
+
+    Args:
+        f (:obj:`nnabla.function.Function`): Function in a computation graph.
+        itemsize (int): Bytes per element. Default is 4 (float32).
+
+    Returns:
+        :obj:`FunctionCost`
+    """
+    return estimate_function_cost(f.info.type_name,
+                                  [x.shape for x in f.inputs],
+                                  [y.shape for y in f.outputs],
+                                  f.info.args, itemsize)
+
+
+def roofline_stat(function_name, cost, mean_time_sec, parameter_scope=None, inputs_shape=None,
+                  peak_gflops=None, peak_bandwidth=None):
+    """Create a roofline statistic of a function from its cost and time.
+
+    Args:
+        function_name (str): Function type name.
+        cost (:obj:`FunctionCost`): Analytical cost of the function.
+        mean_time_sec (float): Measured mean execution time in seconds.
+        parameter_scope (str): Parameter scope of the function.
+        inputs_shape (list of tuple): Shapes of the function inputs.
+        peak_gflops (float): Peak compute performance of the device in GFLOP/s.
+        peak_bandwidth (float): Peak memory bandwidth of the device in GB/s.
+
+    Returns:
+        :obj:`RooflineStat`: ``bound`` is ``"compute"`` or ``"memory"``
+        when both ``peak_gflops`` and ``peak_bandwidth`` are given,
+        ``None`` otherwise.
+    """
+    nbytes = cost.bytes_read + cost.bytes_written
+    gflops_per_sec = cost.flops / mean_time_sec * 1e-9 if mean_time_sec > 0 else 0.
+    intensity = cost.flops / nbytes if nbytes > 0 else 0.
+    bound = None
+    if peak_gflops is not None and peak_bandwidth is not None:
+        # Ridge point of the roofline in FLOP/byte.
+        ridge = peak_gflops / peak_bandwidth
+        bound = "compute" if intensity >= ridge else "memory"
+    return RooflineStat(parameter_scope=parameter_scope,
+                        function_name=function_name,
+                        inputs_shape=inputs_shape,
+                        flops=cost.flops,
+                        bytes=nbytes,
+                        mean_time=mean_time_sec,
+                        gflops_per_sec=gflops_per_sec,
+                        arithmetic_intensity=intensity,
+                        bound=bound)
+
+
 def _zero_variables(variables):
     for v in variables:
         if v.parent is None:
@@ -140,6 +362,78 @@ class GraphProfilerCsvWriter:
                 ["training_n_run", self.gb.result["n_run_training"]])
 
 
+class GraphProfilerRooflineCsvWriter:
+    """GraphProfilerRooflineCsvWriter
+    csv writer of the roofline report of GraphProfiler class.
+
+    Example:
+
+    .. code-block:: python
+
+        from nnabla.utils.profiler import GraphProfiler, GraphProfilerRooflineCsvWriter
+
+        # Network building comes above
+
+        B = GraphProfiler(variable, device_id=0, ext_name=device, n_run=1000)
+        B.run()
+
+        with open("./roofline.csv", "w") as f:
+            writer = GraphProfilerRooflineCsvWriter(B, file=f, peak_gflops=1000., peak_bandwidth=50.)
+            writer.write()
+
+    Args:
+        gb (:py:class:`GraphProfiler <nnabla.utils.profile.GraphProfiler>`):
+            Instance of GraphProfiler class which is main executor of profiling.
+        file (Python file object):
+            Output file object.
+        peak_gflops (float):
+            Peak compute performance of the device in GFLOP/s.
+        peak_bandwidth (float):
+            Peak memory bandwidth of the device in GB/s.
+    """
+
+    def __init__(self, gb, file=sys.stdout, peak_gflops=None, peak_bandwidth=None):
+        self.file = file
+        self.gb = gb
+        self.peak_gflops = peak_gflops
+        self.peak_bandwidth = peak_bandwidth
+
+        self.fields = ["parameter_scope", "function_name", "inputs_shape",
+                       "flops", "bytes", "forward", "gflops_per_sec",
+                       "arithmetic_intensity", "bound"]
+
+    def write(self):
+        """
+        Write roofline report to the file.
+        The output file is specified by ``file``.
+        """
+        writer = csv.writer(self.file)
+        writer.writerow(["time scale", self.gb.time_scale])
+        writer.writerow(["peak GFLOP/s", self.peak_gflops])
+        writer.writerow(["peak bandwidth GB/s", self.peak_bandwidth])
+        writer.writerow([])
+        writer.writerow(self.fields)
+
+        report = self.gb.roofline_report(self.peak_gflops, self.peak_bandwidth)
+        for r in report["functions"]:
+            writer.writerow([r.parameter_scope, r.function_name, r.inputs_shape,
+                             r.flops, r.bytes,
+                             convert_time_scale(
+                                 r.mean_time, format=self.gb.time_scale),
+                             r.gflops_per_sec, r.arithmetic_intensity, r.bound])
+
+        total = report["total"]
+        writer.writerow([])
+        writer.writerow(["total flops", total.flops])
+        writer.writerow(["total bytes", total.bytes])
+        writer.writerow(["total forward", convert_time_scale(
+            total.mean_time, format=self.gb.time_scale)])
+        writer.writerow(["total GFLOP/s", total.gflops_per_sec])
+        writer.writerow(["total arithmetic intensity",
+                         total.arithmetic_intensity])
+        writer.writerow(["total bound", total.bound])
+
+
 class GraphProfiler:
     """GraphProfiler
     Class for measuring calculation time of each functions which compose nnabla computation graph.
@@ -299,9 +593,12 @@ class GraphProfiler:
                                                        function_name=function_name,
                                                        mean_time=mean_time,
                                                        n_run=measured_count))
+        if target_process == "forward":
+            self.result["forward_cost"].append(function_cost(f))
 
     def time_profiling_forward(self):
         self.result["forward"] = list()
+        self.result["forward_cost"] = list()
         func = partial(self._time_profiling, target_process="forward")
         self.graph.visit(func)
 
@@ -346,6 +643,43 @@ class GraphProfiler:
     def get_result(self):
         return self.result
 
+    def roofline_report(self, peak_gflops=None, peak_bandwidth=None):
+        """
+        Aggregate analytical FLOPs and memory traffic of each function with
+        the measured forward time into a roofline report.
+
+        This must be called after :meth:`run`.
+
+        Args:
+            peak_gflops (float):
+                Peak compute performance of the device in GFLOP/s.
+            peak_bandwidth (float):
+                Peak memory bandwidth of the device in GB/s.
+                A function is classified as compute-bound when its arithmetic
+                intensity is equal to or greater than
+                ``peak_gflops / peak_bandwidth``, memory-bound otherwise.
+
+        Returns:
+            dict: ``"functions"`` is the list of :obj:`RooflineStat` of each
+            function, and ``"total"`` is the :obj:`RooflineStat` aggregated
+            over the graph.
+        """
+        scale = convert_time_scale(1., format=self.time_scale)
+        functions = []
+        total_flops, total_read, total_written, total_time = 0, 0, 0, 0.
+        for stat, cost in zip(self.result["forward"], self.result["forward_cost"]):
+            mean_time = float(stat.mean_time) / scale
+            functions.append(roofline_stat(stat.function_name, cost, mean_time,
+                                           stat.parameter_scope, stat.inputs_shape,
+                                           peak_gflops, peak_bandwidth))
+            total_flops += cost.flops
+            total_read += cost.bytes_read
+            total_written += cost.bytes_written
+            total_time += mean_time
+        total = roofline_stat("total", FunctionCost(total_flops, total_read, total_written),
+                              total_time, peak_gflops=peak_gflops, peak_bandwidth=peak_bandwidth)
+        return {"functions": functions, "total": total}
+
     def print_result(self):
         print("time scale: {}".format(self.time_scale))
         print("-----------------forward--------------------")
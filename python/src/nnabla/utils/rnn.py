@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from functools import lru_cache
+
 import nnabla as nn
 import nnabla.functions as F
 import numpy as np
@@ -39,6 +41,52 @@ class PackedSequence(object):
           .format(self.data, self.batch_sizes, self.sorted_indices, self.unsorted_indices)
 
 
+@lru_cache(maxsize=256)
+def _pad_index(lengths, batch_first):
+    """Index map from a padded sequence to the concatenation of sequences.
+
+    The concatenation is followed by a padding element, which padded
+    positions refer to. Maps are cached by the pattern of lengths.
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    t = np.arange(lengths.max())[:, None]
+    index = np.where(t < lengths, offsets + t, lengths.sum())  # [T, B]
+    if batch_first:
+        index = index.T
+    index = np.ascontiguousarray(index, dtype=np.int32)
+    index.flags.writeable = False
+    return index
+
+
+@lru_cache(maxsize=256)
+def _pack_index(lengths, enforce_sorted):
+    """Index map from a packed sequence to the concatenation of sequences.
+
+    Returns the index map, batch sizes, and sorted and unsorted indices,
+    which are None if `enforce_sorted` is True. Maps are cached by the
+    pattern of lengths.
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    sorted_indices = unsorted_indices = None
+    if not enforce_sorted:
+        # Stable to order equal lengths by index as F.sort does.
+        sorted_indices = np.argsort(-lengths, kind='stable')
+        unsorted_indices = np.argsort(sorted_indices)
+        lengths = lengths[sorted_indices]
+        offsets = offsets[sorted_indices]
+    # Time-major order of (t, b) where t < lengths[b].
+    t, b = np.nonzero(np.arange(lengths.max())[:, None] < lengths)
+    batch_sizes = np.bincount(t, minlength=lengths.max())
+    arrays = [offsets[b] + t, batch_sizes, sorted_indices, unsorted_indices]
+    arrays = [a if a is None else a.astype(np.int32) for a in arrays]
+    for a in arrays:
+        if a is not None:
+            a.flags.writeable = False
+    return tuple(arrays)
+
+
 def pad_sequence(sequences, batch_first=False, padding_value=0.0):
     """Pad a list of variable-length Variables.
 
@@ -84,19 +132,14 @@ def pad_sequence(sequences, batch_first=False, padding_value=0.0):
       :obj:`nnabla.Variable` of (:math:`T`, :math:`B`, :math:`*`) or (:math:`B`, :math:`T`, :math:`*`) shape
     """
 
-    B = len(sequences)
-    T = max([e.shape[0] for e in sequences])
-    shape0 = (B, T) if batch_first else (T, B)
+    # A single gather from the concatenation instead of an assignment for
+    # each sequence.
+    lengths = tuple(s.shape[0] for s in sequences)
     shape1 = sequences[0].shape[1:]
-
-    padded_sequence = F.constant(padding_value, shape0 + shape1)
-    for b, s in enumerate(sequences):
-        l = s.shape[0]
-        if batch_first:
-            padded_sequence[b, :l, ...] = s
-        else:
-            padded_sequence[:l, b, ...] = s
-    return padded_sequence
+    padding = F.constant(padding_value, (1, ) + shape1)
+    x = F.concatenate(*sequences, padding, axis=0)
+    index = nn.Variable.from_numpy_array(_pad_index(lengths, batch_first))
+    return F.gather(x, index, axis=0)
 
 
 def pack_padded_sequence(padded_sequence, lengths, batch_first=False, enforce_sorted=True):
@@ -154,14 +197,13 @@ def pack_padded_sequence(padded_sequence, lengths, batch_first=False, enforce_so
         sorted_indices = None
         unsorted_indices = None
     else:
-        # TODO: replace cuda context when the bug fix of the sort
-        with nn.context_scope(nn.Context()):
-            lengths, sorted_indices = F.sort(
-                lengths, axis=0, reverse=True, with_index=True)
-
-        B = sorted_indices.shape[0]
-        unsorted_indices = F.scatter_nd(
-            F.arange(0, B), sorted_indices.reshape((1, B)), shape=(B, ))
+        # The lengths reside in CPU, and the order is computed in NumPy.
+        order = np.argsort(-lengths.d, kind='stable')
+        lengths = nn.Variable.from_numpy_array(
+            lengths.d[order].astype(np.int32))
+        sorted_indices = nn.Variable.from_numpy_array(order.astype(np.int32))
+        unsorted_indices = nn.Variable.from_numpy_array(
+            np.argsort(order).astype(np.int32))
         axis = 0 if batch_first else 1
         padded_sequence = F.gather(padded_sequence, sorted_indices, axis)
 
@@ -219,11 +261,20 @@ def pack_sequence(sequences, batch_first=False, enforce_sorted=True):
     Returns: 
         :obj:`PackedSequence`: packed_sequence
     """
-    pad_sequences = pad_sequence(sequences)
-    lengths = np.array([sequence.shape[0] for sequence in sequences])
-    lengths = nn.Variable.from_numpy_array(lengths)
-    packed_sequence = pack_padded_sequence(
-        pad_sequences, lengths, enforce_sorted=enforce_sorted)
+    # A single gather from the concatenation instead of padding and packing.
+    lengths = tuple(sequence.shape[0] for sequence in sequences)
+    index, batch_sizes, sorted_indices, unsorted_indices = _pack_index(
+        lengths, enforce_sorted)
+    x = F.concatenate(*sequences, axis=0)
+    packed_sequence = PackedSequence()
+    packed_sequence.data = F.gather(
+        x, nn.Variable.from_numpy_array(index), axis=0)
+    packed_sequence.batch_sizes = nn.Variable.from_numpy_array(batch_sizes)
+    if sorted_indices is not None:
+        packed_sequence.sorted_indices = nn.Variable.from_numpy_array(
+            sorted_indices)
+        packed_sequence.unsorted_indices = nn.Variable.from_numpy_array(
+            unsorted_indices)
     return packed_sequence
 
 
@@ -302,22 +353,50 @@ def pad_packed_sequence(sequence, batch_first=False, padding_value=0.0, total_le
     return padded_sequence, lengths
 
 
-def _rnn(x, h, w, b, nonlinearity, with_bias):
+def _split_weight(w, num_gates, hidden_size):
+    """Split a weight into the input and recurrent parts.
+    Args:
+        w (:obj:`~nnabla.Variable`): Weight with [G, H, I+H] or [H, I+H] shape.
+        num_gates (int): Number of gates G.
+        hidden_size (int): Hidden size H.
+
+    Returns:
+        Weights of [I, G*H] and [H, G*H] shapes used by affine.
+    """
+    w = F.reshape(w, (num_gates * hidden_size, w.shape[-1]))
+    input_size = w.shape[1] - hidden_size
+    wx = F.transpose(w[:, :input_size], (1, 0))
+    wh = F.transpose(w[:, input_size:], (1, 0))
+    return wx, wh
+
+
+def _project_inputs(xs, wx, b):
+    """Input projections of all time steps by a single affine.
+    Args:
+        xs (:obj:`~nnabla.Variable`): Input data with [T, B, I] shape.
+        wx (:obj:`~nnabla.Variable`): Input weight with [I, G*H] shape.
+        b (:obj:`~nnabla.Variable`): Bias with [G*H] shape or None.
+
+    Returns:
+        List of T projections of [B, G*H] shape.
+    """
+    T, B, I = xs.shape
+    y = F.affine(F.reshape(xs, (T * B, I)), wx, b)
+    y = F.reshape(y, (T, B, wx.shape[1]))
+    if T == 1:
+        return [F.reshape(y, (B, wx.shape[1]))]
+    return F.split(y, axis=0)
+
+
+def _rnn(xp, h, wh, nonlinearity):
     """RNN cell.
     Args:
-        x (:obj:`~nnabla.Variable`): Input data.
+        xp (:obj:`~nnabla.Variable`): Input projection including the bias.
         h (:obj:`~nnabla.Variable`): Hidden state.
-        w (:obj:`~nnabla.Variable`): Weight.
-        b (:obj:`~nnabla.Variable`): Bias.
+        wh (:obj:`~nnabla.Variable`): Recurrent weight.
         nonlinearity (str): "tanh" or "relu".
-        with_bias (bool): Include the bias or not.
     """
-    hidden_size = h.shape[1]
-    xh = F.concatenate(*(x, h), axis=1)
-    b_ = None
-    if with_bias:
-        b_ = b
-    h_t = F.affine(xh, F.transpose(w, (1, 0)), b_)
+    h_t = xp + F.affine(h, wh)
     if nonlinearity == 'tanh':
         h_t = F.tanh(h_t)
     elif nonlinearity == 'relu':
@@ -343,79 +422,53 @@ def _create_fixed_length_rnn(xs0, h0, w0, w, b, num_layers, nonlinearity, num_di
     # h0 : [L, D, B, H]
     # w0 : [D, H, I+H]
     # w : [L-1, D, H, D * H + H]
+    T = xs0.shape[0]
     batch_size = xs0.shape[1]
     hidden_size = h0.shape[3]
 
-    if xs0.shape[0] == 1:
-        xs = [xs0[0]]
-    else:
-        xs = F.split(xs0, axis=0)
+    xs = xs0
     hn = []
     for i in range(num_layers):
         wi = w0
         if i > 0:
             wi = w[i - 1]
         # wi : [D, H, ?]
-        # Forward direction
-        hif = h0[i, 0]  # [B, H]
-        wif = wi[0]
-        bif = None
-        if with_bias:
-            bif = b[i, 0]
-        hs = []
-        for j, x in enumerate(xs):
-            # x : [B, I]
-            hif = _rnn(x, hif, wif, bif, nonlinearity, with_bias)
-            hs.append(hif)
-        hn.append(hif)
-
-        if num_directions == 1:
-            xs = hs
-            continue
-
-        # Backward direction
-        hib = h0[i, 1]  # [B, H]
-        wib = wi[1]
-        bib = None
-        if with_bias:
-            bib = b[i, 1]
-        for k, x, in enumerate(reversed(xs)):
-            j = len(xs) - 1 - k
-            # x : [B, I]
-            hib = _rnn(x, hib, wib, bib, nonlinearity, with_bias)
-            hs[j] = F.concatenate(hs[j], hib, axis=1)
-        hn.append(hib)
-        xs = hs
-
-    ys = xs  # list of [B, HD]
-    ys = F.stack(*ys, axis=0)  # [T, B, HD]
+        ys = []
+        for d in range(num_directions):
+            # The input projections of all steps are computed at once, and
+            # only the recurrent projection is computed at each step.
+            wx, wh = _split_weight(wi[d], 1, hidden_size)
+            xps = _project_inputs(xs, wx, b[i, d] if with_bias else None)
+            hid = h0[i, d]  # [B, H]
+            hs = [None] * T
+            for j in (range(T) if d == 0 else reversed(range(T))):
+                hid = _rnn(xps[j], hid, wh, nonlinearity)
+                hs[j] = hid
+            hn.append(hid)
+            ys.append(F.stack(*hs, axis=0))
+        xs = ys[0] if num_directions == 1 else F.concatenate(*ys, axis=2)
+
+    ys = xs  # [T, B, HD]
     hn = F.reshape(F.stack(*hn, axis=0), (num_layers, num_directions,
                                           batch_size, hidden_size))  # LD list of [B, H] --> [L, D, B, H]
     return ys, hn
 
 
-def _gru(x, h, w, b, with_bias):
+def _gru(xp, h, wh, bh):
     """GRU cell.
     Args:
-        x (:obj:`~nnabla.Variable`): Input data.
+        xp (:obj:`~nnabla.Variable`): Input projection of the three gates including the biases.
         h (:obj:`~nnabla.Variable`): Hidden state.
-        w (:obj:`~nnabla.Variable`): Weight.
-        b (:obj:`~nnabla.Variable`): Bias.
-        with_bias (bool): Include the bias or not.
+        wh (:obj:`~nnabla.Variable`): Recurrent weight of the three gates.
+        bh (:obj:`~nnabla.Variable`): Recurrent bias, which is zero except for the new gate, or None.
     """
-    hidden_size = h.shape[1]
-    xh = F.concatenate(*(x, h), axis=1)
-    w0, w1, w2 = F.split(w, axis=0)
-    b0 = b1 = b2 = b3 = None
-    if with_bias:
-        b0, b1, b2, b3 = F.split(b, axis=0)
-    r_t = F.sigmoid(F.affine(xh, F.transpose(w0, (1, 0)), b0))
-    z_t = F.sigmoid(F.affine(xh, F.transpose(w1, (1, 0)), b1))
-
-    w2_0 = w2[:, :w2.shape[1]-hidden_size]
-    w2_1 = w2[:, w2.shape[1]-hidden_size:]
-    n_t = F.tanh(F.affine(x, F.transpose(w2_0, (1, 0)), b2) +
-                 r_t*F.affine(h, F.transpose(w2_1, (1, 0)), b3))
+    batch_size, hidden_size = h.shape
+    hp = F.affine(h, wh, bh)
+    xr, xz, xn = F.split(F.reshape(xp, (batch_size, 3, hidden_size)), axis=1)
+    hr, hz, hn = F.split(F.reshape(hp, (batch_size, 3, hidden_size)), axis=1)
+    r_t = F.sigmoid(xr + hr)
+    z_t = F.sigmoid(xz + hz)
+    n_t = F.tanh(xn + r_t * hn)
     h_t = (1-z_t)*n_t + z_t*h
 
     return h_t
@@ -428,7 +481,7 @@ def _create_fixed_length_gru(xs0, h0, w0, w, b, num_layers, num_directions, with
         h0 (:obj:`~nnabla.Variable`): Hidden states with [L, D, B, H] shape.
         w0 (:obj:`~nnabla.Variable`): Weights at the first layer with [D, 3, H, I+H] shape.
         w (:obj:`~nnabla.Variable`): Weights with [L-1, D, 3, H, D * H + H] shape at layers other than the first layer.
-        b (:obj:`~nnabla.Variable`): Biases with [L, D, 3, H] shape.
+        b (:obj:`~nnabla.Variable`): Biases with [L, D, 4, H] shape.
         num_layers (int): Number of layers.
         num_directions (int): "tanh" or "relu".
         with_bias (bool): Include the bias or not.
@@ -437,79 +490,55 @@ def _create_fixed_length_gru(xs0, h0, w0, w, b, num_layers, num_directions, with
     # h0 : [L, D, B, H]
     # w0 : [D, 3, H, I+H]
     # w : [L-1, D, 3, H, D * H + H]
-    # b : [L, D, 3, H]
-
+    # b : [L, D, 4, H]
+    T = xs0.shape[0]
     batch_size = xs0.shape[1]
     hidden_size = h0.shape[3]
 
-    if xs0.shape[0] == 1:
-        xs = [xs0[0]]
-    else:
-        xs = F.split(xs0, axis=0)
+    xs = xs0
     hn = []
     for i in range(num_layers):
         wi = w0
         if i > 0:
             wi = w[i - 1]
         # wi : [D, 3, H, ?]
-        # Forward direction
-        hif = h0[i, 0]  # [B, H]
-        wif = wi[0]
-        bif = None
-        if with_bias:
-            bif = b[i, 0]
-        hs = []
-        for j, x in enumerate(xs):
-            # x : [B, I]
-            hif = _gru(x, hif, wif, bif, with_bias)
-            hs.append(hif)
-        hn.append(hif)
-
-        if num_directions == 1:
-            xs = hs
-            continue
-
-        # Backward direction
-        hib = h0[i, 1]  # [B, H]
-        wib = wi[1]
-        bib = None
-        if with_bias:
-            bib = b[i, 1]
-        for k, x, in enumerate(reversed(xs)):
-            j = len(xs) - 1 - k
-            # x : [B, I]
-            hib = _gru(x, hib, wib, bib, with_bias)
-            hs[j] = F.concatenate(hs[j], hib, axis=1)
-        hn.append(hib)
-        xs = hs
-
-    ys = xs  # list of [B, HD]
-    ys = F.stack(*ys, axis=0)  # [T, B, HD]
+        ys = []
+        for d in range(num_directions):
+            wx, wh = _split_weight(wi[d], 3, hidden_size)
+            bx = bh = None
+            if with_bias:
+                # The last bias is added to the recurrent projection of the
+                # new gate.
+                bx = F.reshape(b[i, d, :3], (3 * hidden_size,))
+                bh = F.concatenate(F.constant(0, (2 * hidden_size,)),
+                                   b[i, d, 3], axis=0)
+            xps = _project_inputs(xs, wx, bx)
+            hid = h0[i, d]  # [B, H]
+            hs = [None] * T
+            for j in (range(T) if d == 0 else reversed(range(T))):
+                hid = _gru(xps[j], hid, wh, bh)
+                hs[j] = hid
+            hn.append(hid)
+            ys.append(F.stack(*hs, axis=0))
+        xs = ys[0] if num_directions == 1 else F.concatenate(*ys, axis=2)
+
+    ys = xs  # [T, B, HD]
     hn = F.reshape(F.stack(*hn, axis=0), (num_layers, num_directions,
                                           batch_size, hidden_size))  # LD list of [B, H] --> [L, D, B, H]
     return ys, hn
 
 
-def _lstm(x, h, c, w, b, with_bias):
+def _lstm(xp, h, c, wh):
     """LSTM cell.
     Args:
-        x (:obj:`~nnabla.Variable`): Input data.
+        xp (:obj:`~nnabla.Variable`): Input projection of the four gates including the biases.
         h (:obj:`~nnabla.Variable`): Short-term state.
         c (:obj:`~nnabla.Variable`): Long-term state.
-        w (:obj:`~nnabla.Variable`): Weight.
-        b (:obj:`~nnabla.Variable`): Bias.
-        with_bias (bool): Include the bias or not.
+        wh (:obj:`~nnabla.Variable`): Recurrent weight of the four gates.
     """
-    hidden_size = h.shape[1]
-    xh = F.concatenate(*(x, h), axis=1)
-    w0, w1, w2, w3 = F.split(w, axis=0)
-    b0 = b1 = b2 = b3 = None
-    if with_bias:
-        b0, b1, b2, b3 = F.split(b, axis=0)
-    i_t = F.affine(xh, F.transpose(w0, (1, 0)), b0)
-    f_t = F.affine(xh, F.transpose(w1, (1, 0)), b1)
-    g_t = F.affine(xh, F.transpose(w2, (1, 0)), b2)
-    o_t = F.affine(xh, F.transpose(w3, (1, 0)), b3)
+    batch_size, hidden_size = h.shape
+    gates = F.reshape(xp + F.affine(h, wh), (batch_size, 4, hidden_size))
+    i_t, f_t, g_t, o_t = F.split(gates, axis=1)
     c_t = F.sigmoid(f_t) * c + F.sigmoid(i_t) * F.tanh(g_t)
     h_t = F.sigmoid(o_t) * F.tanh(c_t)
 
@@ -517,14 +546,14 @@ def _lstm(x, h, c, w, b, with_bias):
 
 
 def _create_fixed_length_lstm(xs0, h0, c0, w0, w, b, num_layers, num_directions, with_bias):
-    """NStepGRUCells over time and over layers.
+    """NStepLSTMCells over time and over layers.
     Args:
         xs0 (:obj:`~nnabla.Variable`): Input data with [T, B, I]  shape.
         h0 (:obj:`~nnabla.Variable`): Short-term states with [L, D, B, H] shape.
         c0 (:obj:`~nnabla.Variable`): Long-term states with [L, D, B, H] shape.
         w0 (:obj:`~nnabla.Variable`): Weights at the first layer with [D, 4, H, I+H] shape.
         w (:obj:`~nnabla.Variable`): Weights with [L-1, D, 4, H, D * H + H] shape at layers other than the first layer.
-        b (:obj:`~nnabla.Variable`): Biases with [L, D, 4*H] shape.
+        b (:obj:`~nnabla.Variable`): Biases with [L, D, 4, H] shape.
         num_layers (int): Number of layers.
         num_directions (int): "tanh" or "relu".
         with_bias (bool): Include the bias or not.
@@ -534,15 +563,12 @@ def _create_fixed_length_lstm(xs0, h0, c0, w0, w, b, num_layers, num_directions,
     # c0 : [L, D, B, H]
     # w0 : [D, 4, H, I+H]
     # w : [L-1, D, 4, H, D * H + H]
-    # b : [L, D, 4*H]
-
+    # b : [L, D, 4, H]
+    T = xs0.shape[0]
     batch_size = xs0.shape[1]
     hidden_size = h0.shape[3]
 
-    if xs0.shape[0] == 1:
-        xs = [xs0[0]]
-    else:
-        xs = F.split(xs0, axis=0)
+    xs = xs0
     hn = []
     cn = []
     for i in range(num_layers):
@@ -550,43 +576,25 @@ def _create_fixed_length_lstm(xs0, h0, c0, w0, w, b, num_layers, num_directions,
         if i > 0:
             wi = w[i - 1]
         # wi : [D, 4, H, ?]
-        # Forward direction
-        hif = h0[i, 0]  # [B, H]
-        cif = c0[i, 0]  # [B, H]
-        wif = wi[0]
-        bif = None
-        if with_bias:
-            bif = b[i, 0]
-        hs = []
-        for j, x in enumerate(xs):
-            # x : [B, I]
-            hif, cif = _lstm(x, hif, cif, wif, bif, with_bias)
-            hs.append(hif)
-        hn.append(hif)
-        cn.append(cif)
-
-        if num_directions == 1:
-            xs = hs
-            continue
-
-        # Backward direction
-        hib = h0[i, 1]  # [B, H]
-        cib = c0[i, 1]  # [B, H]
-        wib = wi[1]
-        bib = None
-        if with_bias:
-            bib = b[i, 1]
-        for k, x, in enumerate(reversed(xs)):
-            j = len(xs) - 1 - k
-            # x : [B, I]
-            hib, cib = _lstm(x, hib, cib, wib, bib, with_bias)
-            hs[j] = F.concatenate(hs[j], hib, axis=1)
-        hn.append(hib)
-        cn.append(cib)
-        xs = hs
-
-    ys = xs  # list of [B, HD]
-    ys = F.stack(*ys, axis=0)  # [T, B, HD]
+        ys = []
+        for d in range(num_directions):
+            wx, wh = _split_weight(wi[d], 4, hidden_size)
+            bx = None
+            if with_bias:
+                bx = F.reshape(b[i, d], (4 * hidden_size,))
+            xps = _project_inputs(xs, wx, bx)
+            hid = h0[i, d]  # [B, H]
+            cid = c0[i, d]  # [B, H]
+            hs = [None] * T
+            for j in (range(T) if d == 0 else reversed(range(T))):
+                hid, cid = _lstm(xps[j], hid, cid, wh)
+                hs[j] = hid
+            hn.append(hid)
+            cn.append(cid)
+            ys.append(F.stack(*hs, axis=0))
+        xs = ys[0] if num_directions == 1 else F.concatenate(*ys, axis=2)
+
+    ys = xs  # [T, B, HD]
     hn = F.reshape(F.stack(*hn, axis=0), (num_layers, num_directions,
                                           batch_size, hidden_size))  # LD list of [B, H] --> [L, D, B, H]
     cn = F.reshape(F.stack(*cn, axis=0), (num_layers, num_directions,
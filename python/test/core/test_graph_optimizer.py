@@ -0,0 +1,51 @@
+# Copyright 2022 Sony Group Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import nnabla as nn
+import nnabla.functions as F
+from nnabla.core.graph_optimizer import optimize_inference
+
+
+def test_optimize_inference():
+    rng = np.random.RandomState(313)
+    x = nn.Variable((2, 4))
+    x.d = rng.randn(*x.shape)
+    w = nn.parameter.get_parameter_or_create('w', (4, 3), rng.randn(4, 3))
+    b = nn.parameter.get_parameter_or_create('b', (3,), rng.randn(3))
+    h = F.affine(x, F.mul_scalar(w, 2.0), F.add_scalar(b, 1.0))
+    y = F.relu(h) + F.relu(h)
+    y = F.reshape(F.reshape(F.identity(y), (6,)), (2, 3))
+    y.forward()
+    ref = y.d.copy()
+
+    g = nn.graph_def.create_graph_from_variable('net', y)
+    net = g.default_graph()
+    stats = optimize_inference(net)
+
+    types = [pf.type for pf in net.functions.values()]
+    assert stats['fold'] == 2
+    assert stats['cse'] == 1
+    assert 'MulScalar' not in types
+    assert 'AddScalar' not in types
+    assert 'Identity' not in types
+    assert types.count('ReLU') == 1
+    assert types.count('Reshape') == 1
+    assert len(net.parameters) == 2
+    for name, pv in net.parameters.items():
+        assert pv.required
+
+    out = net(x)
+    out.forward()
+    assert np.allclose(out.d, ref)
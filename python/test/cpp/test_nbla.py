@@ -22,6 +22,7 @@ import nnabla.utils.load
 from nnabla.testing import assert_allclose
 
 import numpy as np
+from six import BytesIO
 from subprocess import check_call, call, check_output
 import platform
 
@@ -103,3 +104,116 @@ def test_nbla_broadcast(tmpdir, batch_size, on_memory):
     x = nn.Variable([10, 1, 4, 1, 5])
     y = F.broadcast(x, shape=[10, 8, 4, 1, 5])
     check_nbla_infer(tmpdir, x, y, batch_size, on_memory)
+
+
+def save_serve_nnp(tmpdir, batch_size):
+    x = nn.Variable([batch_size, 3])
+    y = F.add_scalar(F.mul_scalar(x, 2.0), 1.0)
+    contents = {
+        'networks': [
+            {'name': 'graph',
+             'batch_size': batch_size,
+             'outputs': {'y': y},
+             'names': {'x': x}}],
+        'executors': [
+            {'name': 'runtime',
+             'network': 'graph',
+             'data': ['x'],
+             'output': ['y']}
+        ]}
+
+    from nnabla.utils.save import save
+    tmpdir.ensure(dir=True)
+    nnp_file = tmpdir.join('serve.nnp').strpath
+    save(nnp_file, contents)
+    return nnp_file
+
+
+def serve_request(x):
+    return np.array([len(x)], dtype=np.uint32).tobytes() + \
+        x.astype(np.float32).tobytes()
+
+
+def read_serve_response(read, num_samples):
+    def read_all(size):
+        data = b''
+        while len(data) < size:
+            chunk = read(size - len(data))
+            assert chunk, 'The server closed the connection.'
+            data += chunk
+        return data
+    n = np.frombuffer(read_all(4), dtype=np.uint32)[0]
+    assert n == num_samples
+    return np.frombuffer(read_all(n * 3 * 4), dtype=np.float32).reshape(n, 3)
+
+
+def test_nbla_serve_stdin(tmpdir):
+    if not command_exists('nbla'):
+        pytest.skip('An executable `nbla` is not in path.')
+    from subprocess import PIPE, Popen
+
+    nnp_file = save_serve_nnp(tmpdir, 4)
+    rng = np.random.RandomState(313)
+    xs = [rng.randn(n, 3).astype(np.float32) for n in [2, 3, 4, 1]]
+    p = Popen(['nbla', 'serve', '-e', 'runtime', '-b', '4', '-l', '50',
+               nnp_file], stdin=PIPE, stdout=PIPE)
+    # Requests are answered in order, also when they are batched.
+    out, _ = p.communicate(b''.join(serve_request(x) for x in xs),
+                           timeout=60)
+    assert p.returncode == 0
+    stream = BytesIO(out)
+    for x in xs:
+        assert_allclose(read_serve_response(stream.read, len(x)), x * 2 + 1)
+    assert stream.read() == b''
+
+
+def test_nbla_serve_socket(tmpdir):
+    if not command_exists('nbla'):
+        pytest.skip('An executable `nbla` is not in path.')
+    if platform.system() == 'Windows':
+        pytest.skip('nbla serve is not supported on Windows.')
+    import os
+    import socket
+    import threading
+    import time
+    from subprocess import Popen
+
+    nnp_file = save_serve_nnp(tmpdir, 4)
+    socket_path = tmpdir.join('serve.sock').strpath
+    p = Popen(['nbla', 'serve', '-e', 'runtime', '-b', '4', '-l', '5',
+               '-s', socket_path, nnp_file])
+    try:
+        for _ in range(600):
+            if os.path.exists(socket_path) or p.poll() is not None:
+                break
+            time.sleep(0.1)
+        assert os.path.exists(socket_path)
+
+        # Concurrent clients get the results of their own requests.
+        errors = []
+
+        def client(seed):
+            try:
+                rng = np.random.RandomState(seed)
+                s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                s.settimeout(60)
+                s.connect(socket_path)
+                with s:
+                    for _ in range(10):
+                        x = rng.randn(rng.randint(1, 5), 3)
+                        s.sendall(serve_request(x))
+                        y = read_serve_response(s.recv, len(x))
+                        assert_allclose(y, x.astype(np.float32) * 2 + 1)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=client, args=(seed,))
+                   for seed in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert not errors, errors
+    finally:
+        p.kill()
+        p.wait()
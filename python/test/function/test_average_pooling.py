@@ -79,8 +79,10 @@ def ref_average_pooling(x, kernel, stride, ignore_border, pad, channel_last, inc
 def test_average_pooling_2d(seed, inshape, kernel, stride, pad, ignore_border, channel_last,
                             including_pad, ctx, func_name):
     from nbla_test_utils import function_tester
-    if channel_last and not func_name.endswith('Cudnn'):
-        pytest.skip('Channel last is only supported in Cudnn so far')
+    if channel_last and not (func_name == 'AveragePooling' or func_name.endswith('Cudnn')):
+        pytest.skip('Channel last is only supported in CPU and Cudnn so far')
+    if channel_last and func_name == 'AveragePooling' and len(inshape) == len(kernel):
+        pytest.skip('Channel last in CPU requires a channel axis')
     if channel_last:
         t = refs.ChannelLastToFirstTranspose(len(inshape), len(kernel))
         inshape = tuple(inshape[i] for i in t.inv_axes)
@@ -107,8 +109,10 @@ def test_average_pooling_2d(seed, inshape, kernel, stride, pad, ignore_border, c
 def test_average_pooling_3d(seed, inshape, kernel, stride, pad, ignore_border, channel_last,
                             including_pad, ctx, func_name):
     from nbla_test_utils import function_tester
-    if channel_last and not func_name.endswith('Cudnn'):
-        pytest.skip('Channel last is only supported in Cudnn so far')
+    if channel_last and not (func_name == 'AveragePooling' or func_name.endswith('Cudnn')):
+        pytest.skip('Channel last is only supported in CPU and Cudnn so far')
+    if channel_last and func_name == 'AveragePooling' and len(inshape) == len(kernel):
+        pytest.skip('Channel last in CPU requires a channel axis')
     if channel_last:
         t = refs.ChannelLastToFirstTranspose(len(inshape), len(kernel))
         inshape = tuple(inshape[i] for i in t.inv_axes)
@@ -46,9 +46,9 @@ def core_test_convolution_forward_backward(inshape, kernel, outmaps, pad, stride
     from nbla_test_utils import function_tester
     if func_name == 'ConvolutionCuda':
         pytest.skip('CUDA Convolution N-D is only supported in CUDNN extension')
-    if channel_last and not func_name.endswith('Cudnn'):
+    if channel_last and not (func_name == 'Convolution' or func_name.endswith('Cudnn')):
         pytest.skip(
-            'channel_last=True is only supported in CUDNN backend so far.')
+            'channel_last=True is only supported in CPU and CUDNN backend so far.')
     if channel_last and func_name.endswith('Cudnn') and (np.any(np.asarray(dilation) > 1) or group > 1):
         import nnabla_ext.cuda as nc
         major, minor, revision = map(int, nc.__cudnn_version__.split('.'))
@@ -110,14 +110,19 @@ def ref_einsum(*x, equation):
     # 1. Sum: zabc => abc
     # 2. Sum: aycd => acd
     # 3. Matmul: abc, acd => abd
-    # 4. Sum: abd => bd
-    # 5. Sum: daxe => de
-    # 6. Matmul: bd, de => bde
+    # 4. Sum: daxe => de
+    # 5. Sum: abd => bd
+    # 6. Matmul: de, bd => deb
     # 7. Sum: bdfw => bdf
-    # 8. Transpose: bde => bed
-    # 9. Matmul: bed, bdf => bef
+    # 8. Matmul: bdf, deb => bfe
+    # 9. Transpose: bfe => bef
     [[(1, 2, 3, 4), (2, 1, 4, 2), (2, 2, 1, 3),
-      (3, 2, 3, 1)], "zabc,aycd,daxe,bdfw->bef"]
+      (3, 2, 3, 1)], "zabc,aycd,daxe,bdfw->bef"],
+
+    # Contraction order: jk,kl => jl first
+    ([(16, 2), (2, 16), (16, 3)], "ij,jk,kl->il"),
+    ([(2, 4, 2), (2, 2, 4), (2, 4, 2), (2, 2, 4)], "bij,bjk,bkl,blm->bim"),
+    ([(3, 8), (4, 2), (8, 4)], "ab,cd,bc->ad"),
 ])
 @pytest.mark.parametrize("seed", [313])
 def test_einsum_forward_backward(seed, x_shapes, equation, ctx, func_name):
@@ -187,7 +192,9 @@ def test_einsum_forward_backward(seed, x_shapes, equation, ctx, func_name):
       (3, 2, 3, 1)],
      [(1, 2, 3, 3), (2, 1, 3, 2), (2, 2, 1, 4),
       (3, 2, 4, 1)],
-     "zabc,aycd,daxe,bdfw->bef"]
+     "zabc,aycd,daxe,bdfw->bef"],
+    # Contraction order changes by reset
+    ([(16, 2), (2, 16), (16, 3)], [(2, 16), (16, 2), (2, 16)], "ij,jk,kl->il"),
 ])
 @pytest.mark.parametrize("seed", [313])
 def test_einsum_forward_backward_with_reset(seed, x_shapes, reset_x_shapes, equation, ctx, func_name):
@@ -200,3 +207,15 @@ def test_einsum_forward_backward_with_reset(seed, x_shapes, reset_x_shapes, equa
     atol_f = 0 if func_name.endswith('Cpu') else 1e-6
     function_tester(rng, F.einsum, ref_einsum, inputs, ctx=ctx, func_name=func_name,
                     atol_f=atol_f, atol_b=2e-2, func_kwargs=dict(equation=equation), backward=backward, reset_inputs=reset_inputs)
+
+
+@pytest.mark.parametrize("x_shapes, equation, path", [
+    ([(3, 4)], "ij->i", []),
+    ([(3, 4), (4, 5)], "ij,jk->ik", [(0, 1)]),
+    ([(64, 2), (2, 64), (64, 3)], "ij,jk,kl->il", [(1, 2), (0, 1)]),
+    ([(2, 64), (64, 2), (2, 64)], "ij,jk,kl->il", [(0, 1), (0, 1)]),
+    ([(10, 100), (100, 10), (100, 100)], "ab,cd,bc->ad", [(0, 2), (0, 1)]),
+])
+def test_einsum_path(x_shapes, equation, path):
+    from nnabla.function import einsum_path
+    assert einsum_path(equation, x_shapes) == path
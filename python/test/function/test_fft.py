@@ -60,9 +60,6 @@ def ref_grad_fft(x, dy, signal_ndim, normalized, **kw):
 @pytest.mark.parametrize("normalized", [True, False])
 def test_fft_forward_backward(seed, ctx, func_name, batch_dims,
                               signal_ndim, dims, normalized):
-    if func_name == "FFT":
-        pytest.skip("Not implemented in CPU.")
-
     from nbla_test_utils import function_tester, convert_to_float2_array, convert_to_complex_array
     rng = np.random.RandomState(seed)
     shape = batch_dims + dims
@@ -91,9 +88,6 @@ def test_fft_forward_backward(seed, ctx, func_name, batch_dims,
 @pytest.mark.parametrize("normalized", [True, False])
 def test_fft_double_backward(seed, ctx, func_name, batch_dims,
                              signal_ndim, dims, normalized):
-    if func_name == "FFT":
-        pytest.skip("Not implemented in CPU.")
-
     from nbla_test_utils import backward_function_tester, convert_to_float2_array, convert_to_complex_array
     rng = np.random.RandomState(seed)
     shape = batch_dims + dims
@@ -118,9 +112,6 @@ def test_fft_double_backward(seed, ctx, func_name, batch_dims,
 @pytest.mark.parametrize("normalized", [True, False])
 def test_fft_forward_backward_with_reset(seed, ctx, func_name, batch_dims, reset_batch_dims,
                                          signal_ndim, dims, normalized):
-    if func_name == "FFT":
-        pytest.skip("Not implemented in CPU.")
-
     from nbla_test_utils import function_tester, convert_to_float2_array
     rng = np.random.RandomState(seed)
     shape = batch_dims + dims
@@ -0,0 +1,143 @@
+# Copyright 2023 Sony Group Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import numpy as np
+import nnabla as nn
+import nnabla.functions as F
+from nbla_test_utils import list_context
+
+ctxs = list_context('FusedElementwise')
+
+
+def ref_fused_elementwise_chain(x, z, ops, op_args):
+    # Returns the output, and its derivatives with respect to x and z.
+    args = iter(op_args)
+    h = x.astype(np.float64)
+    dx = np.ones_like(h)
+    dz = np.zeros_like(h)
+    for op in ops.split(','):
+        if op == 'add':
+            h = h + z
+            dz = dz + 1
+            continue
+        elif op == 'add_scalar':
+            h, d = h + next(args), 1
+        elif op == 'mul_scalar':
+            a = next(args)
+            h, d = h * a, a
+        elif op == 'pow_scalar':
+            a = next(args)
+            h, d = h ** a, a * h ** (a - 1)
+        elif op == 'relu':
+            h, d = np.maximum(h, 0), h > 0
+        elif op == 'leaky_relu':
+            alpha = next(args)
+            h, d = np.where(h > 0, h, alpha * h), np.where(h > 0, 1, alpha)
+        elif op == 'relu6':
+            h, d = np.clip(h, 0, 6), (h > 0) & (h < 6)
+        elif op == 'sigmoid':
+            h = 1 / (1 + np.exp(-h))
+            d = h * (1 - h)
+        elif op == 'tanh':
+            h = np.tanh(h)
+            d = 1 - h ** 2
+        elif op == 'swish':
+            s = 1 / (1 + np.exp(-h))
+            h, d = h * s, s + h * s * (1 - s)
+        elif op == 'elu':
+            alpha = next(args)
+            h, d = (np.where(h >= 0, h, alpha * (np.exp(h) - 1)),
+                    np.where(h >= 0, 1, alpha * np.exp(h)))
+        elif op == 'exp':
+            h = np.exp(h)
+            d = h
+        elif op == 'abs':
+            h, d = np.abs(h), np.sign(h)
+        dx = dx * d
+        dz = dz * d
+    return h, dx, dz
+
+
+def ref_fused_elementwise(x, z, ops, op_args):
+    return ref_fused_elementwise_chain(x, z, ops, op_args)[0]
+
+
+def ref_grad_fused_elementwise(x, z, dy, ops, op_args, **kw):
+    # The numerical gradient of a large input is not accurate in float32.
+    _, dx, dz = ref_fused_elementwise_chain(x, z, ops, op_args)
+    grads = [(dy * dx).flatten()]
+    if z is not None:
+        grads.append((dy * dz).flatten())
+    return np.concatenate(grads)
+
+
+@pytest.mark.parametrize("ctx, func_name", ctxs)
+@pytest.mark.parametrize("seed", [313])
+@pytest.mark.parametrize("shape", [(2, 3, 4), (3, 1000)])
+@pytest.mark.parametrize("ops, op_args, with_z", [
+    ('relu', [], False),
+    ('mul_scalar,add_scalar,sigmoid', [0.5, 0.1], False),
+    ('add,relu', [], True),
+    ('mul_scalar,add,leaky_relu', [2.0, 0.2], True),
+    ('tanh,pow_scalar,exp', [2.0], False),
+    ('swish,elu,abs', [0.3], False),
+    ('add_scalar,relu6,mul_scalar', [3.0, -1.5], False),
+])
+def test_fused_elementwise_forward_backward(seed, shape, ops, op_args, with_z, ctx, func_name):
+    from nbla_test_utils import function_tester
+    rng = np.random.RandomState(seed)
+    # Values exact in half so that half and float take the same side of
+    # the kinks of relu-like ops.
+    inputs = [rng.randn(*shape).astype(np.float16).astype(np.float32),
+              rng.randn(*shape).astype(np.float16).astype(np.float32)
+              if with_z else None]
+    function_tester(rng, F.fused_elementwise, ref_fused_elementwise, inputs,
+                    func_args=[ops, op_args], ctx=ctx, func_name=func_name,
+                    atol_f=1e-5, atol_b=3e-2,
+                    ref_grad=ref_grad_fused_elementwise)
+
+
+@pytest.mark.parametrize("ctx, func_name", ctxs)
+@pytest.mark.parametrize("seed", [313])
+@pytest.mark.parametrize("ops, op_args, with_z", [
+    ('mul_scalar,add,tanh', [0.5], True),
+    ('sigmoid,mul_scalar', [2.0], False),
+])
+def test_fused_elementwise_double_backward(seed, ops, op_args, with_z, ctx, func_name):
+    from nbla_test_utils import backward_function_tester
+    rng = np.random.RandomState(seed)
+    inputs = [rng.randn(2, 3).astype(np.float32)]
+    if with_z:
+        inputs.append(rng.randn(2, 3).astype(np.float32))
+    backward_function_tester(rng, F.fused_elementwise,
+                             inputs=inputs,
+                             func_args=[], func_kwargs=dict(ops=ops, op_args=op_args),
+                             atol_accum=1e-3,
+                             dstep=1e-3,
+                             ctx=ctx)
+
+
+@pytest.mark.parametrize("ops, op_args, with_z", [
+    ('relu,unknown', [], False),
+    ('leaky_relu', [], False),
+    ('relu', [0.1], False),
+    ('add,relu', [], False),
+    ('relu', [], True),
+])
+def test_fused_elementwise_invalid_args(ops, op_args, with_z):
+    x = nn.Variable((2, 3))
+    z = nn.Variable((2, 3)) if with_z else None
+    with pytest.raises(RuntimeError):
+        F.fused_elementwise(x, z, ops=ops, op_args=op_args)
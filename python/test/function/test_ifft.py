@@ -61,9 +61,6 @@ def ref_grad_ifft(x, dy, signal_ndim, normalized, **kw):
 @pytest.mark.parametrize("normalized", [True, False])
 def test_fft_forward_backward(seed, ctx, func_name, batch_dims,
                               signal_ndim, dims, normalized):
-    if func_name == "IFFT":
-        pytest.skip("Not implemented in CPU.")
-
     from nbla_test_utils import function_tester, convert_to_float2_array
     rng = np.random.RandomState(seed)
     shape = batch_dims + dims
@@ -92,9 +89,6 @@ def test_fft_forward_backward(seed, ctx, func_name, batch_dims,
 @pytest.mark.parametrize("normalized", [True, False])
 def test_fft_double_backward(seed, ctx, func_name, batch_dims,
                              signal_ndim, dims, normalized):
-    if func_name == "IFFT":
-        pytest.skip("Not implemented in CPU.")
-
     from nbla_test_utils import backward_function_tester, convert_to_float2_array
     rng = np.random.RandomState(seed)
     shape = batch_dims + dims
@@ -119,9 +113,6 @@ def test_fft_double_backward(seed, ctx, func_name, batch_dims,
 @pytest.mark.parametrize("normalized", [True, False])
 def test_fft_forward_backward_with_reset(seed, ctx, func_name, batch_dims, reset_batch_dims,
                                          signal_ndim, dims, normalized):
-    if func_name == "IFFT":
-        pytest.skip("Not implemented in CPU.")
-
     from nbla_test_utils import function_tester, convert_to_float2_array
     rng = np.random.RandomState(seed)
     shape = batch_dims + dims
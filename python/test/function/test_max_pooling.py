@@ -76,8 +76,10 @@ def ref_max_pooling(x, kernel, stride, ignore_border, pad, channel_last):
 def test_max_pooling_2d(seed, inshape, kernel, stride, pad, ignore_border, channel_last,
                         ctx, func_name):
     from nbla_test_utils import function_tester
-    if channel_last and not func_name.endswith('Cudnn'):
-        pytest.skip('Channel last is only supported in Cudnn so far')
+    if channel_last and not (func_name == 'MaxPooling' or func_name.endswith('Cudnn')):
+        pytest.skip('Channel last is only supported in CPU and Cudnn so far')
+    if channel_last and func_name == 'MaxPooling' and len(inshape) == len(kernel):
+        pytest.skip('Channel last in CPU requires a channel axis')
     if channel_last:
         t = refs.ChannelLastToFirstTranspose(len(inshape), len(kernel))
         inshape = tuple(inshape[i] for i in t.inv_axes)
@@ -102,8 +104,10 @@ def test_max_pooling_2d(seed, inshape, kernel, stride, pad, ignore_border, chann
 def test_max_pooling_3d(seed, inshape, kernel, stride, pad, ignore_border, channel_last,
                         ctx, func_name):
     from nbla_test_utils import function_tester
-    if channel_last and not func_name.endswith('Cudnn'):
-        pytest.skip('Channel last is only supported in Cudnn so far')
+    if channel_last and not (func_name == 'MaxPooling' or func_name.endswith('Cudnn')):
+        pytest.skip('Channel last is only supported in CPU and Cudnn so far')
+    if channel_last and func_name == 'MaxPooling' and len(inshape) == len(kernel):
+        pytest.skip('Channel last in CPU requires a channel axis')
     if channel_last:
         t = refs.ChannelLastToFirstTranspose(len(inshape), len(kernel))
         inshape = tuple(inshape[i] for i in t.inv_axes)
@@ -0,0 +1,89 @@
+# Copyright 2023 Sony Group Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import numpy as np
+import nnabla as nn
+import nnabla.functions as F
+from nbla_test_utils import list_context
+from nnabla.testing import assert_allclose
+
+ctxs = list_context('NmsDetection2d')
+
+
+def calculate_iou(a, b):
+    # Boxes of (x_center, y_center, width, height).
+    w = min(a[0] + a[2] / 2, b[0] + b[2] / 2) - \
+        max(a[0] - a[2] / 2, b[0] - b[2] / 2)
+    h = min(a[1] + a[3] / 2, b[1] + b[3] / 2) - \
+        max(a[1] - a[3] / 2, b[1] - b[3] / 2)
+    if w <= 0 or h <= 0:
+        return 0
+    intersection = w * h
+    return intersection / (a[2] * a[3] + b[2] * b[3] - intersection)
+
+
+def ref_nms_detection2d(x, thresh, nms, nms_per_class):
+    y = x.copy()
+    y[..., 4] = np.where(x[..., 4] < thresh, 0, x[..., 4])
+    y[..., 5:] = y[..., 4:5] * x[..., 5:]
+    y[..., 5:] = np.where(y[..., 5:] < thresh, 0, y[..., 5:])
+    for yb in y:
+        if nms_per_class:
+            # A box is suppressed by the kept boxes of the class.
+            for k in range(5, y.shape[2]):
+                order = sorted(np.flatnonzero(yb[:, k]),
+                               key=lambda i: (-yb[i, k], i))
+                kept = []
+                for i in order:
+                    if any(calculate_iou(yb[j], yb[i]) > nms for j in kept):
+                        yb[i, k] = 0
+                    else:
+                        kept.append(i)
+        else:
+            # A box is suppressed by any box having a higher objectness.
+            order = sorted(range(len(yb)), key=lambda i: (-yb[i, 4], i))
+            for n, i in enumerate(order):
+                if yb[i, 4] == 0:
+                    continue
+                if any(calculate_iou(yb[j], yb[i]) > nms for j in order[:n]):
+                    yb[i, 4:] = 0
+    return y
+
+
+@pytest.mark.parametrize("ctx, func_name", ctxs)
+@pytest.mark.parametrize("seed", [313])
+@pytest.mark.parametrize("thresh", [0.3])
+@pytest.mark.parametrize("nms", [0.0, 0.3, 0.6])
+@pytest.mark.parametrize("nms_per_class", [True, False])
+@pytest.mark.parametrize("batch_size, num_boxes, num_classes", [
+    (1, 7, 1),
+    (2, 200, 3),
+])
+def test_nms_detection2d_forward(seed, batch_size, num_boxes, num_classes,
+                                 thresh, nms, nms_per_class, ctx, func_name):
+    rng = np.random.RandomState(seed)
+    x = rng.rand(batch_size, num_boxes, 5 + num_classes).astype(np.float32)
+    # Small boxes so that only their neighbors overlap.
+    x[..., 2:4] = x[..., 2:4] * 0.2 + 0.01
+    # Boxes of the same objectness exercise the order of ties.
+    x[:, ::10, 4] = 0.75
+
+    vx = nn.Variable.from_numpy_array(x)
+    with nn.context_scope(ctx), nn.auto_forward():
+        vy = F.nms_detection2d(vx, thresh, nms, nms_per_class)
+
+    ref = ref_nms_detection2d(x, thresh, nms, nms_per_class)
+    assert_allclose(vy.d, ref)
+    assert func_name == vy.parent.name
@@ -68,6 +68,45 @@ def ref_non_max_suppression(boxes, scores, center_point_box,
     return outputs[0]
 
 
+def calculate_iou(a, b, center_point_box):
+    if center_point_box == 1:
+        # [x_center, y_center, width, height] to [y1, x1, y2, x2]
+        a = [a[1] - a[3] / 2, a[0] - a[2] / 2, a[1] + a[3] / 2, a[0] + a[2] / 2]
+        b = [b[1] - b[3] / 2, b[0] - b[2] / 2, b[1] + b[3] / 2, b[0] + b[2] / 2]
+    ya0, ya1 = sorted([a[0], a[2]])
+    xa0, xa1 = sorted([a[1], a[3]])
+    yb0, yb1 = sorted([b[0], b[2]])
+    xb0, xb1 = sorted([b[1], b[3]])
+    w = min(xa1, xb1) - max(xa0, xb0)
+    h = min(ya1, yb1) - max(ya0, yb0)
+    if w <= 0 or h <= 0:
+        return 0
+    intersection = w * h
+    return intersection / ((xa1 - xa0) * (ya1 - ya0) +
+                           (xb1 - xb0) * (yb1 - yb0) - intersection)
+
+
+def ref_non_max_suppression_numpy(boxes, scores, center_point_box,
+                                  max_output_boxes_per_class, iou_threshold,
+                                  score_threshold):
+    selected = []
+    for b in range(scores.shape[0]):
+        for k in range(scores.shape[1]):
+            s = scores[b, k]
+            order = sorted(np.flatnonzero(s >= score_threshold),
+                           key=lambda i: (-s[i], i))
+            kept = []
+            for i in order:
+                if len(kept) >= max_output_boxes_per_class:
+                    break
+                if all(calculate_iou(boxes[b, j], boxes[b, i],
+                                     center_point_box) <= iou_threshold
+                       for j in kept):
+                    kept.append(i)
+            selected += [[b, k, i] for i in kept]
+    return np.array(selected, dtype=np.int64).reshape(-1, 3)
+
+
 @pytest.mark.parametrize("ctx, func_name", ctxs)
 @pytest.mark.parametrize("seed", [313])
 @pytest.mark.parametrize("center_point_box", [0, 1])
@@ -108,3 +147,72 @@ def test_onnx_non_max_suppression_forward(
 
     assert_allclose(voutput.d, ref)
     assert func_name == voutput.parent.name
+
+
+@pytest.mark.parametrize("ctx, func_name", ctxs)
+def test_onnx_non_max_suppression_imperative(ctx, func_name):
+    from nnabla.function import (
+        get_imperative_cache_capacity, set_imperative_cache_capacity)
+
+    rng = np.random.RandomState(313)
+    boxes = rng.rand(1, 16, 4).astype(np.float32)
+    scores = [rng.rand(1, 2, 16).astype(np.float32) for _ in range(2)]
+    scores[1] *= 0.6
+
+    def nms(s):
+        with nn.context_scope(ctx):
+            return F.onnx_non_max_suppression(
+                nn.NdArray.from_numpy_array(boxes),
+                nn.NdArray.from_numpy_array(s), 0, 16, 0.5, 0.4).data
+
+    capacity = get_imperative_cache_capacity()
+    try:
+        set_imperative_cache_capacity(0)
+        refs = [nms(s) for s in scores]
+        assert refs[0].shape != refs[1].shape
+        set_imperative_cache_capacity(16)
+        # The output is computed at setup, which must not be skipped.
+        for s, ref in zip(scores, refs):
+            assert_allclose(nms(s), ref)
+    finally:
+        set_imperative_cache_capacity(capacity)
+
+
+@pytest.mark.parametrize("ctx, func_name", ctxs)
+@pytest.mark.parametrize("seed", [313])
+@pytest.mark.parametrize("center_point_box", [0, 1])
+@pytest.mark.parametrize("max_output_boxes", [1, 13, 200])
+@pytest.mark.parametrize("iou_threshold", [0.0, 0.3, 0.6])
+@pytest.mark.parametrize("score_threshold", [0.2])
+@pytest.mark.parametrize("batch_size, num_boxes, num_classes", [
+    (1, 7, 1),
+    (2, 200, 3),
+])
+def test_onnx_non_max_suppression_forward_numpy(
+        seed, batch_size, num_boxes, num_classes, center_point_box,
+        max_output_boxes, iou_threshold, score_threshold, ctx, func_name):
+    rng = np.random.RandomState(seed)
+    boxes = rng.rand(batch_size, num_boxes, 4).astype(np.float32)
+    if center_point_box == 1:
+        # Small boxes so that only their neighbors overlap.
+        boxes[..., 2:] = boxes[..., 2:] * 0.2 + 0.01
+    else:
+        # Diagonal corners close to each other in any order.
+        boxes[..., 2:] = boxes[..., :2] + \
+            (boxes[..., 2:] - 0.5).astype(np.float32) * 0.4
+    scores = rng.rand(batch_size, num_classes, num_boxes).astype(np.float32)
+    # Boxes of the same score exercise the order of ties.
+    scores[..., ::10] = 0.75
+
+    vboxes = nn.Variable.from_numpy_array(boxes)
+    vscores = nn.Variable.from_numpy_array(scores)
+    with nn.context_scope(ctx), nn.auto_forward():
+        voutput = F.onnx_non_max_suppression(vboxes, vscores, center_point_box,
+                                             max_output_boxes, iou_threshold,
+                                             score_threshold)
+
+    ref = ref_non_max_suppression_numpy(boxes, scores, center_point_box,
+                                        max_output_boxes, iou_threshold,
+                                        score_threshold)
+    assert_allclose(voutput.d, ref)
+    assert func_name == voutput.parent.name
@@ -102,3 +102,21 @@ def test_forward_backward_with_reset(seed, ishape, reset_ishape, axis, reverse,
     function_tester(rng, F.sort, ref_sort_fw, inputs, ctx=ctx, func_name=fname,
                     func_args=[axis, reverse, with_index, only_index],
                     ref_grad=ref_sort_bw, reset_inputs=reset_inputs)
+
+
+@pytest.mark.parametrize("ctx, fname", ctxs)
+@pytest.mark.parametrize("seed", [313])
+@pytest.mark.parametrize("reverse", [False, True])
+@pytest.mark.parametrize("ishape, axis", [
+    ((1, 100000), -1), ((3, 40000), 1), ((100000, 2), 0), ((64, 8, 128), 1),
+])
+def test_large_forward(seed, ishape, axis, reverse, ctx, fname):
+    # Large inputs are sorted in parallel. Equal values are ordered by index.
+    rng = np.random.RandomState(seed)
+    x = rng.randint(0, 100, size=ishape).astype(np.float32)
+    i = np.argsort(-x if reverse else x, axis, kind='stable')
+    with nn.context_scope(ctx), nn.auto_forward(True):
+        y, j = F.sort(nn.Variable.from_numpy_array(x), axis, reverse,
+                      with_index=True)
+    assert np.array_equal(j.d, i)
+    assert np.array_equal(y.d, np.take_along_axis(x, i, axis))
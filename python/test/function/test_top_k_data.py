@@ -105,6 +105,27 @@ def test_forward_backward(seed, ishape, k, abs, reduce, base_axis, largest,
     # when comparing FP16 to FP32 results of gradient computation.
 
 
+@pytest.mark.parametrize("ctx, fname", ctxs)
+@pytest.mark.parametrize("seed", [313])
+@pytest.mark.parametrize("abs", [False, True])
+@pytest.mark.parametrize("largest", [False, True])
+@pytest.mark.parametrize("k", [3, 500])
+def test_forward_ties(seed, k, abs, largest, ctx, fname):
+    import nnabla as nn
+
+    # Equal elements are taken in the order of their indices whether k is
+    # small or large relative to the size.
+    rng = np.random.RandomState(seed)
+    x = rng.randint(-3, 4, (2, 1000)).astype(np.float32)
+    sign = -1.0 if largest else 1.0
+    ref = np.argsort(sign * (np.abs(x) if abs else x), kind='stable')[:, :k]
+    with nn.context_scope(ctx), nn.auto_forward():
+        y, index = F.top_k_data(nn.Variable.from_numpy_array(x), k, abs=abs,
+                                largest=largest, with_index=True)
+    assert np.array_equal(index.d, ref)
+    assert np.array_equal(y.d, np.take_along_axis(x, ref, axis=1))
+
+
 @pytest.mark.parametrize("ctx, fname", ctxs)
 @pytest.mark.parametrize("seed", [313])
 @pytest.mark.parametrize("ishape, k, base_axis", [((1, 630, 840), 1024, 1),
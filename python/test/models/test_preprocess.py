@@ -0,0 +1,109 @@
+# Copyright 2023 Sony Group Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+import pytest
+import numpy as np
+
+from nnabla.models.preprocess import preprocess_images
+from nnabla.models.utils import CachedNetworkMixin
+
+
+def _images(rng, sizes):
+    return [rng.randint(0, 256, (h, w, 3)).astype(np.uint8) for h, w in sizes]
+
+
+@pytest.mark.parametrize('num_threads', [1, 4])
+@pytest.mark.parametrize('channel_last', [False, True])
+def test_preprocess_images_letterbox(num_threads, channel_last):
+    from nnabla.models.object_detection.utils import letterbox
+    rng = np.random.RandomState(313)
+    images = _images(rng, [(48, 64), (64, 48), (32, 32), (100, 30)])
+    x, sizes = preprocess_images(images, 64, 96, mode='letterbox',
+                                 channel_last=channel_last,
+                                 num_threads=num_threads)
+    assert x.dtype == np.float32
+    for i, img in enumerate(images):
+        ref, new_w, new_h = letterbox(img, 64, 96)
+        if not channel_last:
+            ref = ref.transpose(2, 0, 1)
+        assert np.array_equal(x[i], ref)
+        assert tuple(sizes[i]) == (new_h, new_w)
+
+
+@pytest.mark.parametrize('num_threads', [1, 4])
+def test_preprocess_images_pad(num_threads):
+    from nnabla.models.semantic_segmentation.image_preprocess import preprocess_image_and_label
+    rng = np.random.RandomState(313)
+    images = _images(rng, [(48, 64), (64, 48), (40, 40)])
+    out = np.empty((3, 3, 56, 72), np.float32)
+    x, _ = preprocess_images(images, 56, 72, mode='pad', scale=2 / 255.,
+                             bias=-1., pad_value=127.5, out=out,
+                             num_threads=num_threads)
+    assert x is out
+    for i, img in enumerate(images):
+        ref = preprocess_image_and_label(img, 72, 56).transpose(2, 0, 1)
+        assert np.allclose(x[i], ref, atol=1e-5)
+
+
+def test_preprocess_images_resize():
+    from nnabla.utils.image_utils import imresize
+    rng = np.random.RandomState(313)
+    images = _images(rng, [(48, 64), (30, 20)])
+    x, sizes = preprocess_images(images, 32, 32)
+    for i, img in enumerate(images):
+        assert np.array_equal(x[i], imresize(img, (32, 32)).transpose(2, 0, 1))
+    assert np.array_equal(sizes, [[32, 32], [32, 32]])
+    with pytest.raises(ValueError):
+        preprocess_images(images, 32, 32, out=np.empty((2, 3, 16, 16)))
+
+
+@pytest.mark.parametrize('interpolate', [None, 'bilinear', 'nearest'])
+def test_preprocess_images_grayscale(interpolate):
+    from nnabla.utils.image_utils import imresize
+    rng = np.random.RandomState(313)
+    images = [rng.randint(0, 256, (h, w)).astype(np.uint8)
+              for h, w in [(48, 64), (30, 20)]]
+    kwargs = {} if interpolate is None else {'interpolate': interpolate}
+    x, _ = preprocess_images(images, 32, 32, **kwargs)
+    assert x.shape == (2, 1, 32, 32)
+    # Bilinear by default regardless of the number of channels.
+    for i, img in enumerate(images):
+        ref = imresize(img, (32, 32), interpolate=interpolate or 'bilinear')
+        assert np.array_equal(x[i, 0], ref)
+
+
+def test_cached_network():
+    class Model(CachedNetworkMixin):
+        input_shape = (3, 8, 8)
+        _max_cached_networks = 2
+
+        def __init__(self):
+            self.calls = 0
+
+        def __call__(self, input_var=None, training=False):
+            self.calls += 1
+            return input_var * 2
+
+    model = Model()
+    x, y = model.cached_network()
+    assert x.shape == (1, 3, 8, 8)
+    x2, y2 = model.cached_network()
+    assert x2 is x and y2 is y
+    assert model.cached_network((1, 3, 8, 8), training=False)[0] is not x
+    assert model.cached_network((4, 3, 8, 8))[0].shape == (4, 3, 8, 8)
+    assert model.calls == 3
+    # The least recently used network is discarded.
+    assert model.cached_network()[0] is not x
+    assert model.calls == 4
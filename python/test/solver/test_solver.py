@@ -46,3 +46,95 @@ def test_solver_zeroing():
 
     for x in xs:
         assert_allclose(x.d, 1 - (1 + 0.1))
+
+
+@pytest.mark.parametrize("solver_name, exact", [
+    ("Sgd", True), ("Adagrad", True), ("Momentum", False), ("Adam", False)])
+def test_solver_sparse_grad(solver_name, exact):
+    import nnabla.functions as F
+    rng = np.random.RandomState(313)
+    w_init = rng.randn(10, 3).astype(np.float32)
+    indices = [np.array([[1, 3], [3, 7]]), np.array([[2, 2], [7, 0]])]
+
+    def train(sparse_grad):
+        w = nn.Variable.from_numpy_array(w_init, need_grad=True)
+        w.sparse_grad = sparse_grad
+        x = nn.Variable((2, 2))
+        y = F.sum(F.embed(x, w) ** 2)
+        s = getattr(S, solver_name)()
+        s.set_parameters({"w": w})
+        for idx in indices:
+            x.d = idx
+            y.forward()
+            s.zero_grad()
+            y.backward()
+            if sparse_grad:
+                # Only the sparse gradient is computed.
+                assert w.grad.zeroing
+            s.update()
+        return w.d.copy()
+
+    w_dense = train(False)
+    w_sparse = train(True)
+    touched = np.unique(np.concatenate(indices, axis=None))
+    untouched = np.setdiff1d(np.arange(10), touched)
+    assert_allclose(w_sparse[untouched], w_init[untouched])
+    if exact:
+        assert_allclose(w_sparse, w_dense, rtol=1e-5, atol=1e-6)
+    else:
+        # Rows touched at every step are updated as in the dense update.
+        assert_allclose(w_sparse[7], w_dense[7], rtol=1e-5, atol=1e-6)
+
+
+def test_solver_sparse_grad_densified():
+    import nnabla.functions as F
+    w = nn.Variable.from_numpy_array(np.ones((5, 2), dtype=np.float32),
+                                     need_grad=True)
+    w.sparse_grad = True
+    x = nn.Variable.from_numpy_array(np.array([0, 3, 3]))
+    y = F.sum(F.embed(x, w))
+    s = S.Sgd(1)
+    s.set_parameters({"w": w})
+    s.zero_grad()
+    y.forward()
+    y.backward()
+    s.scale_grad(0.5)
+    assert not s.check_inf_or_nan_grad()
+    # Weight decay adds the sparse gradient to the dense gradient.
+    s.weight_decay(0.1)
+    assert_allclose(w.g, [[0.6, 0.6], [0.1, 0.1], [0.1, 0.1],
+                          [1.1, 1.1], [0.1, 0.1]], rtol=1e-6)
+    s.update()
+    assert_allclose(w.d, [[0.4, 0.4], [0.9, 0.9], [0.9, 0.9],
+                          [-0.1, -0.1], [0.9, 0.9]], rtol=1e-5, atol=1e-6)
+
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_solver_sparse_grad_accumulation(shared):
+    import nnabla.functions as F
+    rng = np.random.RandomState(313)
+    w_init = rng.randn(10, 3).astype(np.float32)
+    indices = [np.array([[1, 3], [3, 7]]), np.array([[2, 2], [7, 0]])]
+
+    def train(sparse_grad):
+        w = nn.Variable.from_numpy_array(w_init, need_grad=True)
+        w.sparse_grad = sparse_grad
+        xs = [nn.Variable.from_numpy_array(idx) for idx in indices]
+        s = S.Sgd(0.1)
+        s.set_parameters({"w": w})
+        s.zero_grad()
+        if shared:
+            # One table used by two embeddings.
+            y = F.sum(F.embed(xs[0], w) ** 2) + F.sum(F.embed(xs[1], w) ** 2)
+            y.forward()
+            y.backward()
+        else:
+            # Gradients accumulated over two backward calls.
+            for x in xs:
+                y = F.sum(F.embed(x, w) ** 2)
+                y.forward()
+                y.backward()
+        s.update()
+        return w.d.copy()
+
+    assert_allclose(train(True), train(False), rtol=1e-5, atol=1e-6)
@@ -40,3 +40,36 @@ def test_imperative_pf():
     import nnabla.parametric_functions as PF
     x = nn.NdArray([2, 3, 4, 5])
     y = PF.batch_normalization(x)
+
+
+def test_imperative_cache():
+    import nnabla.functions as F
+    from nnabla.function import (
+        get_imperative_cache_capacity, set_imperative_cache_capacity,
+        clear_imperative_cache)
+    capacity = get_imperative_cache_capacity()
+    rng = np.random.RandomState(313)
+    try:
+        for c in [capacity, 1, 0]:
+            set_imperative_cache_capacity(c)
+            for shape in [(2, 3), (2, 3), (4, 5), (2, 3)]:
+                x0 = rng.randn(*shape).astype(np.float32)
+                x1 = rng.randn(*shape).astype(np.float32)
+                y = F.add2(nn.NdArray.from_numpy_array(x0),
+                           nn.NdArray.from_numpy_array(x1))
+                assert_allclose(y.data, x0 + x1)
+                # In-place outputs are shared with inputs on every call.
+                a = nn.NdArray.from_numpy_array(x0)
+                r = F.reshape(a, (-1,), inplace=True)
+                assert r.shape == (x0.size,)
+                r.fill(0)
+                assert_allclose(a.data, 0)
+    finally:
+        set_imperative_cache_capacity(capacity)
+        clear_imperative_cache()
+
+    # Functions with a seed are executed from a fresh state.
+    x = nn.NdArray((10,))
+    x.fill(1)
+    assert_allclose(F.dropout(x, 0.5, seed=313).data,
+                    F.dropout(x, 0.5, seed=313).data)
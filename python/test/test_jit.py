@@ -0,0 +1,86 @@
+# Copyright 2023 Sony Group Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+import nnabla as nn
+import nnabla.functions as F
+import nnabla.parametric_functions as PF
+from nnabla.testing import assert_allclose
+
+
+@pytest.mark.parametrize("input_type", ['ndarray', 'variable', 'numpy'])
+def test_jit_replay(input_type):
+    rng = np.random.RandomState(313)
+    calls = []
+
+    @nn.jit
+    def f(x, scale=1.0):
+        calls.append(1)
+        with nn.parameter_scope('jit'):
+            h = F.relu(PF.affine(x, 4, name='fc'))
+        return h * scale, F.sum(h)
+
+    def ref(x, scale=1.0):
+        params = nn.get_parameters()
+        w = params['jit/fc/affine/W'].d
+        b = params['jit/fc/affine/b'].d
+        h = np.maximum(x.reshape(x.shape[0], -1).dot(w) + b, 0)
+        return h * scale, h.sum()
+
+    nn.clear_parameters()
+    try:
+        for shape, scale in [((2, 3), 1.0), ((2, 3), 1.0), ((2, 3), 1.0),
+                             ((2, 3), 2.0), ((2, 3), 1.0)]:
+            x = rng.randn(*shape).astype(np.float32)
+            if input_type == 'ndarray':
+                arg = nn.NdArray.from_numpy_array(x)
+            elif input_type == 'variable':
+                arg = nn.Variable.from_numpy_array(x)
+            else:
+                arg = x
+            y, s = f(arg, scale=scale)
+            cls = nn.Variable if input_type == 'variable' else nn.NdArray
+            assert isinstance(y, cls) and isinstance(s, cls)
+            if input_type == 'variable':
+                assert y.parent is None
+            y_ref, s_ref = ref(x, scale)
+            if input_type == 'variable':
+                y, s = y.data, s.data
+            assert_allclose(y.data, y_ref, rtol=1e-5, atol=1e-6)
+            assert_allclose(s.data, s_ref, rtol=1e-5, atol=1e-5)
+        # Traced for each scale, validated once, and replayed for the others.
+        assert len(calls) == 3
+    finally:
+        nn.clear_parameters()
+
+
+def test_jit_fallback():
+    calls = []
+
+    @nn.jit
+    def f(x):
+        calls.append(1)
+        if x.d.sum() > 0:
+            return F.add_scalar(x, 1)
+        return F.mul_scalar(x, 2)
+
+    for value in [1, -1, 1, -1]:
+        x = np.full((2, 3), value, dtype=np.float32)
+        y = f(x)
+        expected = x + 1 if value > 0 else x * 2
+        assert_allclose(y.data, expected)
+    # Divergence found at the validation falls back to the eager execution.
+    assert len(calls) == 4
@@ -0,0 +1,55 @@
+# Copyright 2023 Sony Group Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from nnabla.monitor import Monitor, MonitorSeries, MonitorTimeElapsed, read_monitor_log
+
+
+@pytest.mark.parametrize("async_write", [False, True])
+def test_monitor_series(tmpdir, async_write):
+    monitor = Monitor(str(tmpdir), async_write=async_write)
+    mons = MonitorSeries('loss value', monitor, interval=2, verbose=False)
+    mont = MonitorTimeElapsed('time', monitor, interval=3, verbose=False)
+    for i in range(10):
+        mons.add(i, i * 2)
+        mont.add(i)
+    monitor.flush()
+
+    series = np.loadtxt(str(tmpdir.join('loss-value.series.txt')))
+    assert np.allclose(series, [[1, 1], [3, 5], [5, 9], [7, 13], [9, 17]])
+    timer = np.loadtxt(str(tmpdir.join('time.timer.txt')))
+    assert np.array_equal(timer[:, 0], [2, 5, 8])
+    monitor.close()
+
+
+@pytest.mark.parametrize("async_write", [False, True])
+def test_monitor_binary_log(tmpdir, async_write):
+    monitor = Monitor(str(tmpdir), async_write=async_write, binary_log=True)
+    mons = MonitorSeries('loss', monitor, interval=1, verbose=False)
+    mont = MonitorTimeElapsed('time', monitor, interval=5, verbose=False)
+    for i in range(10):
+        mons.add(i, i * 0.5)
+        mont.add(i)
+    monitor.close()
+
+    assert not tmpdir.join('loss.series.txt').exists()
+    series = read_monitor_log(str(tmpdir))
+    assert list(series.keys()) == ['loss', 'time', 'time/total']
+    index, value = series['loss']
+    assert np.array_equal(index, np.arange(10))
+    assert np.allclose(value, np.arange(10) * 0.5)
+    assert np.array_equal(series['time'][0], [4, 9])
+    assert np.all(series['time/total'][1] >= series['time'][1])
@@ -131,6 +131,44 @@ def test_nd_array_initialize():
     assert (a.data == ref_a).all()
 
 
+@pytest.mark.parametrize("size", [1, 7, 100000])
+def test_nd_array_cast_float_half(size):
+    rng = np.random.RandomState(313)
+    x = (rng.randn(size) * 10.0 **
+         rng.randint(-9, 6, size=size)).astype(np.float32)
+    x[:min(size, 4)] = [np.inf, -np.inf, 65520, 2.0 ** -25 * 1.5][:size]
+    a = nn.NdArray.from_numpy_array(x)
+    a.cast(np.float16)
+    h = a.data
+    assert h.dtype == np.float16
+    assert np.array_equal(h.view(np.uint16), x.astype(np.float16).view(np.uint16))
+    a.cast(np.float32)
+    assert np.array_equal(a.data, h.astype(np.float32))
+
+
+def test_cast_arrays():
+    rng = np.random.RandomState(313)
+    xs = [rng.randn(*shape).astype(np.float32)
+          for shape in [(3,), (4, 5), (100, 100), (2, 3, 4)]]
+    arrays = [nn.NdArray.from_numpy_array(x) for x in xs]
+    arrays[1] = nn.Variable.from_numpy_array(xs[1])
+    nn.reset_sync_statistics()
+    ds = nn.cast_arrays(arrays, np.float16)
+    for d, x in zip(ds, xs):
+        assert d.dtype == np.float16
+        assert np.array_equal(d, x.astype(np.float16))
+    stats = nn.sync_statistics()
+    assert stats['copies'] == len(xs)
+    assert stats['conversions'] == len(xs)
+    assert stats['transfers'] == 0
+    assert stats['bytes'] == sum(x.size for x in xs) * 2
+
+    # Already in the requested type.
+    nn.reset_sync_statistics()
+    nn.cast_arrays(arrays, np.float16)
+    assert nn.sync_statistics()['copies'] == 0
+
+
 class TestNdArrayNarrow():
 
     def setup_method(self):
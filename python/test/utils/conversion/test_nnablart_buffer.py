@@ -0,0 +1,121 @@
+# Copyright 2023 Sony Group Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+from types import SimpleNamespace
+
+import pytest
+
+from nnabla.utils.converter.nnablart.save_variable_buffer import (
+    plan_variable_arena, plan_variable_offsets, save_variable_buffer)
+
+
+def create_info(sizes, functions, inputs, outputs):
+    # sizes: name to size of Buffer Variables
+    # functions: list of (input names, output names)
+    info = SimpleNamespace()
+    info._network = SimpleNamespace(
+        variable=[SimpleNamespace(name=name, type='Buffer')
+                  for name in sizes],
+        function=[SimpleNamespace(input=i, output=o) for i, o in functions])
+    info._generator_variables = {}
+    info._input_variables = inputs
+    info._output_variables = outputs
+    info._variable_buffer_index = collections.OrderedDict()
+    info._variable_buffer_size = collections.OrderedDict()
+    info._buffer_ids = {}
+    for n, size in enumerate(sizes.values()):
+        info._variable_buffer_index[n] = [n]
+        info._variable_buffer_size[n] = size
+        info._buffer_ids[n] = n
+    return info
+
+
+def check_offsets(info, size_list, offsets, region_size):
+    var_lives = lives(info)
+    assert sorted(offsets) == sorted(var_lives)
+    for i in offsets:
+        assert offsets[i] + size_list[i] <= region_size
+        for j in offsets:
+            if i >= j:
+                continue
+            (bi, ei), (bj, ej) = var_lives[i], var_lives[j]
+            if bi <= ej and bj <= ei:
+                assert (offsets[i] + size_list[i] <= offsets[j] or
+                        offsets[j] + size_list[j] <= offsets[i])
+
+
+def lives(info):
+    # closed intervals of Function indices where each Variable is alive
+    names = [v.name for v in info._network.variable]
+    final_func_idx = len(info._network.function)
+    result = {}
+    for func_idx, func in enumerate(info._network.function):
+        for name in list(func.input) + list(func.output):
+            n = names.index(name)
+            begin = 0 if name in info._input_variables else func_idx
+            end = final_func_idx if name in info._output_variables \
+                else func_idx
+            result[n] = (result.get(n, (begin, end))[0], end)
+    return result
+
+
+cases = [
+    # A chain
+    (collections.OrderedDict([('x', 4), ('a', 8), ('b', 2), ('y', 8)]),
+     [(['x'], ['a']), (['a'], ['b']), (['b'], ['y'])], ['x'], ['y'], 12),
+    # Branches joined later
+    (collections.OrderedDict([('x', 16), ('a', 4), ('b', 12), ('c', 4),
+                              ('d', 12), ('y', 4)]),
+     [(['x'], ['a']), (['x'], ['b']), (['a'], ['c']), (['b'], ['d']),
+      (['c', 'd'], ['y'])], ['x'], ['y'], 32),
+]
+
+
+@pytest.mark.parametrize("sizes, functions, inputs, outputs, arena", cases)
+def test_plan_variable_arena(sizes, functions, inputs, outputs, arena):
+    info = create_info(sizes, functions, inputs, outputs)
+    arena_size, offsets = plan_variable_arena(info)
+    assert arena_size == arena
+    var_lives = lives(info)
+    size_list = list(sizes.values())
+    check_offsets(info, size_list, offsets, arena_size)
+
+    buf_sizes, vidx_to_abidx = save_variable_buffer(info)
+    assert sum(buf_sizes) >= arena_size
+    for i in vidx_to_abidx:
+        assert size_list[i] <= buf_sizes[vidx_to_abidx[i]]
+        for j in vidx_to_abidx:
+            if i < j and vidx_to_abidx[i] == vidx_to_abidx[j]:
+                (bi, ei), (bj, ej) = var_lives[i], var_lives[j]
+                assert ei < bj or ej < bi
+
+
+def test_plan_variable_offsets():
+    # The arena by greedy by size (15) is larger than the buffers (12).
+    sizes = collections.OrderedDict([('v0', 6), ('v1', 4), ('v2', 5),
+                                     ('v3', 6)])
+    info = create_info(sizes, [(['v0'], ['v1']), (['v1'], ['v2']),
+                               (['v2'], ['v3'])], ['v0'], ['v3'])
+    buf_sizes, _ = save_variable_buffer(info)
+    assert plan_variable_arena(info)[0] == 15
+    assert sum(buf_sizes) == 12
+    region_size, offsets = plan_variable_offsets(info)
+    assert region_size == 12
+    check_offsets(info, list(sizes.values()), offsets, region_size)
+    for case in cases:
+        info = create_info(*case[:4])
+        region_size, offsets = plan_variable_offsets(info)
+        assert region_size == case[4]
+        check_offsets(info, list(case[0].values()), offsets, region_size)
@@ -0,0 +1,83 @@
+# Copyright 2023 Sony Group Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import zipfile
+
+import numpy as np
+import pytest
+
+onnx = pytest.importorskip('onnx')
+from onnx import TensorProto, helper, numpy_helper  # noqa: E402
+
+from nnabla.utils import nnabla_pb2  # noqa: E402
+
+
+def save_model(path, params, external):
+    x = helper.make_tensor_value_info('x', TensorProto.FLOAT, [2, 3])
+    y = helper.make_tensor_value_info('y', TensorProto.FLOAT, [2, 3])
+    nodes = [helper.make_node('Add', ['x', 'w0'], ['h']),
+             helper.make_node('Mul', ['h', 'w1'], ['y'])]
+    inits = [numpy_helper.from_array(p, 'w{}'.format(i))
+             for i, p in enumerate(params)]
+    graph = helper.make_graph(nodes, 'g', [x], [y], inits)
+    model = helper.make_model(
+        graph, opset_imports=[helper.make_opsetid('', 13)])
+    model.ir_version = 7
+    onnx.save_model(model, path, save_as_external_data=external,
+                    all_tensors_to_one_file=True, location='weights.bin',
+                    size_threshold=0)
+
+
+@pytest.mark.parametrize('external', [False, True])
+def test_onnx_import_external_data(tmpdir, external):
+    from nnabla.utils.converter.onnx import OnnxImporter
+    from nnabla.utils.converter.nnabla import NnpExporter
+
+    rng = np.random.RandomState(313)
+    params = [rng.randn(2, 3).astype(np.float32) for _ in range(2)]
+    path = os.path.join(str(tmpdir), 'model.onnx')
+    save_model(path, params, external)
+    if external:
+        assert os.path.exists(os.path.join(str(tmpdir), 'weights.bin'))
+
+    nnp = OnnxImporter(path).execute()
+    data = {p.variable_name: np.array(p.data, dtype=np.float32)
+            for p in nnp.protobuf.parameter}
+    for i, p in enumerate(params):
+        assert np.array_equal(data['w{}'.format(i)], p.flatten())
+
+    # Parameters written one at a time parse back as a parameter-only proto.
+    ofile = os.path.join(str(tmpdir), 'model.nnp')
+    NnpExporter(nnp, -1).execute(ofile)
+    with zipfile.ZipFile(ofile) as z:
+        pb = nnabla_pb2.NNablaProtoBuf()
+        pb.ParseFromString(z.read('parameter.protobuf'))
+    assert list(pb.parameter) == list(nnp.protobuf.parameter)
+
+
+def test_onnx_import_external_data_outside_model_dir(tmpdir):
+    from nnabla.utils.converter.onnx import OnnxImporter
+
+    params = [np.ones((2, 3), np.float32), np.ones((2, 3), np.float32)]
+    path = os.path.join(str(tmpdir), 'model.onnx')
+    save_model(path, params, True)
+    model = onnx.load(path, load_external_data=False)
+    for init in model.graph.initializer:
+        for e in init.external_data:
+            if e.key == 'location':
+                e.value = os.path.join('..', 'weights.bin')
+    onnx.save_model(model, path)
+    with pytest.raises(ValueError):
+        OnnxImporter(path).execute()
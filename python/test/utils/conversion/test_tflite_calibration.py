@@ -0,0 +1,79 @@
+# Copyright 2023 Sony Group Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import numpy as np
+import pytest
+
+tf = pytest.importorskip('tensorflow')
+pytest.importorskip('tqdm')
+from nnabla.utils.converter.tflite.quantized_converter import (  # noqa: E402
+    Calibrator, Histogram)
+
+
+def save_model(path):
+    inputs = tf.keras.Input(shape=(6,))
+    outputs = tf.keras.layers.Dense(
+        5, kernel_initializer=tf.keras.initializers.RandomNormal(seed=313))(inputs)
+    model = tf.keras.Model(inputs, outputs)
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    with open(path, 'wb') as f:
+        f.write(converter.convert())
+
+
+def test_histogram_percentile():
+    rng = np.random.RandomState(313)
+    data = rng.randn(4, 10000).astype(np.float32) * [[0.5], [1], [2], [7]]
+    h = Histogram()
+    for d in data:
+        h.add(d)
+    # Histograms of parts merge into the histogram of the whole.
+    h0, h1 = Histogram(), Histogram()
+    h0.add(data[2:])
+    h1.add(data[:2])
+    h0.merge(h1)
+    assert h0.limit == h.limit
+    assert np.array_equal(h0.counts, h.counts)
+
+    bin_width = 2 * h.limit / h.num_bins
+    for percentile in [90.0, 99.0]:
+        lower, upper = h.percentile_range(percentile)
+        tail = (100.0 - percentile) / 2
+        ref_lower, ref_upper = np.percentile(data, [tail, 100.0 - tail])
+        assert abs(lower - ref_lower) <= 2 * bin_width
+        assert abs(upper - ref_upper) <= 2 * bin_width
+
+
+@pytest.mark.parametrize('method', ['minmax', 'percentile'])
+def test_calibrator_batch_size_invariance(tmpdir, method):
+    path = os.path.join(str(tmpdir), 'model.tflite')
+    save_model(path)
+    rng = np.random.RandomState(313)
+    dataset = rng.randn(37, 6).astype(np.float32) * \
+        rng.rand(37, 1).astype(np.float32) * 4
+
+    def calibrate(batch_size, num_threads):
+        calibrator = Calibrator(path, dataset, batch_size=batch_size,
+                                num_threads=num_threads, method=method)
+        assert calibrator.batch_size == min(batch_size, len(dataset))
+        return calibrator.run()
+
+    ref = calibrate(1, 1)
+    for batch_size, num_threads in [(8, 1), (32, 1), (5, 3)]:
+        param = calibrate(batch_size, num_threads)
+        for name in ref:
+            for key in ['min', 'max', 'scale', 'zero_point']:
+                assert param[name][key] == pytest.approx(
+                    ref[name][key], rel=1e-5, abs=1e-6)
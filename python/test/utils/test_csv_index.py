@@ -0,0 +1,102 @@
+# Copyright 2023 Sony Group Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import csv
+import os
+
+import pytest
+
+from nnabla.utils.csv_index import CsvIndex, open_csv_index
+
+
+def _write_csv(path, rows, newline='\n'):
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f, lineterminator=newline)
+        for row in rows:
+            writer.writerow(row)
+
+
+@pytest.mark.parametrize("newline", ['\n', '\r\n'])
+def test_csv_index_values(tmpdir, newline):
+    path = tmpdir.join('dataset.csv').strpath
+    rows = [['x:image', 'y', '#comment', 'z']]
+    for i in range(50):
+        rows.append(['image/{}.png'.format(i), str(i), 'line\n{}'.format(i),
+                     'label{}'.format(i % 3)])
+        if i % 10 == 0:
+            rows.append([])
+    _write_csv(path, rows, newline)
+
+    with open(path, 'rb') as f:
+        index = CsvIndex(f)
+        assert index.header == rows[0]
+        data_rows = [row for row in rows[1:] if row]
+        assert len(index) == len(data_rows)
+        for i, row in enumerate(data_rows):
+            assert index.row(i) == row
+            values = index.values(i)
+            assert values[0] == row[0]
+            assert isinstance(values[1], float) and values[1] == float(row[1])
+            assert values[2] == row[2]
+            assert values[3] == row[3]
+            assert index.values(i, [3, 1]) == [row[3], float(row[1])]
+
+
+def test_csv_index_persistence(tmpdir):
+    path = tmpdir.join('dataset.csv').strpath
+    index_path = path + '.index.npz'
+    _write_csv(path, [['x', 'y']] + [['a{}'.format(i), str(i)]
+                                     for i in range(10)])
+
+    index = open_csv_index(path)
+    assert os.path.exists(index_path)
+    assert len(index) == 10
+    index.close()
+
+    # Saved index is used as long as the CSV is not modified.
+    index = open_csv_index(path)
+    assert index.values(3) == ['a3', 3.0]
+    index.close()
+
+    _write_csv(path, [['x', 'y']] + [['b{}'.format(i), str(i)]
+                                     for i in range(20)])
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    index = open_csv_index(path)
+    assert len(index) == 20
+    assert index.values(3) == ['b3', 3.0]
+    index.close()
+
+
+def test_csv_index_interrupted_save(tmpdir, monkeypatch):
+    from nnabla.utils import csv_index
+    path = tmpdir.join('dataset.csv').strpath
+    _write_csv(path, [['x', 'y']] + [['a{}'.format(i), str(i)]
+                                     for i in range(10)])
+
+    def savez(f, **arrays):
+        f.write(b'PK')
+        raise OSError('No space left on device')
+    monkeypatch.setattr(csv_index.numpy, 'savez', savez)
+    index = open_csv_index(path)
+    assert len(index) == 10
+    index.close()
+    # Neither a truncated index nor a temporary file is left.
+    assert os.listdir(tmpdir.strpath) == ['dataset.csv']
+    monkeypatch.undo()
+
+    index = open_csv_index(path)
+    assert index.values(3) == ['a3', 3.0]
+    index.close()
+    assert os.path.exists(path + '.index.npz')
@@ -270,6 +270,12 @@ def test_data_iterator_concat_datasets(test_data_csv_png_10,
         di.close()
 
 
+def test_data_iterator_concat_datasets_invalid_epoch_size(test_data_csv_png_10):
+    ds = CsvDataSource(test_data_csv_png_10)
+    with pytest.raises(ValueError):
+        data_iterator_concat_datasets([ds, ds], batch_size=2, epoch_size=0)
+
+
 def check_iterator_list(di_list):
     di_size = [di.size for di in di_list]
     assert len(set(di_size)) == 1
@@ -14,9 +14,11 @@
 
 import os
 import pytest
+import numpy as np
 
 # from NNabla
 from nnabla.utils.data_source_implements import SimpleDataSource, CsvDataSource, ConcatDataSource
+from nnabla.utils.data_source_implements import MixtureDataSource
 from nnabla.utils.data_source_loader import load_image
 
 from .conftest import test_data_csv_csv_10, test_data_csv_csv_20
@@ -120,3 +122,71 @@ def test_concat_data_source(test_data_csv_csv_10, test_data_csv_csv_20, shuffle)
         assert sorted(original_order) == sorted(order)
     else:
         assert original_order == order
+
+
+def _simple_sources(sizes, offset=1000):
+    return [SimpleDataSource(lambda i, k=k: (k * offset + i,), size, shuffle=False)
+            for k, size in enumerate(sizes)]
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+@pytest.mark.parametrize("epoch_size, expected_size", [('sum', 60), ('max', 75), ('min', 30), (12, 12)])
+def test_mixture_data_source(shuffle, epoch_size, expected_size):
+    mds = MixtureDataSource(_simple_sources([10, 50]), weights=[1, 2],
+                            epoch_size=epoch_size, shuffle=shuffle, source_shuffle=shuffle)
+    assert mds.size == expected_size
+
+    samples = []
+    for epoch in range(3):
+        mds.reset()
+        assert mds.epoch == epoch
+        samples.append([mds.next()[0] for _ in range(mds.size)])
+    samples = sum(samples, [])
+
+    # Exact proportion of sources in every epoch.
+    for k, size in enumerate([10, 50]):
+        taken = [s % 1000 for s in samples if s // 1000 == k]
+        assert len(taken) == 3 * (expected_size * (k + 1) // 3)
+        # Every sample of a source is taken once before it is repeated.
+        for begin in range(0, len(taken) - size + 1, size):
+            assert sorted(taken[begin:begin + size]) == list(range(size))
+        if not shuffle:
+            assert taken == [i % size for i in range(len(taken))]
+
+
+def test_mixture_data_source_resume():
+    def make(seed, state=None):
+        return MixtureDataSource(_simple_sources([7, 5]), weights=[0.3, 0.7],
+                                 shuffle=True, rng=np.random.RandomState(seed),
+                                 source_shuffle=True, state=state)
+
+    mds = make(313)
+    mds.reset()
+    samples = []
+    state = None
+    for i in range(40):
+        if mds.position >= mds.size:
+            mds.reset()
+        if i == 25:
+            state = mds.get_state()
+        samples.append(mds.next()[0])
+
+    # The orders are restored from the state regardless of rng.
+    resumed = make(1, state)
+    resumed.reset()
+    assert resumed.get_state() == state
+    for s in samples[25:]:
+        if resumed.position >= resumed.size:
+            resumed.reset()
+        assert resumed.next()[0] == s
+
+
+def test_mixture_data_source_invalid_weights():
+    with pytest.raises(ValueError):
+        MixtureDataSource(_simple_sources([3, 4]), weights=[1])
+    with pytest.raises(ValueError):
+        MixtureDataSource(_simple_sources([3, 4]), weights=[0, 0])
+    with pytest.raises(ValueError):
+        MixtureDataSource(_simple_sources([3, 4]), weights=[-1, 2])
+    with pytest.raises(ValueError):
+        MixtureDataSource(_simple_sources([3, 4]), epoch_size=0)
@@ -52,3 +52,156 @@ def test_class_resource_file_reader(tmpdir, source_type):
             with open(file_path, 'r') as f:
                 loaded_source = ResourceFileReader(f)
         return
+
+
+def test_remote_file_cache_lru(tmpdir):
+    from nnabla.utils.data_source_loader import _RemoteFileCache
+
+    cache_dir = tmpdir.join('cache').strpath
+    cache = _RemoteFileCache(cache_dir, 250)
+    fetched = []
+
+    def fetch(name):
+        def f():
+            fetched.append(name)
+            return name.encode('utf-8') * 100
+        return f
+
+    for name in ['a', 'b', 'a', 'c', 'd']:
+        with cache.open('s3://bucket/{}.h5'.format(name), 'v1', fetch(name)) as f:
+            assert f.read() == name.encode('utf-8') * 100
+
+    # 'a' is reused, and least recently used 'b' and 'a' are evicted.
+    assert fetched == ['a', 'b', 'c', 'd']
+    assert not cache.contains('s3://bucket/a.h5', 'v1')
+    assert not cache.contains('s3://bucket/b.h5', 'v1')
+    assert cache.contains('s3://bucket/c.h5', 'v1')
+    assert cache.contains('s3://bucket/d.h5', 'v1')
+
+    # Files are reused by another cache with the same directory.
+    cache2 = _RemoteFileCache(cache_dir, 250)
+    assert cache2.contains('s3://bucket/d.h5', 'v1')
+
+    # A changed remote file is downloaded again.
+    assert not cache.contains('s3://bucket/d.h5', 'v2')
+    with cache.open('s3://bucket/d.h5', 'v2', fetch('e')) as f:
+        assert f.read() == b'e' * 100
+    assert fetched == ['a', 'b', 'c', 'd', 'e']
+
+
+def test_remote_file_cache_eviction(tmpdir):
+    from nnabla.utils.data_source_loader import _RemoteFileCache
+
+    cache_dir = tmpdir.join('cache').strpath
+    cache = _RemoteFileCache(cache_dir, 150)
+    cache.open('s3://bucket/a.h5', 'v1', lambda: b'a' * 100).close()
+    cache2 = _RemoteFileCache(cache_dir, 150)
+    with cache.open('s3://bucket/a.h5', 'v1', lambda: b'x' * 100) as f:
+        # An open file is still readable after it is evicted.
+        cache.open('s3://bucket/b.h5', 'v1', lambda: b'b' * 100).close()
+        assert not cache.contains('s3://bucket/a.h5', 'v1')
+        assert f.read() == b'a' * 100
+
+    # A file removed by another cache sharing the directory is downloaded
+    # again instead of failing.
+    assert cache2.contains('s3://bucket/a.h5', 'v1')
+    with cache2.open('s3://bucket/a.h5', 'v1', lambda: b'c' * 100) as f:
+        assert f.read() == b'c' * 100
+
+
+def test_remote_store_prefetch_error(tmpdir, monkeypatch):
+    from nnabla.utils import data_source_loader
+    from nnabla.utils.data_source_loader import _RemoteFileCache, _RemoteStore
+
+    store = _RemoteStore()
+    store._cache = _RemoteFileCache(tmpdir.join('cache').strpath, 1000)
+    monkeypatch.setattr(store, 'stat', lambda uri: (3, 'v1'))
+
+    def read(uri, begin=None, end=None):
+        raise IOError('unavailable')
+    monkeypatch.setattr(store, 'read', read)
+    warnings = []
+    monkeypatch.setattr(data_source_loader.logger, 'warning',
+                        lambda msg: warnings.append(msg))
+    store.prefetch(['s3://bucket/a.h5'])
+    store._executor.shutdown(wait=True)
+    assert len(warnings) == 1 and 'unavailable' in warnings[0]
+    assert not store.is_cached('s3://bucket/a.h5', (3, 'v1'))
+
+
+@pytest.mark.parametrize("error, calls", [
+    (IOError('HTTP GET x: 404'), 1),
+    ('404', 1),
+    ('403', 1),
+    ('429', 3),
+    ('503', 3),
+    (ConnectionResetError(), 3),
+    (ValueError(), 1),
+])
+def test_retry(monkeypatch, error, calls):
+    from nnabla.utils import data_source_loader
+    from nnabla.utils.data_source_loader import _HTTPError, _retry
+
+    monkeypatch.setattr(data_source_loader.time, 'sleep', lambda t: None)
+    if isinstance(error, str):
+        error = _HTTPError('GET', 'http://host/a.h5', int(error))
+    count = [0]
+
+    def func():
+        count[0] += 1
+        raise error
+    with pytest.raises(type(error)):
+        _retry(func, 'func', max_retry=3)
+    assert count[0] == calls
+
+
+@pytest.mark.parametrize("block_size", [7, 1000, 1 << 20])
+def test_ranged_file(block_size):
+    import io
+    import numpy as np
+    from nnabla.utils.data_source_loader import _RangedFile
+
+    data = np.random.RandomState(313).bytes(5000)
+    ranges = []
+
+    def read_range(begin, end):
+        ranges.append((begin, end))
+        return data[begin:end]
+
+    f = io.BufferedReader(_RangedFile(len(data), read_range,
+                                      block_size=block_size, num_blocks=2))
+    f.seek(2500)
+    assert f.read(1200) == data[2500:3700]
+    f.seek(-10, io.SEEK_END)
+    assert f.read() == data[-10:]
+    f.seek(0)
+    assert f.read() == data
+    assert all(end - begin <= block_size for begin, end in ranges)
+
+
+@pytest.mark.parametrize("shape", [None, (3, 12, 16)])
+def test_load_image_chw_and_normalize_image(tmpdir, shape):
+    import numpy as np
+    from nnabla.utils.image_utils import imsave
+    from nnabla.utils.data_source_loader import load_image_chw, normalize_image, load_image
+
+    tmpdir.ensure(dir=True)
+    img = np.random.RandomState(313).randint(
+        0, 255, size=(24, 32, 3)).astype(np.uint8)
+    paths = [tmpdir.join('{}.png'.format(i)).strpath for i in range(2)]
+    for path in paths:
+        imsave(path, img)
+
+    c, h, w = (3, 24, 32) if shape is None else shape
+    batch = np.zeros((len(paths), c, h, w), dtype=np.uint8)
+    for i, path in enumerate(paths):
+        with open(path, 'rb') as f:
+            load_image_chw(f, shape, out=batch[i])
+    normalized = normalize_image(
+        batch, out=np.empty(batch.shape, dtype=np.float32))
+
+    for i, path in enumerate(paths):
+        with open(path, 'rb') as f:
+            ref = load_image(f, shape, normalize=True)
+        assert ref.shape == (c, h, w)
+        assert np.allclose(normalized[i], ref)
@@ -387,6 +387,31 @@ def small_fbn_resnet(image, test=False, name='fbn-graph-ref'):
     return pred
 
 
+# FusedConvolution Small ResNet
+def fconv_block(x, z, maps, test=False, name='fconv-convblock'):
+    with nn.parameter_scope(name):
+        w, _ = create_conv_weight_bias(x, maps, name='fconv')
+        beta, gamma = create_scale_bias(1, (1, maps, 1, 1))
+        mean, variance = create_scale_bias(2, (1, maps, 1, 1))
+        h = F.fused_convolution(x, w, None, beta, gamma, mean, variance, z,
+                                pad=(1, 1), batch_stat=not test)
+    return h
+
+
+def small_fconv_resnet(image, test=False, name='fconv-graph-ref'):
+    h = image
+    h /= 255.0
+    h = fconv_block(h, None, 16, test=test, name='first-fconv')
+    h = F.max_pooling(h, (2, 2))
+    h = fconv_block(h, h, 16, test=test, name='fconv-cb1')
+    h = fconv_block(h, h, 16, test=test, name='fconv-cb2')
+    h = fconv_block(h, h, 16, test=test, name='fconv-cb3')
+    h = fconv_block(h, h, 16, test=test, name='fconv-cb4')
+    h = F.average_pooling(h, (2, 2))
+    pred = PF.affine(h, 10, name='fconv-fc')
+    return pred
+
+
 # BatchNormalization Small ResNet removed functions
 def bn_rm_resblock(x, maps, kernel=(3, 3), pad=(1, 1), stride=(1, 1),
                    test=False, w_bias=False, name='convblock'):
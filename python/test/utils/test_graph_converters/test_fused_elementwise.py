@@ -0,0 +1,62 @@
+# Copyright 2023 Sony Group Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import pytest
+import numpy as np
+
+import nnabla as nn
+import nnabla.functions as F
+import nnabla.parametric_functions as PF
+import nnabla.experimental.graph_converters as GC
+
+
+def elementwise_graph(x, z):
+    h = PF.affine(x, 16, name='fc0')
+    h = F.leaky_relu(h * 0.5 + 1.0, 0.2)
+    h = F.relu(h + z)
+    h = F.sigmoid(h)
+    # A branch ends the chain. Add2 joins the chain through its first input.
+    h0 = F.tanh(h)
+    h1 = F.exp(F.mul_scalar(h, -1.0))
+    return PF.affine(h0 + h1, 10, name='fc1')
+
+
+def fused_elementwise_graph(x, z):
+    h = PF.affine(x, 16, name='fc0')
+    h = F.fused_elementwise(h, z, ops='mul_scalar,add_scalar,leaky_relu,add,relu,sigmoid',
+                            op_args=[0.5, 1.0, 0.2])
+    h1 = F.fused_elementwise(h, ops='mul_scalar,exp', op_args=[-1.0])
+    h = F.fused_elementwise(h, h1, ops='tanh,add')
+    return PF.affine(h, 10, name='fc1')
+
+
+@pytest.mark.parametrize('seed', [313])
+def test_fused_elementwise(seed):
+    from .graph_converter_test_utils import structure_tester, value_tester
+
+    rng = np.random.RandomState(seed)
+    x = nn.Variable.from_numpy_array(rng.randn(4, 8))
+    z = nn.Variable.from_numpy_array(rng.randn(4, 16))
+
+    y_tgt = elementwise_graph(x, z)
+
+    modifiers = [GC.FusedElementwiseModifier()]
+    y_act = GC.GraphConverter(modifiers).convert(y_tgt)
+
+    y_ref = fused_elementwise_graph(x, z)
+
+    structure_tester(y_ref, y_act)
+    value_tester(y_tgt, y_act, rtol=1e-04, atol=1e-05)
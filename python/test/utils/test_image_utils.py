@@ -194,3 +194,53 @@ def test_imresize(backend, size, channel_first, img):
     resized_img = image_utils.imresize(img, size, channel_first=channel_first)
 
     assert resized_img.shape[channel_axis:channel_axis + 2] == size
+
+
+@pytest.mark.parametrize("backend", ["PilBackend", "Cv2Backend"])
+@pytest.mark.parametrize("grayscale", [False, True])
+@pytest.mark.parametrize("size", [(40, 30), (100, 80), (320, 240)])
+def test_imread_reduce_on_decode(tmpdir, backend, grayscale, size):
+    _change_backend(backend)
+
+    tmpdir.ensure(dir=True)
+    img_file = tmpdir.join("tmp.jpg").strpath
+
+    # Smooth image, which is hardly changed by decoding at a reduced resolution.
+    y, x = np.mgrid[0:240, 0:320]
+    img = np.stack([x * 255 // 320, y * 255 // 240,
+                    (x + y) * 255 // 560], axis=-1).astype(np.uint8)
+    image_utils.imsave(img_file, img)
+
+    ref = image_utils.imread(img_file, grayscale=grayscale, size=size,
+                             channel_first=True)
+    reduced = image_utils.imread(img_file, grayscale=grayscale, size=size,
+                                 channel_first=True, reduce_on_decode=True)
+
+    assert reduced.shape == ref.shape
+    assert reduced.dtype == ref.dtype
+    assert np.abs(reduced.astype(np.int32) - ref).mean() < 2
+
+
+@pytest.mark.parametrize("backend", ["PilBackend", "Cv2Backend"])
+@pytest.mark.parametrize("grayscale", [False, True])
+def test_imread_reduce_on_decode_exif_orientation(tmpdir, backend, grayscale):
+    from PIL import Image
+    _change_backend(backend)
+
+    tmpdir.ensure(dir=True)
+    img_file = tmpdir.join("tmp.jpg").strpath
+    img = np.zeros((40, 80, 3), dtype=np.uint8)
+    img[:, :40] = 200
+    # Rotated by 90 degrees on display.
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    Image.fromarray(img).save(img_file, exif=exif.tobytes())
+
+    ref = image_utils.imread(img_file, grayscale=grayscale)
+    size = (ref.shape[1] // 2, ref.shape[0] // 2)
+    ref = image_utils.imread(img_file, grayscale=grayscale, size=size)
+    reduced = image_utils.imread(img_file, grayscale=grayscale, size=size,
+                                 reduce_on_decode=True)
+    # The orientation is the same as the full decoding.
+    assert reduced.shape == ref.shape
+    assert np.abs(reduced.astype(np.int32) - ref).mean() < 8
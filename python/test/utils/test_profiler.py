@@ -14,6 +14,7 @@
 
 
 import sys
+import pytest
 import nnabla as nn
 import nnabla.functions as F
 import nnabla.parametric_functions as PF
@@ -22,7 +23,8 @@ import numpy as np
 
 from nnabla.ext_utils import get_extension_context
 
-from nnabla.utils.profiler import GraphProfiler, GraphProfilerCsvWriter
+from nnabla.utils.profiler import GraphProfiler, GraphProfilerCsvWriter, GraphProfilerRooflineCsvWriter
+from nnabla.utils.profiler import estimate_function_cost, roofline_stat
 
 
 def cnn(x, n_class):
@@ -64,3 +66,53 @@ def test_profiling():
 
     csv_writer = GraphProfilerCsvWriter(gb=B, file=sys.stdout)
     csv_writer.write()
+
+    roofline_writer = GraphProfilerRooflineCsvWriter(
+        gb=B, file=sys.stdout, peak_gflops=100., peak_bandwidth=10.)
+    roofline_writer.write()
+
+    report = B.roofline_report(peak_gflops=100., peak_bandwidth=10.)
+    assert len(report["functions"]) == len(B.result["forward"])
+    assert report["total"].flops == sum(
+        r.flops for r in report["functions"])
+    assert all(r.bound in ("compute", "memory") for r in report["functions"])
+
+
+@pytest.mark.parametrize("name, inputs_shape, outputs_shape, args, flops", [
+    ("Convolution", [(2, 3, 8, 8), (4, 3, 3, 3), (4,)], [(2, 4, 6, 6)], {},
+     2 * 2 * 4 * 6 * 6 * 3 * 3 * 3 + 2 * 4 * 6 * 6),
+    ("Convolution", [(2, 8, 8, 3), (4, 3, 3, 3)], [(2, 6, 6, 4)],
+     {"channel_last": True}, 2 * 2 * 4 * 6 * 6 * 3 * 3 * 3),
+    ("DepthwiseConvolution", [(1, 4, 5, 5), (4, 3, 3)], [(1, 4, 3, 3)], {},
+     2 * 4 * 3 * 3 * 3 * 3),
+    ("Affine", [(8, 16), (16, 10), (10,)], [(8, 10)], {"base_axis": 1},
+     2 * 8 * 16 * 10 + 8 * 10),
+    ("BatchMatmul", [(3, 4, 5), (3, 5, 6)], [(3, 4, 6)], {}, 2 * 3 * 4 * 6 * 5),
+    ("BatchMatmul", [(3, 5, 4), (3, 5, 6)], [(3, 4, 6)],
+     {"transpose_a": True}, 2 * 3 * 4 * 6 * 5),
+    ("MaxPooling", [(1, 2, 4, 4)], [(1, 2, 2, 2)], {"kernel": (2, 2)}, 32),
+    ("ReLU", [(2, 3)], [(2, 3)], {}, 6),
+    ("Reshape", [(2, 3)], [(3, 2)], {}, 0),
+])
+def test_estimate_function_cost(name, inputs_shape, outputs_shape, args, flops):
+    cost = estimate_function_cost(name, inputs_shape, outputs_shape, args)
+    assert cost.flops == flops
+    assert cost.bytes_read == 4 * sum(int(np.prod(s)) for s in inputs_shape)
+    assert cost.bytes_written == 4 * \
+        sum(int(np.prod(s)) for s in outputs_shape)
+
+
+def test_roofline_stat():
+    cost = estimate_function_cost("ReLU", [(1000,)], [(1000,)])
+    stat = roofline_stat("ReLU", cost, 1e-6,
+                         peak_gflops=100., peak_bandwidth=10.)
+    assert stat.arithmetic_intensity == 1000. / 8000.
+    assert stat.bound == "memory"
+    assert np.isclose(stat.gflops_per_sec, 1.)
+
+    cost = estimate_function_cost(
+        "BatchMatmul", [(1, 256, 256), (1, 256, 256)], [(1, 256, 256)])
+    stat = roofline_stat("BatchMatmul", cost, 1e-3,
+                         peak_gflops=100., peak_bandwidth=10.)
+    assert stat.bound == "compute"
+    assert roofline_stat("BatchMatmul", cost, 1e-3).bound is None
@@ -60,3 +60,36 @@ def test_pack_and_unpack(total_length, enforce_sorted, batch_first, shapes, seed
 
         np.testing.assert_allclose(padded_sequence0.d,
                                    padded_sequence.d)
+
+
+@pytest.mark.parametrize("ctx, func_name", ctxs)
+@pytest.mark.parametrize("seed", [313])
+@pytest.mark.parametrize("lengths", [[4, 3, 3, 2, 2], [2, 4, 1, 4], [3]])
+@pytest.mark.parametrize("batch_first", [False, True])
+@pytest.mark.parametrize("padding_value", [0.0, -1.0])
+def test_pad_sequence(padding_value, batch_first, lengths, seed, ctx,
+                      func_name):
+    rng = np.random.RandomState(seed)
+    sequences = [rng.randn(l, 3).astype(np.float32) for l in lengths]
+
+    B, T = len(lengths), max(lengths)
+    ref = np.full((T, B, 3), padding_value, dtype=np.float32)
+    for b, s in enumerate(sequences):
+        ref[:len(s), b] = s
+    if batch_first:
+        ref = ref.transpose(1, 0, 2)
+
+    sequences = [nn.Variable.from_numpy_array(s, need_grad=True)
+                 for s in sequences]
+    with nn.context_scope(ctx), nn.auto_forward():
+        for _ in range(2):  # The second call uses the cached index map.
+            padded_sequence = rnn_utils.pad_sequence(sequences, batch_first,
+                                                     padding_value)
+            np.testing.assert_allclose(padded_sequence.d, ref)
+
+    # Gradients flow to each sequence except for the padding.
+    for s in sequences:
+        s.grad.zero()
+    padded_sequence.backward(clear_buffer=True)
+    for s in sequences:
+        np.testing.assert_allclose(s.g, np.ones(s.shape))
@@ -31,6 +31,22 @@ void cpu_array_copy(const Array *src, Array *dst) {
   std::copy(p_src, p_src + src->size(), p_dst);
 }
 
+// Conversions between float and half are done in bulk.
+template <>
+inline void cpu_array_copy<float, Half>(const Array *src, Array *dst) {
+  const float *p_src = src->const_pointer<float>();
+  uint16_t *p_dst = reinterpret_cast<uint16_t *>(dst->pointer<Half>());
+  float2halfbits_n(p_src, p_dst, std::max<Size_t>(src->size(), 1));
+}
+
+template <>
+inline void cpu_array_copy<Half, float>(const Array *src, Array *dst) {
+  const uint16_t *p_src =
+      reinterpret_cast<const uint16_t *>(src->const_pointer<Half>());
+  float *p_dst = dst->pointer<float>();
+  halfbits2float_n(p_src, p_dst, std::max<Size_t>(src->size(), 1));
+}
+
 template <typename T> void cpu_fill(Array *self, float value) {
   T *ptr = self->pointer<T>();
   size_t size = self->size();
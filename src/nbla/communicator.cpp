@@ -168,6 +168,94 @@ void Communicator::all_gather(NdArrayPtr ndarray,
   NBLA_ERROR(error_code::not_implemented, "CPU all_gather is not implemented.")
 }
 
+void Communicator::all_reduce_sparse_grad(const vector<VariablePtr> &vars,
+                                          bool division, const string &group) {
+  // Row indices are sent as two parts below 2^20, which are exact in float32
+  // but not in half. The packs are therefore only communicated in float32.
+  for (auto &backend : ctx_.backend) {
+    const auto pos = backend.find(':');
+    NBLA_CHECK(pos == string::npos || backend.substr(pos + 1) == "float",
+               error_code::value,
+               "all_reduce_sparse_grad requires the float type config of the "
+               "communicator. Given %s.",
+               backend.c_str());
+  }
+  const int64_t row_base = 1 << 20;
+  const int n_workers = group == "world" ? size_ : find_group(group).size();
+  Context cpu_ctx{{"cpu:float"}, "CpuCachedArray", "0"};
+  for (auto &var : vars) {
+    auto sparse = var->sparse_grad();
+    const bool dense = !var->grad()->array()->zeroing();
+    const Size_t row_size = var->size(1);
+
+    // Exchange the number of rows and whether the dense grad is computed.
+    auto info = make_shared<NdArray>(Shape_t{2});
+    float *info_data =
+        info->cast(dtypes::FLOAT, cpu_ctx, true)->pointer<float>();
+    info_data[0] = sparse->rows.size();
+    info_data[1] = dense;
+    vector<NdArrayPtr> infos;
+    for (int i = 0; i < n_workers; ++i) {
+      infos.push_back(make_shared<NdArray>(Shape_t{2}));
+    }
+    all_gather(info, infos, group);
+    Size_t max_rows = 0;
+    bool any_dense = false;
+    for (auto &a : infos) {
+      const float *d = a->get(dtypes::FLOAT, cpu_ctx)->const_pointer<float>();
+      max_rows = std::max(max_rows, (Size_t)d[0]);
+      any_dense = any_dense || d[1] != 0;
+    }
+
+    if (any_dense) {
+      sparse_grad_to_dense(var.get());
+      all_reduce(var->grad(), division, false, group);
+      continue;
+    }
+    if (max_rows == 0) {
+      continue;
+    }
+
+    // Gather rows padded to the same number. A padded row has a negative
+    // index.
+    const Shape_t shape{max_rows, row_size + 2};
+    auto pack = make_shared<NdArray>(shape);
+    float *pack_data =
+        pack->cast(dtypes::FLOAT, cpu_ctx, true)->pointer<float>();
+    std::fill(pack_data, pack_data + max_rows * (row_size + 2), -1.f);
+    for (size_t i = 0; i < sparse->rows.size(); ++i) {
+      float *dst = pack_data + i * (row_size + 2);
+      dst[0] = sparse->rows[i] / row_base;
+      dst[1] = sparse->rows[i] % row_base;
+      std::copy_n(sparse->values.data() + i * row_size, row_size, dst + 2);
+    }
+    vector<NdArrayPtr> packs;
+    for (int i = 0; i < n_workers; ++i) {
+      packs.push_back(make_shared<NdArray>(shape));
+    }
+    all_gather(pack, packs, group);
+
+    sparse->clear();
+    for (auto &a : packs) {
+      const float *d = a->get(dtypes::FLOAT, cpu_ctx)->const_pointer<float>();
+      vector<int64_t> rows;
+      vector<float> values;
+      for (Size_t i = 0; i < max_rows; ++i) {
+        const float *src = d + i * (row_size + 2);
+        if (src[0] < 0) {
+          break;
+        }
+        rows.push_back((int64_t)src[0] * row_base + (int64_t)src[1]);
+        values.insert(values.end(), src + 2, src + 2 + row_size);
+      }
+      sparse->add(rows.data(), values.data(), rows.size(), row_size);
+    }
+    if (division) {
+      sparse->scale(1.f / n_workers);
+    }
+  }
+}
+
 void Communicator::reduce_async(bool division) {
   NBLA_ERROR(error_code::not_implemented,
              "CPU reduce_async is not implemented.")
@@ -433,9 +433,11 @@ class BackwardCallback {
         continue;
 
       // If memset with 0 is reserved, accum is not used. For shared case, the
-      // first is only non-accum.
+      // first is only non-accum. A non-empty row-sparse gradient is a part of
+      // the gradient already computed, e.g. by another Embed sharing the
+      // weight or by a previous backward, so it is accumulated.
       auto array = inputs[i]->variable()->grad()->array();
-      if (array->zeroing()) {
+      if (array->zeroing() && inputs[i]->variable()->sparse_grad()->empty()) {
         bool input_shared = false;
         for (vector<CgVariablePtr>::size_type j = 0; j < inputs.size(); j++) {
           if (i == j) {
@@ -87,7 +87,7 @@ void Affine<T>::forward_impl(const Variables &inputs,
   ConstMatrixMap<T> mx(x, i_row_, i_col_);
   ConstMatrixMap<T> mw(w, w_row_, w_col_);
   MatrixMap<T> my(y, o_row_, o_col_);
-  my = mx * mw;
+  matmul<T>(my, false, mx, false, mw, false, false);
   if (inputs.size() == 3) {
     // With bias
     const T *b = inputs[2]->get_data_pointer<T>(this->ctx_);
@@ -111,20 +111,14 @@ void Affine<T>::backward_impl(const Variables &inputs, const Variables &outputs,
     const T *w = inputs[1]->get_data_pointer<T>(this->ctx_);
     MatrixMap<T> mdx(dx, i_row_, i_col_);
     ConstMatrixMap<T> mw(w, w_row_, w_col_);
-    if (accum[0])
-      mdx += mdy * mw.transpose();
-    else
-      mdx = mdy * mw.transpose();
+    matmul<T>(mdx, false, mdy, false, mw, true, accum[0]);
   }
   if (propagate_down[1]) {
     const T *x = inputs[0]->get_data_pointer<T>(this->ctx_);
     T *dw = inputs[1]->cast_grad_and_get_pointer<T>(this->ctx_, !accum[1]);
     ConstMatrixMap<T> mx(x, i_row_, i_col_);
     MatrixMap<T> mdw(dw, w_row_, w_col_);
-    if (accum[1])
-      mdw += mx.transpose() * mdy;
-    else
-      mdw = mx.transpose() * mdy;
+    matmul<T>(mdw, false, mx, true, mdy, false, accum[1]);
   }
   if (inputs.size() == 3 && propagate_down[2]) {
     // With bias.
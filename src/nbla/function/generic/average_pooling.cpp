@@ -201,21 +201,134 @@ inline void backward_map(T *dx, const T *dy, bool including_pad,
     }
   }
 }
+
+// Increment N-d index `idx` in [start, end). Return false after the last one.
+inline bool next_index(vector<int> &idx, const vector<int> &start,
+                       const vector<int> &end) {
+  for (int a = idx.size() - 1; a >= 0; --a) {
+    if (++idx[a] < end[a])
+      return true;
+    idx[a] = start[a];
+  }
+  return false;
+}
+
+// Compute the pooling window of the output position y_idx, returning its size.
+inline int pool_window(const vector<int> &y_idx, bool including_pad,
+                       const vector<int> &x_shape, const vector<int> &kernel,
+                       const vector<int> &stride, const vector<int> &pad,
+                       vector<int> &pool_start, vector<int> &pool_end) {
+  const int ndim = kernel.size();
+  for (int a = 0; a < ndim; a++) {
+    pool_start[a] = y_idx[a] * stride[a] - pad[a];
+    pool_end[a] = min(pool_start[a] + kernel[a], x_shape[a] + pad[a]);
+  }
+  int pool_size = 1;
+  for (int a = 0; a < ndim; a++) {
+    pool_size *= pool_end[a] - pool_start[a];
+  }
+  for (int a = 0; a < ndim; a++) {
+    pool_start[a] = max(pool_start[a], 0);
+    pool_end[a] = min(pool_end[a], x_shape[a]);
+  }
+  if (including_pad == false) {
+    pool_size = 1;
+    for (int a = 0; a < ndim; a++) {
+      pool_size *= pool_end[a] - pool_start[a];
+    }
+  }
+  return pool_size;
+}
+
+inline bool is_empty_window(const vector<int> &pool_start,
+                            const vector<int> &pool_end) {
+  for (size_t a = 0; a < pool_start.size(); a++) {
+    if (pool_start[a] >= pool_end[a])
+      return true;
+  }
+  return false;
+}
+
+// Channel-last maps, where x and y are (shape..., channels). All channels of
+// an output position are computed together over contiguous memory.
+template <typename T>
+inline void forward_map_channel_last(const T *x, T *y, bool including_pad,
+                                     const int channels,
+                                     const vector<int> &x_shape,
+                                     const vector<int> &y_shape,
+                                     const vector<int> &kernel,
+                                     const vector<int> &stride,
+                                     const vector<int> &pad) {
+  const int ndim = kernel.size();
+  const vector<int> zeros(ndim, 0);
+  vector<int> y_idx(ndim, 0), pool_start(ndim), pool_end(ndim);
+
+  do {
+    const int pool_size = pool_window(y_idx, including_pad, x_shape, kernel,
+                                      stride, pad, pool_start, pool_end);
+    std::fill(y, y + channels, (T)0);
+    auto x_idx = pool_start;
+    if (!is_empty_window(pool_start, pool_end)) {
+      do {
+        int idx = 0;
+        for (int a = 0; a < ndim; a++)
+          idx = idx * x_shape[a] + x_idx[a];
+        const T *x_p = x + idx * channels;
+        for (int c = 0; c < channels; ++c)
+          y[c] += x_p[c];
+      } while (next_index(x_idx, pool_start, pool_end));
+    }
+    for (int c = 0; c < channels; ++c)
+      y[c] /= pool_size;
+    y += channels;
+  } while (next_index(y_idx, zeros, y_shape));
+}
+
+template <typename T>
+inline void backward_map_channel_last(T *dx, const T *dy, bool including_pad,
+                                      const int channels,
+                                      const vector<int> &x_shape,
+                                      const vector<int> &y_shape,
+                                      const vector<int> &kernel,
+                                      const vector<int> &stride,
+                                      const vector<int> &pad) {
+  const int ndim = kernel.size();
+  const vector<int> zeros(ndim, 0);
+  vector<int> y_idx(ndim, 0), pool_start(ndim), pool_end(ndim);
+  vector<T> pool_grad(channels);
+
+  do {
+    const int pool_size = pool_window(y_idx, including_pad, x_shape, kernel,
+                                      stride, pad, pool_start, pool_end);
+    for (int c = 0; c < channels; ++c)
+      pool_grad[c] = dy[c] / pool_size;
+    auto x_idx = pool_start;
+    if (!is_empty_window(pool_start, pool_end)) {
+      do {
+        int idx = 0;
+        for (int a = 0; a < ndim; a++)
+          idx = idx * x_shape[a] + x_idx[a];
+        T *dx_p = dx + idx * channels;
+        for (int c = 0; c < channels; ++c)
+          dx_p[c] += pool_grad[c];
+      } while (next_index(x_idx, pool_start, pool_end));
+    }
+    dy += channels;
+  } while (next_index(y_idx, zeros, y_shape));
+}
 } // namespace avg_pooling_impl
 
 using avg_pooling_impl::Array2D;
 using avg_pooling_impl::Array3D;
 using avg_pooling_impl::backward_map;
+using avg_pooling_impl::backward_map_channel_last;
 using avg_pooling_impl::forward_map;
+using avg_pooling_impl::forward_map_channel_last;
 using avg_pooling_impl::v2a;
 
 template <typename T>
 void AveragePooling<T>::forward_impl(const Variables &inputs,
                                      const Variables &outputs) {
-  NBLA_CHECK(!this->channel_last_, error_code::not_implemented,
-             "The passed argument channel_last=true is not supported in CPU "
-             "pooling.");
-
   auto x = inputs[0]->get_data_pointer<T>(this->ctx_);
   auto y = outputs[0]->cast_data_and_get_pointer<T>(this->ctx_, true);
 
@@ -224,11 +337,31 @@ void AveragePooling<T>::forward_impl(const Variables &inputs,
   const Shape_t &instrides = inputs[0]->strides();
   const Shape_t &outstrides = outputs[0]->strides();
   const int s = inshape.size() - this->kernel_.size();
-  const int x_map_size = (s == 0) ? inputs[0]->size() : instrides[s - 1];
-  const int y_map_size = (s == 0) ? outputs[0]->size() : outstrides[s - 1];
+  NBLA_CHECK(!this->channel_last_ || s > 0, error_code::value,
+             "channel_last=true requires the channel axis after the spatial "
+             "axes in CPU pooling.");
+  // A map is the spatial axes, followed by the channel axis if channel_last.
+  const int b = this->channel_last_ ? s - 1 : s;
+  const int x_map_size = (b == 0) ? inputs[0]->size() : instrides[b - 1];
+  const int y_map_size = (b == 0) ? outputs[0]->size() : outstrides[b - 1];
   const int n_map = inputs[0]->size() / x_map_size;
 
-  if (this->kernel_.size() == 2) {
+  if (this->channel_last_) {
+    const int channels = inshape.back();
+    const vector<int> x_shape(inshape.begin() + b, inshape.end() - 1);
+    const vector<int> y_shape(outshape.begin() + b, outshape.end() - 1);
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static)
+#endif
+    for (int n = 0; n < n_map; n++) {
+      forward_map_channel_last(x + n * x_map_size, y + n * y_map_size,
+                               this->including_pad_, channels, x_shape,
+                               y_shape, this->kernel_, this->stride_,
+                               this->pad_);
+    }
+  }
+
+  else if (this->kernel_.size() == 2) {
     const auto x_stride = v2a<Size_t, int, 2>(instrides, s);
     const auto x_shape = v2a<Size_t, int, 2>(inshape, s);
     const auto y_shape = v2a<Size_t, int, 2>(outshape, s);
@@ -269,10 +402,6 @@ void AveragePooling<T>::backward_impl(const Variables &inputs,
   if (!propagate_down[0])
     return;
 
-  NBLA_CHECK(!this->channel_last_, error_code::not_implemented,
-             "The passed argument channel_last=true is not supported in CPU "
-             "pooling.");
-
   if (!accum[0])
     inputs[0]->grad()->zero();
 
@@ -284,11 +413,30 @@ void AveragePooling<T>::backward_impl(const Variables &inputs,
   const Shape_t &instrides = inputs[0]->strides();
   const Shape_t &outstrides = outputs[0]->strides();
   const int s = inshape.size() - this->kernel_.size();
-  const int x_map_size = (s == 0) ? inputs[0]->size() : instrides[s - 1];
-  const int y_map_size = (s == 0) ? outputs[0]->size() : outstrides[s - 1];
+  NBLA_CHECK(!this->channel_last_ || s > 0, error_code::value,
+             "channel_last=true requires the channel axis after the spatial "
+             "axes in CPU pooling.");
+  // A map is the spatial axes, followed by the channel axis if channel_last.
+  const int b = this->channel_last_ ? s - 1 : s;
+  const int x_map_size = (b == 0) ? inputs[0]->size() : instrides[b - 1];
+  const int y_map_size = (b == 0) ? outputs[0]->size() : outstrides[b - 1];
   const int n_map = outputs[0]->size() / y_map_size;
 
-  if (this->kernel_.size() == 2) {
+  if (this->channel_last_) {
+    const int channels = inshape.back();
+    const vector<int> x_shape(inshape.begin() + b, inshape.end() - 1);
+    const vector<int> y_shape(outshape.begin() + b, outshape.end() - 1);
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static)
+#endif
+    for (int n = 0; n < n_map; n++) {
+      backward_map_channel_last(dx + n * x_map_size, dy + n * y_map_size,
+                                including_pad_, channels, x_shape, y_shape,
+                                this->kernel_, this->stride_, this->pad_);
+    }
+  }
+
+  else if (this->kernel_.size() == 2) {
     const auto x_stride = v2a<Size_t, int, 2>(instrides, s);
     const auto x_shape = v2a<Size_t, int, 2>(inshape, s);
     const auto y_shape = v2a<Size_t, int, 2>(outshape, s);
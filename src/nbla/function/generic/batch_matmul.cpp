@@ -122,7 +122,7 @@ void BatchMatmul<T>::forward_impl(const Variables &inputs,
     ConstMatrixMap<T> ma(a + s * offset_a_, row_a_, col_a_);
     ConstMatrixMap<T> mb(b + s * offset_b_, row_b_, col_b_);
     MatrixMap<T> my(y + s * offset_y_, row_y_, col_y_);
-    NBLA_EIGEN_MATMUL_T(my, false, ma, transpose_a_, mb, transpose_b_, =);
+    matmul<T>(my, false, ma, transpose_a_, mb, transpose_b_, false);
   }
 }
 
@@ -160,13 +160,8 @@ void BatchMatmul<T>::backward_impl(const Variables &inputs,
       MatrixMap<T> mda(da + s * offset_a_, row_a_, col_a_);
       ConstMatrixMap<T> mb(b + s * offset_b_, row_b_, col_b_);
       ConstMatrixMap<T> mdy(dy + s * offset_y_, row_y_, col_y_);
-      if (accum[0] && !f_broadcast_a_) {
-        NBLA_EIGEN_MATMUL_T(mda, transpose_a_, mdy, false, mb, !transpose_b_,
-                            +=);
-      } else {
-        NBLA_EIGEN_MATMUL_T(mda, transpose_a_, mdy, false, mb, !transpose_b_,
-                            =);
-      }
+      matmul<T>(mda, transpose_a_, mdy, false, mb, !transpose_b_,
+                accum[0] && !f_broadcast_a_);
     }
     // Broadcast backward
     if (f_broadcast_a_)
@@ -190,13 +185,8 @@ void BatchMatmul<T>::backward_impl(const Variables &inputs,
       ConstMatrixMap<T> ma(a + s * offset_a_, row_a_, col_a_);
       MatrixMap<T> mdb(db + s * offset_b_, row_b_, col_b_);
       ConstMatrixMap<T> mdy(dy + s * offset_y_, row_y_, col_y_);
-      if (accum[1] && !f_broadcast_b_) {
-        NBLA_EIGEN_MATMUL_T(mdb, transpose_b_, ma, !transpose_a_, mdy, false,
-                            +=);
-      } else {
-        NBLA_EIGEN_MATMUL_T(mdb, transpose_b_, ma, !transpose_a_, mdy, false,
-                            =);
-      }
+      matmul<T>(mdb, transpose_b_, ma, !transpose_a_, mdy, false,
+                accum[1] && !f_broadcast_b_);
     }
     // Broadcast backward
     if (f_broadcast_b_)
@@ -186,6 +186,45 @@ void BatchNormalization<T>::forward_impl_batch(const Variables &inputs,
   T *rv = inputs[v_idx_]->template cast_data_and_get_pointer<T>(
       this->ctx_); // running var
 
+  if (size2_ == 1) {
+    // The axis is the innermost (e.g., channel-last): x is (size0_, size1_).
+    // Statistics of all channels are accumulated together by walking x row by
+    // row.
+    std::fill(m, m + size1_, (T)0);
+    std::fill(v, v + size1_, (T)0);
+    for (int i0 = 0; i0 < size0_; ++i0) {
+      const T *x_i0 = x + i0 * size1_;
+      for (int i1 = 0; i1 < size1_; ++i1) {
+        const T value = x_i0[i1];
+        m[i1] += value;
+        v[i1] += value * value;
+      }
+    }
+    vector<T> scale(size1_), shift(size1_);
+    for (int i1 = 0; i1 < size1_; ++i1) {
+      m[i1] /= size02_;
+      v[i1] = v[i1] / size02_ - m[i1] * m[i1];
+      if (update_inputs) {
+        rm[i1] = decay_rate_ * rm[i1] + (1 - decay_rate_) * m[i1];
+        rv[i1] = decay_rate_ * rv[i1] +
+                 (1 - decay_rate_) * v[i1] * size02_ / (size02_ - 1);
+      }
+      scale[i1] = (gamma ? gamma[i1] : (T)1) / std::sqrt(v[i1] + (T)eps_);
+      shift[i1] = (beta ? beta[i1] : (T)0) - m[i1] * scale[i1];
+    }
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static)
+#endif
+    for (int i0 = 0; i0 < size0_; ++i0) {
+      const T *x_i0 = x + i0 * size1_;
+      T *y_i0 = y + i0 * size1_;
+      for (int i1 = 0; i1 < size1_; ++i1) {
+        y_i0[i1] = x_i0[i1] * scale[i1] + shift[i1];
+      }
+    }
+    return;
+  }
+
   // Main loop
   for (int i1 = 0; i1 < size1_; ++i1) {
     // Mean and variance calculation and their moving ones.
@@ -242,20 +281,36 @@ void BatchNormalization<T>::forward_impl_global(const Variables &inputs,
   // Output
   T *y = outputs[0]->cast_data_and_get_pointer<T>(this->ctx_, true);
 
+  // Subtract mean and divide by std, and apply beta and gamma, which are
+  // folded into a scale and a shift per channel.
+  vector<T> scale(size1_), shift(size1_);
+  for (int i1 = 0; i1 < size1_; ++i1) {
+    scale[i1] = (gamma ? gamma[i1] : (T)1) / std::sqrt(rv[i1] + (T)eps_);
+    shift[i1] = (beta ? beta[i1] : (T)0) - rm[i1] * scale[i1];
+  }
+  if (size2_ == 1) {
+    // Channel-last
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static)
+#endif
+    for (int i0 = 0; i0 < size0_; ++i0) {
+      const T *x_i0 = x + i0 * size1_;
+      T *y_i0 = y + i0 * size1_;
+      for (int i1 = 0; i1 < size1_; ++i1) {
+        y_i0[i1] = x_i0[i1] * scale[i1] + shift[i1];
+      }
+    }
+    return;
+  }
 #ifdef _OPENMP
 #pragma omp parallel for schedule(static)
 #endif
-  // Subtract mean and divide by std, and apply beta and gamma.
   for (int i1 = 0; i1 < size1_; ++i1) {
     for (int i02 = 0; i02 < size02_; ++i02) {
       const int i0 = i02 / size2_;
       const int i2 = i02 % size2_;
       const int i = i0 * size12_ + i1 * size2_ + i2;
-      const T mean = rm[i1];
-      const T stdvar = std::sqrt(rv[i1] + (T)eps_);
-      const auto scale = gamma ? gamma[i1] : (T)1;
-      const auto bias = beta ? beta[i1] : (T)0;
-      y[i] = (x[i] - mean) * scale / stdvar + bias;
+      y[i] = x[i] * scale[i1] + shift[i1];
     }
   }
 }
@@ -311,41 +366,87 @@ void BatchNormalization<T>::backward_impl_batch(
       dm = batch_mean->get_grad_pointer<T>(this->ctx_);
       dv = batch_var->get_grad_pointer<T>(this->ctx_);
     }
-    for (int i1 = 0; i1 < size1_; ++i1) {
-      // Compute gradient wrt mean and var respectively
-      T dvar = 0;
-      T dmean = 0;
-      T tmp = 0;
-      for (int i02 = 0; i02 < size02_; ++i02) {
-        const int i0 = i02 / size2_;
-        const int i2 = i02 % size2_;
-        const int i = i0 * size12_ + i1 * size2_ + i2;
-        const auto scale = g ? g[i1] : (T)1;
-        const T dxh = dy[i] * scale; // Grad of x hat.
-        const T cx = x[i] - m[i1];   // x - mean
-        dvar += dxh * cx;
-        dmean += dxh;
-        tmp += cx;
+    if (size2_ == 1) {
+      // Channel-last: the reductions of all channels are computed together.
+      vector<T> sum_dxh(size1_, (T)0), sum_dxh_cx(size1_, (T)0),
+          sum_cx(size1_, (T)0);
+      for (int i0 = 0; i0 < size0_; ++i0) {
+        const T *x_i0 = x + i0 * size1_;
+        const T *dy_i0 = dy + i0 * size1_;
+        for (int i1 = 0; i1 < size1_; ++i1) {
+          const auto scale = g ? g[i1] : (T)1;
+          const T dxh = dy_i0[i1] * scale; // Grad of x hat.
+          const T cx = x_i0[i1] - m[i1];   // x - mean
+          sum_dxh_cx[i1] += dxh * cx;
+          sum_dxh[i1] += dxh;
+          sum_cx[i1] += cx;
+        }
       }
-      // dm and dv are set if batch mean and var are used following functions
-      // in computation graph.
-      dvar = dvar * (T)-0.5 * std::pow(v[i1] + (T)eps_, (T)-1.5) +
-             (dv ? dv[i1] : (T)0);
-      dmean = dmean * (-1 / std::sqrt(v[i1] + (T)eps_)) +
-              dvar * (-2) * tmp / (size02_) + (dm ? dm[i1] : (T)0);
-      // Compute gradient wrt x.
-      for (int i02 = 0; i02 < size02_; ++i02) {
-        const int i0 = i02 / size2_;
-        const int i2 = i02 % size2_;
-        const int i = i0 * size12_ + i1 * size2_ + i2;
-        const auto scale = g ? g[i1] : (T)1;
-        const T grad = dy[i] * scale / std::sqrt(v[i1] + (T)eps_) +
-                       dvar * 2 * (x[i] - m[i1]) / (size02_) +
-                       dmean / (size02_);
-        if (accum[0])
-          dx[i] += grad;
-        else
-          dx[i] = grad;
+      // Gradient wrt x is a * dy + b * x + c per channel.
+      vector<T> a(size1_), b(size1_), c(size1_);
+      for (int i1 = 0; i1 < size1_; ++i1) {
+        const T dvar = sum_dxh_cx[i1] * (T)-0.5 *
+                           std::pow(v[i1] + (T)eps_, (T)-1.5) +
+                       (dv ? dv[i1] : (T)0);
+        const T dmean = sum_dxh[i1] * (-1 / std::sqrt(v[i1] + (T)eps_)) +
+                        dvar * (-2) * sum_cx[i1] / (size02_) +
+                        (dm ? dm[i1] : (T)0);
+        a[i1] = (g ? g[i1] : (T)1) / std::sqrt(v[i1] + (T)eps_);
+        b[i1] = dvar * 2 / (size02_);
+        c[i1] = dmean / (size02_) - b[i1] * m[i1];
+      }
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static)
+#endif
+      for (int i0 = 0; i0 < size0_; ++i0) {
+        const T *x_i0 = x + i0 * size1_;
+        const T *dy_i0 = dy + i0 * size1_;
+        T *dx_i0 = dx + i0 * size1_;
+        for (int i1 = 0; i1 < size1_; ++i1) {
+          const T grad = a[i1] * dy_i0[i1] + b[i1] * x_i0[i1] + c[i1];
+          if (accum[0])
+            dx_i0[i1] += grad;
+          else
+            dx_i0[i1] = grad;
+        }
+      }
+    } else {
+      for (int i1 = 0; i1 < size1_; ++i1) {
+        // Compute gradient wrt mean and var respectively
+        T dvar = 0;
+        T dmean = 0;
+        T tmp = 0;
+        for (int i02 = 0; i02 < size02_; ++i02) {
+          const int i0 = i02 / size2_;
+          const int i2 = i02 % size2_;
+          const int i = i0 * size12_ + i1 * size2_ + i2;
+          const auto scale = g ? g[i1] : (T)1;
+          const T dxh = dy[i] * scale; // Grad of x hat.
+          const T cx = x[i] - m[i1];   // x - mean
+          dvar += dxh * cx;
+          dmean += dxh;
+          tmp += cx;
+        }
+        // dm and dv are set if batch mean and var are used following functions
+        // in computation graph.
+        dvar = dvar * (T)-0.5 * std::pow(v[i1] + (T)eps_, (T)-1.5) +
+               (dv ? dv[i1] : (T)0);
+        dmean = dmean * (-1 / std::sqrt(v[i1] + (T)eps_)) +
+                dvar * (-2) * tmp / (size02_) + (dm ? dm[i1] : (T)0);
+        // Compute gradient wrt x.
+        for (int i02 = 0; i02 < size02_; ++i02) {
+          const int i0 = i02 / size2_;
+          const int i2 = i02 % size2_;
+          const int i = i0 * size12_ + i1 * size2_ + i2;
+          const auto scale = g ? g[i1] : (T)1;
+          const T grad = dy[i] * scale / std::sqrt(v[i1] + (T)eps_) +
+                         dvar * 2 * (x[i] - m[i1]) / (size02_) +
+                         dmean / (size02_);
+          if (accum[0])
+            dx[i] += grad;
+          else
+            dx[i] = grad;
+        }
       }
     }
   }
@@ -359,6 +460,28 @@ void BatchNormalization<T>::backward_impl_batch(
                      : nullptr;
     const bool b_accum = pd_beta ? accum[b_idx_] : false;
     const bool g_accum = pd_gamma ? accum[g_idx_] : false;
+    if (size2_ == 1) {
+      // Channel-last
+      vector<T> dbv(size1_, (T)0), dgv(size1_, (T)0), rstd(size1_);
+      for (int i1 = 0; i1 < size1_; ++i1) {
+        rstd[i1] = 1 / std::sqrt(v[i1] + (T)eps_);
+      }
+      for (int i0 = 0; i0 < size0_; ++i0) {
+        const T *x_i0 = x + i0 * size1_;
+        const T *dy_i0 = dy + i0 * size1_;
+        for (int i1 = 0; i1 < size1_; ++i1) {
+          dbv[i1] += dy_i0[i1];
+          dgv[i1] += dy_i0[i1] * (x_i0[i1] - m[i1]) * rstd[i1];
+        }
+      }
+      for (int i1 = 0; i1 < size1_; ++i1) {
+        if (db)
+          db[i1] = (b_accum ? db[i1] : (T)0) + dbv[i1];
+        if (dg)
+          dg[i1] = (g_accum ? dg[i1] : (T)0) + dgv[i1];
+      }
+      return;
+    }
     for (int i1 = 0; i1 < size1_; ++i1) {
       T dbv = b_accum ? db[i1] : (T)0;
       T dgv = g_accum ? dg[i1] : (T)0;
@@ -37,6 +37,108 @@ NBLA_REGISTER_FUNCTION_SOURCE(Convolution, int,    // base_axis
                               int,                 // group
                               bool);               // channel_last
 
+namespace {
+// Increment N-d counter `idx` in `shape`, in C order.
+inline void increment_index(vector<int> &idx, const vector<int> &shape) {
+  for (int d = static_cast<int>(idx.size()) - 1; d >= 0; --d) {
+    if (++idx[d] < shape[d])
+      return;
+    idx[d] = 0;
+  }
+}
+
+// Visit all pairs of an output position p and a kernel position k in the
+// channel-last layout, calling func(p, k, i) with the flattened spatial index
+// i of the input, or -1 if it points into the padding.
+template <typename F>
+void for_each_patch_channel_last(const vector<int> &shape_i,
+                                 const vector<int> &shape_o,
+                                 const vector<int> &kernel,
+                                 const vector<int> &pad,
+                                 const vector<int> &stride,
+                                 const vector<int> &dilation, F func) {
+  const int ndim = shape_i.size();
+  Size_t size_o = 1, size_k = 1;
+  for (int d = 0; d < ndim; ++d) {
+    size_o *= shape_o[d];
+    size_k *= kernel[d];
+  }
+  vector<int> po(ndim, 0), pk(ndim, 0);
+  for (Size_t p = 0; p < size_o; ++p) {
+    std::fill(pk.begin(), pk.end(), 0);
+    for (Size_t k = 0; k < size_k; ++k) {
+      Size_t i = 0;
+      bool inside = true;
+      for (int d = 0; d < ndim; ++d) {
+        const int c = po[d] * stride[d] - pad[d] + pk[d] * dilation[d];
+        inside = inside && c >= 0 && c < shape_i[d];
+        i = i * shape_i[d] + c;
+      }
+      func(p, k, inside ? i : -1);
+      increment_index(pk, kernel);
+    }
+    increment_index(po, shape_o);
+  }
+}
+
+// Channel-last im2col. The patches of group g are stored as a
+// (P, K * C/group) matrix at col + g * P * K * C/group, where P and K are the
+// numbers of output and kernel positions.
+template <typename T>
+void unfold_to_patches_channel_last(
+    const T *x, T *col, Size_t channels, int group, const vector<int> &shape_i,
+    const vector<int> &shape_o, const vector<int> &kernel,
+    const vector<int> &pad, const vector<int> &stride,
+    const vector<int> &dilation) {
+  const Size_t cg = channels / group;
+  Size_t size_o = 1, size_k = 1;
+  for (size_t d = 0; d < kernel.size(); ++d) {
+    size_o *= shape_o[d];
+    size_k *= kernel[d];
+  }
+  for_each_patch_channel_last(
+      shape_i, shape_o, kernel, pad, stride, dilation,
+      [&](Size_t p, Size_t k, Size_t i) {
+        for (int g = 0; g < group; ++g) {
+          T *col_pk = col + (g * size_o * size_k + p * size_k + k) * cg;
+          if (i < 0) {
+            std::fill(col_pk, col_pk + cg, (T)0);
+          } else {
+            const T *x_i = x + i * channels + g * cg;
+            std::copy(x_i, x_i + cg, col_pk);
+          }
+        }
+      });
+}
+
+// Channel-last col2im, accumulating into x.
+template <typename T>
+void fold_from_patches_channel_last(
+    const T *col, T *x, Size_t channels, int group, const vector<int> &shape_i,
+    const vector<int> &shape_o, const vector<int> &kernel,
+    const vector<int> &pad, const vector<int> &stride,
+    const vector<int> &dilation) {
+  const Size_t cg = channels / group;
+  Size_t size_o = 1, size_k = 1;
+  for (size_t d = 0; d < kernel.size(); ++d) {
+    size_o *= shape_o[d];
+    size_k *= kernel[d];
+  }
+  for_each_patch_channel_last(
+      shape_i, shape_o, kernel, pad, stride, dilation,
+      [&](Size_t p, Size_t k, Size_t i) {
+        if (i < 0)
+          return;
+        for (int g = 0; g < group; ++g) {
+          const T *col_pk = col + (g * size_o * size_k + p * size_k + k) * cg;
+          T *x_i = x + i * channels + g * cg;
+          for (Size_t c = 0; c < cg; ++c)
+            x_i[c] += col_pk[c];
+        }
+      });
+}
+} // namespace
+
 template <typename T>
 void Convolution<T>::setup_impl(const Variables &inputs,
                                 const Variables &outputs) {
@@ -160,9 +262,10 @@ void Convolution<T>::setup_impl(const Variables &inputs,
 template <class T>
 void Convolution<T>::forward_impl(const Variables &inputs,
                                   const Variables &outputs) {
-  NBLA_CHECK(!channel_last_, error_code::not_implemented,
-             "The passed argument channel_last_=true is not supported in CPU "
-             "Convolution.");
+  if (channel_last_) {
+    forward_channel_last(inputs, outputs);
+    return;
+  }
 
   using namespace ::nbla::eigen;
   // Getting variable pointers
@@ -182,10 +285,11 @@ void Convolution<T>::forward_impl(const Variables &inputs,
     // Convolution by matrix multiplication
     T *y_n = y + n * inner_size_o_;
     for (int g = 0; g < group_; ++g) {
-      MatrixMap<T> mcol(col + g * row_col_ * col_col_, row_col_, col_col_);
+      ConstMatrixMap<T> mcol(col + g * row_col_ * col_col_, row_col_,
+                             col_col_);
       ConstMatrixMap<T> mk(w + g * row_w_ * col_w_, row_w_, col_w_);
       MatrixMap<T> my(y_n + g * row_y_ * col_y_, row_y_, col_y_);
-      my = mk * mcol;
+      matmul<T>(my, false, mk, false, mcol, false, false);
     }
     // Adding bias
     if (inputs.size() == 3) {
@@ -206,9 +310,10 @@ void Convolution<T>::backward_impl(const Variables &inputs,
     return;
   }
 
-  NBLA_CHECK(!channel_last_, error_code::not_implemented,
-             "The passed argument channel_last_=true is not supported in CPU "
-             "Convolution.");
+  if (channel_last_) {
+    backward_channel_last(inputs, outputs, propagate_down, accum);
+    return;
+  }
 
   using namespace ::nbla::eigen;
   const T *dy = outputs[0]->get_grad_pointer<T>(this->ctx_);
@@ -251,7 +356,7 @@ void Convolution<T>::backward_impl(const Variables &inputs,
         ConstMatrixMap<T> mdy(dy_n + g * row_y_ * col_y_, row_y_, col_y_);
         ConstMatrixMap<T> mw(w + g * row_w_ * col_w_, row_w_, col_w_);
         MatrixMap<T> mdx(col + g * row_col_ * col_col_, row_col_, col_col_);
-        mdx = mw.transpose() * mdy;
+        matmul<T>(mdx, false, mw, true, mdy, false, false);
       }
       // col2im
       fold_from_patches<T>(col, dx_n, channels_i_, spatial_shape_i_, kernel_,
@@ -268,7 +373,7 @@ void Convolution<T>::backward_impl(const Variables &inputs,
         ConstMatrixMap<T> mcol(col + g * row_col_ * col_col_, row_col_,
                                col_col_);
         MatrixMap<T> mdw(dw + g * row_w_ * col_w_, row_w_, col_w_);
-        mdw += mdy * mcol.transpose();
+        matmul<T>(mdw, false, mdy, false, mcol, true, true);
       }
     }
     if (inputs.size() == 3 && propagate_down[2]) {
@@ -279,4 +384,218 @@ void Convolution<T>::backward_impl(const Variables &inputs,
   }
   col_.data()->array()->clear();
 }
+
+// In channel-last layout, a sample is a (P, C) matrix where P is the number of
+// spatial positions, and weights are (K', k..., C/group). Patches are unfolded
+// into a (P, k... * C/group) matrix per group so that convolution is
+// col * W^T. Outputs of a group are columns of y with the stride K'.
+// Depthwise convolution (one input channel per group) is computed directly
+// over the channels instead of many tiny matrix products.
+template <class T>
+void Convolution<T>::forward_channel_last(const Variables &inputs,
+                                          const Variables &outputs) {
+  using namespace ::nbla::eigen;
+  using StridedMatrixMap = Eigen::Map<Matrix<T>, 0, Eigen::OuterStride<>>;
+  const T *x = inputs[0]->get_data_pointer<T>(this->ctx_);
+  const T *w = inputs[1]->get_data_pointer<T>(this->ctx_);
+  T *y = outputs[0]->cast_data_and_get_pointer<T>(this->ctx_, true);
+  const T *b = nullptr;
+  if (inputs.size() == 3) {
+    b = inputs[2]->get_data_pointer<T>(this->ctx_);
+  }
+  const Size_t size_o = col_col_;
+  const Size_t size_k = inner_size_k_ / channels_g_;
+  const Size_t C = channels_i_;
+  const Size_t OC = channels_o_;
+  const Size_t Cg = channels_g_;
+  const Size_t OCg = row_w_;
+
+  if (Cg == 1) {
+    // Depthwise: transpose weights to (k..., K') to be contiguous over
+    // output channels.
+    const Size_t m = OCg;
+    vector<T> wt(size_k * OC);
+    for (Size_t oc = 0; oc < OC; ++oc)
+      for (Size_t k = 0; k < size_k; ++k)
+        wt[k * OC + oc] = w[oc * size_k + k];
+    for (int n = 0; n < outer_size_; ++n) {
+      const T *x_n = x + n * inner_size_i_;
+      T *y_n = y + n * inner_size_o_;
+      for (Size_t p = 0; p < size_o; ++p)
+        for (Size_t oc = 0; oc < OC; ++oc)
+          y_n[p * OC + oc] = b ? b[oc] : (T)0;
+      for_each_patch_channel_last(
+          spatial_shape_i_, spatial_shape_o_, kernel_, pad_, stride_,
+          dilation_, [&](Size_t p, Size_t k, Size_t i) {
+            if (i < 0)
+              return;
+            const T *x_i = x_n + i * C;
+            const T *w_k = wt.data() + k * OC;
+            T *y_p = y_n + p * OC;
+            if (m == 1) {
+              for (Size_t c = 0; c < C; ++c)
+                y_p[c] += x_i[c] * w_k[c];
+            } else {
+              for (Size_t oc = 0; oc < OC; ++oc)
+                y_p[oc] += x_i[oc / m] * w_k[oc];
+            }
+          });
+    }
+    return;
+  }
+
+  T *col = col_.cast_data_and_get_pointer<T>(this->ctx_, true);
+  for (int n = 0; n < outer_size_; ++n) {
+    const T *x_n = x + n * inner_size_i_;
+    T *y_n = y + n * inner_size_o_;
+    // Im2col
+    unfold_to_patches_channel_last<T>(x_n, col, C, group_, spatial_shape_i_,
+                                      spatial_shape_o_, kernel_, pad_, stride_,
+                                      dilation_);
+    // Convolution by matrix multiplication
+    for (int g = 0; g < group_; ++g) {
+      ConstMatrixMap<T> mcol(col + g * row_col_ * col_col_, col_col_,
+                             row_col_);
+      ConstMatrixMap<T> mk(w + g * row_w_ * col_w_, row_w_, col_w_);
+      StridedMatrixMap my(y_n + g * OCg, size_o, OCg, Eigen::OuterStride<>(OC));
+      my = mcol * mk.transpose();
+    }
+    // Adding bias
+    if (b) {
+      MatrixMap<T> my(y_n, size_o, OC);
+      my.rowwise() += ConstRowVectorMap<T>(b, OC);
+    }
+  }
+  col_.data()->array()->clear();
+}
+
+template <class T>
+void Convolution<T>::backward_channel_last(const Variables &inputs,
+                                           const Variables &outputs,
+                                           const vector<bool> &propagate_down,
+                                           const vector<bool> &accum) {
+  using namespace ::nbla::eigen;
+  using ConstStridedMatrixMap =
+      Eigen::Map<const Matrix<T>, 0, Eigen::OuterStride<>>;
+  const T *dy = outputs[0]->get_grad_pointer<T>(this->ctx_);
+  const T *x = nullptr;
+  const T *w = nullptr;
+  T *dx = nullptr;
+  T *dw = nullptr;
+  T *db = nullptr;
+  if (propagate_down[0]) {
+    if (!accum[0])
+      inputs[0]->grad()->zero();
+    w = inputs[1]->get_data_pointer<T>(this->ctx_);
+    dx = inputs[0]->cast_grad_and_get_pointer<T>(this->ctx_, false);
+  }
+  if (propagate_down[1]) {
+    if (!accum[1])
+      inputs[1]->grad()->zero();
+    x = inputs[0]->get_data_pointer<T>(this->ctx_);
+    dw = inputs[1]->cast_grad_and_get_pointer<T>(this->ctx_, false);
+  }
+  if (inputs.size() == 3 && propagate_down[2]) {
+    if (!accum[2])
+      inputs[2]->grad()->zero();
+    db = inputs[2]->cast_grad_and_get_pointer<T>(this->ctx_, false);
+  }
+  const Size_t size_o = col_col_;
+  const Size_t size_k = inner_size_k_ / channels_g_;
+  const Size_t C = channels_i_;
+  const Size_t OC = channels_o_;
+  const Size_t Cg = channels_g_;
+  const Size_t OCg = row_w_;
+
+  // Backprop to bias
+  if (db) {
+    ConstMatrixMap<T> mdy(dy, outer_size_ * size_o, OC);
+    RowVectorMap<T>(db, OC) += mdy.colwise().sum();
+  }
+  if (!(dx || dw)) {
+    return;
+  }
+
+  if (Cg == 1) {
+    // Depthwise
+    const Size_t m = OCg;
+    vector<T> wt, dwt;
+    if (dx) {
+      wt.resize(size_k * OC);
+      for (Size_t oc = 0; oc < OC; ++oc)
+        for (Size_t k = 0; k < size_k; ++k)
+          wt[k * OC + oc] = w[oc * size_k + k];
+    }
+    if (dw) {
+      dwt.assign(size_k * OC, (T)0);
+    }
+    for (int n = 0; n < outer_size_; ++n) {
+      const T *dy_n = dy + n * inner_size_o_;
+      const T *x_n = x ? x + n * inner_size_i_ : nullptr;
+      T *dx_n = dx ? dx + n * inner_size_i_ : nullptr;
+      for_each_patch_channel_last(
+          spatial_shape_i_, spatial_shape_o_, kernel_, pad_, stride_,
+          dilation_, [&](Size_t p, Size_t k, Size_t i) {
+            if (i < 0)
+              return;
+            const T *dy_p = dy_n + p * OC;
+            if (dx_n) {
+              const T *w_k = wt.data() + k * OC;
+              T *dx_i = dx_n + i * C;
+              for (Size_t oc = 0; oc < OC; ++oc)
+                dx_i[oc / m] += dy_p[oc] * w_k[oc];
+            }
+            if (x_n) {
+              const T *x_i = x_n + i * C;
+              T *dw_k = dwt.data() + k * OC;
+              for (Size_t oc = 0; oc < OC; ++oc)
+                dw_k[oc] += x_i[oc / m] * dy_p[oc];
+            }
+          });
+    }
+    if (dw) {
+      for (Size_t oc = 0; oc < OC; ++oc)
+        for (Size_t k = 0; k < size_k; ++k)
+          dw[oc * size_k + k] += dwt[k * OC + oc];
+    }
+    return;
+  }
+
+  T *col = col_.cast_data_and_get_pointer<T>(this->ctx_, true);
+  for (int n = 0; n < outer_size_; ++n) {
+    const T *dy_n = dy + n * inner_size_o_;
+    if (dx) {
+      // Backprop to image
+      T *dx_n = dx + n * inner_size_i_;
+      for (int g = 0; g < group_; ++g) {
+        ConstStridedMatrixMap mdy(dy_n + g * OCg, size_o, OCg,
+                                  Eigen::OuterStride<>(OC));
+        ConstMatrixMap<T> mw(w + g * row_w_ * col_w_, row_w_, col_w_);
+        MatrixMap<T> mcol(col + g * row_col_ * col_col_, col_col_, row_col_);
+        mcol = mdy * mw;
+      }
+      // col2im
+      fold_from_patches_channel_last<T>(col, dx_n, C, group_, spatial_shape_i_,
+                                        spatial_shape_o_, kernel_, pad_,
+                                        stride_, dilation_);
+    }
+    if (dw) {
+      // Backprop to weights
+      // im2col
+      unfold_to_patches_channel_last<T>(
+          x + n * inner_size_i_, col, C, group_, spatial_shape_i_,
+          spatial_shape_o_, kernel_, pad_, stride_, dilation_);
+      // Weight convolution by matrix multiplication
+      for (int g = 0; g < group_; ++g) {
+        ConstStridedMatrixMap mdy(dy_n + g * OCg, size_o, OCg,
+                                  Eigen::OuterStride<>(OC));
+        ConstMatrixMap<T> mcol(col + g * row_col_ * col_col_, col_col_,
+                               row_col_);
+        MatrixMap<T> mdw(dw + g * row_w_ * col_w_, row_w_, col_w_);
+        mdw += mdy.transpose() * mcol;
+      }
+    }
+  }
+  col_.data()->array()->clear();
+}
 } // namespace nbla
@@ -21,6 +21,9 @@
 #include <nbla/functions.hpp>
 #include <nbla/variable.hpp>
 
+#include <limits>
+#include <mutex>
+
 namespace nbla {
 
 NBLA_REGISTER_FUNCTION_SOURCE(Einsum, const string &);
@@ -54,6 +57,143 @@ bool need_transpose(vector<int> axes) {
   }
   return false;
 }
+
+// Set of labels as bits. Alphabets are 0 to 51 and ellipsis is 52.
+using LabelMask = uint64_t;
+using ContractionPath = vector<pair<int, int>>;
+
+constexpr int kNumLabelBits = 53;
+constexpr int kMaxOptimalOperands = 8;
+constexpr size_t kPathCacheCapacity = 1024;
+
+int label_bit(char label) {
+  if (label >= 'a' && label <= 'z')
+    return label - 'a';
+  if (label >= 'A' && label <= 'Z')
+    return 26 + label - 'A';
+  return 52;
+}
+
+double labels_size(LabelMask labels, const vector<double> &label_sizes) {
+  double size = 1;
+  for (int i = 0; labels; i++, labels >>= 1) {
+    if (labels & 1)
+      size *= label_sizes[i];
+  }
+  return size;
+}
+
+// Searches all binary contraction trees by dynamic programming over subsets of
+// the operands. The cost of contracting two subsets is the size of the labels
+// spanned by the BatchMatmul, i.e. the labels kept after the contraction and
+// the labels contracted between them.
+ContractionPath optimal_path(const vector<LabelMask> &operands,
+                             LabelMask output,
+                             const vector<double> &label_sizes) {
+  const int n = operands.size();
+  const int full = (1 << n) - 1;
+  // Labels of operands in a subset, and labels of the contraction of them
+  vector<LabelMask> labels(full + 1, 0), result(full + 1, 0);
+  for (int s = 1; s <= full; s++) {
+    int i = 0;
+    while (!(s & (1 << i)))
+      i++;
+    labels[s] = labels[s & (s - 1)] | operands[i];
+  }
+  for (int s = 1; s <= full; s++) {
+    result[s] = labels[s] & (output | labels[full & ~s]);
+  }
+
+  vector<double> cost(full + 1, std::numeric_limits<double>::infinity());
+  vector<int> split(full + 1, 0);
+  for (int s = 1; s <= full; s++) {
+    if (!(s & (s - 1))) {
+      cost[s] = 0;
+      continue;
+    }
+    const int lowest = s & -s;
+    // Visit each split once by keeping the lowest operand in a
+    for (int a = (s - 1) & s; a > 0; a = (a - 1) & s) {
+      if (!(a & lowest))
+        continue;
+      const int b = s & ~a;
+      const double c =
+          cost[a] + cost[b] +
+          labels_size(result[s] | (result[a] & result[b]), label_sizes);
+      if (c < cost[s]) {
+        cost[s] = c;
+        split[s] = a;
+      }
+    }
+  }
+
+  // Convert the tree to pairs of positions in the list of operands
+  ContractionPath path;
+  vector<int> operand_list;
+  for (int i = 0; i < n; i++)
+    operand_list.push_back(1 << i);
+  std::function<void(int)> contract = [&](int s) {
+    if (!(s & (s - 1)))
+      return;
+    const int a = split[s];
+    const int b = s & ~a;
+    contract(a);
+    contract(b);
+    const int pos_a = std::find(operand_list.begin(), operand_list.end(), a) -
+                      operand_list.begin();
+    const int pos_b = std::find(operand_list.begin(), operand_list.end(), b) -
+                      operand_list.begin();
+    const int i = std::min(pos_a, pos_b);
+    const int j = std::max(pos_a, pos_b);
+    path.emplace_back(i, j);
+    operand_list.erase(operand_list.begin() + j);
+    operand_list.erase(operand_list.begin() + i);
+    operand_list.push_back(s);
+  };
+  contract(full);
+  return path;
+}
+
+// Repeatedly contracts the pair sharing labels whose result is the smallest
+// relative to the operands.
+ContractionPath greedy_path(vector<LabelMask> operands, LabelMask output,
+                            const vector<double> &label_sizes) {
+  ContractionPath path;
+  while (operands.size() > 1) {
+    const int n = operands.size();
+    tuple<bool, double, double> best_score;
+    int best_i = -1, best_j = -1;
+    LabelMask best_result = 0;
+    for (int i = 0; i < n; i++) {
+      for (int j = i + 1; j < n; j++) {
+        LabelMask others = output;
+        for (int k = 0; k < n; k++) {
+          if (k != i && k != j)
+            others |= operands[k];
+        }
+        const LabelMask shared = operands[i] & operands[j];
+        const LabelMask result = (operands[i] | operands[j]) & others;
+        const auto score =
+            std::make_tuple(shared == 0,
+                            labels_size(result, label_sizes) -
+                                labels_size(operands[i], label_sizes) -
+                                labels_size(operands[j], label_sizes),
+                            labels_size(result | shared, label_sizes));
+        if (best_i < 0 || score < best_score) {
+          best_score = score;
+          best_i = i;
+          best_j = j;
+          best_result = result;
+        }
+      }
+    }
+    path.emplace_back(best_i, best_j);
+    operands.erase(operands.begin() + best_j);
+    operands.erase(operands.begin() + best_i);
+    operands.push_back(best_result);
+  }
+  return path;
+}
 } // namespace
 
 class EinsumGraph {
@@ -66,20 +206,26 @@ class EinsumGraph {
   Context ctx_;
   vector<TermType> input_terms_;
   TermType output_term_;
-  // last_term_index_ denotes the input index at which label last appears
-  // If value is -1, indicating that it appears in the output term
-  map<char, int> last_term_index_;
   set<char> labels_;
+  ContractionPath path_;
 
 public:
   EinsumGraph(const Context &ctx, const Variables &inputs,
               const string &equation)
       : ctx_(ctx) {
+    vector<Shape_t> input_shapes;
     for (const auto &input : inputs) {
       input_cg_variables_.emplace_back(
           create_cgvariable_from_variable(input, true));
+      input_shapes.push_back(input->shape());
     }
-    preprocess(equation);
+    std::tie(input_terms_, output_term_) = preprocess(equation, input_shapes);
+    for (const auto &input_term : input_terms_) {
+      for (const auto &pair : input_term) {
+        labels_.insert(pair.first);
+      }
+    }
+    path_ = contraction_path(equation, input_shapes);
     output_cg_variable_ = create_einsum_graph(input_cg_variables_);
   }
 
@@ -89,8 +235,36 @@ public:
 
   CgVariablePtr output_cg_variable() const { return output_cg_variable_; }
 
+  ContractionPath path() const { return path_; }
+
+  static ContractionPath contraction_path(const string &equation,
+                                          const vector<Shape_t> &shapes) {
+    static std::mutex mtx;
+    static map<pair<string, vector<Shape_t>>, ContractionPath> cache;
+    const auto key = std::make_pair(equation, shapes);
+    {
+      std::lock_guard<std::mutex> lock(mtx);
+      const auto it = cache.find(key);
+      if (it != cache.end()) {
+        return it->second;
+      }
+    }
+
+    vector<TermType> input_terms;
+    TermType output_term;
+    std::tie(input_terms, output_term) = preprocess(equation, shapes);
+    const auto path = optimize_path(input_terms, output_term, shapes);
+
+    std::lock_guard<std::mutex> lock(mtx);
+    if (cache.size() >= kPathCacheCapacity) {
+      cache.clear();
+    }
+    cache[key] = path;
+    return path;
+  }
+
 private:
-  tuple<vector<string>, string> preprocess_equation(string equation) const {
+  static tuple<vector<string>, string> preprocess_equation(string equation) {
     // Check tokens in equation
     std::regex re("([a-zA-Z, ]|\\.{3}|->)*");
     NBLA_CHECK(std::regex_match(equation, re), error_code::value,
@@ -149,9 +323,8 @@ private:
     return std::make_tuple(input_labels, output_label);
   }
 
-  size_t
-  compute_ellipsis_ndim(const vector<string> &input_labels,
-                        const vector<CgVariablePtr> &input_cg_variables) const {
+  static size_t compute_ellipsis_ndim(const vector<string> &input_labels,
+                                      const vector<Shape_t> &input_shapes) {
     size_t ellipsis_ndim = 0;
     for (size_t i = 0; i < input_labels.size(); i++) {
       const auto &input_label = input_labels[i];
@@ -159,7 +332,7 @@ private:
                  error_code::value,
                  "Only one ellipsis is allowed per input_label.");
 
-      const auto input_shape = input_cg_variables[i]->variable()->shape();
+      const auto &input_shape = input_shapes[i];
       const auto ndim = input_shape.size();
 
       NBLA_CHECK(ndim >= input_label.size(), error_code::value,
@@ -183,7 +356,7 @@ private:
       // Check the number of dimensions for each inputs
       for (size_t i = 0; i < input_labels.size(); i++) {
         const auto &input_label = input_labels[i];
-        const auto input_shape = input_cg_variables[i]->variable()->shape();
+        const auto &input_shape = input_shapes[i];
         NBLA_CHECK(input_label.size() == input_shape.size(), error_code::value,
                    "The number of dimensions indicated by equation does not "
                    "match the number of dimensions of inputs.");
@@ -215,14 +388,13 @@ private:
     return term;
   }
 
-  static void
-  validate_input_shapes(const vector<CgVariablePtr> &input_cg_variables,
-                        const vector<TermType> &input_terms) {
+  static void validate_input_shapes(const vector<Shape_t> &input_shapes,
+                                    const vector<TermType> &input_terms) {
     map<char, Size_t> label_dim_size;
     vector<Size_t> ellipsis_dim_sizes;
     for (size_t i = 0; i < input_terms.size(); i++) {
       const auto &input_term = input_terms[i];
-      const auto &input_shape = input_cg_variables[i]->variable()->shape();
+      const auto &input_shape = input_shapes[i];
       for (const auto &term : input_term) {
         const auto label = term.first;
         const auto dims = term.second;
@@ -261,42 +433,69 @@ private:
     }
   }
 
-  void preprocess(const string &equation) {
+  static tuple<vector<TermType>, TermType>
+  preprocess(const string &equation, const vector<Shape_t> &input_shapes) {
     // Get input labels and output label from equation
     vector<string> input_labels;
     string output_label;
     std::tie(input_labels, output_label) = preprocess_equation(equation);
-    NBLA_CHECK(input_cg_variables_.size() == input_labels.size(),
+    NBLA_CHECK(input_shapes.size() == input_labels.size(),
                nbla::error_code::value,
                "The number of the input terms in "
                "equation does not match the inputs "
                "size.");
 
     // Compute the sizes of dimensions of ellipsis
-    size_t ellipsis_ndim =
-        compute_ellipsis_ndim(input_labels, input_cg_variables_);
+    size_t ellipsis_ndim = compute_ellipsis_ndim(input_labels, input_shapes);
 
     // Generate input_terms
-    last_term_index_.clear();
-    for (size_t i = 0; i < input_labels.size(); i++) {
-      const auto &input_label = input_labels[i];
-      const auto input_term = create_term(input_label, ellipsis_ndim);
-      for (const auto &label : input_label) {
-        labels_.insert(label);
-        last_term_index_[label] = i;
-      }
-      input_terms_.push_back(std::move(input_term));
+    vector<TermType> input_terms;
+    for (const auto &input_label : input_labels) {
+      input_terms.push_back(create_term(input_label, ellipsis_ndim));
     }
 
-    validate_input_shapes(input_cg_variables_, input_terms_);
+    validate_input_shapes(input_shapes, input_terms);
 
     // Generate output_term
-    {
-      output_term_ = create_term(output_label, ellipsis_ndim);
-      for (const auto label : output_label) {
-        last_term_index_[label] = -1;
+    auto output_term = create_term(output_label, ellipsis_ndim);
+    return std::make_tuple(std::move(input_terms), std::move(output_term));
+  }
+
+  static ContractionPath optimize_path(const vector<TermType> &input_terms,
+                                       const TermType &output_term,
+                                       const vector<Shape_t> &input_shapes) {
+    if (input_terms.size() < 2) {
+      return {};
+    }
+
+    // Estimate sizes of labels. Ellipsis is a label of the broadcasted size.
+    vector<double> label_sizes(kNumLabelBits, 1);
+    vector<LabelMask> operands;
+    for (size_t i = 0; i < input_terms.size(); i++) {
+      LabelMask mask = 0;
+      for (const auto &pair : input_terms[i]) {
+        const auto bit = label_bit(pair.first);
+        double size = 1;
+        for (const auto dim : pair.second) {
+          size *= input_shapes[i][dim];
+        }
+        if (std::isalpha(pair.first)) {
+          size = input_shapes[i][pair.second[0]];
+        }
+        label_sizes[bit] = std::max(label_sizes[bit], size);
+        mask |= LabelMask(1) << bit;
       }
+      operands.push_back(mask);
+    }
+    LabelMask output = 0;
+    for (const auto &pair : output_term) {
+      output |= LabelMask(1) << label_bit(pair.first);
+    }
+
+    if (operands.size() <= kMaxOptimalOperands) {
+      return optimal_path(operands, output, label_sizes);
     }
+    return greedy_path(operands, output, label_sizes);
   }
 
   tuple<CgVariablePtr, TermType>
@@ -351,8 +550,7 @@ private:
 
   tuple<CgVariablePtr, TermType>
   connect_matmul(CgVariablePtr a, const TermType &a_term, CgVariablePtr b,
-                 const TermType &b_term, int b_index) {
-    const auto a_index = b_index - 1;
+                 const TermType &b_term, const set<char> &keep_labels) {
     auto last_a_term = a_term;
     auto last_b_term = b_term;
 
@@ -363,25 +561,24 @@ private:
     for (const auto &label : labels_) {
       const bool has_a = last_a_term.count(label) == 1;
       const bool has_b = last_b_term.count(label) == 1;
-      const int last_index = last_term_index_.at(label);
+      // keep_labels are the labels appearing in the other operands or the
+      // output
+      const bool keep = keep_labels.count(label) == 1;
       if (has_a && has_b) {
-        // the label appears in successors
-        if (last_index > b_index || last_index == -1)
+        if (keep)
           batch_labels.push_back(label);
         else
           k_labels.push_back(label);
       } else if (has_a && !has_b) {
-        // the label does not appear in a's successors
-        if (last_index == a_index)
-          a_reduce_labels.push_back(label);
-        else
+        if (keep)
           m_labels.push_back(label);
-      } else if (!has_a && has_b) {
-        // the label does not appear in b's successors
-        if (last_index == b_index)
-          b_reduce_labels.push_back(label);
         else
+          a_reduce_labels.push_back(label);
+      } else if (!has_a && has_b) {
+        if (keep)
           n_labels.push_back(label);
+        else
+          b_reduce_labels.push_back(label);
       }
     }
 
@@ -598,7 +795,7 @@ private:
       vector<char> reduce_labels;
       for (const auto &pair : last_terms[0]) {
         const auto label = pair.first;
-        if (last_term_index_.at(label) != -1) {
+        if (output_term_.count(label) == 0) {
           // Reduce labels is not in output_term
           reduce_labels.push_back(label);
         }
@@ -610,13 +807,31 @@ private:
 
       last_terms[0] = last_term;
     } else {
-      // Matmul
-      last_out = last_outs[0];
-      last_term = last_terms[0];
-      for (int i = 1; i < last_outs.size(); i++) {
-        // Matmul last_out[i - 1] and last_out[i]
+      // Matmul pairs of operands in the order of the contraction path. The
+      // pair is replaced with the result appended to the operands.
+      for (const auto &pair : path_) {
+        const int i = pair.first;
+        const int j = pair.second;
+        set<char> keep_labels;
+        for (const auto &term : output_term_) {
+          keep_labels.insert(term.first);
+        }
+        for (int k = 0; k < last_terms.size(); k++) {
+          if (k == i || k == j)
+            continue;
+          for (const auto &term : last_terms[k]) {
+            keep_labels.insert(term.first);
+          }
+        }
         std::tie(last_out, last_term) =
-            connect_matmul(last_out, last_term, last_outs[i], last_terms[i], i);
+            connect_matmul(last_outs[i], last_terms[i], last_outs[j],
+                           last_terms[j], keep_labels);
+        last_outs.erase(last_outs.begin() + j);
+        last_outs.erase(last_outs.begin() + i);
+        last_outs.push_back(last_out);
+        last_terms.erase(last_terms.begin() + j);
+        last_terms.erase(last_terms.begin() + i);
+        last_terms.push_back(last_term);
       }
     }
 
@@ -651,11 +866,17 @@ private:
   }
 };
 
+vector<pair<int, int>> einsum_path(const string &equation,
+                                   const vector<Shape_t> &shapes) {
+  return EinsumGraph::contraction_path(equation, shapes);
+}
+
 template <typename T>
 void Einsum<T>::setup_impl(const Variables &inputs, const Variables &outputs) {
   EinsumGraph graph(ctx_, inputs, equation_);
   input_cg_variables_ = graph.input_cg_variables();
   last_output_cg_variable_ = graph.output_cg_variable();
+  contraction_path_ = graph.path();
 
   outputs[0]->reshape(last_output_cg_variable_->variable()->shape(), true);
   last_output_cg_variable_->variable()->set_data(outputs[0]->data());
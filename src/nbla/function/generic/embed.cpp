@@ -58,6 +58,30 @@ void embed_backward_cpu(int size, int stride0, T1 *dw, const T1 *dy,
   }
 }
 
+template <typename T, typename T1>
+void Embed<T, T1>::backward_sparse(const Variables &inputs,
+                                   const Variables &outputs, bool accum) {
+  // The gradient is the dense grad, lazily zeroed unless accumulated, plus
+  // the rows added to the sparse gradient. A non-empty sparse gradient is
+  // always accumulated (see get_accum in computation_graph/variable.cpp), and
+  // cleared by Solver::zero_grad.
+  auto sparse = inputs[1]->sparse_grad();
+  if (!accum) {
+    inputs[1]->grad()->zero();
+    sparse->clear();
+  }
+  const Size_t size = inputs[0]->size();
+  const Size_t stride0 = inputs[1]->size(1);
+  const T *x = inputs[0]->get_data_pointer<T>(this->ctx_);
+  const T1 *dy = outputs[0]->get_grad_pointer<T1>(this->ctx_);
+  vector<int64_t> rows(x, x + size);
+  vector<float> values(size * stride0);
+  for (Size_t i = 0; i < size * stride0; ++i) {
+    values[i] = dy[i];
+  }
+  sparse->add(rows.data(), values.data(), size, stride0);
+}
+
 template <typename T, typename T1>
 void Embed<T, T1>::backward_impl(const Variables &inputs,
                                  const Variables &outputs,
@@ -69,6 +93,10 @@ void Embed<T, T1>::backward_impl(const Variables &inputs,
   if (!propagate_down[1]) {
     return;
   }
+  if (inputs[1]->sparse_grad_enabled()) {
+    backward_sparse(inputs, outputs, accum[1]);
+    return;
+  }
   if (!accum[1])
     inputs[1]->grad()->zero();
   const T *x = inputs[0]->get_data_pointer<T>(this->ctx_);
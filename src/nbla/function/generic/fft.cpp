@@ -15,28 +15,57 @@
 #include <nbla/array.hpp>
 #include <nbla/common.hpp>
 #include <nbla/function/fft.hpp>
+#include <nbla/utils/fft.hpp>
 #include <nbla/variable.hpp>
 
+#include <cmath>
+
 namespace nbla {
 
 NBLA_REGISTER_FUNCTION_SOURCE(FFT, int, bool);
 
 template <typename T>
 void FFT<T>::setup_impl(const Variables &inputs, const Variables &outputs) {
-  outputs[0]->reshape(inputs[0]->shape(), true);
+  const Shape_t &shape = inputs[0]->shape();
+  const int ndim = shape.size();
+  NBLA_CHECK(signal_ndim_ >= 1, error_code::value,
+             "signal_ndim must be positive: %d.", signal_ndim_);
+  NBLA_CHECK(ndim >= signal_ndim_ + 1 && shape[ndim - 1] == 2,
+             error_code::value,
+             "Input must be complex-valued with the last axis of size 2 and "
+             "have at least signal_ndim + 1 (%d) dimensions.",
+             signal_ndim_ + 1);
+  outputs[0]->reshape(shape, true);
 }
 
 template <typename T>
 void FFT<T>::forward_impl(const Variables &inputs, const Variables &outputs) {
-  NBLA_ERROR(error_code::not_implemented,
-             "FFT forward not implemented in CPU yet.");
+  const Shape_t &shape = inputs[0]->shape();
+  const T *x = inputs[0]->get_data_pointer<T>(this->ctx_);
+  T *y = outputs[0]->cast_data_and_get_pointer<T>(this->ctx_, true);
+  const double scale = normalized_ ? 1.0 / std::sqrt(signal_size(shape)) : 1.0;
+  fft_nd(x, y, shape, signal_ndim_, false /* inverse */, scale, false);
 }
 
 template <typename T>
 void FFT<T>::backward_impl(const Variables &inputs, const Variables &outputs,
                            const vector<bool> &propagate_down,
                            const vector<bool> &accum) {
-  NBLA_ERROR(error_code::not_implemented,
-             "FFT backward not implemented in CPU yet.");
+  if (!propagate_down[0]) {
+    return;
+  }
+  // The adjoint of DFT is the unnormalized inverse DFT.
+  const Shape_t &shape = inputs[0]->shape();
+  const T *dy = outputs[0]->get_grad_pointer<T>(this->ctx_);
+  T *dx = inputs[0]->cast_grad_and_get_pointer<T>(this->ctx_, !accum[0]);
+  const double scale = normalized_ ? 1.0 / std::sqrt(signal_size(shape)) : 1.0;
+  fft_nd(dy, dx, shape, signal_ndim_, true /* inverse */, scale, accum[0]);
+}
+
+template <typename T> double FFT<T>::signal_size(const Shape_t &shape) const {
+  double n = 1;
+  for (int i = 0; i < signal_ndim_; ++i)
+    n *= shape[shape.size() - 2 - i];
+  return n;
 }
 } // namespace nbla
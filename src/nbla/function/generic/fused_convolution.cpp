@@ -18,10 +18,14 @@
 #include <nbla/computation_graph/computation_graph.hpp>
 #include <nbla/computation_graph/function.hpp>
 #include <nbla/computation_graph/variable.hpp>
+#include <nbla/function/convolution.hpp>
 #include <nbla/function/fused_convolution.hpp>
 #include <nbla/functions.hpp>
 #include <nbla/variable.hpp>
 
+#include <algorithm>
+#include <cmath>
+
 namespace nbla {
 
 NBLA_REGISTER_FUNCTION_SOURCE(FusedConvolution, int, const vector<int> &,
@@ -103,8 +107,104 @@ bool reset_cgvariable(CgVariablePtr cg_var, Variable *var) {
   }
   return ret;
 }
+
+// Apply `y = act(y * scale[c] + shift[c] + z)` in-place in a single pass over
+// the convolution output. The output is viewed as (outer, channels, inner),
+// which covers both channel-first (inner = spatial size) and channel-last
+// (inner = 1) layouts.
+template <typename T, typename Act>
+void conv_epilogue(T *y, const T *z, const vector<float> &scale,
+                   const vector<float> &shift, Size_t size, Size_t channels,
+                   Size_t inner, Act act) {
+  const bool affine = !scale.empty();
+  const int64_t outer_channels = size / inner;
+#pragma omp parallel for schedule(static)
+  for (int64_t oc = 0; oc < outer_channels; ++oc) {
+    const Size_t c = oc % channels;
+    const float s = affine ? scale[c] : 1.0f;
+    const float b = affine ? shift[c] : 0.0f;
+    T *yy = y + oc * inner;
+    const T *zz = z ? z + oc * inner : nullptr;
+    for (Size_t k = 0; k < inner; ++k) {
+      float v = (float)yy[k] * s + b;
+      if (zz) {
+        v += (float)zz[k];
+      }
+      yy[k] = act(v);
+    }
+  }
+}
 } // namespace
 
+template <typename T>
+Variables FusedConvolution<T>::conv_inputs(const Variables &inputs) {
+  auto get_input = [this, &inputs](InName name) -> Variable * {
+    return inputs[this->input_variables_[name].first];
+  };
+  Variables conv_inputs{get_input(X), get_input(WEIGHT)};
+  if (input_variables_[BIAS].second) {
+    conv_inputs.push_back(get_input(BIAS));
+  }
+  return conv_inputs;
+}
+
+template <typename T>
+void FusedConvolution<T>::forward_epilogue(const Variables &inputs,
+                                           const Variables &outputs) {
+  auto get_data = [this, &inputs](InName name) -> const T * {
+    auto var = inputs[this->input_variables_[name].first];
+    return var->template get_data_pointer<T>(this->ctx_);
+  };
+  const Shape_t &shape = outputs[0]->shape();
+  const Size_t channels = channel_last_ ? shape.back() : shape[base_axis_];
+  const Size_t inner = channel_last_ ? 1 : outputs[0]->strides()[base_axis_];
+
+  // Fold the inference-mode batch normalization into a per-channel affine.
+  vector<float> scale, shift;
+  if (input_variables_[BETA].second) {
+    const T *beta = get_data(BETA);
+    const T *gamma = get_data(GAMMA);
+    const T *mean = get_data(MEAN);
+    const T *var = get_data(VARIANCE);
+    scale.resize(channels);
+    shift.resize(channels);
+    for (Size_t c = 0; c < channels; ++c) {
+      scale[c] = (float)gamma[c] / std::sqrt((float)var[c] + eps_);
+      shift[c] = (float)beta[c] - (float)mean[c] * scale[c];
+    }
+  }
+  const T *z = input_variables_[Z].second ? get_data(Z) : nullptr;
+  T *y = outputs[0]->cast_data_and_get_pointer<T>(ctx_, false);
+  const Size_t size = outputs[0]->size();
+
+  if (nonlinearity_ == "relu") {
+    conv_epilogue(y, z, scale, shift, size, channels, inner,
+                  [](float v) { return std::max(v, 0.0f); });
+  } else if (nonlinearity_ == "sigmoid") {
+    conv_epilogue(y, z, scale, shift, size, channels, inner,
+                  [](float v) { return 1.0f / (1.0f + std::exp(-v)); });
+  } else if (nonlinearity_ == "tanh") {
+    conv_epilogue(y, z, scale, shift, size, channels, inner,
+                  [](float v) { return std::tanh(v); });
+  } else if (nonlinearity_ == "leaky_relu") {
+    const float alpha = nonlinearity_args_[0];
+    conv_epilogue(y, z, scale, shift, size, channels, inner,
+                  [alpha](float v) { return v > 0.0f ? v : alpha * v; });
+  } else if (nonlinearity_ == "elu") {
+    const float alpha = nonlinearity_args_[0];
+    conv_epilogue(y, z, scale, shift, size, channels, inner, [alpha](float v) {
+      return v >= 0.0f ? v : alpha * (std::exp(v) - 1.0f);
+    });
+  } else if (nonlinearity_ == "relu6") {
+    conv_epilogue(y, z, scale, shift, size, channels, inner, [](float v) {
+      return std::min(std::max(v, 0.0f), 6.0f);
+    });
+  } else if (!scale.empty() || z) {
+    conv_epilogue(y, z, scale, shift, size, channels, inner,
+                  [](float v) { return v; });
+  }
+}
+
 template <typename T>
 bool FusedConvolution<T>::reset_cg_variables(const Variables &inputs,
                                              const Variables &outputs) {
@@ -256,11 +356,31 @@ void FusedConvolution<T>::setup_impl(const Variables &inputs,
                                      false /* as_recomputation */,
                                      [](CgFunctionPtr fn) { fn->setup(); });
   this->last_output_cg_variable_ = last_out;
+
+  // ----------------------------------------------------------------
+  // Fast path
+  // ----------------------------------------------------------------
+  // When padding is folded into the convolution and BN does not compute
+  // batch statistics, everything after the convolution is an element-wise
+  // epilogue which is applied in one pass over the convolution output,
+  // instead of materializing an intermediate array per function.
+  fast_path_ =
+      skip_pad_func && !(input_variables_[BETA].second && batch_stat_);
+  if (fast_path_) {
+    conv_ = create_Convolution(ctx_, base_axis_, conv_pad, stride_, dilation_,
+                               group_, channel_last_);
+    conv_->setup(conv_inputs(inputs), outputs);
+  }
 }
 
 template <typename T>
 void FusedConvolution<T>::forward_impl(const Variables &inputs,
                                        const Variables &outputs) {
+  if (fast_path_) {
+    conv_->forward(conv_inputs(inputs), outputs);
+    forward_epilogue(inputs, outputs);
+    return;
+  }
   reset_cg_variables(inputs, outputs);
   bool clear_buffer =
       SingletonManager::get<GlobalClearBufferState>()->clear_buffer();
@@ -315,6 +435,12 @@ void FusedConvolution<T>::backward_impl(const Variables &inputs,
     input_cg_variables_[Z]->set_need_grad(propagate_down[get_index(Z)]);
   }
 
+  // The fast path does not keep the intermediate buffers required by the
+  // composite graph. Recompute them before running backward.
+  if (fast_path_) {
+    last_output_cg_variable_->forward(false, false);
+  }
+
   // Propagate need_grad states
   unordered_set<CgFunctionPtr> fclosed;
   last_output_cg_variable_->visit_function_recursive(
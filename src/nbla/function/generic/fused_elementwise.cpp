@@ -0,0 +1,301 @@
+// Copyright 2023 Sony Group Corporation.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <nbla/array.hpp>
+#include <nbla/common.hpp>
+#include <nbla/function/fused_elementwise.hpp>
+#include <nbla/variable.hpp>
+
+#include <algorithm>
+#include <cmath>
+#include <sstream>
+#include <unordered_map>
+
+namespace nbla {
+
+NBLA_REGISTER_FUNCTION_SOURCE(FusedElementwise, const string &,
+                              const vector<float> &);
+
+namespace {
+// Number of elements processed at once. Intermediate values of a block fit in
+// the L1/L2 cache.
+constexpr Size_t kBlockSize = 1024;
+
+inline float sigmoid(float x) { return 1.0f / (1.0f + std::exp(-x)); }
+
+// Apply an operation to `n` elements of a block. `z` is only referred by ADD.
+template <typename T, typename Op>
+void apply_op(Op op, float p, const float *in, float *out, const T *z,
+              Size_t n) {
+  switch (op) {
+  case Op::ADD:
+    for (Size_t i = 0; i < n; ++i)
+      out[i] = in[i] + (float)z[i];
+    break;
+  case Op::ADD_SCALAR:
+    for (Size_t i = 0; i < n; ++i)
+      out[i] = in[i] + p;
+    break;
+  case Op::MUL_SCALAR:
+    for (Size_t i = 0; i < n; ++i)
+      out[i] = in[i] * p;
+    break;
+  case Op::POW_SCALAR:
+    for (Size_t i = 0; i < n; ++i)
+      out[i] = std::pow(in[i], p);
+    break;
+  case Op::RELU:
+    for (Size_t i = 0; i < n; ++i)
+      out[i] = std::max(in[i], 0.0f);
+    break;
+  case Op::LEAKY_RELU:
+    for (Size_t i = 0; i < n; ++i)
+      out[i] = in[i] > 0.0f ? in[i] : p * in[i];
+    break;
+  case Op::RELU6:
+    for (Size_t i = 0; i < n; ++i)
+      out[i] = std::min(std::max(in[i], 0.0f), 6.0f);
+    break;
+  case Op::SIGMOID:
+    for (Size_t i = 0; i < n; ++i)
+      out[i] = sigmoid(in[i]);
+    break;
+  case Op::TANH:
+    for (Size_t i = 0; i < n; ++i)
+      out[i] = std::tanh(in[i]);
+    break;
+  case Op::SWISH:
+    for (Size_t i = 0; i < n; ++i)
+      out[i] = in[i] * sigmoid(in[i]);
+    break;
+  case Op::ELU:
+    for (Size_t i = 0; i < n; ++i)
+      out[i] = in[i] >= 0.0f ? in[i] : p * (std::exp(in[i]) - 1.0f);
+    break;
+  case Op::EXP:
+    for (Size_t i = 0; i < n; ++i)
+      out[i] = std::exp(in[i]);
+    break;
+  case Op::ABS:
+    for (Size_t i = 0; i < n; ++i)
+      out[i] = std::abs(in[i]);
+    break;
+  }
+}
+
+// Multiply `g` by the derivative of an operation given its input `in` and its
+// output `out`.
+template <typename Op>
+void apply_op_grad(Op op, float p, const float *in, const float *out, float *g,
+                   Size_t n) {
+  switch (op) {
+  case Op::ADD:
+  case Op::ADD_SCALAR:
+    break;
+  case Op::MUL_SCALAR:
+    for (Size_t i = 0; i < n; ++i)
+      g[i] *= p;
+    break;
+  case Op::POW_SCALAR:
+    for (Size_t i = 0; i < n; ++i)
+      g[i] *= p * std::pow(in[i], p - 1.0f);
+    break;
+  case Op::RELU:
+    for (Size_t i = 0; i < n; ++i)
+      g[i] = in[i] > 0.0f ? g[i] : 0.0f;
+    break;
+  case Op::LEAKY_RELU:
+    for (Size_t i = 0; i < n; ++i)
+      g[i] = in[i] > 0.0f ? g[i] : p * g[i];
+    break;
+  case Op::RELU6:
+    for (Size_t i = 0; i < n; ++i)
+      g[i] = (in[i] > 0.0f && in[i] < 6.0f) ? g[i] : 0.0f;
+    break;
+  case Op::SIGMOID:
+    for (Size_t i = 0; i < n; ++i)
+      g[i] *= out[i] * (1.0f - out[i]);
+    break;
+  case Op::TANH:
+    for (Size_t i = 0; i < n; ++i)
+      g[i] *= 1.0f - out[i] * out[i];
+    break;
+  case Op::SWISH:
+    for (Size_t i = 0; i < n; ++i) {
+      const float s = sigmoid(in[i]);
+      g[i] *= s * (1.0f + in[i] * (1.0f - s));
+    }
+    break;
+  case Op::ELU:
+    for (Size_t i = 0; i < n; ++i)
+      g[i] = in[i] >= 0.0f ? g[i] : g[i] * (out[i] + p);
+    break;
+  case Op::EXP:
+    for (Size_t i = 0; i < n; ++i)
+      g[i] *= out[i];
+    break;
+  case Op::ABS:
+    for (Size_t i = 0; i < n; ++i)
+      g[i] = in[i] > 0.0f ? g[i] : (in[i] < 0.0f ? -g[i] : 0.0f);
+    break;
+  }
+}
+} // namespace
+
+template <typename T>
+void FusedElementwise<T>::setup_impl(const Variables &inputs,
+                                     const Variables &outputs) {
+  // name, takes a scalar argument
+  const std::unordered_map<string, std::pair<Op, bool>> op_table{
+      {"add", {Op::ADD, false}},
+      {"add_scalar", {Op::ADD_SCALAR, true}},
+      {"mul_scalar", {Op::MUL_SCALAR, true}},
+      {"pow_scalar", {Op::POW_SCALAR, true}},
+      {"relu", {Op::RELU, false}},
+      {"leaky_relu", {Op::LEAKY_RELU, true}},
+      {"relu6", {Op::RELU6, false}},
+      {"sigmoid", {Op::SIGMOID, false}},
+      {"tanh", {Op::TANH, false}},
+      {"swish", {Op::SWISH, false}},
+      {"elu", {Op::ELU, true}},
+      {"exp", {Op::EXP, false}},
+      {"abs", {Op::ABS, false}},
+  };
+
+  op_types_.clear();
+  params_.clear();
+  std::stringstream ss(ops_);
+  string name;
+  size_t arg_index = 0;
+  int num_add = 0;
+  while (std::getline(ss, name, ',')) {
+    name.erase(0, name.find_first_not_of(" "));
+    name.erase(name.find_last_not_of(" ") + 1);
+    auto it = op_table.find(name);
+    NBLA_CHECK(it != op_table.end(), error_code::value,
+               "Unsupported operation '%s' in ops '%s'.", name.c_str(),
+               ops_.c_str());
+    float param = 0.0f;
+    if (it->second.second) {
+      NBLA_CHECK(arg_index < op_args_.size(), error_code::value,
+                 "op_args is too short for ops '%s'.", ops_.c_str());
+      param = op_args_[arg_index++];
+    }
+    num_add += it->second.first == Op::ADD;
+    op_types_.push_back(it->second.first);
+    params_.push_back(param);
+  }
+  NBLA_CHECK(!op_types_.empty(), error_code::value, "ops must not be empty.");
+  NBLA_CHECK(arg_index == op_args_.size(), error_code::value,
+             "op_args has %d values while ops '%s' consume %d.",
+             op_args_.size(), ops_.c_str(), arg_index);
+  NBLA_CHECK(num_add <= 1, error_code::value,
+             "'add' can appear at most once in ops.");
+  NBLA_CHECK(num_add == (int)inputs.size() - 1, error_code::value,
+             "z must be given if and only if ops contain 'add'.");
+  if (inputs.size() == 2) {
+    NBLA_CHECK(inputs[1]->shape() == inputs[0]->shape(), error_code::value,
+               "The shape of z must be the same as x.");
+  }
+  outputs[0]->reshape(inputs[0]->shape(), true);
+}
+
+template <typename T>
+void FusedElementwise<T>::forward_impl(const Variables &inputs,
+                                       const Variables &outputs) {
+  const T *x = inputs[0]->get_data_pointer<T>(this->ctx_);
+  const T *z = inputs.size() == 2 ? inputs[1]->get_data_pointer<T>(this->ctx_)
+                                  : nullptr;
+  T *y = outputs[0]->cast_data_and_get_pointer<T>(this->ctx_, true);
+  const Size_t size = inputs[0]->size();
+  const int64_t num_blocks = (size + kBlockSize - 1) / kBlockSize;
+
+#pragma omp parallel
+  {
+    vector<float> buf0(kBlockSize), buf1(kBlockSize);
+#pragma omp for schedule(static)
+    for (int64_t b = 0; b < num_blocks; ++b) {
+      const Size_t offset = b * kBlockSize;
+      const Size_t n = std::min(kBlockSize, size - offset);
+      float *h = buf0.data();
+      float *t = buf1.data();
+      for (Size_t i = 0; i < n; ++i)
+        h[i] = (float)x[offset + i];
+      for (size_t k = 0; k < op_types_.size(); ++k) {
+        apply_op(op_types_[k], params_[k], h, t, z ? z + offset : z, n);
+        std::swap(h, t);
+      }
+      for (Size_t i = 0; i < n; ++i)
+        y[offset + i] = h[i];
+    }
+  }
+}
+
+template <typename T>
+void FusedElementwise<T>::backward_impl(const Variables &inputs,
+                                        const Variables &outputs,
+                                        const vector<bool> &propagate_down,
+                                        const vector<bool> &accum) {
+  const bool prop_z = inputs.size() == 2 && propagate_down[1];
+  if (!(propagate_down[0] || prop_z)) {
+    return;
+  }
+  const T *x = inputs[0]->get_data_pointer<T>(this->ctx_);
+  const T *z = inputs.size() == 2 ? inputs[1]->get_data_pointer<T>(this->ctx_)
+                                  : nullptr;
+  const T *dy = outputs[0]->get_grad_pointer<T>(this->ctx_);
+  T *dx = propagate_down[0]
+              ? inputs[0]->cast_grad_and_get_pointer<T>(this->ctx_, !accum[0])
+              : nullptr;
+  T *dz = prop_z
+              ? inputs[1]->cast_grad_and_get_pointer<T>(this->ctx_, !accum[1])
+              : nullptr;
+  const Size_t size = inputs[0]->size();
+  const int64_t num_blocks = (size + kBlockSize - 1) / kBlockSize;
+  const size_t num_ops = op_types_.size();
+
+#pragma omp parallel
+  {
+    // Intermediate values of all operations for a block, and the gradient.
+    vector<float> hs((num_ops + 1) * kBlockSize), g(kBlockSize);
+#pragma omp for schedule(static)
+    for (int64_t b = 0; b < num_blocks; ++b) {
+      const Size_t offset = b * kBlockSize;
+      const Size_t n = std::min(kBlockSize, size - offset);
+      float *h = hs.data();
+      for (Size_t i = 0; i < n; ++i)
+        h[i] = (float)x[offset + i];
+      for (size_t k = 0; k < num_ops; ++k) {
+        apply_op(op_types_[k], params_[k], h + k * kBlockSize,
+                 h + (k + 1) * kBlockSize, z ? z + offset : z, n);
+      }
+      for (Size_t i = 0; i < n; ++i)
+        g[i] = (float)dy[offset + i];
+      for (size_t k = num_ops; k-- > 0;) {
+        if (op_types_[k] == Op::ADD && dz) {
+          for (Size_t i = 0; i < n; ++i)
+            dz[offset + i] =
+                (accum[1] ? (float)dz[offset + i] : 0.0f) + g[i];
+        }
+        apply_op_grad(op_types_[k], params_[k], h + k * kBlockSize,
+                      h + (k + 1) * kBlockSize, g.data(), n);
+      }
+      if (dx) {
+        for (Size_t i = 0; i < n; ++i)
+          dx[offset + i] = (accum[0] ? (float)dx[offset + i] : 0.0f) + g[i];
+      }
+    }
+  }
+}
+} // namespace nbla
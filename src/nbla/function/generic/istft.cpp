@@ -264,20 +264,49 @@ void ISTFT<T>::apply_inv_window_backward(Variable *x, Variable *y,
   inv_window_.data()->array()->clear();
 }
 
+template <typename T>
+void ISTFT<T>::idft_forward(Variable *y_r, Variable *y_i, Variable *x) {
+  calculate_window(ctx_, &window_);
+  const auto batch_size = x->shape()[0];
+  // STFT backward needs DFT coefficients not IDFT's.
+  istft_by_fft<T>(y_r->get_data_pointer<T>(ctx_),
+                  y_i->get_data_pointer<T>(ctx_),
+                  x->cast_data_and_get_pointer<T>(ctx_, true),
+                  window_.get_data_pointer<T>(ctx_), batch_size,
+                  x->size() / batch_size, fft_size_, stride_, y_r->shape()[2],
+                  !as_stft_backward_, false);
+  window_.data()->array()->clear();
+}
+
+template <typename T>
+void ISTFT<T>::idft_backward(Variable *y_r, Variable *y_i, Variable *x,
+                             const vector<bool> &propagate_down,
+                             const vector<bool> &accum) {
+  calculate_window(ctx_, &window_);
+  const auto batch_size = x->shape()[0];
+  T *g_y_r = propagate_down[0]
+                 ? y_r->cast_grad_and_get_pointer<T>(ctx_, !accum[0])
+                 : nullptr;
+  T *g_y_i = propagate_down[1]
+                 ? y_i->cast_grad_and_get_pointer<T>(ctx_, !accum[1])
+                 : nullptr;
+  stft_by_fft<T>(x->get_grad_pointer<T>(ctx_), g_y_r, g_y_i,
+                 window_.get_data_pointer<T>(ctx_), batch_size,
+                 x->size() / batch_size, fft_size_, stride_, y_r->shape()[2],
+                 !as_stft_backward_, accum[0], accum[1]);
+  window_.data()->array()->clear();
+}
+
 template <typename T>
 void ISTFT<T>::forward_impl(const Variables &inputs, const Variables &outputs) {
   auto y_r = inputs[0];
   auto y_i = inputs[1];
   auto x = outputs[0];
 
-  // Performe IDFT and part of overlap-add.
-  calculate_conv_weight(conv_cos_, conv_sin_);
-  deconv_->forward({y_r, &conv_cos_}, {&x_cos_});
-  deconv_->forward({y_i, &conv_sin_}, {&x_sin_});
-
-  // Compute rest of overlap-add and slicing to original signal.
+  // IDFT and overlap-add are computed by FFT instead of the deconvolution
+  // prepared in setup_impl.
   if (center_) {
-    add2_->forward({&x_cos_, &x_sin_}, {&add2_out_});
+    idft_forward(y_r, y_i, &add2_out_);
 
     // Remove channel axis temporally
     const auto add2_out_s = add2_out_.shape();
@@ -300,26 +329,15 @@ void ISTFT<T>::forward_impl(const Variables &inputs, const Variables &outputs) {
     // Restore shape
     add2_out_.reshape(add2_out_s, false);
   } else {
-    // Add channel axis temporally
-    const auto xs = x->shape();
-    x->reshape({xs[0], 1, xs[1]}, false);
-
     if (as_stft_backward_) {
-      add2_->forward({&x_cos_, &x_sin_}, {x});
+      idft_forward(y_r, y_i, x);
     } else {
-      add2_->forward({&x_cos_, &x_sin_}, {&add2_out_});
+      idft_forward(y_r, y_i, &add2_out_);
       apply_inv_window_forward(&add2_out_, x);
     }
-
-    // Restore shape
-    x->reshape(xs, false);
   }
 
   // Clear internal buffers
-  conv_cos_.data()->array()->clear();
-  conv_sin_.data()->array()->clear();
-  x_cos_.data()->array()->clear();
-  x_sin_.data()->array()->clear();
   add2_out_.data()->array()->clear();
 }
 
@@ -335,8 +353,6 @@ void ISTFT<T>::backward_impl(const Variables &inputs, const Variables &outputs,
   auto y_i = inputs[1];
   auto x = outputs[0];
 
-  calculate_conv_weight(conv_cos_, conv_sin_);
-
   // Execute in reverse order of forward_impl.
 
   if (center_) {
@@ -360,39 +376,17 @@ void ISTFT<T>::backward_impl(const Variables &inputs, const Variables &outputs,
     deconv_out_.reshape(deconv_out_s, false);
   } else {
     if (!as_stft_backward_) {
-      // Add channel axis temporally
-      const auto xs = x->shape();
-      x->reshape({xs[0], 1, xs[1]}, false);
-
       apply_inv_window_backward(&deconv_out_, x, false);
-
-      // Restore shape
-      x->reshape(xs, false);
     }
   }
 
   if (as_stft_backward_ && !center_) {
-    // Add channel axis temporally
-    const auto xs = x->shape();
-    x->reshape({xs[0], 1, xs[1]}, false);
-
-    deconv_->backward({y_r, &conv_cos_}, {x}, {propagate_down[0], false},
-                      {accum[0], false});
-    deconv_->backward({y_i, &conv_sin_}, {x}, {propagate_down[1], false},
-                      {accum[1], false});
-
-    // Restore shape
-    x->reshape(xs, false);
+    idft_backward(y_r, y_i, x, propagate_down, accum);
   } else {
-    deconv_->backward({y_r, &conv_cos_}, {&deconv_out_},
-                      {propagate_down[0], false}, {accum[0], false});
-    deconv_->backward({y_i, &conv_sin_}, {&deconv_out_},
-                      {propagate_down[1], false}, {accum[1], false});
+    idft_backward(y_r, y_i, &deconv_out_, propagate_down, accum);
   }
 
   // Clear internal buffers
-  conv_cos_.data()->array()->clear();
-  conv_sin_.data()->array()->clear();
   deconv_out_.grad()->array()->clear();
 }
 } // namespace nbla
@@ -114,6 +114,66 @@ inline void forward_map(const T *x, T *y, int *m, const Array3D &x_stride,
   }
 }
 
+// Increment N-d index `idx` in [start, end). Return false after the last one.
+inline bool next_index(vector<int> &idx, const vector<int> &start,
+                       const vector<int> &end) {
+  for (int a = idx.size() - 1; a >= 0; --a) {
+    if (++idx[a] < end[a])
+      return true;
+    idx[a] = start[a];
+  }
+  return false;
+}
+
+// Channel-last map, where x and y are (shape..., channels). All channels of an
+// output position are computed together over contiguous memory. Indices in m
+// are the same as forward_map so that backward_map is shared.
+template <typename T>
+inline void forward_map_channel_last(const T *x, T *y, int *m,
+                                     const int channels,
+                                     const vector<int> &x_shape,
+                                     const vector<int> &y_shape,
+                                     const vector<int> &kernel,
+                                     const vector<int> &stride,
+                                     const vector<int> &pad) {
+  const int ndim = kernel.size();
+  const vector<int> zeros(ndim, 0);
+  vector<int> y_idx(ndim, 0), pool_start(ndim), pool_end(ndim);
+
+  do {
+    for (int a = 0; a < ndim; a++) {
+      pool_start[a] = y_idx[a] * stride[a] - pad[a];
+      pool_end[a] = min(pool_start[a] + kernel[a], x_shape[a] + pad[a]);
+      pool_start[a] = max(pool_start[a], 0);
+      pool_end[a] = min(pool_end[a], x_shape[a]);
+    }
+    auto x_idx = pool_start;
+    bool first = true;
+    do {
+      int idx = 0;
+      for (int a = 0; a < ndim; a++)
+        idx = idx * x_shape[a] + x_idx[a];
+      idx *= channels;
+      if (first) {
+        for (int c = 0; c < channels; ++c) {
+          y[c] = x[idx + c];
+          m[c] = idx + c;
+        }
+        first = false;
+        continue;
+      }
+      for (int c = 0; c < channels; ++c) {
+        if (y[c] < x[idx + c]) {
+          y[c] = x[idx + c];
+          m[c] = idx + c;
+        }
+      }
+    } while (next_index(x_idx, pool_start, pool_end));
+    y += channels;
+    m += channels;
+  } while (next_index(y_idx, zeros, y_shape));
+}
+
 template <typename T>
 inline void backward_map(T *dx, const T *dy, const int *m, const int size) {
   for (int k = 0; k < size; k++) {
@@ -126,6 +186,7 @@ using max_pooling_impl::Array2D;
 using max_pooling_impl::Array3D;
 using max_pooling_impl::backward_map;
 using max_pooling_impl::forward_map;
+using max_pooling_impl::forward_map_channel_last;
 using max_pooling_impl::v2a;
 
 template <typename T>
@@ -139,10 +200,6 @@ void MaxPooling<T>::setup_impl(const Variables &inputs,
 template <typename T>
 void MaxPooling<T>::forward_impl(const Variables &inputs,
                                  const Variables &outputs) {
-  NBLA_CHECK(!this->channel_last_, error_code::not_implemented,
-             "The passed argument channel_last=true is not supported in CPU "
-             "pooling.");
-
   auto x = inputs[0]->get_data_pointer<T>(this->ctx_);
   auto y = outputs[0]->cast_data_and_get_pointer<T>(this->ctx_, true);
   auto m = max_idx_.cast_data_and_get_pointer<int>(this->ctx_, true);
@@ -152,11 +209,30 @@ void MaxPooling<T>::forward_impl(const Variables &inputs,
   const Shape_t &instrides = inputs[0]->strides();
   const Shape_t &outstrides = outputs[0]->strides();
   const int s = inshape.size() - this->kernel_.size();
-  const int x_map_size = (s == 0) ? inputs[0]->size() : instrides[s - 1];
-  const int y_map_size = (s == 0) ? outputs[0]->size() : outstrides[s - 1];
+  NBLA_CHECK(!this->channel_last_ || s > 0, error_code::value,
+             "channel_last=true requires the channel axis after the spatial "
+             "axes in CPU pooling.");
+  // A map is the spatial axes, followed by the channel axis if channel_last.
+  const int b = this->channel_last_ ? s - 1 : s;
+  const int x_map_size = (b == 0) ? inputs[0]->size() : instrides[b - 1];
+  const int y_map_size = (b == 0) ? outputs[0]->size() : outstrides[b - 1];
   const int n_map = inputs[0]->size() / x_map_size;
 
-  if (this->kernel_.size() == 2) {
+  if (this->channel_last_) {
+    const int channels = inshape.back();
+    const vector<int> x_shape(inshape.begin() + b, inshape.end() - 1);
+    const vector<int> y_shape(outshape.begin() + b, outshape.end() - 1);
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static)
+#endif
+    for (int n = 0; n < n_map; ++n) {
+      forward_map_channel_last(x + n * x_map_size, y + n * y_map_size,
+                               m + n * y_map_size, channels, x_shape, y_shape,
+                               this->kernel_, this->stride_, this->pad_);
+    }
+  }
+
+  else if (this->kernel_.size() == 2) {
     const auto x_stride = v2a<Size_t, int, 2>(instrides, s);
     const auto x_shape = v2a<Size_t, int, 2>(inshape, s);
     const auto y_shape = v2a<Size_t, int, 2>(outshape, s);
@@ -198,10 +274,6 @@ void MaxPooling<T>::backward_impl(const Variables &inputs,
   if (!propagate_down[0])
     return;
 
-  NBLA_CHECK(!this->channel_last_, error_code::not_implemented,
-             "The passed argument channel_last=true is not supported in CPU "
-             "pooling.");
-
   NBLA_CHECK(forward_done_, error_code::value,
              "Forward must be called before calling backward.");
 
@@ -215,8 +287,9 @@ void MaxPooling<T>::backward_impl(const Variables &inputs,
   const Shape_t &instrides = inputs[0]->strides();
   const Shape_t &outstrides = outputs[0]->strides();
   const int s = inputs[0]->shape().size() - this->kernel_.size();
-  const int x_map_size = (s == 0) ? inputs[0]->size() : instrides[s - 1];
-  const int y_map_size = (s == 0) ? outputs[0]->size() : outstrides[s - 1];
+  const int b = this->channel_last_ ? s - 1 : s;
+  const int x_map_size = (b == 0) ? inputs[0]->size() : instrides[b - 1];
+  const int y_map_size = (b == 0) ? outputs[0]->size() : outstrides[b - 1];
   int n_map = outputs[0]->size() / y_map_size;
 
   while (n_map--) {
@@ -26,6 +26,11 @@ void Min<T>::forward_impl_reduce(const T *x, T *y, int outer_size,
     return v->cast_data_and_get_pointer<int>(this->ctx_, true);
   };
   int *ind = _cast(this->index_buff_.get());
+  const bool parallel =
+      outer_size > 1 && (Size_t)outer_size * reduction_size >= (1 << 14);
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static) if (parallel)
+#endif
   for (int o = 0; o < outer_size; ++o) {
     int mi = 0;
     T m = 1e+8;
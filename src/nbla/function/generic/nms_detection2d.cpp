@@ -15,9 +15,11 @@
 /** NmsDetection2d
  */
 #include <iostream>
+#include <tuple>
 #include <nbla/array.hpp>
 #include <nbla/array/cpu_array.hpp>
 #include <nbla/function/nms_detection2d.hpp>
+#include <nbla/utils/nms.hpp>
 #include <nbla/variable.hpp>
 
 namespace nbla {
@@ -45,7 +47,7 @@ template <typename T> T calculate_overlap(T x1, T w1, T x2, T w2) {
          std::max(x1 - w1 / 2, x2 - w2 / 2);
 }
 
-template <typename T> T calculate_iou(T *a, T *b) {
+template <typename T> T calculate_iou(const T *a, const T *b) {
   // intersection
   T x1 = a[0];
   T y1 = a[1];
@@ -71,35 +73,17 @@ template <typename T> T calculate_iou(T *a, T *b) {
   return intersection / union_;
 }
 
-template <typename T>
-void index_sort_ascend(int *indexes, T *scores, int size, int stride_score) {
-  std::sort(indexes, indexes + size, [&scores, stride_score](int i, int j) {
-    return scores[i * stride_score] > scores[j * stride_score];
-  });
-}
-
 template <typename T> T suppress_under_thresh(T value, T thresh) {
   return value < thresh ? (T)0 : value;
 }
 
 template <typename T>
-void NmsDetection2d<T>::forward_impl_per_class(const Variables &inputs,
-                                               const Variables &outputs) {
-
-  const T *x = inputs[0]->get_data_pointer<T>(this->ctx_);
-  T *y = outputs[0]->cast_data_and_get_pointer<T>(this->ctx_, true);
-
-  auto sh = inputs[0]->shape();
-  int num_b = sh[0];
-  int num_nhw = sh[1];
-  int num_bnhw = num_b * num_nhw;
-  int num_c = sh[2];
-  int num_classes = sh[2] - 5;
-
+static void fill_outputs(const T *x, T *y, int num_bnhw, int num_c,
+                         float thresh) {
+  const int num_classes = num_c - 5;
 #ifdef _OPENMP
 #pragma omp parallel for schedule(static)
 #endif
-  // Fill outputs first
   for (int i = 0; i < num_bnhw; ++i) {
     const T *xx = x + i * num_c;
     T *yy = y + i * num_c;
@@ -107,52 +91,90 @@ void NmsDetection2d<T>::forward_impl_per_class(const Variables &inputs,
     yy[1] = xx[1]; // y
     yy[2] = xx[2]; // w
     yy[3] = xx[3]; // h
-    T objectness = suppress_under_thresh(xx[4], thresh_);
+    T objectness = suppress_under_thresh(xx[4], (T)thresh);
     yy[4] = objectness;
     // Class probabilities, objectness * p.
     for (int k = 0; k < num_classes; k++) {
-      yy[5 + k] = suppress_under_thresh(objectness * xx[5 + k], thresh_);
+      yy[5 + k] = suppress_under_thresh(objectness * xx[5 + k], (T)thresh);
     }
   }
+}
 
-  CpuCachedArray indexes_arr(num_nhw * num_classes, get_dtype<int>(),
-                             this->ctx_);
-  int *indexes = indexes_arr.pointer<int>();
-
+// Extents (x_begin, y_begin, x_end, y_end) of the boxes used for spatial
+// binning.
+template <typename T>
+static void compute_extents(const T *y, T *extents, int num_bnhw, int num_c) {
 #ifdef _OPENMP
 #pragma omp parallel for schedule(static)
 #endif
-  // NMS per class
-  for (int k = 0; k < num_classes; k++) {
-    for (int b = 0; b < num_b; b++) {
-      // Initialize buffer for sort
-      int *kindexes = indexes + k * num_nhw;
-      for (int i = 0; i < num_nhw; ++i) {
-        kindexes[i] = i;
-      }
-      // Sort indexes
-      index_sort_ascend(kindexes, y + b * num_nhw * num_c + 5 + k, num_nhw,
-                        num_c);
+  for (int i = 0; i < num_bnhw; ++i) {
+    const T *box = y + i * num_c;
+    T *e = extents + 4 * i;
+    std::tie(e[0], e[2]) =
+        std::minmax(box[0] - box[2] / 2, box[0] + box[2] / 2);
+    std::tie(e[1], e[3]) =
+        std::minmax(box[1] - box[3] / 2, box[1] + box[3] / 2);
+  }
+}
+
+template <typename T>
+void NmsDetection2d<T>::forward_impl_per_class(const Variables &inputs,
+                                               const Variables &outputs) {
 
-      // NMS
+  const T *x = inputs[0]->get_data_pointer<T>(this->ctx_);
+  T *y = outputs[0]->cast_data_and_get_pointer<T>(this->ctx_, true);
+
+  auto sh = inputs[0]->shape();
+  int num_b = sh[0];
+  int num_nhw = sh[1];
+  int num_bnhw = num_b * num_nhw;
+  int num_c = sh[2];
+  int num_classes = sh[2] - 5;
+
+  // Fill outputs first
+  fill_outputs(x, y, num_bnhw, num_c, thresh_);
+
+  CpuCachedArray extents_arr(num_bnhw * 4, get_dtype<T>(), this->ctx_);
+  T *extents = extents_arr.pointer<T>();
+  compute_extents(y, extents, num_bnhw, num_c);
+
+  // NMS per class and batch. Boxes are visited in descending order of the
+  // score and each of them is compared only with the already kept boxes
+  // sharing a grid cell.
+  const int num_tasks = num_b * num_classes;
+#ifdef _OPENMP
+#pragma omp parallel
+#endif
+  {
+    vector<int> candidates;
+    NmsScoreQueue<T> queue;
+    NmsSpatialGrid<T> grid;
+#ifdef _OPENMP
+#pragma omp for schedule(dynamic)
+#endif
+    for (int task = 0; task < num_tasks; ++task) {
+      const int b = task / num_classes;
+      const int k = task % num_classes;
+      T *yb = y + b * num_nhw * num_c;
+      const T *eb = extents + b * num_nhw * 4;
+      candidates.clear();
       for (int i = 0; i < num_nhw; ++i) {
-        int offset = (b * num_nhw + kindexes[i]) * num_c;
-        T prob = y[offset + 5 + k];
-        if (prob == 0) {
-          continue;
+        if (yb[i * num_c + 5 + k] != 0) {
+          candidates.push_back(i);
         }
-        T *box = y + offset;
-        for (int j = i + 1; j < num_nhw; ++j) {
-          int offset2 = (b * num_nhw + kindexes[j]) * num_c;
-          T &prob2 = y[offset2 + 5 + k]; // NOTE: as a reference.
-          if (prob2 == 0) {
-            continue;
-          }
-          T *box2 = y + offset2;
-          T iou = calculate_iou(box, box2);
-          if (iou > nms_) {
-            prob2 = 0;
-          }
+      }
+      queue.reset(yb + 5 + k, num_c, candidates);
+      grid.reset(eb, num_nhw, candidates, nms_);
+      while (!queue.empty()) {
+        const int i = queue.pop();
+        T *box = yb + i * num_c;
+        const bool suppressed = grid.any_of_neighbors(i, [&](int j) {
+          return calculate_iou(yb + j * num_c, box) > nms_;
+        });
+        if (suppressed) {
+          box[5 + k] = 0;
+        } else {
+          grid.insert(i);
         }
       }
     }
@@ -176,55 +198,55 @@ void NmsDetection2d<T>::forward_impl(const Variables &inputs,
   int num_c = sh[2];
   int num_classes = sh[2] - 5;
 
-#ifdef _OPENMP
-#pragma omp parallel for schedule(static)
-#endif
   // Fill outputs first
-  for (int i = 0; i < num_bnhw; ++i) {
-    const T *xx = x + i * num_c;
-    T *yy = y + i * num_c;
-    yy[0] = xx[0]; // x
-    yy[1] = xx[1]; // y
-    yy[2] = xx[2]; // w
-    yy[3] = xx[3]; // h
-    T objectness = suppress_under_thresh(xx[4], thresh_);
-    yy[4] = objectness;
-    // Class probabilities, objectness * p.
-    for (int k = 0; k < num_classes; k++) {
-      yy[5 + k] = suppress_under_thresh(objectness * xx[5 + k], thresh_);
-    }
-  }
+  fill_outputs(x, y, num_bnhw, num_c, thresh_);
 
-  CpuCachedArray indexes_arr(num_nhw, get_dtype<int>(), this->ctx_);
-  int *indexes = indexes_arr.pointer<int>();
+  CpuCachedArray extents_arr(num_bnhw * 4, get_dtype<T>(), this->ctx_);
+  T *extents = extents_arr.pointer<T>();
+  compute_extents(y, extents, num_bnhw, num_c);
 
-  // Non-Maximum Suppression (Naive implementation)
-  for (int b = 0; b < num_b; b++) {
-    // Initialize buffer for sort
-    for (int i = 0; i < num_nhw; ++i) {
-      indexes[i] = i;
-    }
-    // Sort indexes
-    index_sort_ascend(indexes, y + b * num_nhw * num_c + 4, num_nhw, num_c);
+  // Non-Maximum Suppression by objectness. A box is suppressed if it overlaps
+  // with any box having a higher objectness, whether the latter box is
+  // suppressed or not.
 #ifdef _OPENMP
-#pragma omp parallel for schedule(static)
+#pragma omp parallel
 #endif
-    for (int i = num_nhw - 1; i >= 0; --i) {
-      int offset = num_c * (b * num_nhw + indexes[i]);
-      T &objectness = y[offset + 4]; // NOTE: as a reference.
-      if (objectness == 0) {
-        continue;
+  {
+    vector<int> candidates;
+    NmsScoreQueue<T> queue;
+    NmsSpatialGrid<T> grid;
+#ifdef _OPENMP
+#pragma omp for schedule(dynamic)
+#endif
+    for (int b = 0; b < num_b; b++) {
+      T *yb = y + b * num_nhw * num_c;
+      const T *eb = extents + b * num_nhw * 4;
+      candidates.resize(num_nhw);
+      int num_remaining = 0;
+      for (int i = 0; i < num_nhw; ++i) {
+        candidates[i] = i;
+        num_remaining += yb[i * num_c + 4] != 0;
       }
-      T *box = y + offset;
-      for (int j = i - 1; j >= 0; --j) {
-        T *box2 = y + num_c * (b * num_nhw + indexes[j]);
-        T iou = calculate_iou(box, box2);
-        if (iou > nms_) {
-          objectness = 0;
-          for (int k = 0; k < num_classes; ++k) {
-            y[offset + 5 + k] = 0;
+      queue.reset(yb + 4, num_c, candidates);
+      grid.reset(eb, num_nhw, candidates, nms_);
+      // Boxes having zero objectness are only needed until no box to be
+      // tested remains.
+      while (num_remaining > 0) {
+        const int i = queue.pop();
+        T *box = yb + i * num_c;
+        if (box[4] != 0) {
+          --num_remaining;
+          const bool suppressed = grid.any_of_neighbors(i, [&](int j) {
+            return calculate_iou(box, yb + j * num_c) > nms_;
+          });
+          if (suppressed) {
+            box[4] = 0;
+            for (int k = 0; k < num_classes; ++k) {
+              box[5 + k] = 0;
+            }
           }
         }
+        grid.insert(i);
       }
     }
   }
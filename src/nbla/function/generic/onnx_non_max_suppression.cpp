@@ -13,9 +13,11 @@
 // limitations under the License.
 
 #include <array>
+#include <tuple>
 #include <nbla/array.hpp>
 #include <nbla/common.hpp>
 #include <nbla/function/onnx_non_max_suppression.hpp>
+#include <nbla/utils/nms.hpp>
 #include <nbla/variable.hpp>
 
 namespace nbla {
@@ -81,6 +83,20 @@ static T calculate_iou(const T *a, const T *b, int center_point_box) {
   return intersection / union_;
 }
 
+template <typename T>
+static void calculate_extent(const T *box, int center_point_box, T *extent) {
+  // extent: [x_begin, y_begin, x_end, y_end]
+  if (center_point_box == 0) {
+    std::tie(extent[1], extent[3]) = std::minmax(box[0], box[2]);
+    std::tie(extent[0], extent[2]) = std::minmax(box[1], box[3]);
+  } else {
+    std::tie(extent[0], extent[2]) =
+        std::minmax(box[0] - box[2] / 2, box[0] + box[2] / 2);
+    std::tie(extent[1], extent[3]) =
+        std::minmax(box[1] - box[3] / 2, box[1] + box[3] / 2);
+  }
+}
+
 template <typename T>
 static void non_max_suppression_impl(
     const T *boxes,  // (batch_size, num_boxes, 4)
@@ -94,69 +110,81 @@ static void non_max_suppression_impl(
   // Differences from NmsDetection2d:
   // - The input/output format
   // - Support for center_point_box and max_output_boxes_per_class
+  // - Boxes are shared by all classes, so that their extents used for spatial
+  //   binning are computed once per batch.
 
   if (max_output_boxes == 0) {
     return;
   }
 
-  vector<Size_t> indexes(num_boxes);
-  vector<bool> selected_boxes(num_boxes);
+  const int num_b = static_cast<int>(batch_size);
+  const int num_n = static_cast<int>(num_boxes);
+  const int num_k = static_cast<int>(num_classes);
 
-  // NMS per class
-  for (Size_t b = 0; b < batch_size; b++) {
-    for (Size_t k = 0; k < num_classes; k++) {
-      // Initialize buffer for sort
-      for (Size_t i = 0; i < num_boxes; ++i) {
-        indexes[i] = i;
-      }
-      // Sort indexes
-      const T *scores_per_class = scores + (b * num_classes + k) * num_boxes;
-      std::sort(indexes.begin(), indexes.end(),
-                [&scores_per_class](Size_t i, Size_t j) {
-                  return scores_per_class[i] > scores_per_class[j];
-                });
-
-      // Initialize selected or suppressed flags
-      for (Size_t i = 0; i < num_boxes; ++i) {
-        // Suppress by score
-        selected_boxes[i] = (scores_per_class[i] >= score_threshold);
-      }
+  vector<T> extents(batch_size * num_boxes * 4);
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static)
+#endif
+  for (int i = 0; i < num_b * num_n; ++i) {
+    calculate_extent(boxes + i * 4, center_point_box, extents.data() + i * 4);
+  }
 
-      // NMS
-      for (Size_t i = 0; i < num_boxes; ++i) {
-        const Size_t box_index = indexes[i];
-        if (!selected_boxes[box_index]) {
-          continue;
-        }
-        const T *box = boxes + (b * num_boxes + box_index) * 4;
-        for (Size_t j = i + 1; j < num_boxes; ++j) {
-          const Size_t box_index2 = indexes[j];
-          if (!selected_boxes[box_index2]) {
-            continue;
-          }
-          // Suppress by IoU
-          const T *box2 = boxes + (b * num_boxes + box_index2) * 4;
-          const T iou = calculate_iou(box, box2, center_point_box);
-          if (iou > iou_threshold) {
-            selected_boxes[box_index2] = false;
-          }
+  // NMS per batch and class in parallel. The selected boxes are gathered in
+  // the order of (batch, class) afterwards.
+  const int num_tasks = num_b * num_k;
+  vector<vector<Size_t>> selected_per_task(num_tasks);
+#ifdef _OPENMP
+#pragma omp parallel
+#endif
+  {
+    vector<int> candidates;
+    NmsScoreQueue<T> queue;
+    NmsSpatialGrid<T> grid;
+#ifdef _OPENMP
+#pragma omp for schedule(dynamic)
+#endif
+    for (int task = 0; task < num_tasks; ++task) {
+      const int b = task / num_k;
+      const T *scores_per_class = scores + task * num_boxes;
+      const T *boxes_per_batch = boxes + b * num_boxes * 4;
+      auto &selected = selected_per_task[task];
+
+      // Suppress by score
+      candidates.clear();
+      for (int i = 0; i < num_n; ++i) {
+        if (scores_per_class[i] >= score_threshold) {
+          candidates.push_back(i);
         }
       }
+      queue.reset(scores_per_class, 1, candidates);
+      grid.reset(extents.data() + b * num_boxes * 4, num_n, candidates,
+                 iou_threshold);
 
-      // Fill outputs
-      size_t count = 0;
-      for (Size_t i = 0; i < num_boxes; ++i) {
-        const Size_t box_index = indexes[i];
-        if (selected_boxes[box_index]) {
-          selected_indices.push_back({b, k, box_index});
-          count += 1;
-          if (count >= max_output_boxes) {
-            break;
-          }
+      // Suppress by IoU with the selected boxes, visiting the boxes in
+      // descending order of the score until enough boxes are selected.
+      while (!queue.empty() && selected.size() < max_output_boxes) {
+        const int box_index = queue.pop();
+        const T *box = boxes_per_batch + box_index * 4;
+        const bool suppressed = grid.any_of_neighbors(box_index, [&](int j) {
+          return calculate_iou(boxes_per_batch + j * 4, box,
+                               center_point_box) > iou_threshold;
+        });
+        if (!suppressed) {
+          selected.push_back(box_index);
+          grid.insert(box_index);
         }
       }
     }
   }
+
+  // Fill outputs
+  for (int task = 0; task < num_tasks; ++task) {
+    const Size_t b = task / num_k;
+    const Size_t k = task % num_k;
+    for (Size_t box_index : selected_per_task[task]) {
+      selected_indices.push_back({b, k, box_index});
+    }
+  }
 }
 
 NBLA_REGISTER_FUNCTION_SOURCE(ONNXNonMaxSuppression, int, int, float, float);
@@ -116,156 +116,34 @@ void RNN<T>::setup_impl(const Variables &inputs, const Variables &outputs) {
   outputs[0]->reshape({seq_len_, batch_size_, num_directions_ * hidden_size_},
                       true);
   outputs[1]->reshape(shape_h, true);
+  fused_rnn_.setup(this->num_layers_, num_directions_, seq_len_, batch_size_,
+                   input_dim_, hidden_size_, bias_exists_);
 }
 
 template <typename T>
-shared_ptr<CgVariable>
-RNN<T>::rnn_cell(shared_ptr<CgVariable> x, shared_ptr<CgVariable> h,
-                 shared_ptr<CgVariable> w, shared_ptr<CgVariable> b) {
-  // Graph construction
-  vector<CgVariablePtr> out_rnn;
-  vector<int> t_axes{1, 0};
-  auto concatenate = make_shared<CgFunction>(create_Concatenate(this->ctx_, 1));
-  out_rnn = connect(concatenate, {x, h}, 1);
-
-  auto transpose =
-      make_shared<CgFunction>(create_Transpose(this->ctx_, t_axes));
-  auto affine = make_shared<CgFunction>(create_Affine(this->ctx_, 1));
-  if (bias_exists_ == true) {
-    out_rnn =
-        connect(affine, {out_rnn[0], connect(transpose, {w}, 1)[0], b}, 1);
-  } else {
-    out_rnn = connect(affine, {out_rnn[0], connect(transpose, {w}, 1)[0]}, 1);
-  }
-  if (nonlinearity_.compare("tanh") == 0) {
-    auto tanh = make_shared<CgFunction>(create_Tanh(this->ctx_));
-    out_rnn = connect(tanh, {out_rnn[0]}, 1);
-  } else if (nonlinearity_.compare("relu") == 0) {
-    auto relu = make_shared<CgFunction>(create_ReLU(this->ctx_, true));
-    out_rnn = connect(relu, {out_rnn[0]}, 1);
-  } else {
-    NBLA_ERROR(error_code::not_implemented,
-               "RNN does not support given nonlinearity function.")
-  }
-  return out_rnn[0];
-}
-
-template <typename T>
-vector<vector<CgVariablePtr>> RNN<T>::create_fixed_length_rnn_graph(
-    shared_ptr<CgVariable> in_x, shared_ptr<CgVariable> in_h,
-    shared_ptr<CgVariable> in_w0, shared_ptr<CgVariable> in_w,
-    shared_ptr<CgVariable> in_b) {
-
-  vector<CgVariablePtr> xs, hn;
-  vector<CgVariablePtr> ys_out, hn_out;
-
-  if (seq_len_ == 1) {
-    auto tmp = cg_utils::get_item_nd(this->ctx_, in_x, vector<int>{0});
-    xs.push_back(tmp);
-  } else {
-    auto split = make_shared<CgFunction>(create_Split(this->ctx_, 0));
-    xs = connect(split, {in_x}, in_x->variable()->shape()[0]);
-  }
-
-  // Create graph & pass value
-  for (int i = 0; i < num_layers_; i++) {
-    vector<CgVariablePtr> hs;
-    shared_ptr<CgVariable> hf_var, wf_var, bf_var;
-    shared_ptr<CgVariable> hb_var, wb_var, bb_var;
-
-    auto wi = in_w0;
-    if (i > 0) {
-      wi = cg_utils::get_item_nd(this->ctx_, in_w,
-                                 vector<int>{i - 1}); // w[i-1];
-    }
-    // Forward on graph
-    hf_var =
-        cg_utils::get_item_nd(this->ctx_, in_h, vector<int>{i, 0}); // h0[i,0]
-    wf_var = cg_utils::get_item_nd(this->ctx_, wi, vector<int>{0}); // wi[0]
-    if (bias_exists_ == true) {
-      bf_var =
-          cg_utils::get_item_nd(this->ctx_, in_b, vector<int>{i, 0}); // b[i, 0]
-    }
-    for (vector<CgVariablePtr>::size_type k = 0; k < xs.size(); k++) {
-      hf_var = rnn_cell(xs[k], hf_var, wf_var, bf_var);
-      hs.push_back(hf_var);
-    }
-    hn.push_back(hf_var);
-    if (bidirectional_ == false) {
-      xs = hs;
-      continue;
-    }
-    // backward on graph
-    hb_var =
-        cg_utils::get_item_nd(this->ctx_, in_h, vector<int>{i, 1}); // h0[i,1]
-    wb_var = cg_utils::get_item_nd(this->ctx_, wi, vector<int>{1}); // wi[1]
-    if (bias_exists_ == true) {
-      bb_var =
-          cg_utils::get_item_nd(this->ctx_, in_b, vector<int>{i, 1}); // b[i, 1]
-    }
-    if (xs.size() > 1) {
-      std::reverse(std::begin(xs), std::end(xs));
-    }
-    for (vector<CgVariablePtr>::size_type k = 0; k < xs.size(); k++) {
-      int j = xs.size() - 1 - k;
-      hb_var = rnn_cell(xs[k], hb_var, wb_var, bb_var);
-      auto concatenate =
-          make_shared<CgFunction>(create_Concatenate(this->ctx_, 1));
-      auto h_t = connect(concatenate, {hs[j], hb_var}, 1);
-      hs[j] = h_t[0];
-    }
-    hn.push_back(hb_var);
-    xs = hs;
-  }
-
-  auto stack_y = make_shared<CgFunction>(create_Stack(this->ctx_, 0));
-  ys_out = connect(stack_y, xs, 1);
-  vector<int> shape_ys{seq_len_, batch_size_, num_directions_ * hidden_size_};
-  auto reshape_ys =
-      make_shared<CgFunction>(create_Reshape(this->ctx_, shape_ys, true));
-  ys_out = connect(reshape_ys, ys_out, 1);
-
-  auto stack_hn = make_shared<CgFunction>(create_Stack(this->ctx_, 0));
-  hn_out = connect(stack_hn, hn, 1);
-  vector<int> shape_hn{num_layers_, num_directions_, batch_size_, hidden_size_};
-  auto reshape =
-      make_shared<CgFunction>(create_Reshape(this->ctx_, shape_hn, true));
-  hn_out = connect(reshape, hn_out, 1);
-
-  return {ys_out, hn_out};
+vector<Variable *> RNN<T>::fused_inputs(const Variables &inputs) {
+  vector<Variable *> fused(FusedRNN::NUM_INPUTS, nullptr);
+  fused[FusedRNN::X] = inputs[0];
+  fused[FusedRNN::H] = inputs[1];
+  fused[FusedRNN::W0] = inputs[2];
+  int i = 3;
+  if (weight_exists_)
+    fused[FusedRNN::W] = inputs[i++];
+  if (bias_exists_)
+    fused[FusedRNN::B] = inputs[i++];
+  return fused;
 }
 
 template <typename T>
 void RNN<T>::forward_impl_training(const Variables &inputs,
                                    const Variables &outputs) {
-  bool need_grad = this->training_;
-  x_ = make_shared<CgVariable>(inputs[0]->view(), need_grad);  // x
-  h_ = make_shared<CgVariable>(inputs[1]->view(), need_grad);  // h
-  w0_ = make_shared<CgVariable>(inputs[2]->view(), need_grad); // w0
-
-  if (inputs.size() == 4) {
-    if (weight_exists_) {
-      w_ = make_shared<CgVariable>(inputs[3]->view(), need_grad); // w
-    } else if (bias_exists_) {
-      b_ = make_shared<CgVariable>(inputs[3]->view(), need_grad); // b
-    }
-  }
-  if (inputs.size() > 4) {
-    w_ = make_shared<CgVariable>(inputs[3]->view(), need_grad); // w
-    b_ = make_shared<CgVariable>(inputs[4]->view(), need_grad); // b
-  }
-
-  auto out_rnn = create_fixed_length_rnn_graph(x_, h_, w0_, w_, b_);
-  ys_ = out_rnn[0];
-  hn_ = out_rnn[1];
-
-  auto sink = make_shared<CgFunction>(create_Sink(this->ctx_, false));
-  auto dummy = connect(sink, {ys_[0], hn_[0]}, 1);
-
-  dummy[0]->forward(false, true);
+  fused_rnn_.forward<T>(this->ctx_, fused_inputs(inputs), outputs, true);
+}
 
-  cg_utils::copy_data_cgvariable_to_variable<T>(this->ctx_, ys_[0], outputs[0]);
-  cg_utils::copy_data_cgvariable_to_variable<T>(this->ctx_, hn_[0], outputs[1]);
+template <typename T>
+void RNN<T>::forward_impl_inference(const Variables &inputs,
+                                    const Variables &outputs) {
+  fused_rnn_.forward<T>(this->ctx_, fused_inputs(inputs), outputs, false);
 }
 
 template <typename T>
@@ -277,39 +155,6 @@ void RNN<T>::forward_impl(const Variables &inputs, const Variables &outputs) {
   }
 }
 
-template <typename T>
-void RNN<T>::forward_impl_inference(const Variables &inputs,
-                                    const Variables &outputs) {
-
-  bool need_grad = this->training_;
-  x_ = make_shared<CgVariable>(inputs[0]->view(), need_grad);  // x
-  h_ = make_shared<CgVariable>(inputs[1]->view(), need_grad);  // h
-  w0_ = make_shared<CgVariable>(inputs[2]->view(), need_grad); // w0
-
-  if (inputs.size() == 4) {
-    if (weight_exists_) {
-      w_ = make_shared<CgVariable>(inputs[3]->view(), need_grad); // w
-    } else if (bias_exists_) {
-      b_ = make_shared<CgVariable>(inputs[3]->view(), need_grad); // b
-    }
-  }
-  if (inputs.size() > 4) {
-    w_ = make_shared<CgVariable>(inputs[3]->view(), need_grad); // w
-    b_ = make_shared<CgVariable>(inputs[4]->view(), need_grad); // b
-  }
-
-  auto out_rnn = create_fixed_length_rnn_graph(x_, h_, w0_, w_, b_);
-  ys_ = out_rnn[0];
-  hn_ = out_rnn[1];
-
-  auto sink = make_shared<CgFunction>(create_Sink(this->ctx_, true));
-  auto dummy = connect(sink, {ys_[0], hn_[0]}, 1);
-
-  dummy[0]->forward(true, false);
-  cg_utils::copy_data_cgvariable_to_variable<T>(this->ctx_, ys_[0], outputs[0]);
-  cg_utils::copy_data_cgvariable_to_variable<T>(this->ctx_, hn_[0], outputs[1]);
-}
-
 template <typename T>
 void RNN<T>::backward_impl(const Variables &inputs, const Variables &outputs,
                            const vector<bool> &propagate_down,
@@ -328,91 +173,18 @@ void RNN<T>::backward_impl(const Variables &inputs, const Variables &outputs,
                "If bias is backpropagated, so should weights.");
   }
 
-  // settings data , propagate & accum flags
-  x_->variable()->set_data(inputs[0]->data());
-  if (!propagate_down[0]) {
-    x_->set_need_grad(false);
-  }
-  if (!accum[0]) {
-    x_->variable()->grad()->zero();
-  } else {
-    x_->variable()->set_grad(inputs[0]->grad());
-  }
-
-  h_->variable()->set_data(inputs[1]->data());
-  if (!propagate_down[1]) {
-    h_->set_need_grad(false);
-  }
-  if (!accum[1]) {
-    h_->variable()->grad()->zero();
-  } else {
-    h_->variable()->set_grad(inputs[1]->grad());
-  }
-
-  w0_->variable()->set_data(inputs[2]->data());
-  if (!propagate_down[2]) {
-    w0_->set_need_grad(false);
-  }
-  if (!accum[2]) {
-    w0_->variable()->grad()->zero();
-  } else {
-    w0_->variable()->set_grad(inputs[2]->grad());
-  }
-
-  if (inputs.size() == 4) {
-    if (weight_exists_) {
-      w_->variable()->set_data(inputs[3]->data());
-      if (!propagate_down[3]) {
-        w_->set_need_grad(false);
-      }
-      if (!accum[3]) {
-        w_->variable()->grad()->zero();
-      } else {
-        w_->variable()->set_grad(inputs[3]->grad());
-      }
-    } else if (bias_exists_) {
-      b_->variable()->set_data(inputs[3]->data());
-      if (!propagate_down[3]) {
-        b_->set_need_grad(false);
-      }
-      if (!accum[3]) {
-        b_->variable()->grad()->zero();
-      } else {
-        b_->variable()->set_grad(inputs[3]->grad());
-      }
-    }
-  }
-
-  if (inputs.size() == 5) {
-    w_->variable()->set_data(inputs[3]->data());
-    if (!propagate_down[3]) {
-      w_->set_need_grad(false);
-    }
-    if (!accum[3]) {
-      w_->variable()->grad()->zero();
-    } else {
-      w_->variable()->set_grad(inputs[3]->grad());
-    }
-
-    b_->variable()->set_data(inputs[4]->data());
-    if (!propagate_down[4]) {
-      b_->set_need_grad(false);
-    }
-    if (!accum[4]) {
-      b_->variable()->grad()->zero();
-    } else {
-      b_->variable()->set_grad(inputs[4]->grad());
+  // Flags in the order of the roles of the inputs.
+  auto fused = fused_inputs(inputs);
+  vector<bool> fused_propagate_down(FusedRNN::NUM_INPUTS, false);
+  vector<bool> fused_accum(FusedRNN::NUM_INPUTS, false);
+  for (int r = 0, i = 0; r < FusedRNN::NUM_INPUTS; ++r) {
+    if (fused[r]) {
+      fused_propagate_down[r] = propagate_down[i];
+      fused_accum[r] = accum[i];
+      ++i;
     }
   }
-
-  ys_[0]->variable()->grad()->zero();
-  hn_[0]->variable()->grad()->zero();
-  auto sink = make_shared<CgFunction>(create_Sink(this->ctx_, false));
-  auto dummy = connect(sink, {ys_[0], hn_[0]}, 1);
-
-  ys_[0]->variable()->set_grad(outputs[0]->grad());
-  hn_[0]->variable()->set_grad(outputs[1]->grad());
-
-  dummy[0]->backward(nullptr, true);
+  fused_rnn_.backward<T>(this->ctx_, fused, outputs, fused_propagate_down,
+                         fused_accum);
 }
 } // namespace nbla
@@ -21,10 +21,114 @@
 #include <nbla/variable.hpp>
 #include <numeric>
 
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
 namespace nbla {
 
 NBLA_REGISTER_FUNCTION_SOURCE(Sort, int, bool, bool, bool);
 
+namespace {
+
+// Sorting is parallelized over slices along the axis when the input has at
+// least this number of elements, and a single slice of at least this size is
+// sorted by a parallel merge sort when there are fewer slices than threads.
+constexpr size_t kParallelSize = 1 << 15;
+
+// Orders by value, and equal values by index so that the result does not
+// depend on how a slice is split for the parallel merge sort.
+template <typename T, bool reverse> struct SortKeyLess {
+  bool operator()(const std::pair<T, size_t> &a,
+                  const std::pair<T, size_t> &b) const {
+    if (reverse ? b.first < a.first : a.first < b.first)
+      return true;
+    if (reverse ? a.first < b.first : b.first < a.first)
+      return false;
+    return a.second < b.second;
+  }
+};
+
+// Sort chunks in parallel and merge them pairwise in parallel rounds.
+template <typename Iter, typename Compare>
+void parallel_merge_sort(Iter first, Iter last, Compare cmp, int num_chunks) {
+  const size_t n = last - first;
+  vector<size_t> bounds(num_chunks + 1);
+  for (int c = 0; c <= num_chunks; ++c)
+    bounds[c] = n * c / num_chunks;
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static)
+#endif
+  for (int c = 0; c < num_chunks; ++c)
+    std::sort(first + bounds[c], first + bounds[c + 1], cmp);
+  for (int width = 1; width < num_chunks; width *= 2) {
+    const int num_merges = (num_chunks - width + 2 * width - 1) / (2 * width);
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static)
+#endif
+    for (int m = 0; m < num_merges; ++m) {
+      const int c = m * 2 * width;
+      const int end = std::min(c + 2 * width, num_chunks);
+      std::inplace_merge(first + bounds[c], first + bounds[c + width],
+                         first + bounds[end], cmp);
+    }
+  }
+}
+
+template <typename T, bool reverse>
+void sort_slices(const T *x, T *y, size_t *index, size_t outer_count,
+                 size_t axis_size, size_t inner_size) {
+  using Key = std::pair<T, size_t>;
+  const size_t num_slices = outer_count * inner_size;
+  const size_t total_size = num_slices * axis_size;
+  const SortKeyLess<T, reverse> cmp;
+
+  // Gather a strided slice into contiguous (value, index) pairs, sort and
+  // scatter the result back.
+  auto sort_slice = [&](size_t slice, vector<Key> &keys, int num_chunks) {
+    const size_t o = slice / inner_size;
+    const size_t i = slice % inner_size;
+    const size_t offset = o * axis_size * inner_size + i;
+    for (size_t a = 0; a < axis_size; ++a)
+      keys[a] = std::make_pair(x[offset + a * inner_size], a);
+    if (num_chunks > 1)
+      parallel_merge_sort(keys.begin(), keys.end(), cmp, num_chunks);
+    else
+      std::sort(keys.begin(), keys.end(), cmp);
+    for (size_t a = 0; a < axis_size; ++a) {
+      index[offset + a * inner_size] = keys[a].second;
+      if (y)
+        y[offset + a * inner_size] = keys[a].first;
+    }
+  };
+
+  int num_threads = 1;
+#ifdef _OPENMP
+  num_threads = omp_get_max_threads();
+#endif
+  if (num_threads > 1 && num_slices < (size_t)num_threads &&
+      axis_size >= kParallelSize) {
+    vector<Key> keys(axis_size);
+    for (size_t slice = 0; slice < num_slices; ++slice)
+      sort_slice(slice, keys, num_threads);
+    return;
+  }
+
+  const long long num_tasks = num_slices;
+#ifdef _OPENMP
+#pragma omp parallel if (num_slices > 1 && total_size >= kParallelSize)
+#endif
+  {
+    vector<Key> keys(axis_size);
+#ifdef _OPENMP
+#pragma omp for schedule(static)
+#endif
+    for (long long slice = 0; slice < num_tasks; ++slice)
+      sort_slice(slice, keys, 1);
+  }
+}
+} // namespace
+
 template <typename T>
 void Sort<T>::setup_impl(const Variables &inputs, const Variables &outputs) {
 
@@ -53,69 +157,23 @@ void Sort<T>::setup_impl(const Variables &inputs, const Variables &outputs) {
 template <typename T>
 void Sort<T>::forward_impl(const Variables &inputs, const Variables &outputs) {
   const auto &shape = inputs[0]->shape();
-  Variable &sort_index_var = this->sort_index;
-  Variable &temp_index_var = this->temp_index;
-
-  auto sort_index_ptr = sort_index_var.cast_data_and_get_pointer<size_t>(ctx_);
-  auto temp_index_ptr = temp_index_var.cast_data_and_get_pointer<size_t>(ctx_);
+  auto sort_index_ptr =
+      this->sort_index.cast_data_and_get_pointer<size_t>(ctx_);
   auto x_data = inputs[0]->get_data_pointer<T>(ctx_);
-
-  auto outer_x_ptr = x_data;
-  auto outer_i_ptr = sort_index_ptr;
-  auto stride = this->inner_size;
-
-  while (outer_x_ptr < x_data + this->total_size) {
-    auto inner_x_ptr = outer_x_ptr;
-    auto inner_i_ptr = outer_i_ptr;
-
-    while (inner_x_ptr < outer_x_ptr + this->inner_size) {
-      std::iota(temp_index_ptr, temp_index_ptr + temp_index_var.size(), 0);
-      auto x = inner_x_ptr; // shorter name for compare function
-      auto s = stride;      // shorter name for compare function
-
-      if (this->reverse) {
-        std::sort(temp_index_ptr, temp_index_ptr + temp_index_var.size(),
-                  [&](size_t i1, size_t i2) { return x[i1 * s] > x[i2 * s]; });
-      } else {
-        std::sort(temp_index_ptr, temp_index_ptr + temp_index_var.size(),
-                  [&](size_t i1, size_t i2) { return x[i1 * s] < x[i2 * s]; });
-      }
-
-      for (size_t i = 0; i < static_cast<size_t>(shape[this->axis]); i++) {
-        inner_i_ptr[i * stride] = temp_index_ptr[i];
-      }
-      inner_x_ptr++;
-      inner_i_ptr++;
-    }
-    outer_x_ptr += this->outer_size;
-    outer_i_ptr += this->outer_size;
-  }
-
-  if (!this->only_index) {
-    auto y_data = outputs[0]->cast_data_and_get_pointer<T>(ctx_, true);
-    auto outer_x_ptr = x_data;
-    auto outer_y_ptr = y_data;
-    auto outer_i_ptr = sort_index_ptr;
-    auto stride = this->inner_size;
-
-    while (outer_x_ptr < x_data + this->total_size) {
-      auto inner_x_ptr = outer_x_ptr;
-      auto inner_y_ptr = outer_y_ptr;
-      auto inner_i_ptr = outer_i_ptr;
-
-      while (inner_x_ptr < outer_x_ptr + this->inner_size) {
-        for (size_t i = 0; i < static_cast<size_t>(shape[this->axis]); i++) {
-          const auto sort_index = inner_i_ptr[i * stride];
-          inner_y_ptr[i * stride] = inner_x_ptr[sort_index * stride];
-        }
-        inner_x_ptr++;
-        inner_y_ptr++;
-        inner_i_ptr++;
-      }
-      outer_x_ptr += this->outer_size;
-      outer_y_ptr += this->outer_size;
-      outer_i_ptr += this->outer_size;
-    }
+  auto y_data = this->only_index
+                    ? nullptr
+                    : outputs[0]->cast_data_and_get_pointer<T>(ctx_, true);
+
+  const size_t axis_size = shape[this->axis];
+  size_t outer_count = 1;
+  for (int i = 0; i < this->axis; i++)
+    outer_count *= shape[i];
+  if (this->reverse) {
+    sort_slices<T, true>(x_data, y_data, sort_index_ptr, outer_count, axis_size,
+                         this->inner_size);
+  } else {
+    sort_slices<T, false>(x_data, y_data, sort_index_ptr, outer_count,
+                          axis_size, this->inner_size);
   }
 
   if (this->with_index || this->only_index) {
@@ -133,41 +191,33 @@ void Sort<T>::backward_impl(const Variables &inputs, const Variables &outputs,
     return;
   }
 
-  Variable &sort_index_var = this->sort_index;
-  auto sort_index_ptr = sort_index_var.cast_data_and_get_pointer<size_t>(ctx_);
+  auto sort_index_ptr =
+      this->sort_index.cast_data_and_get_pointer<size_t>(ctx_);
   auto x_grad = inputs[0]->cast_grad_and_get_pointer<T>(ctx_, !accum[0]);
   auto y_grad = outputs[0]->get_grad_pointer<T>(ctx_);
   const auto &shape = inputs[0]->shape();
 
-  auto outer_x_ptr = x_grad;
-  auto outer_y_ptr = y_grad;
-  auto outer_i_ptr = sort_index_ptr;
-  auto stride = this->inner_size;
-
-  while (outer_x_ptr < x_grad + this->total_size) {
-    auto inner_x_ptr = outer_x_ptr;
-    auto inner_y_ptr = outer_y_ptr;
-    auto inner_i_ptr = outer_i_ptr;
-
-    while (inner_y_ptr < outer_y_ptr + this->inner_size) {
-      if (accum[0]) {
-        for (size_t i = 0; i < static_cast<size_t>(shape[this->axis]); i++) {
-          const auto sort_index = inner_i_ptr[i * stride];
-          inner_x_ptr[i * stride] += inner_y_ptr[sort_index * stride];
-        }
-      } else {
-        for (size_t i = 0; i < static_cast<size_t>(shape[this->axis]); i++) {
-          const auto sort_index = inner_i_ptr[i * stride];
-          inner_x_ptr[i * stride] = inner_y_ptr[sort_index * stride];
-        }
-      }
-      inner_x_ptr++;
-      inner_y_ptr++;
-      inner_i_ptr++;
+  const size_t axis_size = shape[this->axis];
+  const size_t stride = this->inner_size;
+  const long long num_slices = axis_size ? this->total_size / axis_size : 0;
+  const bool acc = accum[0];
+
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static) if (this->total_size >= kParallelSize)
+#endif
+  for (long long slice = 0; slice < num_slices; ++slice) {
+    const size_t offset =
+        (slice / stride) * axis_size * stride + slice % stride;
+    auto x = x_grad + offset;
+    auto y = y_grad + offset;
+    auto index = sort_index_ptr + offset;
+    for (size_t i = 0; i < axis_size; i++) {
+      const auto sort_index = index[i * stride];
+      if (acc)
+        x[i * stride] += y[sort_index * stride];
+      else
+        x[i * stride] = y[sort_index * stride];
     }
-    outer_x_ptr += this->outer_size;
-    outer_y_ptr += this->outer_size;
-    outer_i_ptr += this->outer_size;
   }
 }
 
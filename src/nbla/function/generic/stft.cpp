@@ -147,60 +147,67 @@ void STFT<T>::apply_inv_window_backward(Variable *x, Variable *y,
   istft_cpu_->apply_inv_window_backward(x, y, accum);
 }
 
+template <typename T>
+void STFT<T>::dft_forward(Variable *x, Variable *y_r, Variable *y_i) {
+  create_window<T>(&window_, window_type_, window_size_, fft_size_, ctx_);
+  const auto batch_size = x->shape()[0];
+  // ISTFT backward needs IDFT coefficients not DFT's.
+  stft_by_fft<T>(x->get_data_pointer<T>(ctx_),
+                 y_r->cast_data_and_get_pointer<T>(ctx_, true),
+                 y_i->cast_data_and_get_pointer<T>(ctx_, true),
+                 window_.get_data_pointer<T>(ctx_), batch_size,
+                 x->size() / batch_size, fft_size_, stride_, y_r->shape()[2],
+                 as_istft_backward_, false, false);
+  window_.data()->array()->clear();
+}
+
+template <typename T>
+void STFT<T>::dft_backward(Variable *x, Variable *y_r, Variable *y_i,
+                           const bool accum) {
+  create_window<T>(&window_, window_type_, window_size_, fft_size_, ctx_);
+  const auto batch_size = x->shape()[0];
+  istft_by_fft<T>(y_r->get_grad_pointer<T>(ctx_),
+                  y_i->get_grad_pointer<T>(ctx_),
+                  x->cast_grad_and_get_pointer<T>(ctx_, !accum),
+                  window_.get_data_pointer<T>(ctx_), batch_size,
+                  x->size() / batch_size, fft_size_, stride_, y_r->shape()[2],
+                  as_istft_backward_, accum);
+  window_.data()->array()->clear();
+}
+
 template <typename T>
 void STFT<T>::forward_impl(const Variables &inputs, const Variables &outputs) {
   auto x = inputs[0];
   auto y_r = outputs[0];
   auto y_i = outputs[1];
 
+  // The windowed DFT of frames is computed by FFT instead of the convolution
+  // prepared in setup_impl.
   if (center_) {
     pad_->forward({x}, {&pad_out_});
 
-    // Add channel axis temporally to be used as input of convolution.
-    const auto pad_out_s = pad_out_.shape();
-    pad_out_.reshape(Shape_t{pad_out_s[0], 1, pad_out_s[1]}, false);
-
     if (as_istft_backward_) {
       apply_inv_window_forward(&pad_out_, &pad_out_);
     }
 
     // Compute STFT
-    calculate_conv_weight(conv_r_, conv_i_);
-    conv_->forward({&pad_out_, &conv_r_}, {y_r});
-    conv_->forward({&pad_out_, &conv_i_}, {y_i});
+    dft_forward(&pad_out_, y_r, y_i);
 
-    // Restore the shape and clear buffer
-    pad_out_.reshape(pad_out_s, false);
+    // Clear buffer
     pad_out_.data()->array()->clear();
   } else {
-    // Add channel axis temporally to be used as input of convolution.
-    const auto x_shape_org = x->shape();
-    x->reshape(Shape_t{x_shape_org[0], 1, x_shape_org[1]}, false);
-
     if (as_istft_backward_) {
       // Compute ISTFT backward
       apply_inv_window_forward(x, &x_inv_window_);
-
-      calculate_conv_weight(conv_r_, conv_i_);
-      conv_->forward({&x_inv_window_, &conv_r_}, {y_r});
-      conv_->forward({&x_inv_window_, &conv_i_}, {y_i});
+      dft_forward(&x_inv_window_, y_r, y_i);
 
       // Clear buffer
       x_inv_window_.data()->array()->clear();
     } else {
       // Compute STFT
-      calculate_conv_weight(conv_r_, conv_i_);
-      conv_->forward({x, &conv_r_}, {y_r});
-      conv_->forward({x, &conv_i_}, {y_i});
+      dft_forward(x, y_r, y_i);
     }
-
-    // Restore x shape
-    x->reshape(x_shape_org, false);
   }
-
-  // Clear internal buffers
-  conv_r_.data()->array()->clear();
-  conv_i_.data()->array()->clear();
 }
 
 template <typename T>
@@ -218,55 +225,28 @@ void STFT<T>::backward_impl(const Variables &inputs, const Variables &outputs,
   // Execute in reverse order of forward_impl.
 
   if (center_) {
-    // Add channel axis
-    const auto pad_out_s = pad_out_.shape();
-    pad_out_.reshape({pad_out_s[0], 1, pad_out_s[1]}, false);
-
     // Compute STFT backward
-    calculate_conv_weight(conv_r_, conv_i_);
-    conv_->backward({&pad_out_, &conv_r_}, {y_r}, {true, false},
-                    {false, false});
-    conv_->backward({&pad_out_, &conv_i_}, {y_i}, {true, false}, {true, false});
+    dft_backward(&pad_out_, y_r, y_i, false);
 
     if (as_istft_backward_) {
       apply_inv_window_backward(&pad_out_, &pad_out_, false);
     }
 
-    // Remove channel axis
-    pad_out_.reshape(pad_out_s, false);
-
     pad_->backward({x}, {&pad_out_}, {true}, {accum[0]});
 
     pad_out_.grad()->array()->clear();
   } else {
-    // Add channel dimension temporally
-    const auto x_shape_org = x->shape();
-    x->reshape(Shape_t{x_shape_org[0], 1, x_shape_org[1]}, false);
-
     if (as_istft_backward_) {
       // Compute ISTFT double backward
-      calculate_conv_weight(conv_r_, conv_i_);
-      conv_->backward({&conv_grad_, &conv_r_}, {y_r}, {true, false},
-                      {false, false});
-      conv_->backward({&conv_grad_, &conv_i_}, {y_i}, {true, false},
-                      {true, false});
+      dft_backward(&conv_grad_, y_r, y_i, false);
 
       apply_inv_window_backward(x, &conv_grad_, accum[0]);
 
       conv_grad_.grad()->array()->clear();
     } else {
       // Compute STFT backward
-      calculate_conv_weight(conv_r_, conv_i_);
-      conv_->backward({x, &conv_r_}, {y_r}, {true, false}, {accum[0], false});
-      conv_->backward({x, &conv_i_}, {y_i}, {true, false}, {true, false});
+      dft_backward(x, y_r, y_i, accum[0]);
     }
-
-    // Restore x shape
-    x->reshape(x_shape_org, false);
   }
-
-  // Clear internal buffers
-  conv_r_.data()->array()->clear();
-  conv_i_.data()->array()->clear();
 }
 } // namespace nbla
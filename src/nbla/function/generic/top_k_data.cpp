@@ -91,15 +91,20 @@ void TopKData<T>::forward_impl(const Variables &inputs,
     top_k_func = this->largest_ ? top_k<T, true> : top_k<T, false>;
   }
 
-  for (int s = 0; s < this->ns_; s++) {
-    top_k_func(x_data, this->ss_, this->k_, tk_idx);
+  // Samples are independent and selected in parallel.
+  const Size_t ns = this->ns_;
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static) if (ns > 1 && ns * ss_ >= (1 << 14))
+#endif
+  for (Size_t s = 0; s < ns; s++) {
+    const auto x_s = x_data + s * ss_; // offset by input sample size
+    const auto y_s = y_data + s * fs_; // offset by output feature size
+    const auto tk_idx_s = tk_idx + s * k_;
+    top_k_func(x_s, this->ss_, this->k_, tk_idx_s);
     for (int k = 0; k < k_; k++) {
-      const auto i = tk_idx[k];
-      y_data[reduce_ ? k : i] = x_data[i];
+      const auto i = tk_idx_s[k];
+      y_s[reduce_ ? k : i] = x_s[i];
     }
-    x_data += ss_; // increase by input sample size
-    y_data += fs_; // increase by output feature size
-    tk_idx += k_;
   }
   forward_done_ = true;
 }
@@ -132,13 +137,14 @@ void TopKData<T>::backward_impl(const Variables &inputs,
       x_grad[i] += y_grad[i];
     }
   } else {
-    for (int s = 0; s < ns_; s++) {
+    const Size_t ns = ns_;
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static) if (ns > 1 && ns * ss_ >= (1 << 14))
+#endif
+    for (Size_t s = 0; s < ns; s++) {
       for (int k = 0; k < k_; k++) {
-        x_grad[tk_idx[k]] += y_grad[k];
+        x_grad[s * ss_ + tk_idx[s * k_ + k]] += y_grad[s * fs_ + k];
       }
-      x_grad += ss_;
-      y_grad += fs_;
-      tk_idx += k_;
     }
   }
 }
@@ -43,7 +43,8 @@ void TopKGrad<T>::setup_impl(const Variables &inputs,
              x->size(base_axis));
 
   y->reshape(x_shape, true);
-  top_k_idx_.reshape(Shape_t{k}, true);
+  // Indices of each sample, which is selected in parallel.
+  top_k_idx_.reshape(Shape_t{x->size() / x->size(base_axis), k}, true);
 }
 
 template <typename T>
@@ -80,17 +81,22 @@ void TopKGrad<T>::backward_impl(const Variables &inputs,
   function<void(const T *, const size_t, const size_t, size_t *)> top_k_func =
       this->abs_ ? top_k_abs<T, true> : top_k<T, true>;
 
-  auto inner_size = y->size(this->base_axis_);
-  auto outer_size = y->size() / inner_size;
-
-  for (int s = 0; s < outer_size; s++) {
-    top_k_func(y_grad, inner_size, this->k_, tk_idx);
+  const auto inner_size = y->size(this->base_axis_);
+  const auto outer_size = y->size() / inner_size;
+
+  const bool parallel = outer_size > 1 && y->size() >= (1 << 14);
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static) if (parallel)
+#endif
+  for (Size_t s = 0; s < outer_size; s++) {
+    const auto y_grad_s = y_grad + s * inner_size;
+    const auto x_grad_s = x_grad + s * inner_size;
+    const auto tk_idx_s = tk_idx + s * k_;
+    top_k_func(y_grad_s, inner_size, this->k_, tk_idx_s);
     for (int k = 0; k < k_; k++) {
-      const auto i = tk_idx[k];
-      x_grad[i] += y_grad[i];
+      const auto i = tk_idx_s[k];
+      x_grad_s[i] += y_grad_s[i];
     }
-    y_grad += inner_size;
-    x_grad += inner_size;
   }
 }
 } // namespace nbla
@@ -0,0 +1,330 @@
+// Copyright 2023 Sony Group Corporation.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <nbla/function/utils/fused_rnn.hpp>
+#include <nbla/utils/eigen.hpp>
+
+#include <algorithm>
+#include <cmath>
+
+namespace nbla {
+
+namespace {
+using eigen::ConstMatrixMap;
+using eigen::ConstRowVectorMap;
+using eigen::MatrixMap;
+using eigen::RowVectorMap;
+using ConstStridedMatrixMap =
+    Eigen::Map<const eigen::Matrix<float>, 0, Eigen::OuterStride<>>;
+
+inline float sigmoid(float x) { return 1.f / (1.f + std::exp(-x)); }
+} // namespace
+
+void FusedRNN::setup(int num_layers, int num_directions, int seq_len,
+                     int batch_size, int input_size, int hidden_size,
+                     bool has_bias) {
+  num_layers_ = num_layers;
+  num_directions_ = num_directions;
+  seq_len_ = seq_len;
+  batch_size_ = batch_size;
+  input_size_ = input_size;
+  hidden_size_ = hidden_size;
+  has_bias_ = has_bias;
+  trained_ = false;
+}
+
+int FusedRNN::num_gates() const {
+  return cell_ == LSTM ? 4 : (cell_ == GRU ? 3 : 1);
+}
+
+int FusedRNN::num_biases() const {
+  return (cell_ == LSTM || cell_ == GRU) ? 4 : 1;
+}
+
+int FusedRNN::layer_input_size(int l) const {
+  return l == 0 ? input_size_ : num_directions_ * hidden_size_;
+}
+
+const float *FusedRNN::weight(const float *w0, const float *w, int l,
+                              int d) const {
+  const Size_t gh = num_gates() * hidden_size_;
+  if (l == 0)
+    return w0 + d * gh * (input_size_ + hidden_size_);
+  const Size_t cols = layer_input_size(l) + hidden_size_;
+  return w + ((l - 1) * num_directions_ + d) * gh * cols;
+}
+
+float *FusedRNN::weight(float *w0, float *w, int l, int d) const {
+  return const_cast<float *>(weight(static_cast<const float *>(w0),
+                                    static_cast<const float *>(w), l, d));
+}
+
+void FusedRNN::forward(const float *x, const float *h0, const float *c0,
+                       const float *w0, const float *w, const float *b,
+                       float *y, float *hn, float *cn, bool training) {
+  const int L = num_layers_, D = num_directions_, T = seq_len_, B = batch_size_,
+            H = hidden_size_;
+  const Size_t GH = num_gates() * H, TB = Size_t(T) * B, DH = D * H;
+  NBLA_CHECK(L == 1 || w, error_code::value,
+             "Weight argument must be passed when num_layers > 1");
+
+  // All intermediate results are kept in training. Otherwise only the
+  // outputs of the current and previous layers are.
+  const int num_slots = training ? L * D : 1;
+  layer_outputs_.resize((training ? L : std::min(L, 2)) * TB * DH);
+  gates_.resize(num_slots * TB * GH);
+  if (cell_ == LSTM)
+    cells_.resize(num_slots * TB * H);
+  if (cell_ == GRU)
+    recurrent_n_.resize(num_slots * TB * H);
+  vector<float> hp(B * GH);
+
+  for (int l = 0; l < L; ++l) {
+    const Size_t I = layer_input_size(l), cols = I + H;
+    const float *xl = l == 0 ? x
+                             : layer_outputs_.data() +
+                                   (training ? l - 1 : (l - 1) % 2) * TB * DH;
+    float *yl = layer_outputs_.data() + (training ? l : l % 2) * TB * DH;
+    for (int d = 0; d < D; ++d) {
+      const int slot = training ? l * D + d : 0;
+      const Size_t state = (Size_t(l) * D + d) * B * H;
+      ConstMatrixMap<float> mw(weight(w0, w, l, d), GH, cols);
+      const float *bias =
+          has_bias_ ? b + (Size_t(l) * D + d) * num_biases() * H : nullptr;
+      float *gates = gates_.data() + slot * TB * GH;
+      float *cells = cell_ == LSTM ? cells_.data() + slot * TB * H : nullptr;
+      float *rn = cell_ == GRU ? recurrent_n_.data() + slot * TB * H : nullptr;
+
+      // Input projection of the whole sequence.
+      MatrixMap<float> mg(gates, TB, GH);
+      mg.noalias() =
+          ConstMatrixMap<float>(xl, TB, I) * mw.leftCols(I).transpose();
+      if (bias)
+        mg.rowwise() += ConstRowVectorMap<float>(bias, GH);
+
+      for (int s = 0; s < T; ++s) {
+        const int t = d == 0 ? s : T - 1 - s;
+        const int tp = d == 0 ? t - 1 : t + 1;
+        const float *hprev = s == 0 ? h0 + state : yl + tp * B * DH + d * H;
+        const Size_t hstride = s == 0 ? H : DH;
+        MatrixMap<float>(hp.data(), B, GH).noalias() =
+            ConstStridedMatrixMap(hprev, B, H, Eigen::OuterStride<>(hstride)) *
+            mw.rightCols(H).transpose();
+        float *gt = gates + t * B * GH;
+        float *ht = yl + t * B * DH + d * H;
+        for (int bi = 0; bi < B; ++bi) {
+          float *g = gt + bi * GH;
+          const float *p = hp.data() + bi * GH;
+          float *h = ht + bi * DH;
+          if (cell_ == LSTM) {
+            const float *cp =
+                s == 0 ? c0 + state + bi * H : cells + (tp * B + bi) * H;
+            float *c = cells + (t * B + bi) * H;
+            for (int j = 0; j < H; ++j) {
+              const float gi = sigmoid(g[j] + p[j]);
+              const float gf = sigmoid(g[H + j] + p[H + j]);
+              const float gg = std::tanh(g[2 * H + j] + p[2 * H + j]);
+              const float go = sigmoid(g[3 * H + j] + p[3 * H + j]);
+              g[j] = gi;
+              g[H + j] = gf;
+              g[2 * H + j] = gg;
+              g[3 * H + j] = go;
+              c[j] = gf * cp[j] + gi * gg;
+              h[j] = go * std::tanh(c[j]);
+            }
+          } else if (cell_ == GRU) {
+            const float *hpb = hprev + bi * hstride;
+            float *n_lin = rn + (t * B + bi) * H;
+            for (int j = 0; j < H; ++j) {
+              const float gr = sigmoid(g[j] + p[j]);
+              const float gz = sigmoid(g[H + j] + p[H + j]);
+              n_lin[j] = p[2 * H + j] + (bias ? bias[3 * H + j] : 0.f);
+              const float gn = std::tanh(g[2 * H + j] + gr * n_lin[j]);
+              g[j] = gr;
+              g[H + j] = gz;
+              g[2 * H + j] = gn;
+              h[j] = (1.f - gz) * gn + gz * hpb[j];
+            }
+          } else {
+            for (int j = 0; j < H; ++j) {
+              const float a = g[j] + p[j];
+              h[j] = cell_ == RNN_TANH ? std::tanh(a) : std::max(a, 0.f);
+            }
+          }
+        }
+      }
+
+      // Last states.
+      const int t_last = d == 0 ? T - 1 : 0;
+      for (int bi = 0; bi < B; ++bi) {
+        std::copy_n(yl + (t_last * B + bi) * DH + d * H, H,
+                    hn + state + bi * H);
+      }
+      if (cell_ == LSTM)
+        std::copy_n(cells + t_last * B * H, B * H, cn + state);
+    }
+  }
+  std::copy_n(layer_outputs_.data() +
+                  (training ? L - 1 : (L - 1) % 2) * TB * DH,
+              TB * DH, y);
+  trained_ = training;
+}
+
+void FusedRNN::backward(const float *x, const float *h0, const float *c0,
+                        const float *w0, const float *w, const float *b,
+                        const float *dy, const float *dhn, const float *dcn,
+                        float *dx, float *dh0, float *dc0, float *dw0,
+                        float *dw, float *db) {
+  NBLA_CHECK(trained_, error_code::value,
+             "Forward in training must precede backward.");
+  const int L = num_layers_, D = num_directions_, T = seq_len_, B = batch_size_,
+            H = hidden_size_;
+  const Size_t GH = num_gates() * H, TB = Size_t(T) * B, DH = D * H;
+
+  // Gradients of the output and the input of the current layer.
+  vector<float> dyl(TB * DH, 0.f);
+  if (dy)
+    std::copy_n(dy, TB * DH, dyl.data());
+  vector<float> dxl;
+  // Gradients of the gates before activations in the input and recurrent
+  // projections, which differ only in the candidate gate of GRU.
+  vector<float> dgx(TB * GH);
+  vector<float> dgh(cell_ == GRU ? TB * GH : 0);
+  vector<float> hprev_all(TB * H);
+  vector<float> dh(B * H), dc(B * H), dhprev(B * H);
+
+  for (int l = L - 1; l >= 0; --l) {
+    const Size_t I = layer_input_size(l), cols = I + H;
+    const float *xl =
+        l == 0 ? x : layer_outputs_.data() + Size_t(l - 1) * TB * DH;
+    const float *yl = layer_outputs_.data() + Size_t(l) * TB * DH;
+    const bool need_dx = l > 0 || dx;
+    dxl.assign(need_dx ? TB * I : 0, 0.f);
+    float *dwl = l == 0 ? dw0 : dw;
+
+    for (int d = 0; d < D; ++d) {
+      const int slot = l * D + d;
+      const Size_t state = Size_t(slot) * B * H;
+      ConstMatrixMap<float> mw(weight(w0, w, l, d), GH, cols);
+      const float *gates = gates_.data() + slot * TB * GH;
+      const float *cells =
+          cell_ == LSTM ? cells_.data() + slot * TB * H : nullptr;
+      const float *rn =
+          cell_ == GRU ? recurrent_n_.data() + slot * TB * H : nullptr;
+      float *dga = dgx.data();
+      float *dgr = cell_ == GRU ? dgh.data() : dgx.data();
+
+      if (dhn)
+        std::copy_n(dhn + state, B * H, dh.data());
+      else
+        std::fill(dh.begin(), dh.end(), 0.f);
+      if (cell_ == LSTM && dcn)
+        std::copy_n(dcn + state, B * H, dc.data());
+      else
+        std::fill(dc.begin(), dc.end(), 0.f);
+
+      for (int s = T - 1; s >= 0; --s) {
+        const int t = d == 0 ? s : T - 1 - s;
+        const int tp = d == 0 ? t - 1 : t + 1;
+        const float *hprev = s == 0 ? h0 + state : yl + tp * B * DH + d * H;
+        const Size_t hstride = s == 0 ? H : DH;
+        for (int bi = 0; bi < B; ++bi) {
+          std::copy_n(hprev + bi * hstride, H,
+                      hprev_all.data() + (t * B + bi) * H);
+        }
+        for (int bi = 0; bi < B; ++bi) {
+          const float *g = gates + (t * B + bi) * GH;
+          const float *h = yl + (t * B + bi) * DH + d * H;
+          const float *dyt = dyl.data() + (t * B + bi) * DH + d * H;
+          float *dhb = dh.data() + bi * H;
+          float *dcb = dc.data() + bi * H;
+          float *dhp = dhprev.data() + bi * H;
+          float *da = dga + (t * B + bi) * GH;
+          float *dr = dgr + (t * B + bi) * GH;
+          for (int j = 0; j < H; ++j)
+            dhb[j] += dyt[j];
+          if (cell_ == LSTM) {
+            const float *c = cells + (t * B + bi) * H;
+            const float *cp =
+                s == 0 ? c0 + state + bi * H : cells + (tp * B + bi) * H;
+            for (int j = 0; j < H; ++j) {
+              const float gi = g[j], gf = g[H + j], gg = g[2 * H + j],
+                          go = g[3 * H + j];
+              const float tc = std::tanh(c[j]);
+              const float dcv = dcb[j] + dhb[j] * go * (1.f - tc * tc);
+              da[j] = dcv * gg * gi * (1.f - gi);
+              da[H + j] = dcv * cp[j] * gf * (1.f - gf);
+              da[2 * H + j] = dcv * gi * (1.f - gg * gg);
+              da[3 * H + j] = dhb[j] * tc * go * (1.f - go);
+              dcb[j] = dcv * gf;
+              dhp[j] = 0.f;
+            }
+          } else if (cell_ == GRU) {
+            const float *n_lin = rn + (t * B + bi) * H;
+            const float *hpb = hprev + bi * hstride;
+            for (int j = 0; j < H; ++j) {
+              const float gr = g[j], gz = g[H + j], gn = g[2 * H + j];
+              const float dn = dhb[j] * (1.f - gz) * (1.f - gn * gn);
+              const float dz = dhb[j] * (hpb[j] - gn) * gz * (1.f - gz);
+              const float dgr_ = dn * n_lin[j] * gr * (1.f - gr);
+              da[j] = dr[j] = dgr_;
+              da[H + j] = dr[H + j] = dz;
+              da[2 * H + j] = dn;
+              dr[2 * H + j] = dn * gr;
+              dhp[j] = dhb[j] * gz;
+            }
+          } else {
+            for (int j = 0; j < H; ++j) {
+              da[j] = dhb[j] * (cell_ == RNN_TANH ? 1.f - h[j] * h[j]
+                                                  : float(h[j] > 0.f));
+              dhp[j] = 0.f;
+            }
+          }
+        }
+        MatrixMap<float>(dhprev.data(), B, H).noalias() +=
+            ConstMatrixMap<float>(dgr + t * B * GH, B, GH) * mw.rightCols(H);
+        std::swap(dh, dhprev);
+      }
+
+      if (dh0)
+        std::copy_n(dh.data(), B * H, dh0 + state);
+      if (dc0)
+        std::copy_n(dc.data(), B * H, dc0 + state);
+
+      ConstMatrixMap<float> mdga(dga, TB, GH);
+      ConstMatrixMap<float> mdgr(dgr, TB, GH);
+      if (dwl) {
+        MatrixMap<float> mdw(weight(dw0, dw, l, d), GH, cols);
+        mdw.leftCols(I).noalias() =
+            mdga.transpose() * ConstMatrixMap<float>(xl, TB, I);
+        mdw.rightCols(H).noalias() =
+            mdgr.transpose() * ConstMatrixMap<float>(hprev_all.data(), TB, H);
+      }
+      if (db && has_bias_) {
+        float *dbl = db + Size_t(slot) * num_biases() * H;
+        RowVectorMap<float>(dbl, GH) = mdga.colwise().sum();
+        if (cell_ == GRU)
+          RowVectorMap<float>(dbl + GH, H) = mdgr.rightCols(H).colwise().sum();
+      }
+      if (need_dx) {
+        MatrixMap<float>(dxl.data(), TB, I).noalias() += mdga * mw.leftCols(I);
+      }
+    }
+    if (l > 0)
+      std::swap(dyl, dxl);
+    else if (dx)
+      std::copy_n(dxl.data(), TB * I, dx);
+  }
+}
+} // namespace nbla
@@ -0,0 +1,120 @@
+// Copyright 2023 Sony Group Corporation.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <nbla/function/utils/stft_istft.hpp>
+#include <nbla/half.hpp>
+#include <nbla/utils/fft.hpp>
+
+namespace nbla {
+
+namespace {
+inline double bin_coef(int f, int fft_size, bool idft_coef) {
+  if (!idft_coef)
+    return 1.0;
+  return (f == 0 || f == fft_size / 2 ? 1.0 : 2.0) / fft_size;
+}
+} // namespace
+
+template <typename T>
+void stft_by_fft(const T *x, T *y_r, T *y_i, const T *window, int batch_size,
+                 int x_size, int fft_size, int stride, int num_frames,
+                 bool idft_coef, bool accum_r, bool accum_i) {
+  typedef FFTPlan::Complex Complex;
+  const FFTPlan plan(fft_size);
+  const int num_bins = fft_size / 2 + 1;
+  const int64_t num_jobs = (int64_t)batch_size * num_frames;
+
+#ifdef _OPENMP
+#pragma omp parallel
+#endif
+  {
+    vector<Complex> frame(fft_size), work(plan.work_size());
+#ifdef _OPENMP
+#pragma omp for schedule(static)
+#endif
+    for (int64_t job = 0; job < num_jobs; ++job) {
+      const int b = job / num_frames;
+      const int t = job % num_frames;
+      const T *x_t = x + (int64_t)b * x_size + (int64_t)t * stride;
+      for (int n = 0; n < fft_size; ++n) {
+        frame[n] = Complex((double)x_t[n] * (double)window[n], 0.0);
+      }
+      plan.execute(frame.data(), false, work.data());
+      for (int f = 0; f < num_bins; ++f) {
+        const Complex v = frame[f] * bin_coef(f, fft_size, idft_coef);
+        const int64_t i = ((int64_t)b * num_bins + f) * num_frames + t;
+        if (y_r)
+          y_r[i] = (accum_r ? (double)y_r[i] : 0.0) + v.real();
+        if (y_i)
+          y_i[i] = (accum_i ? (double)y_i[i] : 0.0) + v.imag();
+      }
+    }
+  }
+}
+
+template <typename T>
+void istft_by_fft(const T *y_r, const T *y_i, T *x, const T *window,
+                  int batch_size, int x_size, int fft_size, int stride,
+                  int num_frames, bool idft_coef, bool accum) {
+  typedef FFTPlan::Complex Complex;
+  const FFTPlan plan(fft_size);
+  const int num_bins = fft_size / 2 + 1;
+
+  // Frames overlap in a signal, so that signals are processed in parallel.
+#ifdef _OPENMP
+#pragma omp parallel
+#endif
+  {
+    vector<Complex> frame(fft_size), work(plan.work_size());
+    vector<double> out(x_size);
+#ifdef _OPENMP
+#pragma omp for schedule(static)
+#endif
+    for (int b = 0; b < batch_size; ++b) {
+      std::fill(out.begin(), out.end(), 0.0);
+      for (int t = 0; t < num_frames; ++t) {
+        std::fill(frame.begin(), frame.end(), Complex(0.0, 0.0));
+        for (int f = 0; f < num_bins; ++f) {
+          const int64_t i = ((int64_t)b * num_bins + f) * num_frames + t;
+          frame[f] = Complex(y_r ? (double)y_r[i] : 0.0,
+                             y_i ? (double)y_i[i] : 0.0) *
+                     bin_coef(f, fft_size, idft_coef);
+        }
+        plan.execute(frame.data(), true, work.data());
+        double *out_t = out.data() + (int64_t)t * stride;
+        for (int n = 0; n < fft_size; ++n) {
+          out_t[n] += frame[n].real() * (double)window[n];
+        }
+      }
+      T *x_b = x + (int64_t)b * x_size;
+      for (int n = 0; n < x_size; ++n) {
+        x_b[n] = (accum ? (double)x_b[n] : 0.0) + out[n];
+      }
+    }
+  }
+}
+
+// Template specialization
+#define NBLA_SPEC_STFT_BY_FFT(TYPE)                                            \
+  template void stft_by_fft<TYPE>(                                             \
+      const TYPE *x, TYPE *y_r, TYPE *y_i, const TYPE *window,                 \
+      int batch_size, int x_size, int fft_size, int stride, int num_frames,    \
+      bool idft_coef, bool accum_r, bool accum_i);                             \
+  template void istft_by_fft<TYPE>(                                            \
+      const TYPE *y_r, const TYPE *y_i, TYPE *x, const TYPE *window,           \
+      int batch_size, int x_size, int fft_size, int stride, int num_frames,    \
+      bool idft_coef, bool accum)
+NBLA_SPEC_STFT_BY_FFT(float);
+NBLA_SPEC_STFT_BY_FFT(Half);
+} // namespace nbla
@@ -14,6 +14,16 @@
 // limitations under the License.
 
 #include <nbla/half.hpp>
+
+#include <algorithm>
+#include <cstring>
+
+#if (defined(__GNUC__) || defined(__clang__)) &&                               \
+    (defined(__x86_64__) || defined(__i386__))
+#define NBLA_HALF_F16C
+#include <immintrin.h>
+#endif
+
 namespace nbla {
 
 // Constructor
@@ -196,6 +206,152 @@ ROP_TYPE(!=, Half) { return !(lhs == rhs); }
 //   from_float(to_float() - 1);
 //   return *this;
 // }
+
+// Bulk conversions
+namespace {
+inline uint32_t fp32_to_bits(float f) {
+  uint32_t w;
+  std::memcpy(&w, &f, sizeof(w));
+  return w;
+}
+
+inline float fp32_from_bits(uint32_t w) {
+  float f;
+  std::memcpy(&f, &w, sizeof(f));
+  return f;
+}
+
+// Branch-free versions of float2halfbits and halfbits2float which compilers
+// can vectorize. Rounding is done by float additions in the default rounding
+// mode (to nearest even).
+inline uint16_t float2halfbits_nobranch(float f) {
+  const uint32_t w = fp32_to_bits(f);
+  const uint32_t shl1_w = w + w;
+  const uint32_t sign = w & 0x80000000u;
+  // Overflows to inf if too large for half (2^112 * 2^-110).
+  float base = (std::fabs(f) * fp32_from_bits(0x77800000u)) *
+               fp32_from_bits(0x08800000u);
+  uint32_t bias = shl1_w & 0xff000000u;
+  bias = bias < 0x71000000u ? 0x71000000u : bias;
+  base = fp32_from_bits((bias >> 1) + 0x07800000u) + base;
+  const uint32_t bits = fp32_to_bits(base);
+  const uint32_t nonsign = ((bits >> 13) & 0x00007c00u) + (bits & 0x00000fffu);
+  // NaN propagates the upper bits of the significand.
+  uint32_t nan = (w >> 13) & 0x3ffu;
+  nan = 0x7c00u | nan | (nan == 0);
+  return (uint16_t)((sign >> 16) | (shl1_w > 0xff000000u ? nan : nonsign));
+}
+
+inline float halfbits2float_nobranch(uint16_t h) {
+  const uint32_t w = (uint32_t)h << 16;
+  const uint32_t sign = w & 0x80000000u;
+  const uint32_t two_w = w + w;
+  const float normalized = fp32_from_bits((two_w >> 4) + (0xe0u << 23)) *
+                           fp32_from_bits(0x07800000u);
+  const float denormalized =
+      fp32_from_bits((two_w >> 17) | (126u << 23)) - 0.5f;
+  uint32_t bits = two_w < (1u << 27) ? fp32_to_bits(denormalized)
+                                     : fp32_to_bits(normalized);
+  // inf and NaN without quieting signaling NaN.
+  bits = (h & 0x7c00u) == 0x7c00u ? 0x7f800000u | ((h & 0x3ffu) << 13) : bits;
+  return fp32_from_bits(sign | bits);
+}
+
+#ifdef NBLA_HALF_F16C
+bool has_f16c() {
+  static const bool f16c =
+      __builtin_cpu_supports("avx") && __builtin_cpu_supports("f16c");
+  return f16c;
+}
+
+__attribute__((target("avx,f16c"))) size_t float2halfbits_f16c(const float *src,
+                                                               uint16_t *dst,
+                                                               size_t n) {
+  size_t i = 0;
+  for (; i + 8 <= n; i += 8) {
+    const __m256 v = _mm256_loadu_ps(src + i);
+    _mm_storeu_si128(reinterpret_cast<__m128i *>(dst + i),
+                     _mm256_cvtps_ph(v, _MM_FROUND_TO_NEAREST_INT));
+  }
+  return i;
+}
+
+__attribute__((target("avx,f16c"))) size_t
+halfbits2float_f16c(const uint16_t *src, float *dst, size_t n) {
+  size_t i = 0;
+  for (; i + 8 <= n; i += 8) {
+    const __m128i v =
+        _mm_loadu_si128(reinterpret_cast<const __m128i *>(src + i));
+    _mm256_storeu_ps(dst + i, _mm256_cvtph_ps(v));
+  }
+  return i;
+}
+#endif
+
+void float2halfbits_block(const float *src, uint16_t *dst, size_t n) {
+  size_t i = 0;
+#ifdef NBLA_HALF_F16C
+  if (has_f16c())
+    i = float2halfbits_f16c(src, dst, n);
+#endif
+  for (; i < n; ++i)
+    dst[i] = float2halfbits_nobranch(src[i]);
+}
+
+void halfbits2float_block(const uint16_t *src, float *dst, size_t n) {
+  size_t i = 0;
+#ifdef NBLA_HALF_F16C
+  if (has_f16c())
+    i = halfbits2float_f16c(src, dst, n);
+#endif
+  for (; i < n; ++i)
+    dst[i] = halfbits2float_nobranch(src[i]);
+}
+
+void float2bfloat16bits_block(const float *src, uint16_t *dst, size_t n) {
+  for (size_t i = 0; i < n; ++i) {
+    const uint32_t w = fp32_to_bits(src[i]);
+    const uint32_t rounded = (w + 0x7fffu + ((w >> 16) & 1u)) >> 16;
+    const uint32_t nan = (w >> 16) | 0x40u;
+    dst[i] = (uint16_t)((w & 0x7fffffffu) > 0x7f800000u ? nan : rounded);
+  }
+}
+
+void bfloat16bits2float_block(const uint16_t *src, float *dst, size_t n) {
+  for (size_t i = 0; i < n; ++i)
+    dst[i] = fp32_from_bits((uint32_t)src[i] << 16);
+}
+
+// Split large arrays into blocks converted in parallel.
+template <typename S, typename D, typename F>
+void convert_in_blocks(const S *src, D *dst, size_t n, F convert) {
+  constexpr size_t block = 1 << 14;
+  const long long num_blocks = (long long)((n + block - 1) / block);
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static) if (num_blocks > 1)
+#endif
+  for (long long b = 0; b < num_blocks; ++b) {
+    const size_t begin = b * block;
+    convert(src + begin, dst + begin, std::min(block, n - begin));
+  }
+}
+} // namespace
+
+void float2halfbits_n(const float *src, uint16_t *dst, size_t n) {
+  convert_in_blocks(src, dst, n, float2halfbits_block);
+}
+
+void halfbits2float_n(const uint16_t *src, float *dst, size_t n) {
+  convert_in_blocks(src, dst, n, halfbits2float_block);
+}
+
+void float2bfloat16bits_n(const float *src, uint16_t *dst, size_t n) {
+  convert_in_blocks(src, dst, n, float2bfloat16bits_block);
+}
+
+void bfloat16bits2float_n(const uint16_t *src, float *dst, size_t n) {
+  convert_in_blocks(src, dst, n, bfloat16bits2float_block);
+}
 } // namespace nbla
 
 namespace std {
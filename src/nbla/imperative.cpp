@@ -13,14 +13,15 @@
 // limitations under the License.
 
 #include <nbla/imperative.hpp>
+#include <nbla/singleton_manager-internal.hpp>
 #include <nbla/variable.hpp>
 
 #include <memory>
 
 namespace nbla {
 
-vector<NdArrayPtr> execute(FunctionPtr func, const vector<NdArrayPtr> &inputs,
-                           int n_outputs, vector<NdArrayPtr> outputs) {
+namespace {
+void check_n_outputs(vector<NdArrayPtr> &outputs, int n_outputs) {
   // Check inplace outputs size.
   NBLA_CHECK(outputs.size() <= static_cast<unsigned>(n_outputs),
              error_code::value,
@@ -30,6 +31,39 @@ vector<NdArrayPtr> execute(FunctionPtr func, const vector<NdArrayPtr> &inputs,
   if (outputs.size() != static_cast<unsigned>(n_outputs)) {
     outputs.resize(n_outputs, nullptr);
   }
+}
+
+void set_inplace_outputs(vector<NdArrayPtr> &outputs,
+                         const Variables &foutputs) {
+  // Set inplace buffer to function output buffer if size matches.
+  for (unsigned int i = 0; i < outputs.size(); ++i) {
+    if (!outputs[i]) {
+      outputs[i] = foutputs[i]->data();
+    }
+    NBLA_CHECK(outputs[i]->size() == foutputs[i]->size(), error_code::value,
+               "In-place array size and function output size must match. "
+               "outputs[%d] size: %d, function output[%d] size: %d",
+               i, outputs[i]->size(), i, foutputs[i]->size());
+    foutputs[i]->data()->set_array(outputs[i]->array()); // Inplace.
+  }
+}
+
+string cache_key(const string &key, FunctionPtr func,
+                 const vector<NdArrayPtr> &inputs, int n_outputs) {
+  string ret =
+      key + ";" + func->context().to_string() + ";" + std::to_string(n_outputs);
+  for (auto &x : inputs) {
+    auto array = x->array();
+    ret += ";" + string_join(x->shape(), string(",")) + ":" +
+           (array->has_head_array() ? dtype_to_string(array->dtype()) : "");
+  }
+  return ret;
+}
+} // namespace
+
+vector<NdArrayPtr> execute(FunctionPtr func, const vector<NdArrayPtr> &inputs,
+                           int n_outputs, vector<NdArrayPtr> outputs) {
+  check_n_outputs(outputs, n_outputs);
 
   // Copy if function is already used.
   if (func->ask_if_used_and_use()) {
@@ -51,23 +85,68 @@ vector<NdArrayPtr> execute(FunctionPtr func, const vector<NdArrayPtr> &inputs,
   // Setup function.
   func->setup(finputs, foutputs);
 
-  // Set inplace buffer to function output buffer if size matches.
-  for (unsigned int i = 0; i < outputs.size(); ++i) {
-    if (!outputs[i]) {
-      outputs[i] = foutputs[i]->data();
-    }
-    NBLA_CHECK(outputs[i]->size() == foutputs[i]->size(), error_code::value,
-               "In-place array size and function output size must match. "
-               "outputs[%d] size: %d, function output[%d] size: %d",
-               i, outputs[i]->size(), i, foutputs[i]->size());
-    foutputs[i]->data()->set_array(outputs[i]->array()); // Inplace.
-  }
+  set_inplace_outputs(outputs, foutputs);
 
   // Execute Forward.
   func->forward(finputs, foutputs);
   return outputs;
 }
 
+vector<NdArrayPtr> execute(const string &key, FunctionPtr func,
+                           const vector<NdArrayPtr> &inputs, int n_outputs,
+                           vector<NdArrayPtr> outputs) {
+  auto cache = SingletonManager::get<ImperativeCache>();
+  if (key.empty() || cache->capacity() == 0 || func->prohibit_setup_reuse()) {
+    return execute(func, inputs, n_outputs, outputs);
+  }
+  check_n_outputs(outputs, n_outputs);
+  const string full_key = cache_key(key, func, inputs, n_outputs);
+
+  vector<VariablePtr> vinputs(inputs.size());
+  vector<VariablePtr> voutputs(outputs.size());
+  for (unsigned int i = 0; i < inputs.size(); ++i) {
+    vinputs[i] = make_shared<Variable>(inputs[i]);
+  }
+  auto finputs = as_pointer_array(vinputs);
+
+  ImperativeCache::Entry entry = cache->pop(full_key);
+  if (entry.func) {
+    // Outputs are shaped as the previous setup.
+    for (int i = 0; i < n_outputs; ++i) {
+      voutputs[i] = make_shared<Variable>(entry.out_shapes[i]);
+    }
+  } else {
+    if (func->ask_if_used_and_use()) {
+      func = func->copy();
+    }
+    for (int i = 0; i < n_outputs; ++i) {
+      voutputs[i] = make_shared<Variable>();
+    }
+    entry.func = func;
+  }
+  auto foutputs = as_pointer_array(voutputs);
+  if (entry.out_shapes.empty()) {
+    entry.func->setup(finputs, foutputs);
+    for (auto v : foutputs) {
+      entry.out_shapes.push_back(v->shape());
+    }
+  } else {
+    // Share in-place buffers as setup does.
+    for (unsigned int i = 0; i < finputs.size(); ++i) {
+      if (entry.func->inplace_data(i) != Function::NOT_INPLACE) {
+        foutputs[entry.func->inplace_data_with(i)]->data()->set_array(
+            finputs[i]->data()->array());
+      }
+    }
+  }
+
+  set_inplace_outputs(outputs, foutputs);
+
+  entry.func->forward(finputs, foutputs);
+  cache->push(full_key, entry);
+  return outputs;
+}
+
 void execute(FunctionPtr f, const Variables &inputs, const Variables &outputs) {
   f->setup(inputs, outputs);
   f->forward(inputs, outputs);
@@ -81,4 +160,71 @@ void backward(FunctionPtr f, const Variables &inputs, const Variables &outputs,
   }
   f->backward(inputs, outputs, propagate_down, accum);
 }
+
+// ----------------------------------------------------------------------
+// ImperativeCache
+// ----------------------------------------------------------------------
+ImperativeCache::ImperativeCache() : capacity_(256) {}
+
+ImperativeCache::~ImperativeCache() {}
+
+ImperativeCache::Entry ImperativeCache::pop(const string &key) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  auto it = index_.find(key);
+  if (it == index_.end()) {
+    return Entry{nullptr, {}};
+  }
+  Entry entry = it->second->second;
+  entries_.erase(it->second);
+  index_.erase(it);
+  return entry;
+}
+
+void ImperativeCache::push(const string &key, const Entry &entry) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  if (capacity_ == 0) {
+    return;
+  }
+  entries_.emplace_front(key, entry);
+  index_.emplace(key, entries_.begin());
+  evict();
+}
+
+size_t ImperativeCache::capacity() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return capacity_;
+}
+
+void ImperativeCache::set_capacity(size_t capacity) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  capacity_ = capacity;
+  evict();
+}
+
+size_t ImperativeCache::size() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return entries_.size();
+}
+
+void ImperativeCache::clear() {
+  std::lock_guard<std::mutex> lock(mutex_);
+  index_.clear();
+  entries_.clear();
+}
+
+void ImperativeCache::evict() {
+  while (entries_.size() > capacity_) {
+    auto last = std::prev(entries_.end());
+    auto range = index_.equal_range(last->first);
+    for (auto it = range.first; it != range.second; ++it) {
+      if (it->second == last) {
+        index_.erase(it);
+        break;
+      }
+    }
+    entries_.erase(last);
+  }
+}
+
+NBLA_INSTANTIATE_SINGLETON(NBLA_API, ImperativeCache);
 } // namespace nbla
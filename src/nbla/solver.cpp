@@ -184,11 +184,16 @@ void Solver::zero_grad() {
   for (auto &kv : params_) {
     SyncedArrayPtr g = kv.second.p->grad()->array();
     g->zero();
+    kv.second.p->sparse_grad()->clear();
   }
 }
 
 namespace {
 
+bool has_sparse_grad(const VariablePtr &param) {
+  return !param->sparse_grad()->empty();
+}
+
 struct ScopedCallback {
   update_hook_type post_;
   ScopedCallback(update_hook_type &pre, update_hook_type &post) : post_(post) {
@@ -213,8 +218,22 @@ struct ScopedCallback {
 void Solver::update(update_hook_type pre_callback,
                     update_hook_type post_callback) {
 
+  const auto cpu_classes = SingletonManager::get<Cpu>()->array_classes();
+  const bool cpu = std::find(cpu_classes.begin(), cpu_classes.end(),
+                             ctx_.array_class) != cpu_classes.end();
   for (auto &kv : params_) {
     SyncedArrayPtr g = kv.second.p->grad()->array();
+    if (has_sparse_grad(kv.second.p)) {
+      ScopedCallback(pre_callback, post_callback);
+      // Lazy update of the rows if the dense grad is not computed.
+      if (cpu && g->zeroing() && this->weight_decay_rate_ == 0 &&
+          update_sparse_impl(kv.first, kv.second.p)) {
+        continue;
+      }
+      sparse_grad_to_dense(kv.second.p.get());
+      update_impl(kv.first, kv.second.p);
+      continue;
+    }
     if (g->zeroing()) {
       // The gradient is not computed. Skip.
       continue;
@@ -240,6 +259,7 @@ void Solver::weight_decay(float decay_rate, update_hook_type pre_callback,
   if (decay_rate == 0)
     return;
   for (auto &kv : params_) {
+    sparse_grad_to_dense(kv.second.p.get());
     SyncedArrayPtr g = kv.second.p->grad()->array();
     if (g->zeroing()) {
       // The gradient is not computed. Skip.
@@ -259,6 +279,7 @@ void Solver::clip_grad_by_norm(float norm, update_hook_type pre_callback,
   if (norm == 0)
     return;
   for (auto &kv : params_) {
+    sparse_grad_to_dense(kv.second.p.get());
     SyncedArrayPtr g = kv.second.p->grad()->array();
     if (g->zeroing()) {
       // The gradient is not computed. Skip.
@@ -276,6 +297,9 @@ void Solver::clip_grad_by_norm(float norm, update_hook_type pre_callback,
 bool Solver::check_inf_grad(update_hook_type pre_callback,
                             update_hook_type post_callback) {
   for (auto &kv : params_) {
+    if (kv.second.p->sparse_grad()->has_inf_or_nan(true, false)) {
+      return true;
+    }
     SyncedArrayPtr g = kv.second.p->grad()->array();
     if (g->zeroing()) {
       // The gradient is not computed. Skip.
@@ -293,6 +317,9 @@ bool Solver::check_inf_grad(update_hook_type pre_callback,
 bool Solver::check_nan_grad(update_hook_type pre_callback,
                             update_hook_type post_callback) {
   for (auto &kv : params_) {
+    if (kv.second.p->sparse_grad()->has_inf_or_nan(false, true)) {
+      return true;
+    }
     SyncedArrayPtr g = kv.second.p->grad()->array();
     if (g->zeroing()) {
       // The gradient is not computed. Skip.
@@ -310,6 +337,9 @@ bool Solver::check_nan_grad(update_hook_type pre_callback,
 bool Solver::check_inf_or_nan_grad(update_hook_type pre_callback,
                                    update_hook_type post_callback) {
   for (auto &kv : params_) {
+    if (kv.second.p->sparse_grad()->has_inf_or_nan(true, true)) {
+      return true;
+    }
     SyncedArrayPtr g = kv.second.p->grad()->array();
     if (g->zeroing()) {
       // The gradient is not computed. Skip.
@@ -327,6 +357,7 @@ bool Solver::check_inf_or_nan_grad(update_hook_type pre_callback,
 void Solver::scale_grad(float scale, update_hook_type pre_callback,
                         update_hook_type post_callback) {
   for (auto &kv : params_) {
+    kv.second.p->sparse_grad()->scale(scale);
     SyncedArrayPtr g = kv.second.p->grad()->array();
     if (g->zeroing()) {
       // The gradient is not computed. Skip.
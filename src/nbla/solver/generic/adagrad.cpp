@@ -57,6 +57,28 @@ void Adagrad<T>::update_impl(const string &key, VariablePtr param) {
   }
 }
 
+template <typename T>
+bool Adagrad<T>::update_sparse_impl(const string &key, VariablePtr param) {
+  auto sparse = param->sparse_grad();
+  const Size_t row_size = sparse->row_size;
+  auto &state = states_.at(key);
+  VariablePtr g_ = state.pstate["v"];
+  auto &t = state.t;
+  T *g = g_->cast_data_and_get_pointer<T>(this->ctx_);
+  T *data = param->cast_data_and_get_pointer<T>(this->ctx_);
+  t = std::min(t + 1, std::numeric_limits<uint32_t>::max() - 1);
+  for (size_t i = 0; i < sparse->rows.size(); ++i) {
+    const float *grad = sparse->values.data() + i * row_size;
+    const Size_t offset = sparse->rows[i] * row_size;
+    for (Size_t s = offset; s < offset + row_size; ++s) {
+      const T gs = grad[s - offset];
+      g[s] += gs * gs;
+      data[s] -= lr_ * gs / (std::sqrt(g[s]) + eps_);
+    }
+  }
+  return true;
+}
+
 NBLA_DEF_WEIGHT_DECAY(Adagrad, weight_decay_cpu);
 NBLA_DEF_CLIP_GRAD_BY_NORM(Adagrad, clip_grad_by_norm_cpu);
 NBLA_DEF_CHECK_INF_GRAD(Adagrad, check_inf_grad_cpu);
@@ -70,6 +70,36 @@ void Adam<T>::update_impl(const string &key, VariablePtr param) {
   }
 }
 
+template <typename T>
+bool Adam<T>::update_sparse_impl(const string &key, VariablePtr param) {
+  auto sparse = param->sparse_grad();
+  const Size_t row_size = sparse->row_size;
+  auto &state = states_.at(key);
+  auto &t = state.t;
+  VariablePtr s1 = state.pstate["mean"];
+  VariablePtr s2 = state.pstate["var"];
+  T *m = s1->cast_data_and_get_pointer<T>(this->ctx_);
+  T *v = s2->cast_data_and_get_pointer<T>(this->ctx_);
+  T *theta = param->cast_data_and_get_pointer<T>(this->ctx_);
+  t = std::min(t + 1, std::numeric_limits<uint32_t>::max() - 1);
+  const T bias_correction =
+      std::sqrt(1 - std::pow(beta2_, t)) / (1 - std::pow(beta1_, t));
+  const T alpha_t = alpha_ * bias_correction;
+  for (size_t i = 0; i < sparse->rows.size(); ++i) {
+    const float *grad = sparse->values.data() + i * row_size;
+    const Size_t offset = sparse->rows[i] * row_size;
+    for (Size_t s = offset; s < offset + row_size; ++s) {
+      const T g = grad[s - offset];
+      // Updating running mean and var of the row.
+      m[s] = beta1_ * m[s] + (1 - beta1_) * g;
+      v[s] = beta2_ * v[s] + (1 - beta2_) * g * g;
+      // Update parameters.
+      theta[s] = theta[s] - alpha_t * m[s] / (std::sqrt(v[s]) + eps_);
+    }
+  }
+  return true;
+}
+
 NBLA_DEF_WEIGHT_DECAY(Adam, weight_decay_cpu);
 NBLA_DEF_CLIP_GRAD_BY_NORM(Adam, clip_grad_by_norm_cpu);
 NBLA_DEF_CHECK_INF_GRAD(Adam, check_inf_grad_cpu);
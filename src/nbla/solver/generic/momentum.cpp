@@ -56,6 +56,28 @@ void Momentum<T>::update_impl(const string &key, VariablePtr param) {
   t = std::min(t + 1, std::numeric_limits<uint32_t>::max() - 1);
 }
 
+template <typename T>
+bool Momentum<T>::update_sparse_impl(const string &key, VariablePtr param) {
+  auto sparse = param->sparse_grad();
+  const Size_t row_size = sparse->row_size;
+  auto &state = states_.at(key);
+  VariablePtr v_ = state.pstate["m"];
+  T *v = v_->cast_data_and_get_pointer<T>(this->ctx_);
+  T *data = param->cast_data_and_get_pointer<T>(this->ctx_);
+  for (size_t i = 0; i < sparse->rows.size(); ++i) {
+    const float *grad = sparse->values.data() + i * row_size;
+    const Size_t offset = sparse->rows[i] * row_size;
+    for (Size_t k = offset; k < offset + row_size; ++k) {
+      const T g = grad[k - offset];
+      v[k] = momentum_ * v[k] + lr_ * g;
+      data[k] = data[k] - v[k];
+    }
+  }
+  auto &t = state.t;
+  t = std::min(t + 1, std::numeric_limits<uint32_t>::max() - 1);
+  return true;
+}
+
 NBLA_DEF_WEIGHT_DECAY(Momentum, weight_decay_cpu);
 NBLA_DEF_CLIP_GRAD_BY_NORM(Momentum, clip_grad_by_norm_cpu);
 NBLA_DEF_CHECK_INF_GRAD(Momentum, check_inf_grad_cpu);
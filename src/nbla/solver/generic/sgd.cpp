@@ -48,6 +48,24 @@ void Sgd<T>::update_impl(const string &key, VariablePtr param) {
   t = std::min(t + 1, std::numeric_limits<uint32_t>::max() - 1);
 }
 
+template <typename T>
+bool Sgd<T>::update_sparse_impl(const string &key, VariablePtr param) {
+  auto sparse = param->sparse_grad();
+  const Size_t row_size = sparse->row_size;
+  T *data = param->cast_data_and_get_pointer<T>(this->ctx_);
+  for (size_t i = 0; i < sparse->rows.size(); ++i) {
+    const float *grad = sparse->values.data() + i * row_size;
+    T *x = data + sparse->rows[i] * row_size;
+    for (Size_t k = 0; k < row_size; ++k) {
+      x[k] = x[k] - T(lr_ * grad[k]);
+    }
+  }
+  auto &state = states_.at(key);
+  auto &t = state.t;
+  t = std::min(t + 1, std::numeric_limits<uint32_t>::max() - 1);
+  return true;
+}
+
 NBLA_DEF_WEIGHT_DECAY(Sgd, weight_decay_cpu);
 NBLA_DEF_CLIP_GRAD_BY_NORM(Sgd, clip_grad_by_norm_cpu);
 NBLA_DEF_CHECK_INF_GRAD(Sgd, check_inf_grad_cpu);
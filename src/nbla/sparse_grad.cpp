@@ -0,0 +1,101 @@
+// Copyright 2023 Sony Group Corporation.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <nbla/sparse_grad.hpp>
+#include <nbla/variable.hpp>
+
+#include <algorithm>
+#include <cmath>
+#include <numeric>
+
+namespace nbla {
+
+void SparseGrad::clear() {
+  rows.clear();
+  values.clear();
+}
+
+void SparseGrad::add(const int64_t *new_rows, const float *new_values, Size_t n,
+                     Size_t row_size) {
+  NBLA_CHECK(rows.empty() || this->row_size == row_size, error_code::value,
+             "Row size of sparse gradient mismatch: %ld != %ld.",
+             (long)row_size, (long)this->row_size);
+  this->row_size = row_size;
+
+  vector<Size_t> order(n);
+  std::iota(order.begin(), order.end(), 0);
+  std::stable_sort(order.begin(), order.end(), [&](Size_t a, Size_t b) {
+    return new_rows[a] < new_rows[b];
+  });
+
+  // Merge the sorted rows, summing up the values of the same row.
+  vector<int64_t> merged_rows;
+  vector<float> merged_values;
+  merged_rows.reserve(rows.size() + n);
+  merged_values.reserve((rows.size() + n) * row_size);
+  auto append = [&](int64_t row, const float *value) {
+    if (merged_rows.empty() || merged_rows.back() != row) {
+      merged_rows.push_back(row);
+      merged_values.insert(merged_values.end(), value, value + row_size);
+      return;
+    }
+    float *dst = merged_values.data() + merged_values.size() - row_size;
+    for (Size_t k = 0; k < row_size; ++k) {
+      dst[k] += value[k];
+    }
+  };
+  Size_t i = 0, j = 0;
+  while (i < (Size_t)rows.size() || j < n) {
+    if (j == n || (i < (Size_t)rows.size() && rows[i] <= new_rows[order[j]])) {
+      append(rows[i], values.data() + i * row_size);
+      ++i;
+    } else {
+      append(new_rows[order[j]], new_values + order[j] * row_size);
+      ++j;
+    }
+  }
+  rows.swap(merged_rows);
+  values.swap(merged_values);
+}
+
+void SparseGrad::scale(float scale) {
+  for (auto &v : values) {
+    v *= scale;
+  }
+}
+
+bool SparseGrad::has_inf_or_nan(bool inf, bool nan) const {
+  return std::any_of(values.begin(), values.end(), [&](float v) {
+    return (inf && std::isinf(v)) || (nan && std::isnan(v));
+  });
+}
+
+void sparse_grad_to_dense(Variable *var) {
+  auto sparse = var->sparse_grad();
+  if (sparse->empty()) {
+    return;
+  }
+  Context cpu_ctx{{"cpu:float"}, "CpuCachedArray", "0"};
+  float *g = var->cast_grad_and_get_pointer<float>(cpu_ctx);
+  const Size_t row_size = sparse->row_size;
+  for (size_t i = 0; i < sparse->rows.size(); ++i) {
+    float *dst = g + sparse->rows[i] * row_size;
+    const float *src = sparse->values.data() + i * row_size;
+    for (Size_t k = 0; k < row_size; ++k) {
+      dst[k] += src[k];
+    }
+  }
+  sparse->clear();
+}
+} // namespace nbla
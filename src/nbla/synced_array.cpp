@@ -19,6 +19,7 @@
 #include <nbla/synced_array.hpp>
 
 #include <algorithm>
+#include <atomic>
 
 #ifdef ENABLE_SYNC_DEBUG
 #include <cstdlib>
@@ -63,6 +64,57 @@ inline string create_key(const string &parent_key, const Size_t offset,
   return parent_key + ":" + to_string(offset) + ":" + to_string(size);
 }
 
+namespace {
+std::atomic<size_t> sync_copies(0);
+std::atomic<size_t> sync_conversions(0);
+std::atomic<size_t> sync_transfers(0);
+std::atomic<size_t> sync_bytes(0);
+
+// Copies between host arrays deferred during cast_sp_batch or get_sp_batch.
+// The source arrays are held since they may be cleared from the SyncedArray.
+typedef vector<pair<shared_ptr<Array>, shared_ptr<Array>>> DeferredCopies;
+thread_local DeferredCopies *deferred_copies = nullptr;
+
+class DeferredCopyScope {
+  DeferredCopies copies_;
+  DeferredCopies *prev_;
+
+public:
+  DeferredCopyScope(const Context &ctx) : prev_(deferred_copies) {
+    // Callbacks may observe the array contents, and copies of device arrays
+    // are already asynchronous.
+    Context filtered_ctx = ArrayCreator::filter_context(ctx);
+    if (SingletonManager::get<SyncedArrayCallback>()->empty() &&
+        ArrayGroup::get_group(filtered_ctx.array_class) == "cpu") {
+      deferred_copies = &copies_;
+    }
+  }
+
+  ~DeferredCopyScope() {
+    deferred_copies = prev_;
+    // Copies left by an exception are done here since their destinations
+    // are already at the head.
+    for (auto &c : copies_) {
+      try {
+        c.first->copy_from(c.second.get());
+      } catch (...) {
+      }
+    }
+  }
+
+  void run() {
+    const int n = static_cast<int>(copies_.size());
+#ifdef _OPENMP
+#pragma omp parallel for schedule(dynamic)
+#endif
+    for (int i = 0; i < n; ++i) {
+      copies_[i].first->copy_from(copies_[i].second.get());
+    }
+    copies_.clear();
+  }
+};
+} // namespace
+
 // Constructor
 SyncedArray::SyncedArray(const Size_t size)
     : head_{"", "", dtypes::FLOAT}, zeroing_lazy_eval_(true),
@@ -205,6 +257,45 @@ shared_ptr<Array> SyncedArray::cast_sp(dtypes dtype, const Context &ctx,
   return created_array.first;
 }
 
+vector<shared_ptr<Array>>
+SyncedArray::cast_sp_batch(const vector<SyncedArrayPtr> &arrays, dtypes dtype,
+                           const Context &ctx, bool write_only,
+                           const int async_flags) {
+  vector<shared_ptr<Array>> ret;
+  ret.reserve(arrays.size());
+  DeferredCopyScope scope(ctx);
+  for (auto &a : arrays) {
+    ret.push_back(a->cast_sp(dtype, ctx, write_only, async_flags));
+  }
+  scope.run();
+  return ret;
+}
+
+vector<shared_ptr<const Array>>
+SyncedArray::get_sp_batch(const vector<SyncedArrayPtr> &arrays, dtypes dtype,
+                          const Context &ctx, const int async_flags) {
+  vector<shared_ptr<const Array>> ret;
+  ret.reserve(arrays.size());
+  DeferredCopyScope scope(ctx);
+  for (auto &a : arrays) {
+    ret.push_back(a->get_sp(dtype, ctx, async_flags));
+  }
+  scope.run();
+  return ret;
+}
+
+SyncStatistics SyncedArray::sync_statistics() {
+  return SyncStatistics{sync_copies.load(), sync_conversions.load(),
+                        sync_transfers.load(), sync_bytes.load()};
+}
+
+void SyncedArray::reset_sync_statistics() {
+  sync_copies = 0;
+  sync_conversions = 0;
+  sync_transfers = 0;
+  sync_bytes = 0;
+}
+
 const Array *SyncedArray::get(dtypes dtype, const Context &ctx,
                               const int async_flags) {
   return get_sp(dtype, ctx, async_flags).get();
@@ -371,11 +462,22 @@ SyncedArray::ArrayDesc SyncedArray::sync(dtypes dtype, const Context &ctx_orig,
     filling_lazy_eval_ = false;
   } else if (array_.size() > 1) {
     // TODO: Better heuristic choice from current heads
-    Array *head_array = array_[head_.key].first.get();
+    auto head_array_sp = array_[head_.key].first;
+    Array *head_array = head_array_sp.get();
+    sync_copies++;
+    sync_bytes += size_ * sizeof_dtype(desc.dtype);
+    if (head_.dtype != desc.dtype) {
+      sync_conversions++;
+    }
     if (head_.array_class == desc.array_class) {
       head_array->wait_event(ctx, async_flags);
-      array->copy_from(head_array);
+      if (deferred_copies && !has_family()) {
+        deferred_copies->emplace_back(ah.first, head_array_sp);
+      } else {
+        array->copy_from(head_array);
+      }
     } else {
+      sync_transfers++;
       ArraySynchronizer::synchronize(head_.array_class, head_array,
                                      desc.array_class, array, async_flags);
       SYNC_DEBUG("SYNC: %s<%s> --[%ld elements (%ld bytes in %s)]--> %s<%s>.",
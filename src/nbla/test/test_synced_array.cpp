@@ -72,4 +72,23 @@ TEST_F(SyncedArrayManipTest, SyncDtypesByCastDataGetData) {
     }
   }
 }
+
+TEST_F(SyncedArrayManipTest, CastBatchCompletesCopiesOnError) {
+  float *data_f = arr_->cast(dtypes::FLOAT, ctx_)->pointer<float>();
+  for (int i = 0; i < arr_->size(); ++i) {
+    data_f[i] = i - 5;
+  }
+  // Cast of a child array to another dtype than the root throws after the
+  // copy of arr_ is deferred.
+  auto root = make_shared<SyncedArray>(size_);
+  root->cast(dtypes::FLOAT, ctx_);
+  auto child = root->narrow(size_ / 2, 0);
+  ASSERT_THROW(SyncedArray::cast_sp_batch({arr_, child}, dtypes::DOUBLE, ctx_),
+               Exception);
+  const double *data_d =
+      arr_->get(dtypes::DOUBLE, ctx_)->const_pointer<double>();
+  for (int i = 0; i < arr_->size(); ++i) {
+    EXPECT_EQ(data_d[i], i - 5);
+  }
+}
 } // namespace nbla
@@ -0,0 +1,240 @@
+// Copyright 2023 Sony Group Corporation.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <nbla/half.hpp>
+#include <nbla/utils/fft.hpp>
+
+#include <algorithm>
+#include <cmath>
+
+namespace nbla {
+
+namespace {
+// Radices transformed by the Stockham algorithm. A length having other prime
+// factors is transformed by Bluestein's algorithm.
+const Size_t kMaxRadix = 13;
+
+bool factorize(Size_t n, vector<Size_t> &radices) {
+  radices.clear();
+  while (n % 4 == 0) {
+    radices.push_back(4);
+    n /= 4;
+  }
+  for (Size_t r = 2; r <= kMaxRadix && n > 1; ++r) {
+    while (n % r == 0) {
+      radices.push_back(r);
+      n /= r;
+    }
+  }
+  return n == 1;
+}
+} // namespace
+
+FFTPlan::FFTPlan(Size_t n) : n_(n) {
+  NBLA_CHECK(n > 0, error_code::value, "FFT size must be positive: %ld.", n);
+  const double pi = std::acos(-1);
+  if (factorize(n, radices_)) {
+    twiddle_.resize(n);
+    for (Size_t k = 0; k < n; ++k) {
+      twiddle_[k] = std::polar(1.0, -2.0 * pi * k / n);
+    }
+    return;
+  }
+
+  // Bluestein's algorithm computes DFT as a convolution with a chirp,
+  // X_k = c_k sum_n (x_n c_n) conj(c_{k-n}), where c_k = exp(-pi j k^2 / N).
+  // The convolution is computed by FFT of a power of two.
+  radices_.clear();
+  Size_t m = 1;
+  while (m < 2 * n - 1)
+    m *= 2;
+  sub_ = std::make_shared<FFTPlan>(m);
+  chirp_.resize(n);
+  for (Size_t k = 0; k < n; ++k) {
+    // k^2 mod 2N keeps the precision of the phase for a large k.
+    const Size_t k2 = (k * k) % (2 * n);
+    chirp_[k] = std::polar(1.0, -pi * k2 / n);
+  }
+  chirp_fft_.assign(m, Complex(0, 0));
+  chirp_fft_[0] = std::conj(chirp_[0]);
+  for (Size_t k = 1; k < n; ++k) {
+    chirp_fft_[k] = chirp_fft_[m - k] = std::conj(chirp_[k]);
+  }
+  vector<Complex> work(sub_->work_size());
+  sub_->execute(chirp_fft_.data(), false, work.data());
+}
+
+FFTPlan::~FFTPlan() {}
+
+Size_t FFTPlan::work_size() const {
+  if (sub_) {
+    return sub_->size() + sub_->work_size();
+  }
+  return n_;
+}
+
+void FFTPlan::execute(Complex *data, bool inverse, Complex *work) const {
+  // The inverse transform is conj(DFT(conj(x))).
+  if (inverse) {
+    for (Size_t i = 0; i < n_; ++i)
+      data[i] = std::conj(data[i]);
+  }
+  if (sub_) {
+    bluestein(data, work);
+  } else {
+    stockham(data, work);
+  }
+  if (inverse) {
+    for (Size_t i = 0; i < n_; ++i)
+      data[i] = std::conj(data[i]);
+  }
+}
+
+void FFTPlan::stockham(Complex *data, Complex *work) const {
+  // Each stage with a radix r splits the current length l into r * m and
+  // writes the r-point DFTs of the decimated sequences with twiddle factors.
+  // s is the number of sequences being transformed in parallel.
+  Complex *x = data;
+  Complex *y = work;
+  Size_t l = n_;
+  Size_t s = 1;
+  Complex a[kMaxRadix];
+  for (auto r : radices_) {
+    const Size_t m = l / r;
+    const Size_t step = n_ / l; // twiddle_[p * step] = exp(-2 pi j p / l)
+    const Size_t step_r = n_ / r;
+    for (Size_t p = 0; p < m; ++p) {
+      for (Size_t q = 0; q < s; ++q) {
+        for (Size_t j = 0; j < r; ++j) {
+          a[j] = x[q + s * (p + j * m)];
+        }
+        Complex *y_pq = y + q + s * r * p;
+        if (r == 2) {
+          y_pq[0] = a[0] + a[1];
+          y_pq[s] = (a[0] - a[1]) * twiddle_[p * step];
+        } else if (r == 4) {
+          const Complex t0 = a[0] + a[2];
+          const Complex t1 = a[0] - a[2];
+          const Complex t2 = a[1] + a[3];
+          // -j * (a[1] - a[3])
+          const Complex t3 = Complex((a[1] - a[3]).imag(), -(a[1] - a[3]).real());
+          y_pq[0] = t0 + t2;
+          y_pq[s] = (t1 + t3) * twiddle_[p * step];
+          y_pq[2 * s] = (t0 - t2) * twiddle_[2 * p * step];
+          y_pq[3 * s] = (t1 - t3) * twiddle_[3 * p * step];
+        } else {
+          for (Size_t k = 0; k < r; ++k) {
+            Complex v = a[0];
+            for (Size_t j = 1; j < r; ++j) {
+              v += a[j] * twiddle_[((j * k) % r) * step_r];
+            }
+            y_pq[k * s] = v * twiddle_[k * p * step];
+          }
+        }
+      }
+    }
+    std::swap(x, y);
+    l = m;
+    s *= r;
+  }
+  if (x != data) {
+    std::copy(x, x + n_, data);
+  }
+}
+
+void FFTPlan::bluestein(Complex *data, Complex *work) const {
+  const Size_t m = sub_->size();
+  Complex *a = work;
+  Complex *sub_work = work + m;
+  for (Size_t k = 0; k < n_; ++k) {
+    a[k] = data[k] * chirp_[k];
+  }
+  std::fill(a + n_, a + m, Complex(0, 0));
+  sub_->execute(a, false, sub_work);
+  for (Size_t k = 0; k < m; ++k) {
+    a[k] *= chirp_fft_[k];
+  }
+  sub_->execute(a, true, sub_work);
+  const double inv_m = 1.0 / m;
+  for (Size_t k = 0; k < n_; ++k) {
+    data[k] = a[k] * chirp_[k] * inv_m;
+  }
+}
+
+template <typename T>
+void fft_nd(const T *x, T *y, const Shape_t &shape, int signal_ndim,
+            bool inverse, double scale, bool accum) {
+  typedef FFTPlan::Complex Complex;
+  const int ndim = shape.size();
+  NBLA_CHECK(ndim >= signal_ndim + 1 && shape[ndim - 1] == 2,
+             error_code::value,
+             "Input must be (..., N_1, ..., N_d, 2) for %d-D FFT.",
+             signal_ndim);
+  Size_t size = 1;
+  for (int i = 0; i < ndim - 1; ++i)
+    size *= shape[i];
+
+  vector<Complex> buf(size);
+  for (Size_t i = 0; i < size; ++i) {
+    buf[i] = Complex((double)x[2 * i], (double)x[2 * i + 1]);
+  }
+
+  // 1-D transforms along each signal axis.
+  for (int axis = ndim - 2; axis >= ndim - 1 - signal_ndim; --axis) {
+    const Size_t n = shape[axis];
+    Size_t inner = 1;
+    for (int i = axis + 1; i < ndim - 1; ++i)
+      inner *= shape[i];
+    const Size_t outer = size / (n * inner);
+    const int64_t lines = outer * inner;
+    const FFTPlan plan(n);
+#ifdef _OPENMP
+#pragma omp parallel
+#endif
+    {
+      vector<Complex> line(n), work(plan.work_size());
+#ifdef _OPENMP
+#pragma omp for schedule(static)
+#endif
+      for (int64_t l = 0; l < lines; ++l) {
+        Complex *b = buf.data() + (l / inner) * n * inner + l % inner;
+        for (Size_t k = 0; k < n; ++k)
+          line[k] = b[k * inner];
+        plan.execute(line.data(), inverse, work.data());
+        for (Size_t k = 0; k < n; ++k)
+          b[k * inner] = line[k];
+      }
+    }
+  }
+
+  for (Size_t i = 0; i < size; ++i) {
+    const Complex v = buf[i] * scale;
+    if (accum) {
+      y[2 * i] += (T)v.real();
+      y[2 * i + 1] += (T)v.imag();
+    } else {
+      y[2 * i] = (T)v.real();
+      y[2 * i + 1] = (T)v.imag();
+    }
+  }
+}
+
+// Template specialization
+#define NBLA_SPEC_FFT_ND(TYPE)                                                 \
+  template void fft_nd<TYPE>(const TYPE *x, TYPE *y, const Shape_t &shape,     \
+                             int signal_ndim, bool inverse, double scale,      \
+                             bool accum)
+NBLA_SPEC_FFT_ND(float);
+NBLA_SPEC_FFT_ND(Half);
+} // namespace nbla
@@ -57,14 +57,15 @@ void Variable::update_shape_info() {
   ndim_ = shape_.size();
 }
 
-Variable::Variable(const Shape_t &shape) {
+Variable::Variable(const Shape_t &shape)
+    : sparse_grad_(make_shared<SparseGrad>()) {
   this->shape_ = shape;
   update_shape_info();
   this->set_data(make_shared<NdArray>(shape_));
   this->set_grad(make_shared<NdArray>(shape_));
 }
 
-Variable::Variable(NdArrayPtr data) {
+Variable::Variable(NdArrayPtr data) : sparse_grad_(make_shared<SparseGrad>()) {
   shape_ = data->shape();
   update_shape_info();
   this->set_data(data);
@@ -96,6 +97,7 @@ VariablePtr Variable::view() {
   auto v = make_shared<Variable>(shape_);
   v->set_data(this->data());
   v->set_grad(this->grad());
+  v->sparse_grad_ = sparse_grad_;
   return v;
 }
 
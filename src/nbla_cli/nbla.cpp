@@ -17,7 +17,7 @@
 #include "nbla_commands.hpp"
 
 static void print_usage_and_exit(const char *name) {
-  std::cerr << "Usage: " << name << " (infer|dump|train)" << std::endl;
+  std::cerr << "Usage: " << name << " (infer|serve|dump|train)" << std::endl;
   std::cerr << "    " << name
             << " infer -e EXECUTOR [-b BATCHSIZE] [-o OUTPUT] input_files ..."
             << std::endl;
@@ -36,6 +36,12 @@ static void print_usage_and_exit(const char *name) {
                "parameters in binary."
             << std::endl;
   std::cerr << "                   *.bin      : Input data." << std::endl;
+  std::cerr << "    " << name
+            << " serve -e EXECUTOR [-b BATCHSIZE] [-l MAX_LATENCY_MS] "
+               "[-s SOCKET] input_files ..."
+            << std::endl;
+  std::cerr << "               Serve inference requests from stdin or SOCKET."
+            << std::endl;
   std::cerr << "    " << name << " dump input_files ..." << std::endl;
   std::cerr
       << "               input_file must be nnp, nntxt, prototxt, h5, protobuf."
@@ -57,6 +63,8 @@ int main(int argc, char *argv[]) {
 
   if (command == "infer") {
     nbla_infer(argc, argv);
+  } else if (command == "serve") {
+    nbla_serve(argc, argv);
   } else if (command == "dump") {
     nbla_dump(argc, argv);
   } else if (command == "train") {
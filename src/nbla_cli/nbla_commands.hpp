@@ -17,6 +17,7 @@
 
 bool nbla_dump(int argc, char *argv[]);
 bool nbla_infer(int argc, char *argv[]);
+bool nbla_serve(int argc, char *argv[]);
 bool nbla_train(int argc, char *argv[]);
 
 #endif // H_NBLA_COMMANDS_HPP_
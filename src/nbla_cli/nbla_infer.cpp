@@ -79,40 +79,22 @@ bool nbla_infer_core(nbla::Context ctx, int argc, char *argv[]) {
     std::streamsize size = file.tellg();
     file.seekg(0, std::ios::beg);
 
-    if (p.get<std::string>("data_type") == "uint8") {
-      uint8_t *data = var->cast_data_and_get_pointer<uint8_t>(ctx);
-      if ((int)size == ((int)(var->size()) * (int)(sizeof(uint8_t)))) {
-        std::vector<uint8_t> buffer(size / sizeof(uint8_t));
-        if (file.read((char *)buffer.data(), size)) {
-          std::cout << "  Read data from [" << ifile << "]" << std::endl;
-          for (int j = 0; j < var->size(); ++j) {
-            data[j] = buffer[j];
-          }
-        }
-      } else {
-        std::cout << " Data size mismatch on data " << i
-                  << ". expected size is "
-                  << (int)(var->size()) * sizeof(uint8_t) << " but data file ["
-                  << ifile << "] size is " << size << "." << std::endl;
-        return false;
-      }
-    } else {
-      float *data = var->cast_data_and_get_pointer<float>(ctx);
-      if ((int)size == ((int)(var->size()) * (int)(sizeof(float)))) {
-        std::vector<float> buffer(size / sizeof(float));
-        if (file.read((char *)buffer.data(), size)) {
-          std::cout << "  Read data from [" << ifile << "]" << std::endl;
-          for (int j = 0; j < var->size(); ++j) {
-            data[j] = buffer[j];
-          }
-        }
-      } else {
-        std::cout << " Data size mismatch on data " << i
-                  << ". expected size is " << (int)(var->size()) * sizeof(float)
-                  << " but data file [" << ifile << "] size is " << size << "."
-                  << std::endl;
-        return false;
-      }
+    const bool uint8_input = p.get<std::string>("data_type") == "uint8";
+    const size_t elem_size = uint8_input ? sizeof(uint8_t) : sizeof(float);
+    if ((size_t)size != var->size() * elem_size) {
+      std::cout << " Data size mismatch on data " << i << ". expected size is "
+                << var->size() * elem_size << " but data file [" << ifile
+                << "] size is " << size << "." << std::endl;
+      return false;
+    }
+    // Read into the variable buffer directly.
+    char *data = uint8_input
+                     ? reinterpret_cast<char *>(
+                           var->cast_data_and_get_pointer<uint8_t>(ctx, true))
+                     : reinterpret_cast<char *>(
+                           var->cast_data_and_get_pointer<float>(ctx, true));
+    if (file.read(data, size)) {
+      std::cout << "  Read data from [" << ifile << "]" << std::endl;
     }
   }
 
@@ -0,0 +1,418 @@
+// Copyright 2023 Sony Group Corporation.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+// Inference server.
+//
+// The network is built once, and requests are read from stdin or from
+// connections to a unix domain socket. A request is
+//
+//   uint32 num_samples
+//   data of the input 0 for num_samples samples
+//   data of the input 1 for num_samples samples
+//   ...
+//
+// and the response is
+//
+//   uint32 num_samples
+//   float data of the output 0 for num_samples samples
+//   ...
+//
+// in the native byte order. Requests arriving within the latency budget are
+// executed together up to the batch size of the network.
+
+#include <nbla/logger.hpp>
+#include <nbla_utils/nnp.hpp>
+
+#include <cmdline.h>
+
+#include <iostream>
+
+#include "internal.hpp"
+#include "nbla_commands.hpp"
+
+#ifdef _WIN32
+
+bool nbla_serve(int argc, char *argv[]) {
+  std::cerr << "nbla serve is not supported on this platform." << std::endl;
+  return false;
+}
+
+#else
+
+#include <cerrno>
+#include <chrono>
+#include <condition_variable>
+#include <csignal>
+#include <cstdint>
+#include <cstring>
+#include <deque>
+#include <mutex>
+#include <thread>
+
+#include <sys/socket.h>
+#include <sys/un.h>
+#include <unistd.h>
+
+namespace {
+
+using std::shared_ptr;
+using std::vector;
+using Clock = std::chrono::steady_clock;
+
+bool read_all(int fd, void *buf, size_t size) {
+  char *p = static_cast<char *>(buf);
+  while (size > 0) {
+    ssize_t n = ::read(fd, p, size);
+    if (n <= 0) {
+      if (n < 0 && errno == EINTR) {
+        continue;
+      }
+      return false;
+    }
+    p += n;
+    size -= n;
+  }
+  return true;
+}
+
+bool write_all(int fd, const void *buf, size_t size) {
+  const char *p = static_cast<const char *>(buf);
+  while (size > 0) {
+    ssize_t n = ::write(fd, p, size);
+    if (n < 0) {
+      if (errno == EINTR) {
+        continue;
+      }
+      return false;
+    }
+    p += n;
+    size -= n;
+  }
+  return true;
+}
+
+struct Connection {
+  int in_fd;
+  int out_fd;
+  bool owns_fd;
+  std::mutex write_mutex;
+  bool failed = false;
+
+  Connection(int in, int out, bool owns)
+      : in_fd(in), out_fd(out), owns_fd(owns) {}
+  ~Connection() {
+    if (owns_fd) {
+      ::close(in_fd);
+    }
+  }
+};
+
+struct Request {
+  shared_ptr<Connection> connection;
+  uint32_t num_samples;
+  vector<vector<char>> inputs;
+  Clock::time_point arrival;
+};
+
+/** Server holding a built executor.
+
+    Reader threads push requests into the queue, and the thread calling run()
+    executes them in batches.
+ */
+class Server {
+  nbla::Context ctx_;
+  shared_ptr<nbla::utils::nnp::Executor> exec_;
+  vector<nbla::utils::nnp::Executor::DataVariable> inputs_;
+  vector<nbla::utils::nnp::Executor::OutputVariable> outputs_;
+  bool uint8_input_;
+  int batch_size_;
+  Clock::duration max_latency_;
+  vector<size_t> input_sample_bytes_;
+  vector<size_t> output_sample_size_;
+
+  std::mutex mutex_;
+  std::condition_variable cond_;
+  std::deque<Request> queue_;
+  int num_readers_ = 0;
+  bool accepting_ = false;
+
+public:
+  Server(nbla::Context ctx, shared_ptr<nbla::utils::nnp::Executor> exec,
+         bool uint8_input, int max_latency_ms)
+      : ctx_(ctx), exec_(exec), uint8_input_(uint8_input),
+        batch_size_(exec->batch_size()),
+        max_latency_(std::chrono::milliseconds(max_latency_ms)) {
+    using namespace nbla;
+    inputs_ = exec_->get_data_variables();
+    outputs_ = exec_->get_output_variables();
+    const size_t elem_size = uint8_input_ ? sizeof(uint8_t) : sizeof(float);
+    for (auto &in : inputs_) {
+      auto var = in.variable->variable();
+      NBLA_CHECK(var->ndim() > 0 && var->shape()[0] == batch_size_,
+                 error_code::value,
+                 "The first dimension of the input %s must be the batch size.",
+                 in.variable_name.c_str());
+      input_sample_bytes_.push_back(var->size() / batch_size_ * elem_size);
+      // Fix the dtype of the input buffer.
+      if (uint8_input_) {
+        var->cast_data_and_get_pointer<uint8_t>(ctx_, true);
+      } else {
+        var->cast_data_and_get_pointer<float>(ctx_, true);
+      }
+    }
+    for (auto &out : outputs_) {
+      auto var = out.variable->variable();
+      NBLA_CHECK(var->ndim() > 0 && var->shape()[0] == batch_size_,
+                 error_code::value,
+                 "The first dimension of the output %s must be the batch size.",
+                 out.variable_name.c_str());
+      output_sample_size_.push_back(var->size() / batch_size_);
+    }
+  }
+
+  /** Read requests from a connection until it is closed. */
+  void read_requests(shared_ptr<Connection> connection) {
+    while (true) {
+      Request request;
+      request.connection = connection;
+      if (!read_all(connection->in_fd, &request.num_samples,
+                    sizeof(request.num_samples))) {
+        break;
+      }
+      if (request.num_samples == 0 ||
+          request.num_samples > static_cast<uint32_t>(batch_size_)) {
+        std::cerr << "Invalid number of samples " << request.num_samples
+                  << " (batch size is " << batch_size_ << ")." << std::endl;
+        break;
+      }
+      bool ok = true;
+      for (size_t i = 0; i < inputs_.size() && ok; i++) {
+        vector<char> data(input_sample_bytes_[i] * request.num_samples);
+        ok = read_all(connection->in_fd, data.data(), data.size());
+        request.inputs.push_back(std::move(data));
+      }
+      if (!ok) {
+        break;
+      }
+      request.arrival = Clock::now();
+      {
+        std::lock_guard<std::mutex> lock(mutex_);
+        queue_.push_back(std::move(request));
+      }
+      cond_.notify_one();
+    }
+    std::lock_guard<std::mutex> lock(mutex_);
+    num_readers_--;
+    cond_.notify_one();
+  }
+
+  void start_reader(shared_ptr<Connection> connection) {
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      num_readers_++;
+    }
+    std::thread(&Server::read_requests, this, connection).detach();
+  }
+
+  /** Keep running while all the readers are finished. */
+  void set_accepting(bool accepting) {
+    std::lock_guard<std::mutex> lock(mutex_);
+    accepting_ = accepting;
+    cond_.notify_one();
+  }
+
+  /** Execute requests until the queue is empty and no reader is left. */
+  void run() {
+    while (true) {
+      vector<Request> batch;
+      {
+        std::unique_lock<std::mutex> lock(mutex_);
+        cond_.wait(lock, [this] {
+          return !queue_.empty() || (num_readers_ == 0 && !accepting_);
+        });
+        if (queue_.empty()) {
+          break;
+        }
+        // Wait for more requests within the latency budget of the oldest one.
+        const auto deadline = queue_.front().arrival + max_latency_;
+        while (queued_samples() < batch_size_ &&
+               (num_readers_ > 0 || accepting_)) {
+          if (cond_.wait_until(lock, deadline) == std::cv_status::timeout) {
+            break;
+          }
+        }
+        int num_samples = 0;
+        while (!queue_.empty() &&
+               num_samples + (int)queue_.front().num_samples <= batch_size_) {
+          num_samples += queue_.front().num_samples;
+          batch.push_back(std::move(queue_.front()));
+          queue_.pop_front();
+        }
+      }
+      execute(batch);
+    }
+  }
+
+private:
+  int queued_samples() const {
+    int n = 0;
+    for (auto &r : queue_) {
+      n += r.num_samples;
+    }
+    return n;
+  }
+
+  void execute(vector<Request> &batch) {
+    // Write the inputs into the variable buffers.
+    for (size_t i = 0; i < inputs_.size(); i++) {
+      auto var = inputs_[i].variable->variable();
+      char *data = uint8_input_
+                       ? reinterpret_cast<char *>(
+                             var->cast_data_and_get_pointer<uint8_t>(ctx_))
+                       : reinterpret_cast<char *>(
+                             var->cast_data_and_get_pointer<float>(ctx_));
+      for (auto &r : batch) {
+        std::memcpy(data, r.inputs[i].data(), r.inputs[i].size());
+        data += r.inputs[i].size();
+      }
+    }
+
+    exec_->execute();
+
+    vector<const float *> outputs;
+    for (auto &out : outputs_) {
+      outputs.push_back(
+          out.variable->variable()->get_data_pointer<float>(ctx_));
+    }
+    size_t offset = 0;
+    for (auto &r : batch) {
+      auto &c = *r.connection;
+      std::lock_guard<std::mutex> lock(c.write_mutex);
+      if (!c.failed) {
+        bool ok = write_all(c.out_fd, &r.num_samples, sizeof(r.num_samples));
+        for (size_t i = 0; i < outputs.size() && ok; i++) {
+          ok =
+              write_all(c.out_fd, outputs[i] + offset * output_sample_size_[i],
+                        r.num_samples * output_sample_size_[i] * sizeof(float));
+        }
+        c.failed = !ok;
+      }
+      offset += r.num_samples;
+    }
+  }
+};
+
+int listen_unix_socket(const std::string &path) {
+  int fd = ::socket(AF_UNIX, SOCK_STREAM, 0);
+  if (fd < 0) {
+    return -1;
+  }
+  sockaddr_un addr;
+  std::memset(&addr, 0, sizeof(addr));
+  addr.sun_family = AF_UNIX;
+  if (path.size() >= sizeof(addr.sun_path)) {
+    ::close(fd);
+    return -1;
+  }
+  std::strncpy(addr.sun_path, path.c_str(), sizeof(addr.sun_path) - 1);
+  ::unlink(path.c_str());
+  if (::bind(fd, reinterpret_cast<sockaddr *>(&addr), sizeof(addr)) < 0 ||
+      ::listen(fd, SOMAXCONN) < 0) {
+    ::close(fd);
+    return -1;
+  }
+  return fd;
+}
+
+} // namespace
+
+bool nbla_serve_core(nbla::Context ctx, int argc, char *argv[]) {
+  cmdline::parser p;
+  p.add<int>("batch_size", 'b', "Maximum number of samples executed at once",
+             false, -1);
+  p.add<std::string>("executor", 'e', "Executor name (required)", true,
+                     std::string());
+  p.add<std::string>("data_type", 't', "Input data type (uint8 or float)",
+                     false, std::string());
+  p.add<int>("max_latency", 'l',
+             "Milliseconds to wait for more requests to fill a batch", false,
+             1);
+  p.add<std::string>(
+      "socket", 's',
+      "Unix domain socket path, if not specified read requests from stdin.",
+      false, std::string());
+  p.add<int>("help", 0, "Print help", false);
+  p.add("on_memory", 'O', "On memory");
+
+  if (!p.parse(argc, argv) || p.exist("help")) {
+    std::cout << p.error_full() << p.usage();
+    return false;
+  }
+
+  nbla::utils::nnp::Nnp nnp(ctx);
+  add_files_to_nnp(nnp, p.rest(), p.exist("on_memory"));
+
+  std::shared_ptr<nbla::utils::nnp::Executor> exec =
+      nnp.get_executor(p.get<std::string>("executor"));
+  exec->set_batch_size(p.get<int>("batch_size"));
+
+  Server server(ctx, exec, p.get<std::string>("data_type") == "uint8",
+                p.get<int>("max_latency"));
+
+  // A client closing its connection must not kill the server.
+  std::signal(SIGPIPE, SIG_IGN);
+
+  std::string socket_path = p.get<std::string>("socket");
+  if (socket_path.empty()) {
+    server.start_reader(
+        std::make_shared<Connection>(STDIN_FILENO, STDOUT_FILENO, false));
+    server.run();
+    return true;
+  }
+
+  int listen_fd = listen_unix_socket(socket_path);
+  if (listen_fd < 0) {
+    std::cerr << "Could not listen on " << socket_path << ": "
+              << std::strerror(errno) << std::endl;
+    return false;
+  }
+  std::cerr << "Listening on " << socket_path << std::endl;
+  server.set_accepting(true);
+  std::thread accept_thread([&server, listen_fd] {
+    while (true) {
+      int fd = ::accept(listen_fd, nullptr, nullptr);
+      if (fd < 0) {
+        if (errno == EINTR) {
+          continue;
+        }
+        break;
+      }
+      server.start_reader(std::make_shared<Connection>(fd, fd, true));
+    }
+    server.set_accepting(false);
+  });
+  server.run();
+  accept_thread.join();
+  ::close(listen_fd);
+  return true;
+}
+
+bool nbla_serve(int argc, char *argv[]) {
+  // Create a context
+  nbla::Context ctx{{"cpu:float"}, "CpuCachedArray", "0"};
+
+  return nbla_serve_core(ctx, argc, argv);
+}
+
+#endif